@@ -6,6 +6,7 @@ import asyncio
 
 import anthropic
 import httpx
+from data import http_pool
 
 from agent.data_compressor import compress_data
 from agent.institutional_scorer import apply_institutional_scoring
@@ -4362,7 +4363,7 @@ class TradingAgent:
                 }
                 if tools:
                     payload["tools"] = tools
-                async with httpx.AsyncClient(timeout=90.0) as hclient:
+                async with http_pool.session(timeout=90.0) as hclient:
                     resp = await hclient.post(
                         "https://api.x.ai/v1/responses",
                         headers={"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"},
@@ -4398,7 +4399,7 @@ class TradingAgent:
                 traceback.print_exc()
             # Fallback to chat completions (no search tools, but still gets response)
             try:
-                async with httpx.AsyncClient(timeout=90.0) as hclient:
+                async with http_pool.session(timeout=90.0) as hclient:
                     resp = await hclient.post(
                         "https://api.x.ai/v1/chat/completions",
                         headers={"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"},
@@ -4441,7 +4442,7 @@ class TradingAgent:
                 # Enable Google Search grounding for eligible categories
                 if use_web_search:
                     body["tools"] = [{"google_search": {}}]
-                async with httpx.AsyncClient(timeout=90.0) as client:
+                async with http_pool.session(timeout=90.0) as client:
                     resp = await client.post(
                         f"https://generativelanguage.googleapis.com/v1beta/models/gemini-3-flash-preview:generateContent?key={api_key}",
                         headers={"Content-Type": "application/json"},
@@ -4483,7 +4484,7 @@ class TradingAgent:
                 # Perplexity always searches the web — for trending, focus on recent results
                 if use_web_search:
                     body["search_recency_filter"] = "day"
-                async with httpx.AsyncClient(timeout=90.0) as client:
+                async with http_pool.session(timeout=90.0) as client:
                     resp = await client.post(
                         "https://api.perplexity.ai/chat/completions",
                         headers={"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"},
@@ -6118,7 +6119,7 @@ class TradingAgent:
             if use_polygon:
                 try:
                     data["technicals"] = await asyncio.wait_for(
-                        asyncio.to_thread(self.data.polygon.get_technicals, ticker),
+                        self.data.polygon.get_technicals(ticker),
                         timeout=8.0,
                     )
                 except Exception as e:
@@ -6126,7 +6127,7 @@ class TradingAgent:
 
                 try:
                     data["snapshot"] = await asyncio.wait_for(
-                        asyncio.to_thread(self.data.polygon.get_snapshot, ticker),
+                        self.data.polygon.get_snapshot(ticker),
                         timeout=8.0,
                     )
                 except Exception as e:
@@ -1,4 +1,4 @@
-import httpx
+from data import http_pool
 
 try:
     from langsmith import traceable
@@ -50,7 +50,7 @@ class AlphaVantageProvider:
             if topics:
                 params["topics"] = topics
 
-            async with httpx.AsyncClient() as client:
+            async with http_pool.session() as client:
                 resp = await client.get(
                     self.BASE_URL,
                     params=params,
@@ -11,7 +11,7 @@ Real API endpoints (discovered from Swagger):
   Coins list: GET /api/v1/nonauth/marketData/screener/coins
 """
 import asyncio
-import httpx
+from data import http_pool
 from data.cache import cache
 
 try:
@@ -74,7 +74,7 @@ class AltFINSProvider:
         }
 
         try:
-            async with httpx.AsyncClient(timeout=15.0) as client:
+            async with http_pool.session(timeout=15.0) as client:
                 resp = await client.get(
                     f"{self.BASE_URL}{endpoint}",
                     params=params or {},
@@ -9,7 +9,7 @@ Endpoints:
 Free tier: $5/month credit = ~1,000 requests at $5/1K.
 """
 import asyncio
-import httpx
+from data import http_pool
 from data.cache import cache
 
 try:
@@ -64,7 +64,7 @@ class BraveProvider:
             params["result_filter"] = "web,news"
 
         try:
-            async with httpx.AsyncClient() as client:
+            async with http_pool.session() as client:
                 resp = await client.get(
                     url,
                     headers=self._headers,
@@ -1,63 +1,521 @@
 """
-Simple in-memory TTL cache.
-Stores API responses with expiration times.
+In-memory TTL cache for provider responses, bounded per namespace.
 Different data types get different TTLs based on how fast they change.
+
+A key's namespace is the text before its first ':' ("candles:AAPL:1d:120"
+→ "candles"; a key with no ':' is its own namespace).  Each namespace is an
+LRU with its own entry and approximate-byte budget from _NAMESPACES, so a
+burst of large objects (FRED pandas Series, full options scans) evicts the
+least recently used entries of its own kind instead of growing the process.
+Expired entries are dropped when read, when LRU eviction reaches them, or by
+cleanup().
+
+get_or_compute() / get_or_compute_sync() add single-flight fills: when
+several callers miss the same key at once, one computation runs and the
+rest wait for its result instead of each calling (and paying for) the
+provider.  Errors reach every waiter and are never cached.  In namespaces
+with a "stale" window they also serve stale-while-revalidate: for that
+many seconds past expiry the old value is returned at once while a single
+background refresh replaces it.  Plain get() never returns stale values.
+
+Keys under one of _L2_PREFIXES (slow-moving reference data) also have a
+shared L2 (data/cache_l2.py: SQLite file or Postgres table, chosen by
+CACHE_L2) so every worker and restart sees values another process already
+paid for.  Writes are write-behind: set() queues entries with a TTL of at
+least _L2_MIN_TTL and a flusher thread encodes and upserts them in
+batches.  Reads are read-through on an L1 miss from get_async() and the
+get_or_compute*() fills, always in a worker thread; plain get() stays
+L1-only so it never blocks the event loop.  warm_l2() bulk-loads the L2
+at startup.
+
+stats() reports per-namespace hits / misses / stale hits / evictions and
+current size, plus L2 traffic (GET /api/health/cache).
 """
+import asyncio
+import os
+import sys
+import threading
 import time
-from typing import Any
+from collections import OrderedDict
+from concurrent.futures import Future
+from functools import partial
+from typing import Any, Awaitable, Callable, Optional
+
+from data import cache_l2
+
+_MB = 1024 * 1024
+
+# Per-namespace bounds.  "stale" is the stale-while-revalidate window in
+# seconds (0 = off).  Namespaces not listed get _DEFAULT_LIMITS.
+_DEFAULT_LIMITS = {"max_entries": 512, "max_bytes": 16 * _MB, "stale": 0}
+_NAMESPACES: dict[str, dict[str, int]] = {
+    # Daily bars for every scanned ticker
+    "candles":                 {"max_entries": 4096, "max_bytes": 96 * _MB, "stale": 300},
+    "finviz":                  {"max_entries": 256,  "max_bytes": 16 * _MB, "stale": 120},
+    # FRED pandas Series and the macro dashboards built from them
+    "macro":                   {"max_entries": 512,  "max_bytes": 64 * _MB, "stale": 600},
+    "macro_snapshot_v1":       {"max_entries": 1,    "stale": 60},
+    # Per-ticker quote / fundamentals fan-out
+    "finnhub":                 {"max_entries": 4096, "max_bytes": 32 * _MB},
+    "polygon":                 {"max_entries": 4096, "max_bytes": 48 * _MB},
+    "fmp":                     {"max_entries": 4096, "max_bytes": 32 * _MB},
+    "tradier":                 {"max_entries": 2048, "max_bytes": 64 * _MB},
+    "edgar":                   {"max_entries": 2048, "max_bytes": 32 * _MB},
+    # Slow-moving reference data behind the daily API budgets
+    "sector":                  {"max_entries": 4096},
+    "earnings_calendar":       {"max_entries": 64},
+    "earnings_detail_v3":      {"max_entries": 1024},
+    # Full options scans: few keys, large values
+    "options_screener_v9":     {"max_entries": 16,   "max_bytes": 64 * _MB},
+    "options_screener_lkg_v1": {"max_entries": 16,   "max_bytes": 64 * _MB},
+}
+
+# Key prefixes that go to the L2.  Per prefix, not per namespace: quotes,
+# candles and other short-TTL keys would only pay for L2 misses.  List only
+# keys whose writers use a TTL of at least _L2_MIN_TTL, read via get_async().
+_L2_PREFIXES = (
+    "finnhub:profile:", "finnhub:earnings:", "finnhub:upcoming_earnings",
+    "polygon:details:", "edgar:cik:",
+    "sector:", "options_screener_lkg_v1:",
+)
+# ...and of those, only entries cached at least this long
+_L2_MIN_TTL = 1800
+_L2_FLUSH_S = 2.0
+_L2_PURGE_S = 600.0   # expired L2 rows are deleted this often, not per write
+
+_SIZE_SAMPLE = 16   # container items measured per level; the rest extrapolated
+_SIZE_DEPTH = 3
+
+
+def _approx_size(value: Any, depth: int = 0) -> int:
+    """Rough deep size in bytes — cheap enough to run on every set()."""
+    memory_usage = getattr(value, "memory_usage", None)
+    if callable(memory_usage):                       # pandas Series / DataFrame
+        try:
+            usage = memory_usage(index=True, deep=False)
+            return int(usage.sum() if hasattr(usage, "sum") else usage)
+        except Exception:
+            pass
+    nbytes = getattr(value, "nbytes", None)
+    if isinstance(nbytes, int):                      # numpy arrays
+        return nbytes
+    size = sys.getsizeof(value, 64)
+    if depth >= _SIZE_DEPTH or isinstance(value, (str, bytes, bytearray)):
+        return size
+    if isinstance(value, dict):
+        items = value.items()
+        per_item = lambda kv: _approx_size(kv[0], depth + 1) + _approx_size(kv[1], depth + 1)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        items = value
+        per_item = lambda v: _approx_size(v, depth + 1)
+    else:
+        return size
+    n = len(items)
+    if not n:
+        return size
+    sampled = 0
+    for i, item in enumerate(items):
+        if i == _SIZE_SAMPLE:
+            break
+        sampled += per_item(item)
+    return size + sampled * n // min(n, _SIZE_SAMPLE)
+
+
+def _is_not_none(value: Any) -> bool:
+    return value is not None
+
+
+def _persists(key: str) -> bool:
+    return key.startswith(_L2_PREFIXES)
+
+
+class _Entry:
+    __slots__ = ("value", "expires_at", "stale_until", "nbytes")
+
+    def __init__(self, value: Any, expires_at: float, stale_until: float, nbytes: int):
+        self.value = value
+        self.expires_at = expires_at
+        self.stale_until = stale_until
+        self.nbytes = nbytes
+
+
+class _Namespace:
+    __slots__ = ("entries", "max_entries", "max_bytes", "stale", "nbytes",
+                 "hits", "misses", "stale_hits", "evictions", "expirations",
+                 "l2_hits", "l2_misses")
+
+    def __init__(self, name: str):
+        limits = {**_DEFAULT_LIMITS, **_NAMESPACES.get(name, {})}
+        self.entries: OrderedDict[str, _Entry] = OrderedDict()
+        self.max_entries = limits["max_entries"]
+        self.max_bytes = limits["max_bytes"]
+        self.stale = limits["stale"]
+        self.nbytes = 0
+        self.hits = self.misses = self.stale_hits = 0
+        self.evictions = self.expirations = 0
+        self.l2_hits = self.l2_misses = 0
+
+    def drop(self, key: str) -> _Entry:
+        entry = self.entries.pop(key)
+        self.nbytes -= entry.nbytes
+        return entry
+
+    def stats(self) -> dict:
+        stats = {
+            "entries": len(self.entries),
+            "bytes": self.nbytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "stale_window_s": self.stale,
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale_hits": self.stale_hits,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+        if self.l2_hits or self.l2_misses:
+            stats["l2_hits"] = self.l2_hits
+            stats["l2_misses"] = self.l2_misses
+        return stats
 
-try:
-    from langsmith import traceable
-except ImportError:
-    def traceable(*args, **kwargs):
-        def _noop(fn):
-            return fn
-        if args and callable(args[0]):
-            return args[0]
-        return _noop
 
+# _lookup() outcomes
+_FRESH, _STALE, _MISS = "fresh", "stale", "miss"
+_INFLIGHT = "inflight"       # status() only
 
 
 class TTLCache:
-    def __init__(self):
-        self._store: dict[str, tuple[Any, float]] = {}
+    def __init__(self, l2=None):
+        self._namespaces: dict[str, _Namespace] = {}
+        # Guards the namespaces: worker threads (to_thread providers) read
+        # and fill the cache alongside the event loop.
+        self._lock = threading.Lock()
+        # key → computation in flight (asyncio.Task for coroutine fills,
+        # Future for worker-thread fills)
+        self._inflight: dict[str, asyncio.Task] = {}
+        self._inflight_sync: dict[str, Future] = {}
+        # L2 write-behind: key → (value, expires_at) awaiting the flusher
+        self._l2 = l2
+        self._l2_pending: dict[str, tuple[Any, float]] = {}
+        self._l2_flusher_pid: Optional[int] = None
+        self._l2_written = self._l2_errors = 0
+
+    def _namespace(self, key: str) -> _Namespace:
+        name = key.split(":", 1)[0]
+        ns = self._namespaces.get(name)
+        if ns is None:
+            ns = self._namespaces[name] = _Namespace(name)
+        return ns
+
+    def _lookup(self, key: str) -> tuple[str, Any]:
+        """Classify `key` and update LRU order and counters.  Caller holds the lock."""
+        ns = self._namespace(key)
+        entry = ns.entries.get(key)
+        if entry is not None:
+            now = time.time()
+            if now < entry.expires_at:
+                ns.entries.move_to_end(key)
+                ns.hits += 1
+                return _FRESH, entry.value
+            if now < entry.stale_until:
+                ns.stale_hits += 1
+                return _STALE, entry.value
+            ns.drop(key)
+            ns.expirations += 1
+        ns.misses += 1
+        return _MISS, None
 
-    @traceable(name="get")
     def get(self, key: str) -> Any | None:
         """Get a value if it exists and hasn't expired."""
-        if key in self._store:
-            value, expires_at = self._store[key]
-            if time.time() < expires_at:
+        with self._lock:
+            ns = self._namespace(key)
+            entry = ns.entries.get(key)
+            if entry is not None:
+                now = time.time()
+                if now < entry.expires_at:
+                    ns.entries.move_to_end(key)
+                    ns.hits += 1
+                    return entry.value
+                if now >= entry.stale_until:
+                    ns.drop(key)
+                    ns.expirations += 1
+            ns.misses += 1
+            return None
+
+    async def get_async(self, key: str) -> Any | None:
+        """get(), falling back to the L2 (in a worker thread) for persisted keys."""
+        value = self.get(key)
+        if value is None and self._l2 is not None and _persists(key):
+            value = await asyncio.to_thread(self._l2_read, key)
+        return value
+
+    def set(self, key: str, value: Any, ttl_seconds: int):
+        """Store a value with a TTL in seconds, evicting LRU entries past the namespace bounds."""
+        expires_at = time.time() + ttl_seconds
+        self._insert(key, value, expires_at)
+        if self._l2 is not None and ttl_seconds >= _L2_MIN_TTL and _persists(key):
+            with self._lock:
+                self._l2_pending[key] = (value, expires_at)
+            self._ensure_l2_flusher()
+
+    def _insert(self, key: str, value: Any, expires_at: float):
+        """Put an entry in L1."""
+        nbytes = _approx_size(value)
+        with self._lock:
+            ns = self._namespace(key)
+            if key in ns.entries:
+                ns.drop(key)
+            ns.entries[key] = _Entry(value, expires_at, expires_at + ns.stale, nbytes)
+            ns.nbytes += nbytes
+            # Oldest first; a value bigger than the whole budget still stays
+            # as the namespace's only entry
+            while len(ns.entries) > 1 and (len(ns.entries) > ns.max_entries
+                                           or ns.nbytes > ns.max_bytes):
+                oldest = next(iter(ns.entries))
+                if ns.drop(oldest).expires_at <= time.time():
+                    ns.expirations += 1
+                else:
+                    ns.evictions += 1
+
+    async def get_or_compute(
+        self,
+        key: str,
+        ttl_seconds: int,
+        compute: Callable[[], Awaitable[Any]],
+        cache_if: Optional[Callable[[Any], bool]] = None,
+    ) -> Any:
+        """
+        Return the cached value for `key`, or await `compute()` to fill it.
+        Concurrent misses share one computation.  The result is stored only
+        if `cache_if(result)` holds (default: not None), so callers can keep
+        empty/failed fetches out of the cache.  Within the namespace's stale
+        window an expired value is returned immediately and refreshed in the
+        background.
+
+        The computation runs as its own task: a caller that is cancelled
+        (e.g. by asyncio.wait_for) stops waiting without cancelling the
+        fill the other waiters depend on.
+        """
+        with self._lock:
+            state, value = self._lookup(key)
+        if state is _FRESH:
+            return value
+        loop = asyncio.get_running_loop()
+        task = self._inflight.get(key)
+        # A task is only joinable from its own loop (tests and scripts run
+        # each asyncio.run on a fresh one)
+        if task is None or task.get_loop() is not loop:
+            task = loop.create_task(
+                self._fill(key, ttl_seconds, compute, cache_if or _is_not_none))
+            self._inflight[key] = task
+            task.add_done_callback(partial(self._settle, key))
+        if state is _STALE:
+            return value
+        return await asyncio.shield(task)
+
+    async def _fill(self, key, ttl_seconds, compute, cache_if):
+        if self._l2 is not None and _persists(key):
+            value = await asyncio.to_thread(self._l2_read, key)
+            if value is not None:
+                return value
+        value = await compute()
+        if cache_if(value):
+            self.set(key, value, ttl_seconds)
+        return value
+
+    def status(self, key: str) -> str:
+        """
+        How get_or_compute(key) on the running loop would be served right
+        now, without touching LRU order or counters: "fresh" / "stale" (a
+        cached value), "inflight" (joins a running fill) or "miss" (starts
+        one).  Lets callers account for a fill they would pay for before
+        joining it.
+        """
+        with self._lock:
+            entry = self._namespace(key).entries.get(key)
+            if entry is not None:
+                now = time.time()
+                if now < entry.expires_at:
+                    return _FRESH
+                if now < entry.stale_until:
+                    return _STALE
+        task = self._inflight.get(key)
+        if task is not None and not task.done() and task.get_loop() is asyncio.get_running_loop():
+            return _INFLIGHT
+        return _MISS
+
+    def _settle(self, key: str, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()  # retrieved here, so an error nobody awaited isn't logged as lost
+
+    def get_or_compute_sync(
+        self,
+        key: str,
+        ttl_seconds: int,
+        compute: Callable[[], Any],
+        cache_if: Optional[Callable[[Any], bool]] = None,
+    ) -> Any:
+        """get_or_compute() for blocking callers running in worker threads."""
+        cache_if = cache_if or _is_not_none
+        with self._lock:
+            state, value = self._lookup(key)
+            if state is _FRESH:
                 return value
+            pending = self._inflight_sync.get(key)
+            if pending is None:
+                pending = self._inflight_sync[key] = Future()
+                leader = True
             else:
-                del self._store[key]
-        return None
+                leader = False
+        if state is _STALE:
+            if leader:
+                threading.Thread(target=self._fill_sync,
+                                 args=(key, ttl_seconds, compute, cache_if, pending),
+                                 daemon=True).start()
+            return value
+        if leader:
+            self._fill_sync(key, ttl_seconds, compute, cache_if, pending)
+        return pending.result()
 
-    @traceable(name="set")
-    def set(self, key: str, value: Any, ttl_seconds: int):
-        """Store a value with a TTL in seconds."""
-        self._store[key] = (value, time.time() + ttl_seconds)
+    def _fill_sync(self, key, ttl_seconds, compute, cache_if, fill: Future):
+        try:
+            value = None
+            if self._l2 is not None and _persists(key):
+                value = self._l2_read(key)
+            if value is None:
+                value = compute()
+                if cache_if(value):
+                    self.set(key, value, ttl_seconds)
+        except BaseException as e:
+            fill.set_exception(e)
+        else:
+            fill.set_result(value)
+        finally:
+            with self._lock:
+                if self._inflight_sync.get(key) is fill:
+                    del self._inflight_sync[key]
+
+    # ── L2 ───────────────────────────────────────────────────────────────
+
+    def _l2_read(self, key: str) -> Any | None:
+        """Read-through: a live L2 row is loaded into L1 with its remaining TTL."""
+        try:
+            row = self._l2.get(key)
+            value = cache_l2.loads(row[0]) if row else None
+        except Exception as e:
+            print(f"[CACHE] L2 read {key} error: {e}")
+            self._l2_errors += 1
+            row = value = None
+        if value is not None:
+            self._insert(key, value, row[1])
+        with self._lock:
+            ns = self._namespace(key)
+            if value is None:
+                ns.l2_misses += 1
+            else:
+                ns.l2_hits += 1
+        return value
+
+    def warm_l2(self) -> int:
+        """Bulk-load the live L2 rows under _L2_PREFIXES (startup; blocking)."""
+        if self._l2 is None:
+            return 0
+        try:
+            rows = self._l2.load(list(_L2_PREFIXES))
+        except Exception as e:
+            print(f"[CACHE] L2 warm-up error: {e}")
+            return 0
+        loaded = 0
+        for key, blob, expires_at in rows:
+            try:
+                self._insert(key, cache_l2.loads(blob), expires_at)
+                loaded += 1
+            except Exception as e:
+                print(f"[CACHE] L2 warm-up skipped {key}: {e}")
+        print(f"[CACHE] L2 {self._l2.name} warm-up loaded {loaded} entries")
+        return loaded
+
+    def _ensure_l2_flusher(self):
+        # Started lazily, and again in a forked worker (threads don't survive fork)
+        pid = os.getpid()
+        if self._l2_flusher_pid != pid:
+            self._l2_flusher_pid = pid
+            threading.Thread(target=self._l2_flush_loop, daemon=True,
+                             name="cache-l2-flush").start()
+
+    def _l2_flush_loop(self):
+        next_purge = time.monotonic() + _L2_PURGE_S
+        while True:
+            time.sleep(_L2_FLUSH_S)
+            self.flush_l2()
+            if time.monotonic() >= next_purge:
+                next_purge = time.monotonic() + _L2_PURGE_S
+                try:
+                    self._l2.purge()
+                except Exception as e:
+                    print(f"[CACHE] L2 purge error: {e}")
+                    self._l2_errors += 1
+
+    def flush_l2(self):
+        """Write queued entries to the L2 now (flusher thread and app shutdown)."""
+        if self._l2 is None or not self._l2_pending:
+            return
+        with self._lock:
+            pending, self._l2_pending = self._l2_pending, {}
+        rows = []
+        for key, (value, expires_at) in pending.items():
+            try:
+                rows.append((key, cache_l2.dumps(value), expires_at))
+            except Exception as e:
+                print(f"[CACHE] L2 skipped {key}: {e}")
+                self._l2_errors += 1
+        try:
+            if rows and self._l2.put_many(rows):
+                self._l2_written += len(rows)
+        except Exception as e:
+            print(f"[CACHE] L2 write error: {e}")
+            self._l2_errors += 1
 
-    @traceable(name="clear")
     def clear(self):
-        """Clear all cached values."""
-        self._store.clear()
+        """Clear all cached values and counters (L1 only; L2 rows expire on their own)."""
+        with self._lock:
+            self._namespaces.clear()
 
-    @traceable(name="cleanup")
     def cleanup(self):
-        """Remove expired entries."""
+        """Remove entries past their stale window."""
         now = time.time()
-        expired = [k for k, (_, exp) in self._store.items() if now >= exp]
-        for k in expired:
-            del self._store[k]
+        with self._lock:
+            for ns in self._namespaces.values():
+                for k in [k for k, e in ns.entries.items() if now >= e.stale_until]:
+                    ns.drop(k)
+                    ns.expirations += 1
+
+    def stats(self) -> dict:
+        """Per-namespace counters and size, largest namespaces first."""
+        with self._lock:
+            namespaces = {name: ns.stats() for name, ns in
+                          sorted(self._namespaces.items(), key=lambda kv: -kv[1].nbytes)}
+        return {
+            "entries": sum(ns["entries"] for ns in namespaces.values()),
+            "bytes": sum(ns["bytes"] for ns in namespaces.values()),
+            "inflight": len(self._inflight) + len(self._inflight_sync),
+            "l2": None if self._l2 is None else {
+                "backend": self._l2.name,
+                "pending": len(self._l2_pending),
+                "written": self._l2_written,
+                "errors": self._l2_errors,
+            },
+            "namespaces": namespaces,
+        }
 
     @property
-    @traceable(name="size")
     def size(self):
-        return len(self._store)
+        return sum(len(ns.entries) for ns in self._namespaces.values())
 
 
-cache = TTLCache()
+cache = TTLCache(l2=cache_l2.open_store())
 
 FINVIZ_TTL = 300
 POLYGON_SNAPSHOT_TTL = 60
@@ -0,0 +1,185 @@
+"""
+Persistent second tier for data/cache.py, shared by every app worker and
+surviving restarts.
+
+CACHE_L2 selects the backend:
+  sqlite    — a local SQLite file in WAL mode (CACHE_L2_PATH, default
+              data/cache_l2.sqlite3); workers on one host share it
+  postgres  — the UNLOGGED public.response_cache table via pg_storage
+              (NEON_DATABASE_URL / DATABASE_URL); shared across hosts
+  unset/off — no L2 (default)
+
+Stores hold (key, blob, expires_at epoch) rows; values are JSON,
+zlib-compressed past a small size.  JSON rather than pickle because the
+rows live in a shared database: decoding a blob must never be able to run
+code.  Only plain JSON trees (dicts with str keys, lists, str, int, float,
+bool, None) are accepted, so what comes back is exactly what was cached;
+dumps() raises TypeError on anything else and the cache keeps that entry
+process-local.
+
+Expired rows are skipped by every read and deleted by purge(), which the
+cache's flusher calls every _PURGE_S seconds rather than on each write.
+"""
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, Optional
+
+_COMPRESS_OVER = 512  # bytes of JSON before zlib pays for itself
+
+_DEFAULT_SQLITE_PATH = os.path.join(os.path.dirname(__file__), "cache_l2.sqlite3")
+
+
+_SCALARS = (str, int, float, bool, type(None))
+
+
+def _check_json_tree(value: Any):
+    """Raise TypeError unless `value` survives a JSON round-trip unchanged."""
+    stack = [value]
+    while stack:
+        v = stack.pop()
+        if isinstance(v, dict):
+            for k, item in v.items():
+                if not isinstance(k, str):
+                    raise TypeError(f"non-str dict key {k!r}")
+                stack.append(item)
+        elif isinstance(v, list):
+            stack.extend(v)
+        elif not isinstance(v, _SCALARS) or type(v).__module__ != "builtins":
+            # tuples would come back as lists, numpy scalars as floats
+            raise TypeError(f"{type(v).__name__} is not JSON-native")
+
+
+def dumps(value: Any) -> bytes:
+    _check_json_tree(value)
+    raw = json.dumps(value, separators=(",", ":")).encode()
+    if len(raw) > _COMPRESS_OVER:
+        return b"z" + zlib.compress(raw, 1)
+    return b"j" + raw
+
+
+def loads(blob: bytes) -> Any:
+    raw = blob[1:]
+    if blob[:1] == b"z":
+        raw = zlib.decompress(raw)
+    elif blob[:1] != b"j":
+        raise ValueError(f"unknown L2 blob format {blob[:1]!r}")
+    return json.loads(raw)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Backends
+# ─────────────────────────────────────────────────────────────────────────────
+
+class SQLiteStore:
+    """Local file store.  Calls block on the file lock, so the cache runs
+    them in worker threads like the Postgres ones."""
+
+    name = "sqlite"
+
+    def __init__(self, path: str = _DEFAULT_SQLITE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=5.0, check_same_thread=False,
+                                     isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS response_cache (
+                key TEXT PRIMARY KEY,
+                expires_at REAL NOT NULL,
+                value BLOB NOT NULL
+            )
+        """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS response_cache_expires_at ON response_cache (expires_at)")
+
+    def get(self, key: str) -> Optional[tuple[bytes, float]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM response_cache WHERE key = ? AND expires_at > ?",
+                (key, time.time()),
+            ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def load(self, prefixes: list[str]) -> list[tuple[str, bytes, float]]:
+        if not prefixes:
+            return []
+        where = " OR ".join("substr(key, 1, ?) = ?" for _ in prefixes)
+        args: list[Any] = [time.time()]
+        for p in prefixes:
+            args += [len(p), p]
+        with self._lock:
+            return self._conn.execute(
+                f"SELECT key, value, expires_at FROM response_cache WHERE expires_at > ? AND ({where})",
+                args,
+            ).fetchall()
+
+    def put_many(self, rows: list[tuple[str, bytes, float]]) -> bool:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO response_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                    rows,
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return True
+
+    def purge(self) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "DELETE FROM response_cache WHERE expires_at <= ?", (time.time(),)).rowcount
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class PostgresStore:
+    """public.response_cache through pg_storage's pool."""
+
+    name = "postgres"
+
+    def get(self, key: str) -> Optional[tuple[bytes, float]]:
+        from data import pg_storage
+        return pg_storage.response_cache_get(key)
+
+    def load(self, prefixes: list[str]) -> list[tuple[str, bytes, float]]:
+        from data import pg_storage
+        return pg_storage.response_cache_load(prefixes)
+
+    def put_many(self, rows: list[tuple[str, bytes, float]]) -> bool:
+        from data import pg_storage
+        return pg_storage.response_cache_put_many(rows)
+
+    def purge(self) -> int:
+        from data import pg_storage
+        return pg_storage.response_cache_purge()
+
+    def close(self):
+        pass
+
+
+def open_store() -> Optional[SQLiteStore | PostgresStore]:
+    """The backend CACHE_L2 asks for, or None."""
+    backend = os.getenv("CACHE_L2", "").strip().lower()
+    if backend in ("", "0", "off", "none"):
+        return None
+    try:
+        if backend == "sqlite":
+            return SQLiteStore(os.getenv("CACHE_L2_PATH") or _DEFAULT_SQLITE_PATH)
+        if backend in ("postgres", "pg"):
+            return PostgresStore()
+        print(f"[CACHE] Unknown CACHE_L2={backend!r}, L2 disabled")
+    except Exception as e:
+        print(f"[CACHE] L2 {backend} unavailable: {e}")
+    return None
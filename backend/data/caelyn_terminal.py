@@ -21,7 +21,7 @@ from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any
 
-import httpx
+from data import http_pool
 
 from data.cache import cache
 
@@ -245,7 +245,7 @@ async def _cg_prices(coin_ids: list[str]) -> dict[str, dict]:
     if not coin_ids:
         return {}
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
+        async with http_pool.session(timeout=10.0) as client:
             resp = await client.get(
                 "https://api.coingecko.com/api/v3/simple/price",
                 params={
@@ -645,7 +645,7 @@ class CaelynTerminalProvider:
         async def _fetch_one(ticker: str):
             try:
                 surprises = await asyncio.wait_for(
-                    asyncio.to_thread(self.finnhub.get_earnings_surprises, ticker),
+                    self.finnhub.get_earnings_surprises(ticker),
                     timeout=8.0,
                 )
                 last_eps = None
@@ -653,7 +653,7 @@ class CaelynTerminalProvider:
                     last_eps = surprises[0].get("actual_eps") if surprises[0] else None
 
                 cal = await asyncio.wait_for(
-                    asyncio.to_thread(self.finnhub.get_earnings_calendar, ticker),
+                    self.finnhub.get_earnings_calendar(ticker),
                     timeout=8.0,
                 )
                 next_date = None
@@ -688,7 +688,7 @@ class CaelynTerminalProvider:
         if not self.finnhub or not tickers:
             return []
         try:
-            tasks = [asyncio.to_thread(self.finnhub.get_company_news, t, 7) for t in tickers[:4]]
+            tasks = [self.finnhub.get_company_news(t, 7) for t in tickers[:4]]
             results = await asyncio.gather(*tasks, return_exceptions=True)
             combined = []
             for sym, res in zip(tickers[:4], results):
@@ -10,7 +10,7 @@ CMC complements CoinGecko by providing:
 - Richer metadata and category tagging
 - Cross-reference trending data for momentum confirmation
 """
-import httpx
+from data import http_pool
 from data.cache import cache
 
 try:
@@ -48,7 +48,7 @@ class CMCProvider:
             return cached
 
         try:
-            async with httpx.AsyncClient() as client:
+            async with http_pool.session() as client:
                 resp = await client.get(
                     f"{self.BASE_URL}{endpoint}",
                     params=params,
@@ -1,4 +1,4 @@
-import httpx
+from data import http_pool
 from data.cache import cache
 
 try:
@@ -121,7 +121,7 @@ class CoinGeckoProvider:
             return cached
 
         try:
-            async with httpx.AsyncClient() as client:
+            async with http_pool.session() as client:
                 resp = await client.get(
                     f"{self.BASE_URL}/{endpoint}",
                     params=params,
@@ -3,7 +3,7 @@ DeFiLlama provider — free public API, no key required.
 Provides: global DeFi TVL, top protocols, chain TVL flows, DEX volumes, stablecoin data.
 """
 import asyncio
-import httpx
+from data import http_pool
 from data.cache import TTLCache
 
 _cache = TTLCache()
@@ -18,7 +18,7 @@ class DeFiLlamaProvider:
 
     async def _get(self, url: str) -> dict | list | None:
         try:
-            async with httpx.AsyncClient(timeout=self.TIMEOUT) as client:
+            async with http_pool.session(timeout=self.TIMEOUT) as client:
                 r = await client.get(url, headers={"Accept": "application/json"})
             if r.status_code == 200:
                 return r.json()
@@ -1,4 +1,5 @@
 import httpx
+from data import http_pool
 from datetime import datetime, timedelta
 
 try:
@@ -72,7 +73,7 @@ class EdgarProvider:
             if not cik:
                 return [{"error": f"Could not find CIK for {ticker}"}]
 
-            async with httpx.AsyncClient() as client:
+            async with http_pool.session() as client:
                 resp = await client.get(
                     f"{self.DATA_URL}/submissions/CIK{cik}.json",
                     headers=self.HEADERS,
@@ -148,7 +149,7 @@ class EdgarProvider:
             if not cik:
                 return {"ticker": ticker, "error": f"Could not find CIK for {ticker}"}
 
-            async with httpx.AsyncClient() as client:
+            async with http_pool.session() as client:
                 resp = await client.get(
                     f"{self.DATA_URL}/api/xbrl/companyfacts/CIK{cik}.json",
                     headers=self.HEADERS,
@@ -268,7 +269,7 @@ class EdgarProvider:
                 "enddt": datetime.now().strftime("%Y-%m-%d"),
             }
 
-            async with httpx.AsyncClient() as client:
+            async with http_pool.session() as client:
                 resp = await client.get(
                     f"{self.BASE_URL}/search-index?q={query}&dateRange=custom"
                     f"&startdt={params['startdt']}&enddt={params['enddt']}",
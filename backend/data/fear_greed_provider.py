@@ -1,4 +1,4 @@
-import httpx
+from data import http_pool
 from data.cache import cache, FEAR_GREED_TTL
 
 try:
@@ -56,7 +56,7 @@ class FearGreedProvider:
         if cached is not None:
             return cached
         try:
-            async with httpx.AsyncClient() as client:
+            async with http_pool.session() as client:
                 resp = await client.get(
                     self.API_URL,
                     headers=self.HEADERS,
@@ -156,7 +156,7 @@ class FearGreedProvider:
         Tries an alternate CNN endpoint.
         """
         try:
-            async with httpx.AsyncClient() as client:
+            async with http_pool.session() as client:
                 resp = await client.get(
                     "https://production.dataviz.cnn.io/index/fearandgreed/current",
                     headers=self.HEADERS,
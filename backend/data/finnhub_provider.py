@@ -1,5 +1,5 @@
-import finnhub
 from datetime import datetime, timedelta
+from data import http_pool
 from data.cache import cache, FINNHUB_TTL, EARNINGS_TTL
 
 try:
@@ -13,6 +13,73 @@ except ImportError:
         return _noop
 
 
+class FinnhubAPIError(Exception):
+    """Non-200 response from Finnhub (the status code is in the message)."""
+
+    def __init__(self, status_code: int, body: str):
+        self.status_code = status_code
+        super().__init__(f"FinnhubAPIError(status_code: {status_code}): {body[:200]}")
+
+
+class FinnhubClient:
+    """
+    Async Finnhub REST client with the finnhub-python method names and
+    return values used here (raw JSON), over the shared finnhub.io pool.
+    """
+
+    BASE_URL = "https://finnhub.io/api/v1"
+
+    def __init__(self, api_key: str, timeout: float = 10.0):
+        self.api_key = api_key
+        self.timeout = timeout
+
+    async def _get(self, path: str, params: dict):
+        params = {k: v for k, v in params.items() if v is not None}
+        async with http_pool.session(timeout=self.timeout) as client:
+            resp = await client.get(
+                f"{self.BASE_URL}{path}",
+                params=params,
+                headers={"X-Finnhub-Token": self.api_key},
+            )
+        if resp.status_code != 200:
+            raise FinnhubAPIError(resp.status_code, resp.text)
+        return resp.json()
+
+    async def quote(self, symbol: str) -> dict:
+        return await self._get("/quote", {"symbol": symbol})
+
+    async def company_profile2(self, symbol: str) -> dict:
+        return await self._get("/stock/profile2", {"symbol": symbol})
+
+    async def stock_insider_sentiment(self, symbol: str, _from: str, to: str) -> dict:
+        return await self._get("/stock/insider-sentiment", {"symbol": symbol, "from": _from, "to": to})
+
+    async def stock_insider_transactions(self, symbol: str) -> dict:
+        return await self._get("/stock/insider-transactions", {"symbol": symbol})
+
+    async def earnings_calendar(self, _from: str, to: str, symbol: str = None, international: bool = False) -> dict:
+        return await self._get("/calendar/earnings", {
+            "from": _from, "to": to, "symbol": symbol, "international": str(international).lower(),
+        })
+
+    async def company_earnings(self, symbol: str, limit: int = None) -> list:
+        return await self._get("/stock/earnings", {"symbol": symbol, "limit": limit})
+
+    async def recommendation_trends(self, symbol: str) -> list:
+        return await self._get("/stock/recommendation", {"symbol": symbol})
+
+    async def stock_social_sentiment(self, symbol: str) -> dict:
+        return await self._get("/stock/social-sentiment", {"symbol": symbol})
+
+    async def company_peers(self, symbol: str) -> list:
+        return await self._get("/stock/peers", {"symbol": symbol})
+
+    async def stock_candles(self, symbol: str, resolution: str, _from: int, to: int) -> dict:
+        return await self._get("/stock/candle", {"symbol": symbol, "resolution": resolution, "from": _from, "to": to})
+
+    async def company_news(self, symbol: str, _from: str, to: str) -> list:
+        return await self._get("/company-news", {"symbol": symbol, "from": _from, "to": to})
+
 
 class FinnhubProvider:
     """
@@ -22,17 +89,17 @@ class FinnhubProvider:
     """
 
     def __init__(self, api_key: str):
-        self.client = finnhub.Client(api_key=api_key)
+        self.client = FinnhubClient(api_key)
 
     @traceable(name="get_quote")
-    def get_quote(self, ticker: str) -> dict:
+    async def get_quote(self, ticker: str) -> dict:
         ticker = ticker.upper()
         cache_key = f"finnhub:quote:{ticker}"
         cached = cache.get(cache_key)
         if cached is not None:
             return cached
         try:
-            data = self.client.quote(ticker)
+            data = await self.client.quote(ticker)
             if data.get("c") and data["c"] > 0:
                 result = {
                     "price": data.get("c"),
@@ -50,14 +117,14 @@ class FinnhubProvider:
         return {}
 
     @traceable(name="get_company_profile")
-    def get_company_profile(self, ticker: str) -> dict:
+    async def get_company_profile(self, ticker: str) -> dict:
         ticker = ticker.upper()
         cache_key = f"finnhub:profile:{ticker}"
-        cached = cache.get(cache_key)
+        cached = await cache.get_async(cache_key)
         if cached is not None:
             return cached
         try:
-            data = self.client.company_profile2(symbol=ticker)
+            data = await self.client.company_profile2(symbol=ticker)
             if data.get("name"):
                 result = {
                     "name": data.get("name"),
@@ -77,7 +144,7 @@ class FinnhubProvider:
         return {}
 
     @traceable(name="get_insider_sentiment")
-    def get_insider_sentiment(self, ticker: str) -> dict:
+    async def get_insider_sentiment(self, ticker: str) -> dict:
         """
         Get insider sentiment (MSPR) for a ticker.
         MSPR ranges from -100 (heavy insider selling) to +100 (heavy insider buying).
@@ -91,7 +158,7 @@ class FinnhubProvider:
         try:
             today = datetime.now()
             one_year_ago = today - timedelta(days=365)
-            data = self.client.stock_insider_sentiment(
+            data = await self.client.stock_insider_sentiment(
                 ticker,
                 one_year_ago.strftime("%Y-%m-%d"),
                 today.strftime("%Y-%m-%d"),
@@ -125,11 +192,11 @@ class FinnhubProvider:
             return {"ticker": ticker, "insider_sentiment": None, "error": str(e)}
 
     @traceable(name="get_insider_transactions")
-    def get_insider_transactions(self, ticker: str) -> list:
+    async def get_insider_transactions(self, ticker: str) -> list:
         """Get recent insider buy/sell transactions (SEC Form 4 filings)."""
         ticker = ticker.upper()
         try:
-            data = self.client.stock_insider_transactions(ticker)
+            data = await self.client.stock_insider_transactions(ticker)
             transactions = data.get("data", [])[:10]
             return [
                 {
@@ -147,7 +214,7 @@ class FinnhubProvider:
             return []
 
     @traceable(name="get_earnings_calendar")
-    def get_earnings_calendar(self, ticker: str = None) -> list:
+    async def get_earnings_calendar(self, ticker: str = None) -> list:
         """
         Get upcoming earnings dates. If ticker is provided, get earnings
         for that specific stock. Otherwise get the market-wide calendar.
@@ -158,7 +225,7 @@ class FinnhubProvider:
             # Use 30-day window for market-wide calendar scan
             lookahead_days = 90 if ticker else 30
             lookahead = today + timedelta(days=lookahead_days)
-            data = self.client.earnings_calendar(
+            data = await self.client.earnings_calendar(
                 _from=today.strftime("%Y-%m-%d"),
                 to=lookahead.strftime("%Y-%m-%d"),
                 symbol=ticker.upper() if ticker else None,
@@ -188,15 +255,15 @@ class FinnhubProvider:
             return []
 
     @traceable(name="get_earnings_surprises")
-    def get_earnings_surprises(self, ticker: str) -> list:
+    async def get_earnings_surprises(self, ticker: str) -> list:
         """Get past earnings results vs estimates (beat or miss)."""
         ticker = ticker.upper()
         cache_key = f"finnhub:earnings:{ticker}"
-        cached = cache.get(cache_key)
+        cached = await cache.get_async(cache_key)
         if cached is not None:
             return cached
         try:
-            data = self.client.company_earnings(ticker, limit=4)
+            data = await self.client.company_earnings(ticker, limit=4)
             result = [
                 {
                     "period": e.get("period"),
@@ -217,7 +284,7 @@ class FinnhubProvider:
             return []
 
     @traceable(name="get_recommendation_trends")
-    def get_recommendation_trends(self, ticker: str) -> list:
+    async def get_recommendation_trends(self, ticker: str) -> list:
         """Get analyst recommendation trends (buy/hold/sell counts over time)."""
         ticker = ticker.upper()
         cache_key = f"finnhub:recommendations:{ticker}"
@@ -225,7 +292,7 @@ class FinnhubProvider:
         if cached is not None:
             return cached
         try:
-            data = self.client.recommendation_trends(ticker)
+            data = await self.client.recommendation_trends(ticker)
             result = [
                 {
                     "period": r.get("period"),
@@ -244,7 +311,7 @@ class FinnhubProvider:
             return []
 
     @traceable(name="get_social_sentiment")
-    def get_social_sentiment(self, ticker: str) -> dict:
+    async def get_social_sentiment(self, ticker: str) -> dict:
         """Get social media sentiment from Reddit and Twitter."""
         ticker = ticker.upper()
         cache_key = f"finnhub:social:{ticker}"
@@ -253,7 +320,7 @@ class FinnhubProvider:
             return cached
         try:
             try:
-                data = self.client.stock_social_sentiment(ticker)
+                data = await self.client.stock_social_sentiment(ticker)
             except Exception as api_err:
                 err_str = str(api_err)
                 if "403" in err_str or "access" in err_str.lower():
@@ -327,26 +394,26 @@ class FinnhubProvider:
             return {"ticker": ticker, "reddit": None, "twitter": None}
 
     @traceable(name="get_company_peers")
-    def get_company_peers(self, ticker: str) -> list:
+    async def get_company_peers(self, ticker: str) -> list:
         """Get list of peer/comparable companies."""
         ticker = ticker.upper()
         try:
-            return self.client.company_peers(ticker)
+            return await self.client.company_peers(ticker)
         except Exception as e:
             print(f"Finnhub peers error for {ticker}: {e}")
             return []
 
     @traceable(name="get_upcoming_earnings")
-    def get_upcoming_earnings(self) -> list:
+    async def get_upcoming_earnings(self) -> list:
         """Get all earnings coming up in the next 7 days."""
         cache_key = "finnhub:upcoming_earnings"
-        cached = cache.get(cache_key)
+        cached = await cache.get_async(cache_key)
         if cached is not None:
             return cached
         try:
             today = datetime.now()
             next_week = today + timedelta(days=7)
-            data = self.client.earnings_calendar(
+            data = await self.client.earnings_calendar(
                 _from=today.strftime("%Y-%m-%d"),
                 to=next_week.strftime("%Y-%m-%d"),
                 symbol=None,
@@ -369,7 +436,7 @@ class FinnhubProvider:
             return []
 
     @traceable(name="get_stock_candles")
-    def get_stock_candles(self, ticker: str, days: int = 120) -> list:
+    async def get_stock_candles(self, ticker: str, days: int = 120) -> list:
         """Fetch daily OHLCV candles from Finnhub. Returns list of bar dicts."""
         ticker = ticker.upper()
         cache_key = f"finnhub:candles:{ticker}:{days}"
@@ -379,7 +446,7 @@ class FinnhubProvider:
         try:
             end = int(datetime.now().timestamp())
             start = int((datetime.now() - timedelta(days=days)).timestamp())
-            data = self.client.stock_candles(ticker, 'D', start, end)
+            data = await self.client.stock_candles(ticker, 'D', start, end)
             if not data or data.get("s") != "ok":
                 return []
             bars = []
@@ -405,16 +472,16 @@ class FinnhubProvider:
             return []
 
     @traceable(name="get_technicals")
-    def get_technicals(self, ticker: str) -> dict:
+    async def get_technicals(self, ticker: str) -> dict:
         """Compute technicals locally from Finnhub candle data."""
         from data.ta_utils import compute_technicals_from_bars
-        bars = self.get_stock_candles(ticker)
+        bars = await self.get_stock_candles(ticker)
         if not bars:
             return {}
         return compute_technicals_from_bars(bars)
 
     @traceable(name="get_company_news")
-    def get_company_news(self, ticker: str, days: int = 7) -> list:
+    async def get_company_news(self, ticker: str, days: int = 7) -> list:
         """
         Get news articles specifically about this company from Finnhub.
         Returns articles tagged to this ticker — guaranteed relevant.
@@ -429,7 +496,7 @@ class FinnhubProvider:
             today = datetime.now()
             from_date = (today - timedelta(days=days)).strftime("%Y-%m-%d")
             to_date = today.strftime("%Y-%m-%d")
-            data = self.client.company_news(ticker, _from=from_date, to=to_date)
+            data = await self.client.company_news(ticker, _from=from_date, to=to_date)
             if not isinstance(data, list):
                 return []
             articles = []
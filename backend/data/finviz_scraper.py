@@ -1,5 +1,5 @@
 import asyncio
-import httpx
+from data import http_pool
 from bs4 import BeautifulSoup
 from data.cache import cache, FINVIZ_TTL
 
@@ -44,7 +44,7 @@ class FinvizScraper:
         if cached is not None:
             return cached
         try:
-            async with httpx.AsyncClient() as client:
+            async with http_pool.session() as client:
                 resp = await client.get(
                     f"https://finviz.com/screener.ashx?v=111&s={filters}",
                     headers=self.HEADERS,
@@ -176,14 +176,18 @@ class FinvizScraper:
             cache_key = f"finviz:custom:{params[:100]}"
         else:
             cache_key = f"finviz:custom:{str(sorted(params.items()))[:100]}"
-        cached = cache.get(cache_key)
-        if cached is not None:
-            return cached
+        # Several presets and overlapping scans run the same screen; only
+        # one request goes out.  Failed screens return None and aren't cached.
+        results = await cache.get_or_compute(
+            cache_key, FINVIZ_TTL, lambda: self._fetch_custom_screen(params))
+        return results if results is not None else []
+
+    async def _fetch_custom_screen(self, params) -> list | None:
         try:
             if isinstance(params, str):
                 url = f"https://finviz.com/screener.ashx?{params}"
                 print(f"[Finviz] Custom screen URL: {url}")
-                async with httpx.AsyncClient() as client:
+                async with http_pool.session() as client:
                     resp = await client.get(
                         url,
                         headers=self.HEADERS,
@@ -196,7 +200,7 @@ class FinvizScraper:
                     **params,
                 }
                 print(f"[Finviz] Custom screen params: {all_params}")
-                async with httpx.AsyncClient() as client:
+                async with http_pool.session() as client:
                     resp = await client.get(
                         url,
                         params=all_params,
@@ -206,7 +210,7 @@ class FinvizScraper:
 
             if resp.status_code != 200:
                 print(f"[Finviz] Custom screen HTTP {resp.status_code}")
-                return []
+                return None
 
             soup = BeautifulSoup(resp.text, "html.parser")
 
@@ -237,7 +241,7 @@ class FinvizScraper:
                 body_text = soup.get_text()[:500] if soup.body else ""
                 if "No matches" in body_text or "0 Total" in body_text:
                     print("[Finviz] Page indicates no matches for this filter combination")
-                return []
+                return None
 
             header_row = table.find("tr")
             headers = []
@@ -284,13 +288,12 @@ class FinvizScraper:
 
                     results.append(item)
             print(f"[Finviz] Custom screen returned {len(results)} results")
-            cache.set(cache_key, results, FINVIZ_TTL)
             return results
         except Exception as e:
             import traceback
             print(f"[Finviz] Custom screen error: {e}")
             traceback.print_exc()
-            return []
+            return None
 
     @traceable(name="get_stage2_breakouts")
     async def get_stage2_breakouts(self) -> list:
@@ -516,7 +519,6 @@ async def scrape_yahoo_trending() -> list:
     This represents mainstream retail attention — different audience
     from StockTwits (active traders) or Finviz (screener users).
     """
-    import httpx
     from bs4 import BeautifulSoup
     from data.cache import cache
 
@@ -529,7 +531,7 @@ async def scrape_yahoo_trending() -> list:
         headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
         }
-        async with httpx.AsyncClient() as client:
+        async with http_pool.session() as client:
             resp = await client.get(
                 "https://finance.yahoo.com/trending-tickers/",
                 headers=headers,
@@ -591,12 +593,11 @@ async def scrape_stockanalysis_trending() -> list:
         return []
 
     try:
-        import httpx
         results = []
         seen = set()
         base = "https://financialmodelingprep.com/api/v3"
 
-        async with httpx.AsyncClient(timeout=10) as client:
+        async with http_pool.session(timeout=10) as client:
             gainers_resp, actives_resp = await asyncio.gather(
                 client.get(f"{base}/stock_market/gainers", params={"apikey": FMP_API_KEY}),
                 client.get(f"{base}/stock_market/actives", params={"apikey": FMP_API_KEY}),
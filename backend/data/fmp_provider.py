@@ -1,5 +1,5 @@
 import asyncio
-import httpx
+from data import http_pool
 from data.cache import cache, FMP_TTL
 
 try:
@@ -37,7 +37,7 @@ class FMPProvider:
             params = {}
         params["apikey"] = self.api_key
         try:
-            async with httpx.AsyncClient() as client:
+            async with http_pool.session() as client:
                 resp = await client.get(
                     f"{self.BASE_URL}/{endpoint}",
                     params=params,
@@ -471,7 +471,7 @@ class FMPProvider:
 
         high_impact = []
         try:
-            async with httpx.AsyncClient(timeout=10) as client:
+            async with http_pool.session(timeout=10) as client:
                 for day_offset in range(days_ahead):
                     date_str = (datetime.now() + timedelta(days=day_offset)).strftime("%Y-%m-%d")
                     resp = await client.get(
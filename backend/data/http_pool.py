@@ -0,0 +1,218 @@
+"""
+Process-wide pooled HTTP clients, one httpx.AsyncClient per upstream host.
+
+Providers used to open a fresh httpx.AsyncClient per call, paying DNS + TCP +
+TLS setup on every request and never reusing a keep-alive connection.  They
+now take a session instead:
+
+    async with http_pool.session(timeout=15, follow_redirects=True) as client:
+        resp = await client.get("https://finviz.com/screener.ashx", params=...)
+
+A session is a thin facade: each request is routed to the shared client of
+its URL's host, with the session's timeout / headers / redirect policy
+applied per request, and leaving the `async with` closes nothing.  Host
+clients are created on first use with that host's entry in _HOSTS (pool
+size, keep-alive, default timeout, HTTP/2) and closed by close_all() from
+the app lifespan.
+
+HTTP/2 is negotiated (ALPN, falling back to HTTP/1.1) when the optional `h2`
+package is installed.  HTTP_POOL=0 hands every session its own short-lived
+client again — the old behaviour, kept for benchmarking and as an escape
+hatch.
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+from collections import defaultdict
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from typing import Any, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+try:
+    import h2  # noqa: F401
+    _HTTP2 = True
+except ImportError:
+    _HTTP2 = False
+
+_ENABLED = os.getenv("HTTP_POOL", "1") != "0"
+
+# Per-host pool limits and default timeouts.  Hosts not listed get _DEFAULT;
+# a session's explicit timeout always wins over the host default.
+_DEFAULT = {"max_connections": 20, "max_keepalive": 10, "timeout": 5.0, "http2": True}
+_HOSTS: dict[str, dict[str, Any]] = {
+    # Scraped HTML pages — a few parallel screens, keep them modest
+    "finviz.com":                {"max_connections": 8,  "timeout": 10.0},
+    "elite.finviz.com":          {"max_connections": 8,  "timeout": 10.0},
+    "stockanalysis.com":         {"max_connections": 6,  "timeout": 10.0},
+    # Fan-out quote / fundamentals APIs used by the wide scan enrichment
+    "financialmodelingprep.com": {"max_connections": 32, "max_keepalive": 16, "timeout": 10.0},
+    "api.polygon.io":            {"max_connections": 32, "max_keepalive": 16, "timeout": 10.0},
+    "finnhub.io":                {"max_connections": 16, "timeout": 8.0},
+    "api.twelvedata.com":        {"max_connections": 4,  "timeout": 10.0},
+    "api.tradier.com":           {"max_connections": 16, "timeout": 12.0},
+    "sandbox.tradier.com":       {"max_connections": 8,  "timeout": 12.0},
+    "query1.finance.yahoo.com":  {"max_connections": 16, "timeout": 8.0},
+    "query2.finance.yahoo.com":  {"max_connections": 16, "timeout": 8.0},
+    "api.stocktwits.com":        {"max_connections": 8,  "timeout": 8.0},
+    # SEC asks for <= 10 req/s per client
+    "www.sec.gov":               {"max_connections": 4,  "max_keepalive": 4, "timeout": 10.0},
+    "data.sec.gov":              {"max_connections": 4,  "max_keepalive": 4, "timeout": 10.0},
+    "efts.sec.gov":              {"max_connections": 4,  "max_keepalive": 4, "timeout": 10.0},
+    # LLM / search APIs: long responses, few in flight
+    "api.perplexity.ai":         {"max_connections": 8,  "timeout": 60.0},
+    "api.x.ai":                  {"max_connections": 8,  "timeout": 90.0},
+    "api.anthropic.com":         {"max_connections": 8,  "timeout": 90.0},
+}
+
+
+def _host_config(host: str) -> dict[str, Any]:
+    return {**_DEFAULT, **_HOSTS.get(host, {})}
+
+
+def _cookieless_jar() -> CookieJar:
+    """A jar whose policy refuses every cookie: a host client is shared by
+    all callers and users, so a Set-Cookie must not leak into later requests
+    (the per-call clients it replaced always started empty)."""
+    return CookieJar(policy=DefaultCookiePolicy(allowed_domains=[]))
+
+
+def _new_client(host: str) -> httpx.AsyncClient:
+    cfg = _host_config(host)
+    return httpx.AsyncClient(
+        cookies=_cookieless_jar(),
+        timeout=cfg["timeout"],
+        limits=httpx.Limits(
+            max_connections=cfg["max_connections"],
+            max_keepalive_connections=cfg["max_keepalive"],
+            keepalive_expiry=30.0,
+        ),
+        http2=_HTTP2 and cfg["http2"],
+    )
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Registry
+# ─────────────────────────────────────────────────────────────────────────────
+
+# host → (event loop, client).  A pooled connection belongs to the loop that
+# opened it, so a client is only reused on its own loop (tests and scripts
+# run each asyncio.run on a fresh one).
+_clients: dict[str, tuple[asyncio.AbstractEventLoop, httpx.AsyncClient]] = {}
+_requests: dict[str, int] = defaultdict(int)
+_created = 0
+
+
+def get_client(url: str) -> httpx.AsyncClient:
+    """The shared client for `url`'s host, created on first use."""
+    global _created
+    host = urlsplit(url).hostname or ""
+    loop = asyncio.get_running_loop()
+    entry = _clients.get(host)
+    if entry is None or entry[0] is not loop or entry[1].is_closed:
+        _clients[host] = entry = (loop, _new_client(host))
+        _created += 1
+    return entry[1]
+
+
+async def close_all():
+    """Close every host client (app shutdown)."""
+    clients = list(_clients.values())
+    _clients.clear()
+    loop = asyncio.get_running_loop()
+    for owner, client in clients:
+        if owner is loop and not client.is_closed:
+            await client.aclose()
+
+
+def stats() -> dict:
+    return {
+        "enabled": _ENABLED,
+        "http2": _HTTP2,
+        "hosts": len(_clients),
+        "clients_created": _created,
+        "requests": dict(_requests),
+    }
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Session facade
+# ─────────────────────────────────────────────────────────────────────────────
+
+_UNSET: Any = object()
+
+
+class PooledSession:
+    """
+    httpx.AsyncClient-shaped view over the registry: request methods route
+    to the host's shared client with this session's defaults applied.
+    """
+
+    def __init__(
+        self,
+        timeout: Any = _UNSET,
+        headers: Optional[dict[str, str]] = None,
+        follow_redirects: bool = False,
+    ):
+        self.timeout = timeout
+        self.headers = dict(headers or {})
+        self.follow_redirects = follow_redirects
+        self._own: Optional[httpx.AsyncClient] = None
+
+    async def __aenter__(self) -> "PooledSession":
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+    async def aclose(self):
+        if self._own is not None:
+            await self._own.aclose()
+            self._own = None
+
+    def _client(self, url: str) -> httpx.AsyncClient:
+        if _ENABLED:
+            return get_client(url)
+        if self._own is None:
+            self._own = httpx.AsyncClient()
+        return self._own
+
+    def _kwargs(self, url: str, kwargs: dict) -> dict:
+        if self.headers:
+            kwargs["headers"] = {**self.headers, **(kwargs.get("headers") or {})}
+        if "timeout" not in kwargs and self.timeout is not _UNSET:
+            kwargs["timeout"] = self.timeout
+        kwargs.setdefault("follow_redirects", self.follow_redirects)
+        _requests[urlsplit(url).hostname or ""] += 1
+        return kwargs
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        url = str(url)
+        return await self._client(url).request(method, url, **self._kwargs(url, kwargs))
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    async def put(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("PUT", url, **kwargs)
+
+    async def delete(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("DELETE", url, **kwargs)
+
+    def stream(self, method: str, url: str, **kwargs):
+        url = str(url)
+        return self._client(url).stream(method, url, **self._kwargs(url, kwargs))
+
+
+def session(
+    timeout: Any = _UNSET,
+    headers: Optional[dict[str, str]] = None,
+    follow_redirects: bool = False,
+) -> PooledSession:
+    """Drop-in for `httpx.AsyncClient(...)` in `async with` blocks (see module docstring)."""
+    return PooledSession(timeout=timeout, headers=headers, follow_redirects=follow_redirects)
@@ -12,7 +12,7 @@ except ImportError:
         return _noop
 
 
-import httpx
+from data import http_pool
 
 from data.cache import cache
 
@@ -31,7 +31,7 @@ class HyperliquidProvider:
                 return cached
 
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
+            async with http_pool.session(timeout=10.0) as client:
                 resp = await client.post(
                     self.BASE_URL,
                     json=payload,
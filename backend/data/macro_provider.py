@@ -127,17 +127,18 @@ class MacroProvider:
         """Fetch a FRED series, return pandas Series or None."""
         if not self._fred_api:
             return None
-        cache_key = f"macro:fred:{series_id}:{days}"
-        cached = cache.get(cache_key)
-        if cached is not None:
-            return cached
+        # The dashboard, rates and inflation views fetch overlapping series
+        # from parallel worker threads; the first miss fetches for all.
+        return cache.get_or_compute_sync(
+            f"macro:fred:{series_id}:{days}", _MACRO_FRED_SERIES_TTL,
+            lambda: self._fetch_series(series_id, days))
+
+    def _fetch_series(self, series_id: str, days: int) -> Any:
         try:
             start = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
             data = self._fred_api.get_series(series_id, observation_start=start)
             if data is not None and not data.empty:
-                data = data.dropna()
-                cache.set(cache_key, data, _MACRO_FRED_SERIES_TTL)
-                return data
+                return data.dropna()
         except Exception as e:
             print(f"[MACRO] FRED series {series_id} error: {e}")
         return None
@@ -442,22 +442,37 @@ class MarketDataService:
         if budget:
             _last_candle_budget = budget
 
-        cached = cache.get(cache_key)
-        if cached is not None:
-            if budget:
+        # Budget accounting is per caller, decided before joining the fill:
+        # cached (fresh or stale) is a hit, joining a fetch in flight costs
+        # nothing, and only a caller that starts a fetch needs budget left
+        # and is charged for it.  A stale hit's background refresh is
+        # charged to daily_budget alone.
+        status = cache.status(cache_key)
+        payer = None
+        if budget:
+            if status in ("fresh", "stale"):
                 budget.record_cache_hit()
-            return cached
-
-        if budget and not budget.can_spend():
-            budget.record_blocked()
-            return []
-
+            elif status == "miss":
+                if not budget.can_spend():
+                    budget.record_blocked()
+                    return []
+                payer = budget
+
+        async def fetch():
+            return await self._fetch_candles(symbol, days, payer)
+
+        # Overlapping scans asking for the same symbol share one fetch;
+        # empty results (every source failed) stay out of the cache.
+        return await cache.get_or_compute(cache_key, use_ttl, fetch, cache_if=bool)
+
+    async def _fetch_candles(self, symbol: str, days: int,
+                             budget: CandleBudget = None) -> list:
+        """TwelveData → Finnhub → Polygon daily bars; [] if none has 20+."""
         if self.twelvedata and not _is_twelvedata_disabled(
         ) and daily_budget.can_spend("twelvedata"):
             try:
                 td_bars = await asyncio.wait_for(
-                    asyncio.to_thread(self.twelvedata.get_daily_bars, symbol,
-                                      days),
+                    self.twelvedata.get_daily_bars(symbol, days),
                     timeout=12.0,
                 )
                 if isinstance(td_bars, dict) and td_bars.get("error"):
@@ -473,7 +488,6 @@ class MarketDataService:
                     daily_budget.spend("twelvedata")
                     if budget:
                         budget.spend("twelvedata")
-                    cache.set(cache_key, td_bars, use_ttl)
                     print(
                         f"[CANDLES] TwelveData {symbol} OK ({len(td_bars)} bars)"
                     )
@@ -487,13 +501,11 @@ class MarketDataService:
                 "finnhub"):
             try:
                 result = await asyncio.wait_for(
-                    asyncio.to_thread(self.finnhub.get_stock_candles, symbol,
-                                      days),
+                    self.finnhub.get_stock_candles(symbol, days),
                     timeout=10.0,
                 )
                 if result and len(result) >= 20:
                     daily_budget.spend("finnhub")
-                    cache.set(cache_key, result, use_ttl)
                     return result
                 elif not result:
                     _disable_finnhub_candles()
@@ -511,7 +523,7 @@ class MarketDataService:
             if budget:
                 budget.spend("polygon")
             poly_bars = await asyncio.wait_for(
-                asyncio.to_thread(self.polygon.get_daily_bars, symbol, days),
+                self.polygon.get_daily_bars(symbol, days),
                 timeout=10.0,
             )
             if poly_bars and len(poly_bars) >= 20:
@@ -523,7 +535,6 @@ class MarketDataService:
                     "v": b.get("v", 0),
                     "t": b.get("t")
                 } for b in poly_bars]
-                cache.set(cache_key, bars, use_ttl)
                 return bars
         except asyncio.TimeoutError:
             print(f"[CANDLES] Polygon {symbol} timeout")
@@ -743,13 +754,12 @@ class MarketDataService:
         if daily_budget.can_spend("finnhub", 2):
             finnhub_quote = await fetch_with_fallback(
                 "equity_price",
-                lambda: asyncio.to_thread(self.finnhub.get_quote, ticker),
+                lambda: self.finnhub.get_quote(ticker),
                 timeout=3.0,
             )
             finnhub_profile = await fetch_with_fallback(
                 "company_profile",
-                lambda: asyncio.to_thread(self.finnhub.get_company_profile,
-                                          ticker),
+                lambda: self.finnhub.get_company_profile(ticker),
                 timeout=3.0,
             )
             daily_budget.spend("finnhub", 2)
@@ -773,16 +783,11 @@ class MarketDataService:
                 "market_cap": finnhub_profile.get("market_cap"),
             }
 
-        technicals = self.finnhub.get_technicals(ticker)
+        technicals = await self.finnhub.get_technicals(ticker)
         if not technicals:
-            technicals = self.polygon.get_technicals(ticker)
+            technicals = await self.polygon.get_technicals(ticker)
 
-        sync_data = {
-            "quote": finnhub_quote,
-            "company_profile": finnhub_profile,
-            "snapshot": snapshot_compat,
-            "details": details_compat,
-            "technicals": technicals,
+        provider_calls = {
             "news": self.polygon.get_news(ticker, limit=10),
             "insider_sentiment": self.finnhub.get_insider_sentiment(ticker),
             "insider_transactions":
@@ -794,12 +799,21 @@ class MarketDataService:
             "social_sentiment": self.finnhub.get_social_sentiment(ticker),
             "peer_companies": self.finnhub.get_company_peers(ticker),
         }
+        provider_results = await asyncio.gather(*provider_calls.values())
+        sync_data = {
+            "quote": finnhub_quote,
+            "company_profile": finnhub_profile,
+            "snapshot": snapshot_compat,
+            "details": details_compat,
+            "technicals": technicals,
+            **dict(zip(provider_calls, provider_results)),
+        }
 
         # Finnhub company_news for relevant ticker-specific news (replaces web search)
         async_tasks = [
             self.options.get_put_call_ratio(ticker),
             self.edgar.get_company_summary(ticker),
-            asyncio.to_thread(self.finnhub.get_company_news, ticker),
+            self.finnhub.get_company_news(ticker),
         ]
         async_keys = [
             "options_put_call",
@@ -917,7 +931,7 @@ class MarketDataService:
                 self.stocktwits.get_trending(),
                 self.options.get_unusual_options_activity(),
                 self.options.get_options_volume_leaders(),
-                asyncio.to_thread(self.finnhub.get_upcoming_earnings),
+                self.finnhub.get_upcoming_earnings(),
                 self.fear_greed.get_fear_greed_index(),
                 return_exceptions=True,
             ))
@@ -973,7 +987,7 @@ class MarketDataService:
         Used for "what earnings are coming up" type queries.
         """
         return {
-            "upcoming_earnings": self.finnhub.get_upcoming_earnings(),
+            "upcoming_earnings": await self.finnhub.get_upcoming_earnings(),
         }
 
     @traceable(name="get_macro_overview")
@@ -1445,12 +1459,9 @@ class MarketDataService:
                     await asyncio.gather(
                         self.stockanalysis.get_overview(ticker),
                         self.stockanalysis.get_analyst_ratings(ticker),
-                        asyncio.to_thread(lambda: self.finnhub.
-                                          get_insider_sentiment(ticker)),
-                        asyncio.to_thread(lambda: self.finnhub.
-                                          get_earnings_surprises(ticker)),
-                        asyncio.to_thread(lambda: self.finnhub.
-                                          get_recommendation_trends(ticker)),
+                        self.finnhub.get_insider_sentiment(ticker),
+                        self.finnhub.get_earnings_surprises(ticker),
+                        self.finnhub.get_recommendation_trends(ticker),
                         return_exceptions=True,
                     ))
                 return {
@@ -2211,7 +2222,7 @@ class MarketDataService:
         Scan for the best fundamental catalysts — earnings beats,
         revenue growth, insider buying, analyst upgrades.
         """
-        upcoming_earnings = self.finnhub.get_upcoming_earnings()
+        upcoming_earnings = await self.finnhub.get_upcoming_earnings()
 
         earnings_tickers = [
             e["ticker"] for e in upcoming_earnings[:8] if e.get("ticker")
@@ -2225,6 +2236,11 @@ class MarketDataService:
                 self.edgar.get_8k_filings(ticker),
                 return_exceptions=True,
             )
+            earnings_history, insider_sentiment, recommendations = await asyncio.gather(
+                self.finnhub.get_earnings_surprises(ticker),
+                self.finnhub.get_insider_sentiment(ticker),
+                self.finnhub.get_recommendation_trends(ticker),
+            )
             return {
                 "overview":
                 async_results[0]
@@ -2235,12 +2251,9 @@ class MarketDataService:
                 "sec_filings":
                 async_results[2]
                 if not isinstance(async_results[2], Exception) else [],
-                "earnings_history":
-                self.finnhub.get_earnings_surprises(ticker),
-                "insider_sentiment":
-                self.finnhub.get_insider_sentiment(ticker),
-                "recommendations":
-                self.finnhub.get_recommendation_trends(ticker),
+                "earnings_history": earnings_history,
+                "insider_sentiment": insider_sentiment,
+                "recommendations": recommendations,
             }
 
         fund_results = await asyncio.gather(
@@ -2273,12 +2286,14 @@ class MarketDataService:
             async_results = await asyncio.gather(
                 self.stocktwits.get_sentiment(ticker),
                 self.alphavantage.get_news_sentiment(ticker),
+                self.finnhub.get_social_sentiment(ticker),
                 return_exceptions=True,
             )
             return {
                 "stocktwits": async_results[0]
                 if not isinstance(async_results[0], Exception) else {},
-                "social_sentiment": self.finnhub.get_social_sentiment(ticker),
+                "social_sentiment": async_results[2]
+                if not isinstance(async_results[2], Exception) else {},
                 "news_sentiment": async_results[1]
                 if not isinstance(async_results[1], Exception) else {},
             }
@@ -2350,7 +2365,7 @@ class MarketDataService:
         async def get_social_detail(ticker):
             st_result, finn_result, av_result = await asyncio.gather(
                 self.stocktwits.get_sentiment(ticker),
-                asyncio.to_thread(self.finnhub.get_social_sentiment, ticker),
+                self.finnhub.get_social_sentiment(ticker),
                 self.alphavantage.get_news_sentiment(ticker),
                 return_exceptions=True,
             )
@@ -2401,17 +2416,19 @@ class MarketDataService:
         """
         import asyncio
 
-        upcoming_earnings = self.finnhub.get_upcoming_earnings()
+        upcoming_earnings = await self.finnhub.get_upcoming_earnings()
 
         earnings_tickers = [
             e["ticker"] for e in upcoming_earnings[:30]
             if e.get("ticker") and len(e["ticker"]) <= 5
         ]
 
-        def light_enrich_earnings(ticker):
+        async def light_enrich_earnings(ticker):
             try:
-                earnings_hist = self.finnhub.get_earnings_surprises(ticker)
-                recommendations = self.finnhub.get_recommendation_trends(ticker)
+                earnings_hist, recommendations = await asyncio.gather(
+                    self.finnhub.get_earnings_surprises(ticker),
+                    self.finnhub.get_recommendation_trends(ticker),
+                )
                 return {
                     "snapshot": {},
                     "technicals": {},
@@ -2423,7 +2440,7 @@ class MarketDataService:
                 return {"error": str(e)}
 
         results = await asyncio.gather(
-            *[asyncio.to_thread(light_enrich_earnings, t) for t in earnings_tickers],
+            *[light_enrich_earnings(t) for t in earnings_tickers],
             return_exceptions=True,
         )
 
@@ -3065,9 +3082,11 @@ class MarketDataService:
                            for s in (insider_buys or [])[:5]]))[:12]
 
         async def get_asymmetric_detail(ticker):
-            overview, analyst = await asyncio.gather(
+            overview, analyst, insider, earnings = await asyncio.gather(
                 self.stockanalysis.get_overview(ticker),
                 self.stockanalysis.get_analyst_ratings(ticker),
+                self.finnhub.get_insider_sentiment(ticker),
+                self.finnhub.get_earnings_surprises(ticker),
                 return_exceptions=True,
             )
             return {
@@ -3076,9 +3095,9 @@ class MarketDataService:
                 "analyst_ratings":
                 analyst if not isinstance(analyst, Exception) else {},
                 "insider_sentiment":
-                self.finnhub.get_insider_sentiment(ticker),
+                insider if not isinstance(insider, Exception) else {},
                 "earnings_history":
-                self.finnhub.get_earnings_surprises(ticker),
+                earnings if not isinstance(earnings, Exception) else [],
             }
 
         detail_results = await asyncio.gather(
@@ -3305,21 +3324,22 @@ class MarketDataService:
         """
         Lightweight macro snapshot for daily briefing key_numbers.
         Fetches SPY/QQQ/IWM/GLD/USO via Finnhub quotes,
-        VIX/10Y via FRED, DXY via FMP. Cached 90s.
+        VIX/10Y via FRED, DXY via FMP. Cached 90s (served up to 60s stale while refreshing).
         Runs BEFORE heavy scans and is NOT subject to BudgetTracker.
         """
-        cached = cache.get("macro_snapshot_v1")
-        if cached is not None:
-            print("[MACRO_SNAPSHOT] cache hit")
-            return cached
+        # Briefing, agent and the /api endpoints all call this on a cold
+        # cache at once; one of them builds it.
+        return await cache.get_or_compute("macro_snapshot_v1", 90,
+                                          self._compute_macro_snapshot)
 
+    async def _compute_macro_snapshot(self) -> dict:
         import asyncio
 
         async def _finnhub_quote(symbol: str) -> tuple:
             try:
                 if not daily_budget.can_spend("finnhub"):
                     return (symbol, None)
-                q = await asyncio.to_thread(self.finnhub.get_quote, symbol)
+                q = await self.finnhub.get_quote(symbol)
                 daily_budget.spend("finnhub")
                 if q and q.get("price"):
                     chg = q.get("change")
@@ -3483,7 +3503,6 @@ class MarketDataService:
             f"[MACRO_SNAPSHOT] filled={','.join(filled)} missing={','.join(missing) if missing else 'none'}"
         )
 
-        cache.set("macro_snapshot_v1", snapshot, 90)
         return snapshot
 
     @traceable(name="compute_signal_highlights")
@@ -3753,7 +3772,7 @@ class MarketDataService:
             self.finviz.get_rsi_recovery(),
             self.finviz.get_accumulation_stocks(),
             self.stocktwits.get_trending(),
-            asyncio.to_thread(self.finnhub.get_upcoming_earnings),
+            self.finnhub.get_upcoming_earnings(),
         ]
         # News: prefer web_search (Perplexity-routed) in agent_collab, else FMP
         if self._web_search_allowed:
@@ -4091,24 +4110,21 @@ class MarketDataService:
                 print(f"[PORTFOLIO] {ticker} sentiment failed: {e}")
 
             try:
-                insider = await asyncio.to_thread(
-                    lambda: self.finnhub.get_insider_sentiment(ticker))
+                insider = await self.finnhub.get_insider_sentiment(ticker)
                 if insider:
                     data["insider_sentiment"] = insider
             except Exception as e:
                 print(f"[PORTFOLIO] {ticker} insider failed: {e}")
 
             try:
-                earnings = await asyncio.to_thread(
-                    lambda: self.finnhub.get_earnings_surprises(ticker))
+                earnings = await self.finnhub.get_earnings_surprises(ticker)
                 if earnings:
                     data["earnings_history"] = earnings
             except Exception as e:
                 print(f"[PORTFOLIO] {ticker} earnings failed: {e}")
 
             try:
-                recs = await asyncio.to_thread(
-                    lambda: self.finnhub.get_recommendation_trends(ticker))
+                recs = await self.finnhub.get_recommendation_trends(ticker)
                 if recs:
                     data["recommendations"] = recs
             except Exception as e:
@@ -4377,8 +4393,7 @@ class MarketDataService:
                     self.stocktwits.get_sentiment(ticker),
                     self.stockanalysis.get_overview(ticker),
                     self.stockanalysis.get_analyst_ratings(ticker),
-                    asyncio.to_thread(
-                        lambda t=ticker: self.finnhub.get_company_profile(t)),
+                    self.finnhub.get_company_profile(ticker),
                     return_exceptions=True,
                 )
                 ov = overview if not isinstance(overview,
@@ -5313,8 +5328,7 @@ class MarketDataService:
             async with quote_semaphore:
                 if daily_budget.can_spend("finnhub"):
                     try:
-                        quote = await asyncio.to_thread(
-                            self.finnhub.get_quote, ticker)
+                        quote = await self.finnhub.get_quote(ticker)
                         daily_budget.spend("finnhub")
                         if quote and quote.get("price"):
                             results[ticker] = {
@@ -5594,8 +5608,7 @@ class MarketDataService:
                 )
             elif daily_budget.can_spend("finnhub"):
                 try:
-                    quote = await asyncio.to_thread(self.finnhub.get_quote,
-                                                    ticker)
+                    quote = await self.finnhub.get_quote(ticker)
                     daily_budget.spend("finnhub")
                     if quote and quote.get("price"):
                         row["price"] = quote["price"]
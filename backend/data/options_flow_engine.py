@@ -410,7 +410,7 @@ class OptionsFlowEngine:
             labels.extend(["fmp_actives", "fmp_gainers", "fmp_losers"])
 
         tasks.extend([
-            asyncio.to_thread(self.data.finnhub.get_upcoming_earnings),
+            self.data.finnhub.get_upcoming_earnings(),
             asyncio.to_thread(self.data.fred.get_quick_macro),
         ])
         labels.extend(["finnhub_earnings", "fred_macro"])
@@ -648,9 +648,9 @@ class OptionsFlowEngine:
     async def _enrich_stock_candidate(self, row: dict, earnings_event: dict | None, macro: dict) -> dict | None:
         symbol = row["ticker"]
         stored_technicals = get_latest_technicals(symbol)
-        technicals_task = asyncio.to_thread(self.data.finnhub.get_technicals, symbol)
-        profile_task = asyncio.to_thread(self.data.finnhub.get_company_profile, symbol)
-        quote_tasks = [asyncio.to_thread(self.data.finnhub.get_quote, symbol)]
+        technicals_task = self.data.finnhub.get_technicals(symbol)
+        profile_task = self.data.finnhub.get_company_profile(symbol)
+        quote_tasks = [self.data.finnhub.get_quote(symbol)]
         if self.data.fmp:
             quote_tasks.append(self.data.fmp.get_quote(symbol))
         else:
@@ -99,26 +99,26 @@ def _parse_option_ticker(polygon_ticker: str) -> dict:
 
 
 @traceable(name="options_ingestion.ingest_ticker_options")
-def ingest_ticker_options(polygon_opts, ticker: str) -> dict:
+async def ingest_ticker_options(polygon_opts, ticker: str) -> dict:
     """
     Fetch and store historic options data for a single ticker.
     1. Get key contracts from Polygon reference API
     2. Fetch daily bars for each key contract (up to MAX_CONTRACTS_PER_TICKER)
-    3. Store in PostgreSQL
+    3. Store in PostgreSQL (blocking DB writes run in a worker thread)
 
     Returns {contracts_fetched, bars_stored, errors}.
     """
     from data.options_history_store import upsert_options_bars, update_fetch_progress
 
     ticker = ticker.upper()
-    update_fetch_progress(ticker, status="in_progress")
+    await asyncio.to_thread(update_fetch_progress, ticker, status="in_progress")
 
     try:
         # Step 1: Get contracts reference
-        contracts = polygon_opts.get_key_contracts(ticker)
+        contracts = await polygon_opts.get_key_contracts(ticker)
         if not contracts:
             print(f"[INGEST] No contracts found for {ticker}")
-            update_fetch_progress(ticker, status="complete", contracts_fetched=0)
+            await asyncio.to_thread(update_fetch_progress, ticker, status="complete", contracts_fetched=0)
             return {"contracts_fetched": 0, "bars_stored": 0, "errors": 0}
 
         # Prioritize contracts: sort by volume/OI if available, take top N
@@ -141,7 +141,7 @@ def ingest_ticker_options(polygon_opts, ticker: str) -> dict:
                 continue
 
             try:
-                bars = polygon_opts.get_daily_bars(opt_ticker, from_date=from_date, to_date=to_date)
+                bars = await polygon_opts.get_daily_bars(opt_ticker, from_date=from_date, to_date=to_date)
                 if not bars:
                     continue
 
@@ -170,7 +170,7 @@ def ingest_ticker_options(polygon_opts, ticker: str) -> dict:
                         "num_trades": bar.get("n"),
                     })
 
-                stored = upsert_options_bars(db_bars)
+                stored = await asyncio.to_thread(upsert_options_bars, db_bars)
                 total_bars += stored
                 print(f"[INGEST] {opt_ticker}: {stored} bars stored")
 
@@ -178,7 +178,8 @@ def ingest_ticker_options(polygon_opts, ticker: str) -> dict:
                 print(f"[INGEST] Error fetching bars for {opt_ticker}: {e}")
                 errors += 1
 
-        update_fetch_progress(
+        await asyncio.to_thread(
+            update_fetch_progress,
             ticker,
             status="complete",
             contracts_fetched=len(contracts),
@@ -190,12 +191,12 @@ def ingest_ticker_options(polygon_opts, ticker: str) -> dict:
 
     except Exception as e:
         print(f"[INGEST] Fatal error for {ticker}: {e}")
-        update_fetch_progress(ticker, status="error", error_message=str(e)[:500])
+        await asyncio.to_thread(update_fetch_progress, ticker, status="error", error_message=str(e)[:500])
         return {"contracts_fetched": 0, "bars_stored": 0, "errors": 1}
 
 
 @traceable(name="options_ingestion.ingest_technicals")
-def ingest_technicals(polygon_opts, ticker: str) -> int:
+async def ingest_technicals(polygon_opts, ticker: str) -> int:
     """
     Fetch and store all 4 technical indicators for a ticker.
     Uses 4 API calls (SMA 20, SMA 50, RSI 14, MACD).
@@ -207,7 +208,7 @@ def ingest_technicals(polygon_opts, ticker: str) -> int:
     total = 0
 
     try:
-        technicals = polygon_opts.get_all_technicals(ticker)
+        technicals = await polygon_opts.get_all_technicals(ticker)
 
         # Transform Polygon indicator data to our DB format
         db_rows = []
@@ -273,7 +274,7 @@ def ingest_technicals(polygon_opts, ticker: str) -> int:
             })
 
         if db_rows:
-            total = upsert_technicals(db_rows)
+            total = await asyncio.to_thread(upsert_technicals, db_rows)
             print(f"[INGEST] {ticker} technicals: {total} data points stored")
 
     except Exception as e:
@@ -292,7 +293,7 @@ async def run_ingestion_loop(polygon_opts, init_event=None, stop_event=None):
 
     Phase 2 (maintenance): Re-fetch completed tickers every 6 hours to pick up new EOD data.
 
-    This runs in a background thread via asyncio.to_thread().
+    Polygon calls run on the event loop; only the blocking DB writes use threads.
     """
     loop = asyncio.get_event_loop()
 
@@ -348,15 +349,11 @@ async def run_ingestion_loop(polygon_opts, init_event=None, stop_event=None):
 
                 print(f"[INGEST_LOOP] [{i+1}/{len(work_queue)}] Processing {ticker}...")
 
-                # Fetch options data (runs in thread to avoid blocking event loop)
-                result = await loop.run_in_executor(
-                    None, ingest_ticker_options, polygon_opts, ticker
-                )
+                # Fetch options data
+                result = await ingest_ticker_options(polygon_opts, ticker)
 
                 # Fetch technicals (4 more API calls)
-                tech_count = await loop.run_in_executor(
-                    None, ingest_technicals, polygon_opts, ticker
-                )
+                tech_count = await ingest_technicals(polygon_opts, ticker)
 
                 print(
                     f"[INGEST_LOOP] [{i+1}/{len(work_queue)}] {ticker} done: "
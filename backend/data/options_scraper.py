@@ -1,4 +1,4 @@
-import httpx
+from data import http_pool
 from bs4 import BeautifulSoup
 
 try:
@@ -38,7 +38,7 @@ class OptionsScraper:
         indicating large new positions being opened.
         """
         try:
-            async with httpx.AsyncClient() as client:
+            async with http_pool.session() as client:
                 resp = await client.get(
                     "https://www.barchart.com/options/unusual-activity/stocks",
                     headers=self.HEADERS,
@@ -77,7 +77,7 @@ class OptionsScraper:
     async def get_options_volume_leaders(self) -> list:
         """Get stocks with the highest options volume today."""
         try:
-            async with httpx.AsyncClient() as client:
+            async with http_pool.session() as client:
                 resp = await client.get(
                     "https://www.barchart.com/options/volume-leaders/stocks",
                     headers=self.HEADERS,
@@ -117,7 +117,7 @@ class OptionsScraper:
         """
         ticker = ticker.upper()
         try:
-            async with httpx.AsyncClient() as client:
+            async with http_pool.session() as client:
                 resp = await client.get(
                     f"https://www.barchart.com/stocks/quotes/{ticker}/put-call-ratios",
                     headers=self.HEADERS,
@@ -15,7 +15,7 @@ Response format:
   {"results": [{"title", "url", "snippet", "date", "last_updated"}], "id": "..."}
 """
 import asyncio
-import httpx
+from data import http_pool
 from data.cache import cache
 
 try:
@@ -92,7 +92,7 @@ class PerplexityProvider:
             body["search_domain_filter"] = domain_filter[:20]
 
         try:
-            async with httpx.AsyncClient() as client:
+            async with http_pool.session() as client:
                 resp = await client.post(
                     self.SEARCH_URL,
                     headers=self._headers,
@@ -154,7 +154,7 @@ class PerplexityProvider:
             if domain_filter:
                 body["search_domain_filter"] = domain_filter[:20]
 
-            async with httpx.AsyncClient() as client:
+            async with http_pool.session() as client:
                 resp = await client.post(
                     self.CHAT_URL,
                     headers=self._headers,
@@ -371,7 +371,7 @@ class PerplexityProvider:
             "search_recency_filter": "day",
         }
         try:
-            async with httpx.AsyncClient(timeout=55.0) as client:
+            async with http_pool.session(timeout=55.0) as client:
                 resp = await client.post(
                     self.CHAT_URL,
                     headers=self._headers,
@@ -552,7 +552,7 @@ class PerplexityProvider:
         )
 
         try:
-            async with httpx.AsyncClient() as client:
+            async with http_pool.session() as client:
                 resp = await client.post(
                     self.SONAR_URL,
                     headers=self._headers,
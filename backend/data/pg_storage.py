@@ -7,6 +7,7 @@ Auto-creates tables on first use. Survives all deploys and autoscale events.
 
 import json
 import os
+import time
 from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
 
 try:
@@ -407,6 +408,18 @@ def init_tables():
             ALTER TABLE public.watchlist ADD COLUMN IF NOT EXISTS name TEXT NOT NULL DEFAULT 'Watchlist'
         """)
 
+        # ── Response cache L2 (data/cache.py) — disposable, so UNLOGGED ──
+        cur.execute("""
+            CREATE UNLOGGED TABLE IF NOT EXISTS public.response_cache (
+                key TEXT PRIMARY KEY,
+                expires_at DOUBLE PRECISION NOT NULL,
+                value BYTEA NOT NULL
+            )
+        """)
+        cur.execute("""
+            CREATE INDEX IF NOT EXISTS response_cache_expires_at ON public.response_cache (expires_at)
+        """)
+
         conn.commit()
         cur.close()
         print("[PG_STORAGE] init_tables completed (CREATE TABLE IF NOT EXISTS executed)")
@@ -419,6 +432,98 @@ def init_tables():
         _put_conn(conn)
 
 
+# ── Response cache L2 ────────────────────────────────────────
+
+def response_cache_get(key: str) -> tuple[bytes, float] | None:
+    """(serialized value, expires_at epoch) for a live cache row, else None."""
+    conn = _get_conn()
+    if conn is None:
+        return None
+    try:
+        with conn.cursor() as cur:
+            cur.execute(
+                "SELECT value, expires_at FROM public.response_cache WHERE key = %s AND expires_at > %s",
+                (key, time.time()),
+            )
+            row = cur.fetchone()
+        conn.commit()
+        return (bytes(row[0]), row[1]) if row else None
+    except Exception as e:
+        print(f"[PG_STORAGE] response_cache_get error: {e}")
+        conn.rollback()
+        return None
+    finally:
+        _put_conn(conn)
+
+
+def response_cache_load(prefixes: list[str]) -> list[tuple[str, bytes, float]]:
+    """Every live row whose key starts with one of `prefixes` (cache warm-up)."""
+    if not prefixes:
+        return []
+    conn = _get_conn()
+    if conn is None:
+        return []
+    try:
+        with conn.cursor() as cur:
+            cur.execute(
+                "SELECT key, value, expires_at FROM public.response_cache "
+                "WHERE expires_at > %s AND key LIKE ANY(%s)",
+                (time.time(), [p.replace("_", r"\_") + "%" for p in prefixes]),
+            )
+            rows = [(k, bytes(v), exp) for k, v, exp in cur.fetchall()]
+        conn.commit()
+        return rows
+    except Exception as e:
+        print(f"[PG_STORAGE] response_cache_load error: {e}")
+        conn.rollback()
+        return []
+    finally:
+        _put_conn(conn)
+
+
+def response_cache_put_many(rows: list[tuple[str, bytes, float]]) -> bool:
+    """Upsert (key, serialized value, expires_at) rows."""
+    conn = _get_conn()
+    if conn is None:
+        return False
+    try:
+        from psycopg2.extras import execute_values
+        with conn.cursor() as cur:
+            if rows:
+                execute_values(cur, """
+                    INSERT INTO public.response_cache (key, value, expires_at) VALUES %s
+                    ON CONFLICT (key) DO UPDATE
+                    SET value = EXCLUDED.value, expires_at = EXCLUDED.expires_at
+                """, rows)
+        conn.commit()
+        return True
+    except Exception as e:
+        print(f"[PG_STORAGE] response_cache_put_many error: {e}")
+        conn.rollback()
+        return False
+    finally:
+        _put_conn(conn)
+
+
+def response_cache_purge() -> int:
+    """Delete expired cache rows; returns how many were removed."""
+    conn = _get_conn()
+    if conn is None:
+        return 0
+    try:
+        with conn.cursor() as cur:
+            cur.execute("DELETE FROM public.response_cache WHERE expires_at <= %s", (time.time(),))
+            deleted = cur.rowcount
+        conn.commit()
+        return deleted
+    except Exception as e:
+        print(f"[PG_STORAGE] response_cache_purge error: {e}")
+        conn.rollback()
+        return 0
+    finally:
+        _put_conn(conn)
+
+
 # ── Watchlist CRUD ───────────────────────────────────────────
 
 def watchlist_list() -> list:
@@ -13,11 +13,14 @@ Endpoints used:
   - GET /v1/indicators/macd/{ticker}  (MACD)
 """
 
+import asyncio
 import time
-import threading
-import requests
 from datetime import datetime, timedelta
 
+import httpx
+
+from data import http_pool
+
 try:
     from langsmith import traceable
 except ImportError:
@@ -39,34 +42,34 @@ class PolygonOptionsProvider:
 
     def __init__(self, api_key: str, max_per_minute: int = 5):
         self.api_key = api_key
-        self._rate_lock = threading.Lock()
         self._call_times: list[float] = []
         self._max_per_minute = max_per_minute
 
-    def _wait_for_rate_slot(self) -> bool:
-        """Block until a rate slot is available. Returns True if slot acquired."""
+    async def _wait_for_rate_slot(self) -> bool:
+        """Wait until a rate slot is available. Returns True if slot acquired."""
         for _ in range(120):  # wait up to 2 minutes
-            with self._rate_lock:
-                now = time.time()
-                self._call_times = [t for t in self._call_times if now - t < 60]
-                if len(self._call_times) < self._max_per_minute:
-                    self._call_times.append(now)
-                    return True
-            time.sleep(1)
+            # No await between check and record, so concurrent waiters can't both take the slot
+            now = time.time()
+            self._call_times = [t for t in self._call_times if now - t < 60]
+            if len(self._call_times) < self._max_per_minute:
+                self._call_times.append(now)
+                return True
+            await asyncio.sleep(1)
         return False
 
-    def _request(self, path: str, params: dict = None, timeout: int = 15) -> dict:
+    async def _request(self, path: str, params: dict = None, timeout: int = 15) -> dict:
         """Make a rate-limited request to Polygon API."""
         if params is None:
             params = {}
         params["apiKey"] = self.api_key
 
-        if not self._wait_for_rate_slot():
+        if not await self._wait_for_rate_slot():
             print("[POLYGON_OPTIONS] Rate limit wait timed out")
             return {"error": "rate_limit_timeout"}
 
         try:
-            resp = requests.get(f"{self.BASE_URL}{path}", params=params, timeout=timeout)
+            async with http_pool.session(timeout=timeout) as client:
+                resp = await client.get(f"{self.BASE_URL}{path}", params=params)
             if resp.status_code == 429:
                 print("[POLYGON_OPTIONS] 429 rate limited")
                 return {"error": "rate_limited", "status": 429}
@@ -75,7 +78,7 @@ class PolygonOptionsProvider:
             if resp.status_code != 200:
                 return {"error": f"HTTP {resp.status_code}", "status": resp.status_code}
             return resp.json()
-        except requests.exceptions.Timeout:
+        except httpx.TimeoutException:
             print(f"[POLYGON_OPTIONS] Request timed out: {path}")
             return {"error": "timeout"}
         except Exception as e:
@@ -85,7 +88,7 @@ class PolygonOptionsProvider:
     # ── Options Contracts Reference ──────────────────────────────────
 
     @traceable(name="polygon_options.get_contracts")
-    def get_contracts(
+    async def get_contracts(
         self,
         underlying_ticker: str,
         expired: bool = False,
@@ -131,11 +134,8 @@ class PolygonOptionsProvider:
             if next_url:
                 # Polygon pagination uses full URLs
                 try:
-                    resp = requests.get(
-                        next_url,
-                        params={"apiKey": self.api_key},
-                        timeout=15,
-                    )
+                    async with http_pool.session(timeout=15) as client:
+                        resp = await client.get(next_url, params={"apiKey": self.api_key})
                     if resp.status_code != 200:
                         break
                     data = resp.json()
@@ -143,10 +143,9 @@ class PolygonOptionsProvider:
                     print(f"[POLYGON_OPTIONS] Pagination error: {e}")
                     break
                 # Count this as an API call for rate limiting
-                with self._rate_lock:
-                    self._call_times.append(time.time())
+                self._call_times.append(time.time())
             else:
-                data = self._request("/v3/reference/options/contracts", params=params)
+                data = await self._request("/v3/reference/options/contracts", params=params)
                 if "error" in data:
                     print(f"[POLYGON_OPTIONS] Contracts error for {underlying_ticker}: {data['error']}")
                     break
@@ -161,13 +160,13 @@ class PolygonOptionsProvider:
                 break
 
             # Wait for rate slot before next page
-            if not self._wait_for_rate_slot():
+            if not await self._wait_for_rate_slot():
                 break
 
         return all_contracts
 
     @traceable(name="polygon_options.get_key_contracts")
-    def get_key_contracts(self, underlying_ticker: str, current_price: float = None) -> list[dict]:
+    async def get_key_contracts(self, underlying_ticker: str, current_price: float = None) -> list[dict]:
         """
         Get the most relevant options contracts for analysis:
         - Nearest 3 monthly expirations
@@ -187,7 +186,7 @@ class PolygonOptionsProvider:
             params["strike_price_gte"] = round(current_price * 0.80, 2)
             params["strike_price_lte"] = round(current_price * 1.20, 2)
 
-        contracts = self.get_contracts(ticker, **params)
+        contracts = await self.get_contracts(ticker, **params)
 
         # Filter to monthly expirations (3rd Friday pattern) — keep all if <50
         if len(contracts) > 50:
@@ -208,7 +207,7 @@ class PolygonOptionsProvider:
     # ── Options Daily Bars (OHLCV) ───────────────────────────────────
 
     @traceable(name="polygon_options.get_daily_bars")
-    def get_daily_bars(
+    async def get_daily_bars(
         self,
         option_ticker: str,
         from_date: str = None,
@@ -229,7 +228,7 @@ class PolygonOptionsProvider:
         if not option_ticker.startswith("O:"):
             option_ticker = f"O:{option_ticker}"
 
-        data = self._request(
+        data = await self._request(
             f"/v2/aggs/ticker/{option_ticker}/range/1/day/{from_date}/{to_date}",
             params={"adjusted": "true", "sort": "asc", "limit": limit},
         )
@@ -242,9 +241,9 @@ class PolygonOptionsProvider:
     # ── Technical Indicators (for underlying stocks) ─────────────────
 
     @traceable(name="polygon_options.get_sma")
-    def get_sma(self, ticker: str, window: int = 50, timespan: str = "day", limit: int = 500) -> list[dict]:
+    async def get_sma(self, ticker: str, window: int = 50, timespan: str = "day", limit: int = 500) -> list[dict]:
         """Get Simple Moving Average for a stock ticker."""
-        data = self._request(
+        data = await self._request(
             f"/v1/indicators/sma/{ticker.upper()}",
             params={
                 "timespan": timespan,
@@ -260,9 +259,9 @@ class PolygonOptionsProvider:
         return results.get("values", []) if isinstance(results, dict) else []
 
     @traceable(name="polygon_options.get_ema")
-    def get_ema(self, ticker: str, window: int = 12, timespan: str = "day", limit: int = 500) -> list[dict]:
+    async def get_ema(self, ticker: str, window: int = 12, timespan: str = "day", limit: int = 500) -> list[dict]:
         """Get Exponential Moving Average for a stock ticker."""
-        data = self._request(
+        data = await self._request(
             f"/v1/indicators/ema/{ticker.upper()}",
             params={
                 "timespan": timespan,
@@ -278,9 +277,9 @@ class PolygonOptionsProvider:
         return results.get("values", []) if isinstance(results, dict) else []
 
     @traceable(name="polygon_options.get_rsi")
-    def get_rsi(self, ticker: str, window: int = 14, timespan: str = "day", limit: int = 500) -> list[dict]:
+    async def get_rsi(self, ticker: str, window: int = 14, timespan: str = "day", limit: int = 500) -> list[dict]:
         """Get Relative Strength Index for a stock ticker."""
-        data = self._request(
+        data = await self._request(
             f"/v1/indicators/rsi/{ticker.upper()}",
             params={
                 "timespan": timespan,
@@ -296,7 +295,7 @@ class PolygonOptionsProvider:
         return results.get("values", []) if isinstance(results, dict) else []
 
     @traceable(name="polygon_options.get_macd")
-    def get_macd(
+    async def get_macd(
         self,
         ticker: str,
         short_window: int = 12,
@@ -306,7 +305,7 @@ class PolygonOptionsProvider:
         limit: int = 500,
     ) -> list[dict]:
         """Get MACD indicator for a stock ticker."""
-        data = self._request(
+        data = await self._request(
             f"/v1/indicators/macd/{ticker.upper()}",
             params={
                 "timespan": timespan,
@@ -324,7 +323,7 @@ class PolygonOptionsProvider:
         return results.get("values", []) if isinstance(results, dict) else []
 
     @traceable(name="polygon_options.get_all_technicals")
-    def get_all_technicals(self, ticker: str) -> dict:
+    async def get_all_technicals(self, ticker: str) -> dict:
         """
         Fetch all 4 technical indicators for a ticker in sequence (4 API calls).
         Returns dict with sma_20, sma_50, ema_12, ema_26, rsi_14, macd data.
@@ -333,19 +332,19 @@ class PolygonOptionsProvider:
         result = {"ticker": ticker, "fetched_at": datetime.now().isoformat()}
 
         # SMA 20
-        sma_20 = self.get_sma(ticker, window=20, limit=250)
+        sma_20 = await self.get_sma(ticker, window=20, limit=250)
         result["sma_20"] = sma_20
 
         # SMA 50
-        sma_50 = self.get_sma(ticker, window=50, limit=250)
+        sma_50 = await self.get_sma(ticker, window=50, limit=250)
         result["sma_50"] = sma_50
 
         # RSI 14
-        rsi_14 = self.get_rsi(ticker, window=14, limit=250)
+        rsi_14 = await self.get_rsi(ticker, window=14, limit=250)
         result["rsi_14"] = rsi_14
 
         # MACD (12, 26, 9)
-        macd = self.get_macd(ticker, limit=250)
+        macd = await self.get_macd(ticker, limit=250)
         result["macd"] = macd
 
         return result
@@ -353,12 +352,12 @@ class PolygonOptionsProvider:
     # ── Snapshot / Last Quote ────────────────────────────────────────
 
     @traceable(name="polygon_options.get_options_snapshot")
-    def get_options_snapshot(self, underlying_ticker: str) -> list[dict]:
+    async def get_options_snapshot(self, underlying_ticker: str) -> list[dict]:
         """
         Get current snapshot for all options of an underlying (paid tier).
         Falls back gracefully if not available on free tier.
         """
-        data = self._request(
+        data = await self._request(
             f"/v3/snapshot/options/{underlying_ticker.upper()}",
             params={"limit": 250},
         )
@@ -1,7 +1,7 @@
 import time
-import threading
-import requests
+import httpx
 from datetime import datetime, timedelta
+from data import http_pool
 from data.cache import cache, POLYGON_SNAPSHOT_TTL, POLYGON_TECHNICALS_TTL, POLYGON_DETAILS_TTL, POLYGON_NEWS_TTL
 
 try:
@@ -20,28 +20,28 @@ class PolygonProvider:
     def __init__(self, api_key: str):
         self.api_key = api_key
         self.base_url = "https://api.polygon.io"
-        self._rate_lock = threading.Lock()
         self._call_times = []
         self._max_per_minute = 4
 
     @traceable(name="request")
-    def _request(self, path: str, params: dict = None, timeout: int = 8) -> dict:
+    async def _request(self, path: str, params: dict = None, timeout: int = 8) -> dict:
         if params is None:
             params = {}
         params["apiKey"] = self.api_key
 
-        with self._rate_lock:
-            now = time.time()
-            self._call_times = [t for t in self._call_times if now - t < 60]
+        # Check-and-record runs without an await, so it is atomic on the event loop
+        now = time.time()
+        self._call_times = [t for t in self._call_times if now - t < 60]
 
-            if len(self._call_times) >= self._max_per_minute:
-                print(f"[Polygon] Rate limit reached ({self._max_per_minute}/min), skipping")
-                return {}
+        if len(self._call_times) >= self._max_per_minute:
+            print(f"[Polygon] Rate limit reached ({self._max_per_minute}/min), skipping")
+            return {}
 
-            self._call_times.append(now)
+        self._call_times.append(now)
 
         try:
-            resp = requests.get(f"{self.base_url}{path}", params=params, timeout=timeout)
+            async with http_pool.session(timeout=timeout) as client:
+                resp = await client.get(f"{self.base_url}{path}", params=params)
             if resp.status_code == 429:
                 print("[Polygon] 429 rate limited, skipping (no retry)")
                 return {"error": "rate_limited", "status": 429}
@@ -50,7 +50,7 @@ class PolygonProvider:
             if resp.status_code != 200:
                 return {"error": f"HTTP {resp.status_code}", "status": resp.status_code}
             return resp.json()
-        except requests.exceptions.Timeout:
+        except httpx.TimeoutException:
             print(f"[Polygon] Request timed out: {path}")
             return {"error": "timeout"}
         except Exception as e:
@@ -58,7 +58,7 @@ class PolygonProvider:
             return {"error": str(e)}
 
     @traceable(name="get_daily_bars")
-    def get_daily_bars(self, ticker: str, days: int = 120) -> list:
+    async def get_daily_bars(self, ticker: str, days: int = 120) -> list:
         """Fetch daily OHLCV bars. Cached separately since multiple methods use it."""
         ticker = ticker.upper()
         cache_key = f"polygon:bars:{ticker}:{days}"
@@ -69,7 +69,7 @@ class PolygonProvider:
         end = datetime.now().strftime("%Y-%m-%d")
         start = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
 
-        data = self._request(
+        data = await self._request(
             f"/v2/aggs/ticker/{ticker}/range/1/day/{start}/{end}",
             params={"adjusted": "true", "sort": "asc", "limit": days},
         )
@@ -82,7 +82,7 @@ class PolygonProvider:
         return bars
 
     @traceable(name="get_snapshot")
-    def get_snapshot(self, ticker: str) -> dict:
+    async def get_snapshot(self, ticker: str) -> dict:
         """Get latest price data from daily bars (works on free tier)."""
         ticker = ticker.upper()
         cache_key = f"polygon:snapshot:{ticker}"
@@ -90,7 +90,7 @@ class PolygonProvider:
         if cached is not None:
             return cached
         try:
-            bars = self.get_daily_bars(ticker)
+            bars = await self.get_daily_bars(ticker)
             if not bars:
                 return {"ticker": ticker, "error": "no_data"}
 
@@ -122,7 +122,7 @@ class PolygonProvider:
             return {"ticker": ticker, "error": str(e)}
 
     @traceable(name="get_market_movers")
-    def get_market_movers(self) -> dict:
+    async def get_market_movers(self) -> dict:
         """
         Get top gainers and losers.
         Tries Polygon snapshot endpoint first (paid tier).
@@ -133,7 +133,7 @@ class PolygonProvider:
         if cached is not None:
             return cached
         try:
-            data = self._request("/v2/snapshot/locale/us/markets/stocks/gainers")
+            data = await self._request("/v2/snapshot/locale/us/markets/stocks/gainers")
             if "error" not in data and data.get("tickers"):
                 gainers = []
                 for t in (data.get("tickers") or [])[:15]:
@@ -145,7 +145,7 @@ class PolygonProvider:
                         "volume": day.get("v"),
                     })
 
-                data2 = self._request("/v2/snapshot/locale/us/markets/stocks/losers")
+                data2 = await self._request("/v2/snapshot/locale/us/markets/stocks/losers")
                 losers = []
                 if "error" not in data2:
                     for t in (data2.get("tickers") or [])[:15]:
@@ -166,7 +166,6 @@ class PolygonProvider:
             print(f"[Polygon movers] Snapshot failed: {e}. Falling back to FMP.")
 
         try:
-            import httpx
             from config import FMP_API_KEY
             if not FMP_API_KEY:
                 return {"gainers": [], "losers": []}
@@ -175,7 +174,9 @@ class PolygonProvider:
             gainers = []
             losers = []
 
-            resp_g = httpx.get(f"{base}/stock_market/gainers", params={"apikey": FMP_API_KEY}, timeout=10)
+            async with http_pool.session(timeout=10) as client:
+                resp_g = await client.get(f"{base}/stock_market/gainers", params={"apikey": FMP_API_KEY})
+                resp_l = await client.get(f"{base}/stock_market/losers", params={"apikey": FMP_API_KEY})
             if resp_g.status_code == 200:
                 for item in (resp_g.json() or [])[:15]:
                     if isinstance(item, dict):
@@ -186,7 +187,6 @@ class PolygonProvider:
                             "volume": item.get("volume"),
                         })
 
-            resp_l = httpx.get(f"{base}/stock_market/losers", params={"apikey": FMP_API_KEY}, timeout=10)
             if resp_l.status_code == 200:
                 for item in (resp_l.json() or [])[:15]:
                     if isinstance(item, dict):
@@ -207,7 +207,7 @@ class PolygonProvider:
             return {"gainers": [], "losers": []}
 
     @traceable(name="get_news")
-    def get_news(self, ticker: str = None, limit: int = 15) -> list:
+    async def get_news(self, ticker: str = None, limit: int = 15) -> list:
         """Get recent news articles, optionally filtered by ticker."""
         cache_key = f"polygon:news:{ticker}:{limit}"
         cached = cache.get(cache_key)
@@ -217,7 +217,7 @@ class PolygonProvider:
             params = {"limit": limit}
             if ticker:
                 params["ticker"] = ticker.upper()
-            data = self._request("/v2/reference/news", params=params)
+            data = await self._request("/v2/reference/news", params=params)
             if "error" in data:
                 print(f"Error getting news: {data['error']}")
                 return []
@@ -239,7 +239,7 @@ class PolygonProvider:
             return []
 
     @traceable(name="get_technicals")
-    def get_technicals(self, ticker: str) -> dict:
+    async def get_technicals(self, ticker: str) -> dict:
         """Calculate technicals from daily bars using shared ta_utils (works on free Polygon tier)."""
         from data.ta_utils import compute_technicals_from_bars
         ticker = ticker.upper()
@@ -249,7 +249,7 @@ class PolygonProvider:
             return cached
 
         try:
-            bars = self.get_daily_bars(ticker)
+            bars = await self.get_daily_bars(ticker)
             if len(bars) < 20:
                 return {}
 
@@ -273,15 +273,15 @@ class PolygonProvider:
             return {}
 
     @traceable(name="get_ticker_details")
-    def get_ticker_details(self, ticker: str) -> dict:
+    async def get_ticker_details(self, ticker: str) -> dict:
         """Get company info: name, sector, market cap, etc."""
         ticker = ticker.upper()
         cache_key = f"polygon:details:{ticker}"
-        cached = cache.get(cache_key)
+        cached = await cache.get_async(cache_key)
         if cached is not None:
             return cached
         try:
-            data = self._request(f"/v3/reference/tickers/{ticker}")
+            data = await self._request(f"/v3/reference/tickers/{ticker}")
             if "error" in data:
                 print(f"Error getting details for {ticker}: {data['error']}")
                 return {"name": ticker, "error": data["error"]}
@@ -300,13 +300,13 @@ class PolygonProvider:
             return {"name": ticker, "error": str(e)}
 
     @traceable(name="get_ticker_events")
-    def get_ticker_events(self, ticker: str) -> dict:
+    async def get_ticker_events(self, ticker: str) -> dict:
         """Get upcoming earnings, dividends, and recent news catalysts."""
         ticker = ticker.upper()
         result = {"earnings": None, "news": []}
 
         try:
-            news_data = self._request("/v2/reference/news", params={"ticker": ticker, "limit": 10})
+            news_data = await self._request("/v2/reference/news", params={"ticker": ticker, "limit": 10})
             if "error" not in news_data:
                 result["news"] = [
                     {
@@ -12,7 +12,7 @@ Free / unauthenticated — no API key required.
 """
 import json
 import asyncio
-import httpx
+from data import http_pool
 from data.cache import cache
 
 try:
@@ -161,7 +161,7 @@ class PolymarketProvider:
     @traceable(name="fetch_events")
     async def _fetch_events(self, params: dict) -> list[dict]:
         """Raw HTTP call to Gamma API /events endpoint."""
-        async with httpx.AsyncClient(timeout=15.0, follow_redirects=True) as client:
+        async with http_pool.session(timeout=15.0, follow_redirects=True) as client:
             resp = await client.get(
                 f"{GAMMA_BASE}/events",
                 params=params,
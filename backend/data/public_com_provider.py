@@ -1,4 +1,4 @@
-import httpx
+from data import http_pool
 import asyncio
 from data.cache import cache
 
@@ -57,7 +57,7 @@ class PublicComProvider:
                 return cached
 
             try:
-                async with httpx.AsyncClient(timeout=10) as client:
+                async with http_pool.session(timeout=10) as client:
                     resp = await client.post(
                         self.AUTH_URL,
                         headers={"Content-Type": "application/json"},
@@ -99,7 +99,7 @@ class PublicComProvider:
                 return None
 
             try:
-                async with httpx.AsyncClient(timeout=10) as client:
+                async with http_pool.session(timeout=10) as client:
                     resp = await client.get(
                         f"{self.BASE_URL}/trading/account",
                         headers=self._make_headers(access_token),
@@ -137,7 +137,7 @@ class PublicComProvider:
             return []
 
         try:
-            async with httpx.AsyncClient(timeout=10) as client:
+            async with http_pool.session(timeout=10) as client:
                 resp = await client.post(
                     f"{self.BASE_URL}/marketdata/{account_id}/option-expirations",
                     headers=self._make_headers(self._access_token),
@@ -171,7 +171,7 @@ class PublicComProvider:
             return {}
 
         try:
-            async with httpx.AsyncClient(timeout=15) as client:
+            async with http_pool.session(timeout=15) as client:
                 resp = await client.post(
                     f"{self.BASE_URL}/marketdata/{account_id}/option-chain",
                     headers=self._make_headers(self._access_token),
@@ -211,7 +211,7 @@ class PublicComProvider:
         instruments = [{"symbol": s, "type": instrument_type} for s in symbols]
 
         try:
-            async with httpx.AsyncClient(timeout=10) as client:
+            async with http_pool.session(timeout=10) as client:
                 resp = await client.post(
                     f"{self.BASE_URL}/marketdata/{account_id}/quotes",
                     headers=self._make_headers(self._access_token),
@@ -251,7 +251,7 @@ class PublicComProvider:
         all_greeks = []
 
         try:
-            async with httpx.AsyncClient(timeout=15) as client:
+            async with http_pool.session(timeout=15) as client:
                 async def _fetch_batch(batch):
                     params = "&".join([f"osiSymbols={s}" for s in batch])
                     resp = await client.get(
@@ -1,5 +1,5 @@
 import asyncio
-import httpx
+from data import http_pool
 from data.cache import cache
 
 try:
@@ -27,7 +27,7 @@ class RedditSentimentProvider:
             return cached
 
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
+            async with http_pool.session(timeout=10.0) as client:
                 resp = await client.get(
                     f"{self.BASE_URL}/{endpoint}",
                     headers={"User-Agent": "TradingAgent/1.0"},
@@ -1,9 +1,8 @@
 import asyncio
 import time
-import httpx
 from datetime import datetime, timedelta
 from data.cache import cache
-from data import edgar_cache
+from data import edgar_cache, http_pool
 
 try:
     from langsmith import traceable
@@ -105,12 +104,12 @@ class SecEdgarProvider:
     TICKERS_URL = "https://www.sec.gov/files/company_tickers.json"
 
     def __init__(self):
-        self._client: httpx.AsyncClient | None = None
+        self._client: http_pool.PooledSession | None = None
 
     @traceable(name="get_client")
-    async def _get_client(self) -> httpx.AsyncClient:
-        if self._client is None or self._client.is_closed:
-            self._client = httpx.AsyncClient(
+    async def _get_client(self) -> http_pool.PooledSession:
+        if self._client is None:
+            self._client = http_pool.session(
                 headers=HEADERS,
                 timeout=10.0,
                 follow_redirects=True,
@@ -191,7 +190,7 @@ class SecEdgarProvider:
     async def resolve_cik(self, symbol: str) -> str | None:
         symbol = symbol.upper().strip()
         cache_key = f"edgar:cik:{symbol}"
-        cached = cache.get(cache_key)
+        cached = await cache.get_async(cache_key)
         if cached is not None:
             return cached
 
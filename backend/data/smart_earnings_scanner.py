@@ -39,6 +39,7 @@ except ImportError:
 
 
 import httpx
+from data import http_pool
 
 CACHE_FILE = Path("data/earnings_smart_cache.json")
 CACHE_TTL = 6 * 3600  # 6 hours
@@ -115,8 +116,7 @@ async def _fetch_week_tickers(finnhub_client, reference_date: str | None = None)
     print(f"[SMART_EARNINGS] Fetching Finnhub earnings {from_date} → {to_date}")
 
     data = await asyncio.wait_for(
-        asyncio.to_thread(
-            finnhub_client.earnings_calendar,
+        finnhub_client.earnings_calendar(
             _from=from_date,
             to=to_date,
             symbol=None,
@@ -180,7 +180,7 @@ async def _grok_batch_scan(xai_key: str, tickers: list[str]) -> list[dict]:
     }
 
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        async with http_pool.session(timeout=30.0) as client:
             resp = await client.post(
                 "https://api.x.ai/v1/responses",
                 headers=headers,
@@ -235,7 +235,7 @@ async def _perplexity_batch_scan(pplx_key: str, tickers: list[str]) -> list[dict
     }
 
     try:
-        async with httpx.AsyncClient(timeout=20.0) as client:
+        async with http_pool.session(timeout=20.0) as client:
             resp = await client.post(
                 "https://api.perplexity.ai/chat/completions",
                 headers=headers,
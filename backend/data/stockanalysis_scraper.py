@@ -1,5 +1,5 @@
 import re
-import httpx
+from data import http_pool
 from bs4 import BeautifulSoup
 from data.cache import cache, STOCKANALYSIS_TTL
 
@@ -48,7 +48,7 @@ class StockAnalysisScraper:
         if cached is not None:
             return cached
         try:
-            async with httpx.AsyncClient() as client:
+            async with http_pool.session() as client:
                 resp = await client.get(
                     f"https://stockanalysis.com/stocks/{ticker.lower()}/",
                     headers=self.HEADERS,
@@ -178,7 +178,7 @@ class StockAnalysisScraper:
         if cached is not None:
             return cached
         try:
-            async with httpx.AsyncClient() as client:
+            async with http_pool.session() as client:
                 resp = await client.get(
                     f"https://stockanalysis.com/stocks/{ticker.lower()}/forecast/",
                     headers=self.HEADERS,
@@ -266,7 +266,7 @@ class StockAnalysisScraper:
         if cached is not None:
             return cached
         try:
-            async with httpx.AsyncClient() as client:
+            async with http_pool.session() as client:
                 resp = await client.get(
                     f"https://stockanalysis.com/stocks/{ticker.lower()}/financials/",
                     headers=self.HEADERS,
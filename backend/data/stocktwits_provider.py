@@ -1,4 +1,4 @@
-import httpx
+from data import http_pool
 from data.cache import cache, STOCKTWITS_TTL
 
 try:
@@ -27,7 +27,7 @@ class StockTwitsProvider:
         if cached is not None:
             return cached
         try:
-            async with httpx.AsyncClient() as client:
+            async with http_pool.session() as client:
                 resp = await client.get(
                     f"{self.BASE_URL}/streams/symbol/{ticker}.json",
                     timeout=10,
@@ -94,7 +94,7 @@ class StockTwitsProvider:
         if cached is not None:
             return cached
         try:
-            async with httpx.AsyncClient() as client:
+            async with http_pool.session() as client:
                 resp = await client.get(
                     f"{self.BASE_URL}/trending/symbols.json",
                     timeout=10,
@@ -7,7 +7,7 @@ Free tier: 1,000 calls/month.
 Budget strategy: ~5 calls per user prompt, ~5 prompts/day = 750/month.
 """
 import asyncio
-import httpx
+from data import http_pool
 from data.cache import cache
 
 try:
@@ -38,7 +38,7 @@ class TavilyProvider:
                       search_depth: str = "basic", topic: str = "news") -> dict:
         """Execute a single Tavily search."""
         try:
-            async with httpx.AsyncClient() as client:
+            async with http_pool.session() as client:
                 resp = await client.post(
                     self.BASE_URL,
                     json={
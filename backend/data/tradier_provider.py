@@ -14,7 +14,7 @@ import os
 from datetime import date, datetime, timedelta
 from typing import Any
 
-import httpx
+from data import http_pool
 
 from data.cache import cache
 
@@ -84,7 +84,7 @@ class TradierProvider:
         """Generic GET with error handling."""
         url = f"{self.base_url}{path}"
         try:
-            async with httpx.AsyncClient(timeout=_TIMEOUT) as client:
+            async with http_pool.session(timeout=_TIMEOUT) as client:
                 resp = await client.get(url, headers=self._headers(), params=params or {})
             if resp.status_code == 200:
                 return resp.json()
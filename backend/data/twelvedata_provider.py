@@ -1,7 +1,7 @@
 import time
-import threading
-import requests
+import httpx
 from datetime import datetime, timedelta
+from data import http_pool
 
 try:
     from langsmith import traceable
@@ -19,22 +19,21 @@ class TwelveDataProvider:
     def __init__(self, api_key: str):
         self.api_key = api_key
         self.base_url = "https://api.twelvedata.com"
-        self._rate_lock = threading.Lock()
         self._call_times = []
         self._max_per_minute = 8
 
     @traceable(name="check_rate_limit")
     def _check_rate_limit(self) -> bool:
-        with self._rate_lock:
-            now = time.time()
-            self._call_times = [t for t in self._call_times if now - t < 60]
-            if len(self._call_times) >= self._max_per_minute:
-                return False
-            self._call_times.append(now)
-            return True
+        # Synchronous, so check-and-record is atomic on the event loop
+        now = time.time()
+        self._call_times = [t for t in self._call_times if now - t < 60]
+        if len(self._call_times) >= self._max_per_minute:
+            return False
+        self._call_times.append(now)
+        return True
 
     @traceable(name="get_daily_bars")
-    def get_daily_bars(self, symbol: str, days: int = 120) -> list:
+    async def get_daily_bars(self, symbol: str, days: int = 120) -> list:
         symbol = symbol.upper()
 
         if not self._check_rate_limit():
@@ -42,16 +41,16 @@ class TwelveDataProvider:
             return {"error": "rate_limited", "status": 429}
 
         try:
-            resp = requests.get(
-                f"{self.base_url}/time_series",
-                params={
-                    "symbol": symbol,
-                    "interval": "1day",
-                    "outputsize": str(days),
-                    "apikey": self.api_key,
-                },
-                timeout=10,
-            )
+            async with http_pool.session(timeout=10) as client:
+                resp = await client.get(
+                    f"{self.base_url}/time_series",
+                    params={
+                        "symbol": symbol,
+                        "interval": "1day",
+                        "outputsize": str(days),
+                        "apikey": self.api_key,
+                    },
+                )
 
             if resp.status_code == 401:
                 print(f"[TwelveData] 401 auth error for {symbol}")
@@ -101,7 +100,7 @@ class TwelveDataProvider:
 
             return bars
 
-        except requests.exceptions.Timeout:
+        except httpx.TimeoutException:
             print(f"[TwelveData] Timeout for {symbol}")
             return []
         except Exception as e:
@@ -10,6 +10,7 @@ This is an OpenAI-compatible API — xAI uses the same interface.
 
 import json
 import httpx
+from data import http_pool
 import asyncio
 import re
 
@@ -788,7 +789,7 @@ Be specific and opinionated — generic blue chips like AAPL or MSFT only if the
         print(f"[XAI] Calling {model} (raw_mode={raw_mode}, x_search_config={x_search_opts}{ctx_tag})")
 
         try:
-            async with httpx.AsyncClient(timeout=timeout) as client:
+            async with http_pool.session(timeout=timeout) as client:
                 response = await client.post(
                     f"{self.BASE_URL}/responses",
                     headers=self.headers,
@@ -39,8 +39,13 @@ from urllib.parse import urlparse, unquote
 
 # ── Hyperliquid Screener service ──────────────────────────────────────────────
 from services.hyperliquid.state import HyperliquidState as _HLState
-from services.hyperliquid.router import router as _hl_router, set_state as _hl_set_state
+from services.hyperliquid.router import (
+    router as _hl_router,
+    set_state as _hl_set_state,
+    current_state as _hl_current_state,
+)
 from services.hyperliquid.websocket_manager import boot_and_run as _hl_boot_and_run
+from services.hyperliquid.shared_state import SHARED_STATE_ENABLED as _HL_SHARED, run_shared as _hl_run_shared
 from services.sector_rotation.router import router as _sr_router
 from services.insider_activity_service import (
     router as _insider_router,
@@ -174,6 +179,11 @@ async def lifespan(app):
     except Exception as _e:
         print(f"[STARTUP] Storage diagnostic error: {_e}")
 
+    # Response cache L2 (CACHE_L2): start from what other workers / the
+    # previous process already fetched
+    from data.cache import cache as _response_cache
+    await asyncio.to_thread(_response_cache.warm_l2)
+
     import threading
     threading.Thread(target=_do_init, daemon=True).start()
     asyncio.create_task(_briefing_precompute_loop())
@@ -186,7 +196,11 @@ async def lifespan(app):
     asyncio.create_task(_sector_rotation_precompute_loop())
     asyncio.create_task(_insider_bg_loop())
     asyncio.create_task(_cong_bg_loop())
-    asyncio.create_task(_hl_boot_and_run(_hl_state))
+    if _HL_SHARED:
+        # One elected worker ingests; the others serve its published state
+        asyncio.create_task(_hl_run_shared(_hl_state, _hl_set_state))
+    else:
+        asyncio.create_task(_hl_boot_and_run(_hl_state))
     try:
         _whale_create_tables()
         asyncio.create_task(_seed_whales())
@@ -199,6 +213,10 @@ async def lifespan(app):
     except Exception as _e:
         print(f"[STARTUP] Bittensor refresh task error: {_e}")
     yield
+    # Pooled per-host HTTP clients shared by every provider (data/http_pool.py)
+    from data import http_pool
+    await http_pool.close_all()
+    await asyncio.to_thread(_response_cache.flush_l2)
 
 app = FastAPI(title="Trading Agent API", lifespan=lifespan)
 
@@ -513,7 +531,7 @@ async def _briefing_precompute_loop():
                 data_service.finviz.get_rsi_recovery(),
                 data_service.finviz.get_accumulation_stocks(),
                 data_service.stocktwits.get_trending(),
-                asyncio.to_thread(data_service.finnhub.get_upcoming_earnings),
+                data_service.finnhub.get_upcoming_earnings(),
             ]
             # News: prefer web_search (Perplexity→Brave→Tavily), FMP free tier is slow/unreliable
             if data_service.web_search:
@@ -878,6 +896,7 @@ async def ping():
 @app.get("/health")
 @traceable(name="main.health")
 async def health():
+    hl = _hl_current_state() or _hl_state
     return {
         "status": "ok" if _init_done else ("init_failed" if _init_error else "starting"),
         "code_version": "2026-03-08-v4-no-auth",
@@ -885,6 +904,11 @@ async def health():
         "init_error": _init_error,
         "agent_loaded": agent is not None,
         "data_service_loaded": data_service is not None,
+        "hyperliquid": {
+            "readiness": hl.readiness(),
+            "stale": hl.is_stale,
+            "ready_after_s": hl.boot_report()["ready_after_s"],
+        },
     }
 
 
@@ -1145,6 +1169,7 @@ async def polymarket_events_proxy(request: Request):
     always shows live, actionable markets only.
     """
     import httpx
+    from data import http_pool
     from datetime import datetime, timezone
 
     params = dict(request.query_params)
@@ -1197,7 +1222,7 @@ async def polymarket_events_proxy(request: Request):
 
     print(f"[POLYMARKET_PROXY] Fetching {url} params={params}")
     try:
-        async with httpx.AsyncClient(timeout=15.0, follow_redirects=True) as client:
+        async with http_pool.session(timeout=15.0, follow_redirects=True) as client:
             resp = await client.get(url, params=params, headers=headers)
             print(f"[POLYMARKET_PROXY] Response status={resp.status_code} len={len(resp.content)}")
             resp.raise_for_status()
@@ -1325,10 +1350,7 @@ async def notifai_weekly_summary(request: Request, force: bool = False):
     friday = (week_start + timedelta(days=4)).strftime("%Y-%m-%d")
     try:
         raw = await asyncio.wait_for(
-            asyncio.to_thread(
-                agent.data.finnhub.client.earnings_calendar,
-                _from=monday, to=friday, symbol=None,
-            ),
+            agent.data.finnhub.client.earnings_calendar(_from=monday, to=friday, symbol=None),
             timeout=10.0,
         )
         for e in (raw.get("earningsCalendar") or []):
@@ -1497,10 +1519,7 @@ async def notifai_the_brief(request: Request):
     earnings_by_day: dict = {}
     try:
         raw = await asyncio.wait_for(
-            asyncio.to_thread(
-                agent.data.finnhub.client.earnings_calendar,
-                _from=monday, to=friday, symbol=None,
-            ),
+            agent.data.finnhub.client.earnings_calendar(_from=monday, to=friday, symbol=None),
             timeout=10.0,
         )
         for e in (raw.get("earningsCalendar") or []):
@@ -1578,12 +1597,7 @@ async def earnings_calendar(request: Request, from_date: str = "", to_date: str
 
     try:
         data = await asyncio.wait_for(
-            asyncio.to_thread(
-                agent.data.finnhub.client.earnings_calendar,
-                _from=from_date,
-                to=to_date,
-                symbol=None,
-            ),
+            agent.data.finnhub.client.earnings_calendar(_from=from_date, to=to_date, symbol=None),
             timeout=10.0,
         )
         earnings = data.get("earningsCalendar", [])
@@ -1825,7 +1839,7 @@ async def earnings_detail(request: Request, ticker: str = ""):
     company_name = ""
     try:
         profile = await asyncio.wait_for(
-            asyncio.to_thread(agent.data.finnhub.get_company_profile, ticker),
+            agent.data.finnhub.get_company_profile(ticker),
             timeout=4.0,
         )
         if isinstance(profile, dict):
@@ -1840,7 +1854,7 @@ async def earnings_detail(request: Request, ticker: str = ""):
     # Finnhub: earnings surprises (past 4 quarters)
     try:
         tasks["earnings_history"] = asyncio.wait_for(
-            asyncio.to_thread(agent.data.finnhub.get_earnings_surprises, ticker),
+            agent.data.finnhub.get_earnings_surprises(ticker),
             timeout=6.0,
         )
     except Exception:
@@ -1849,7 +1863,7 @@ async def earnings_detail(request: Request, ticker: str = ""):
     # Finnhub: upcoming earnings for this ticker
     try:
         tasks["earnings_upcoming"] = asyncio.wait_for(
-            asyncio.to_thread(agent.data.finnhub.get_earnings_calendar, ticker),
+            agent.data.finnhub.get_earnings_calendar(ticker),
             timeout=6.0,
         )
     except Exception:
@@ -1858,7 +1872,7 @@ async def earnings_detail(request: Request, ticker: str = ""):
     # Finnhub: analyst recommendations
     try:
         tasks["analyst_recommendations"] = asyncio.wait_for(
-            asyncio.to_thread(agent.data.finnhub.get_recommendation_trends, ticker),
+            agent.data.finnhub.get_recommendation_trends(ticker),
             timeout=5.0,
         )
     except Exception:
@@ -1867,7 +1881,7 @@ async def earnings_detail(request: Request, ticker: str = ""):
     # Finnhub: quote for current price
     try:
         tasks["quote"] = asyncio.wait_for(
-            asyncio.to_thread(agent.data.finnhub.get_quote, ticker),
+            agent.data.finnhub.get_quote(ticker),
             timeout=4.0,
         )
     except Exception:
@@ -1876,7 +1890,7 @@ async def earnings_detail(request: Request, ticker: str = ""):
     # Finnhub: company-specific news (guaranteed relevant to this ticker)
     try:
         tasks["company_news"] = asyncio.wait_for(
-            asyncio.to_thread(agent.data.finnhub.get_company_news, ticker),
+            agent.data.finnhub.get_company_news(ticker),
             timeout=8.0,
         )
     except Exception:
@@ -3350,7 +3364,7 @@ async def get_history(request: Request):
         @traceable(name="fetch")
         async def _fetch(ticker):
             try:
-                quote = await _aio.to_thread(data_service.finnhub.get_quote, ticker)
+                quote = await data_service.finnhub.get_quote(ticker)
                 return ticker, quote.get("price")
             except Exception:
                 return ticker, None
@@ -3473,7 +3487,7 @@ async def history_backtest_summary(request: Request):
     @traceable(name="fetch_price")
     async def _fetch_price(ticker: str) -> tuple:
         try:
-            quote = await _aio.to_thread(data_service.finnhub.get_quote, ticker)
+            quote = await data_service.finnhub.get_quote(ticker)
             return ticker, quote.get("price")
         except Exception:
             return ticker, None
@@ -3590,9 +3604,9 @@ async def backtest_recommendations(request: Request, body: BacktestRequest, _sub
     import anthropic
 
     results = []
-    for item in body.items:
+    quotes = await asyncio.gather(*[data_service.finnhub.get_quote(item.ticker.upper()) for item in body.items])
+    for item, quote in zip(body.items, quotes):
         ticker = item.ticker.upper()
-        quote = data_service.finnhub.get_quote(ticker)
         current_price = quote.get("price")
         if current_price and current_price > 0:
             pct_change = round(((current_price - item.recommended_price) / item.recommended_price) * 100, 2)
@@ -3737,6 +3751,13 @@ async def health_budget(request: Request):
     return daily_budget.status()
 
 
+@app.get("/api/health/cache")
+async def health_cache(request: Request):
+    """Response cache size and hit/miss/eviction counters per namespace."""
+    from data.cache import cache
+    return cache.stats()
+
+
 # ============================================================
 # Portfolio Holdings CRUD
 # ============================================================
@@ -3817,14 +3838,14 @@ COINGECKO_COIN_LIST_TTL = 86400
 @traceable(name="main.get_coingecko_symbol_map")
 async def get_coingecko_symbol_map() -> dict:
     """Fetch CoinGecko's full coin list and build symbol->id mapping. Cached 24h."""
-    import httpx
+    from data import http_pool
     from data.cache import cache as _c
     cached = _c.get("cg:coin_list")
     if cached is not None:
         return cached
 
     try:
-        async with httpx.AsyncClient(timeout=15.0) as client:
+        async with http_pool.session(timeout=15.0) as client:
             resp = await client.get("https://api.coingecko.com/api/v3/coins/list")
 
         if resp.status_code != 200:
@@ -3852,7 +3873,7 @@ async def get_coingecko_symbol_map() -> dict:
 @traceable(name="main.get_portfolio_quotes")
 async def get_portfolio_quotes(request: Request, api_key: str = Header(None, alias="X-API-Key")):
     """Get current quotes — stocks via FMP, crypto via dynamic CoinGecko lookup, commodities via FMP."""
-    import httpx
+    from data import http_pool
     import asyncio
 
     if not _jwt_or_key(request, api_key):
@@ -3903,7 +3924,7 @@ async def get_portfolio_quotes(request: Request, api_key: str = Header(None, ali
         "HYPE": "hyperliquid",
     }
 
-    async with httpx.AsyncClient(timeout=10.0) as client:
+    async with http_pool.session(timeout=10.0) as client:
         # ---- STOCKS: Finnhub primary → Yahoo fallback → FMP last resort ----
         if stock_tickers:
             async def _finnhub_quote(sym):
@@ -3922,7 +3943,7 @@ async def get_portfolio_quotes(request: Request, api_key: str = Header(None, ali
 
             async def _finnhub_profile(sym):
                 sector_cache_key = f"sector:{sym}"
-                cached = _cache.get(sector_cache_key)
+                cached = await _cache.get_async(sector_cache_key)
                 if cached is not None:
                     return sym, cached
                 try:
@@ -4059,9 +4080,9 @@ async def get_portfolio_quotes(request: Request, api_key: str = Header(None, ali
                 print(f"[PORTFOLIO] Fetching sector via FMP /stable/profile for: {stocks_needing_sector}")
                 # Resolve cached sectors first
                 _uncached_sector_tickers = []
-                for ticker in stocks_needing_sector:
-                    sector_cache_key = f"sector:{ticker}"
-                    cached_sector = _cache.get(sector_cache_key)
+                cached_sectors = await asyncio.gather(
+                    *[_cache.get_async(f"sector:{t}") for t in stocks_needing_sector])
+                for ticker, cached_sector in zip(stocks_needing_sector, cached_sectors):
                     if cached_sector is not None:
                         quotes[ticker]["sector"] = cached_sector.get("sector", "Other")
                         quotes[ticker]["industry"] = cached_sector.get("industry", "")
@@ -4482,7 +4503,7 @@ async def caelyn_terminal(
 @traceable(name="main.get_portfolio_events")
 async def get_portfolio_events(request: Request, api_key: str = Header(None, alias="X-API-Key")):
     """Get upcoming earnings and dividend dates for portfolio holdings."""
-    import httpx
+    from data import http_pool
     from datetime import datetime, timedelta
 
     user_id = getattr(request.state, "user_id", "default")
@@ -4506,7 +4527,7 @@ async def get_portfolio_events(request: Request, api_key: str = Header(None, ali
     errors = []
 
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
+        async with http_pool.session(timeout=10.0) as client:
             resp = await client.get(
                 "https://financialmodelingprep.com/stable/earnings-calendar",
                 params={"from": today, "to": future, "apikey": FMP_API_KEY},
@@ -4527,7 +4548,7 @@ async def get_portfolio_events(request: Request, api_key: str = Header(None, ali
         errors.append(f"earnings_calendar: {str(e)}")
 
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
+        async with http_pool.session(timeout=10.0) as client:
             resp = await client.get(
                 "https://financialmodelingprep.com/stable/dividends-calendar",
                 params={"from": today, "to": future, "apikey": FMP_API_KEY},
@@ -4654,7 +4675,7 @@ async def review_portfolio(request: Request, api_key: str = Header(None, alias="
                 elif proxy_etf:
                     try:
                         tasks["quote"] = asyncio.wait_for(
-                            asyncio.to_thread(agent.data.finnhub.get_quote, proxy_etf), timeout=4.0)
+                            agent.data.finnhub.get_quote(proxy_etf), timeout=4.0)
                     except Exception:
                         pass
                     try:
@@ -4665,7 +4686,7 @@ async def review_portfolio(request: Request, api_key: str = Header(None, alias="
             else:
                 try:
                     tasks["quote"] = asyncio.wait_for(
-                        asyncio.to_thread(agent.data.finnhub.get_quote, ticker), timeout=4.0)
+                        agent.data.finnhub.get_quote(ticker), timeout=4.0)
                 except Exception:
                     pass
 
@@ -5254,7 +5275,7 @@ async def options_dashboard(
 
     # ── Stale-while-revalidate: serve last-known-good immediately, refresh in background ─
     lkg_key = _options_lkg_cache_key(tab)
-    lkg = cache.get(lkg_key)
+    lkg = await cache.get_async(lkg_key)
 
     prefilter_key = _options_prefilter_cache_key(tab)
     prefilter_snapshot = cache.get(prefilter_key)
@@ -0,0 +1,100 @@
+"""
+Hyperliquid candle storage benchmark — deque of raw dicts vs CandleRing.
+
+  refresh — a REST refresh of the last 50 bars into a full series (200 bars);
+            the dict path rebuilds its timestamp set and skips existing bars,
+            the ring upserts by open time
+  live    — one forming-bar WS update
+  read    — the columns one feature pass pulls from a 120-bar 1h window
+            (closes, highs, lows, opens, volumes; see feature_engine)
+
+Run:  python scripts/bench_hl_candles.py [--series 600] [--repeat 20]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from collections import deque
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from services.hyperliquid.candles import CLOSE, HIGH, LOW, OPEN, VOLUME, CandleRing, parse_candles, present
+
+_N_BARS = 200
+_HOUR_MS = 3_600_000
+
+
+def _bars(n: int, start: int = 0) -> list[dict]:
+    return [{"t": (start + i) * _HOUR_MS, "T": (start + i + 1) * _HOUR_MS - 1, "s": "BTC", "i": "1h",
+             "o": "101.5", "h": "102.25", "l": "100.75", "c": f"{101 + i % 7 / 4:.2f}", "v": "1234.5", "n": 321}
+            for i in range(n)]
+
+
+# The pre-CandleRing storage, kept here as the reference
+def _dict_add(dq: deque, candles: list[dict]):
+    existing_ts = {c["t"] for c in dq}
+    for c in sorted(candles, key=lambda x: x.get("t", 0)):
+        if c.get("t") not in existing_ts:
+            dq.append(c)
+            existing_ts.add(c["t"])
+
+
+def _dict_upsert(dq: deque, candle: dict):
+    if dq and dq[-1].get("t") == candle.get("t"):
+        dq[-1] = candle
+    else:
+        dq.append(candle)
+
+
+def _dict_read(dq: deque) -> list[list[float]]:
+    bars = list(dq)[-120:]
+    return [[float(c["c"]) for c in bars[-48:] if c.get("c")]] + \
+           [[float(c[k]) for c in bars if c.get(k)] for k in ("v", "c", "h", "l", "o")]
+
+
+def _ring_read(ring: CandleRing) -> list[list[float]]:
+    bars = ring.window(120)
+    return [present(bars[-48:, CLOSE])] + [present(bars[:, j]) for j in (VOLUME, CLOSE, HIGH, LOW, OPEN)]
+
+
+def _us(fn, repeat: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - t0) / repeat * 1e6
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--series", type=int, default=600, help="(coin, interval) series")
+    ap.add_argument("--repeat", type=int, default=20)
+    args = ap.parse_args()
+
+    history = _bars(_N_BARS)
+    refresh = history[-50:]
+    forming = dict(history[-1], c="999.5")
+    dicts = [deque(history, maxlen=_N_BARS) for _ in range(args.series)]
+    rings = [CandleRing(_N_BARS) for _ in range(args.series)]
+    for ring in rings:
+        ring.upsert(parse_candles(history))
+
+    results = {
+        "refresh": (_us(lambda: [_dict_add(dq, refresh) for dq in dicts], args.repeat),
+                    _us(lambda: [r.upsert(parse_candles(refresh)) for r in rings], args.repeat)),
+        "live":    (_us(lambda: [_dict_upsert(dq, forming) for dq in dicts], args.repeat),
+                    _us(lambda: [r.upsert(parse_candles([forming])) for r in rings], args.repeat)),
+        "read":    (_us(lambda: [_dict_read(dq) for dq in dicts], args.repeat),
+                    _us(lambda: [_ring_read(r) for r in rings], args.repeat)),
+    }
+
+    print(f"\nCandle storage, {args.series} series × {_N_BARS} bars (µs per pass over all series)")
+    print(f"  {'op':<10}{'dicts':>12}{'ring':>12}{'speedup':>10}")
+    for name, (old, new) in results.items():
+        print(f"  {name:<10}{old:>12.0f}{new:>12.0f}{old / new:>9.1f}×")
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""
+Hyperliquid JSON codec benchmark — WS frame decode + screener response encode.
+
+  decode — Hyperliquid WS frames (allMids / bbo / l2Book / trades /
+           activeAssetCtx), json.loads vs every codec backend
+  encode — a real get_snapshot payload (synthetic universe pushed through
+           the normal boot → feature pass → router path), comparing
+             fastapi  — jsonable_encoder + Starlette JSONResponse (the old path)
+             <codec>  — FastJSONResponse.render per available backend
+           and the frontend WS snapshot frame (send_json vs codec.dumps_str)
+
+Pass --frames path.jsonl to replay recorded raw frames (one WS message per
+line) instead of the synthetic mix.
+
+Run:  python scripts/bench_hl_codec.py [--assets 300] [--frames recorded.jsonl]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from services.hyperliquid import codec, router
+from services.hyperliquid.feature_engine import run_full_feature_pass
+from services.hyperliquid.normalizer import build_perp_universe
+from services.hyperliquid.state import HyperliquidState
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Inputs
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _synthetic_frames(coins: list[str], n: int, rng: random.Random) -> list[str]:
+    def px():
+        return f"{rng.uniform(0.01, 60_000):.6g}"
+
+    def level():
+        return {"px": px(), "sz": f"{rng.uniform(0.1, 500):.4f}", "n": rng.randint(1, 20)}
+
+    frames = []
+    for i in range(n):
+        kind = i % 10
+        coin = rng.choice(coins)
+        if kind == 0:
+            msg = {"channel": "allMids", "data": {"mids": {c: px() for c in coins}}}
+        elif kind in (1, 2, 3, 4):
+            msg = {"channel": "bbo", "data": {"coin": coin, "time": 1_700_000_000_000 + i,
+                                               "bbo": [level(), level()]}}
+        elif kind in (5, 6):
+            msg = {"channel": "l2Book", "data": {"coin": coin, "time": 1_700_000_000_000 + i,
+                                                  "levels": [[level() for _ in range(20)],
+                                                             [level() for _ in range(20)]]}}
+        elif kind in (7, 8):
+            msg = {"channel": "trades", "data": [
+                {"coin": coin, "side": rng.choice("AB"), "px": px(), "sz": f"{rng.uniform(0.01, 50):.4f}",
+                 "time": 1_700_000_000_000 + i, "hash": "0x" + "ab" * 32, "tid": rng.randint(1, 10**15)}
+                for _ in range(rng.randint(1, 8))
+            ]}
+        else:
+            msg = {"channel": "activeAssetCtx", "data": {"coin": coin, "ctx": {
+                "funding": "0.0000125", "openInterest": "1234.5", "prevDayPx": px(), "dayNtlVlm": "98765432.1",
+                "premium": "0.0001", "oraclePx": px(), "markPx": px(), "midPx": px(),
+                "impactPxs": [px(), px()], "dayBaseVlm": "4567.8"}}}
+        frames.append(json.dumps(msg, separators=(",", ":")))
+    return frames
+
+
+def _snapshot_state(n_assets: int, rng: random.Random) -> HyperliquidState:
+    uni = {"universe": [{"name": f"C{i}", "szDecimals": 2, "maxLeverage": 20} for i in range(n_assets)]}
+    ctxs = []
+    for _ in range(n_assets):
+        p = rng.uniform(0.01, 60_000)
+        ctxs.append({
+            "markPx": str(p), "oraclePx": str(p * 1.0004), "midPx": str(p), "prevDayPx": str(p * 0.97),
+            "funding": str(rng.uniform(-1e-4, 1e-4)), "openInterest": str(rng.uniform(1e3, 1e6)),
+            "dayNtlVlm": str(rng.uniform(1e5, 1e9)), "premium": "0.0001",
+            "impactPxs": [str(p * 0.999), str(p * 1.001)], "dayBaseVlm": "1000",
+        })
+    state = HyperliquidState()
+    for coin, asset in build_perp_universe([uni, ctxs]).items():
+        state.assets[coin] = asset
+    state.universe_allowlist = set(state.assets)
+    for coin in list(state.assets):
+        c = 1.0
+        bars = []
+        for i in range(60):
+            o, c = c, c * rng.uniform(0.98, 1.02)
+            bars.append({"t": i * 3_600_000, "o": str(o), "h": str(max(o, c) * 1.01),
+                         "l": str(min(o, c) * 0.99), "c": str(c), "v": str(rng.uniform(1, 100))})
+        state.add_candles(coin, "1h", bars)
+        state.add_candles(coin, "5m", bars[-30:])
+    run_full_feature_pass(state)
+    state.is_ready = True
+    return state
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Runner
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _per_call_us(fn, arg, repeat: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn(arg)
+    return (time.perf_counter() - t0) / repeat * 1e6
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--assets", type=int, default=300)
+    ap.add_argument("--frames", help="JSONL file of recorded raw WS frames")
+    ap.add_argument("--n-frames", type=int, default=5000)
+    ap.add_argument("--repeat", type=int, default=50)
+    args = ap.parse_args()
+
+    rng = random.Random(5)
+    coins = [f"C{i}" for i in range(args.assets)]
+    if args.frames:
+        with open(args.frames) as f:
+            frames = [line.rstrip("\n") for line in f if line.strip()]
+    else:
+        frames = _synthetic_frames(coins, args.n_frames, rng)
+    frame_bytes = sum(len(f) for f in frames)
+
+    backends = codec.available_backends()
+
+    # ── decode ────────────────────────────────────────────────────────────
+    print(f"\nDecode: {len(frames)} WS frames, {frame_bytes / 1024:.0f} KiB")
+    print(f"  {'backend':<10}{'µs/frame':>10}{'MB/s':>10}")
+    for name in backends:
+        codec.use_backend(name)
+        t0 = time.perf_counter()
+        for raw in frames:
+            codec.loads(raw)
+        el = time.perf_counter() - t0
+        print(f"  {name:<10}{el / len(frames) * 1e6:>10.2f}{frame_bytes / el / 1e6:>10.1f}")
+
+    # ── encode ────────────────────────────────────────────────────────────
+    state = _snapshot_state(args.assets, rng)
+    router.set_state(state)
+    resp = asyncio.run(router.get_snapshot(limit=args.assets))
+    payload = json.loads(resp.body)
+    ws_rows = router._ws_rows()
+    ws_frame = {"event": "snapshot_ready", "seq": 0,
+                "data": {"rows": ws_rows, "meta": router._build_meta(ws_rows, state)}, "ts": time.time()}
+
+    def _fastapi_render(p):
+        return JSONResponse(jsonable_encoder(p)).body
+
+    reference = json.loads(_fastapi_render(payload))
+    print(f"\nEncode: get_snapshot payload, {len(payload['rows'])} rows, "
+          f"{len(_fastapi_render(payload)) / 1024:.0f} KiB")
+    print(f"  {'path':<10}{'/snapshot µs':>14}{'ws frame µs':>14}{'same':>7}")
+    base = _per_call_us(_fastapi_render, payload, args.repeat)
+    ws_base = _per_call_us(lambda p: json.dumps(p, separators=(",", ":")), ws_frame, args.repeat)
+    print(f"  {'fastapi':<10}{base:>14.0f}{ws_base:>14.0f}{'—':>7}")
+    for name in backends:
+        codec.use_backend(name)
+        us = _per_call_us(lambda p: codec.FastJSONResponse(p).body, payload, args.repeat)
+        ws_us = _per_call_us(codec.dumps_str, ws_frame, args.repeat)
+        same = json.loads(codec.FastJSONResponse(payload).body) == reference
+        print(f"  {name:<10}{us:>14.0f}{ws_us:>14.0f}{'yes' if same else 'NO':>7}   ({base / us:.1f}× vs fastapi)")
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+Hyperliquid cross-sectional ranking benchmark — scalar vs vectorized.
+
+Times the universe percentile ranks (volume, OI, |funding|, volatility) and
+the five ranking-mode composites over synthetic universes:
+  before — per-asset "count strictly below" scans + per-asset weighted sums
+           (the O(n²) logic compute_universe_ranks / rank_assets used to run)
+  after  — cross_section.universe_percentiles + mode_composites
+
+The scalar percentile path is quadratic; above --scalar-max assets it is
+timed on a fixed sample of queries against the full population and scaled
+up (marked "est.").  Every run also checks both paths agree on the sample.
+
+Run:  python scripts/bench_hl_cross_section.py [--sizes 500 5000 50000]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from services.hyperliquid.cross_section import mode_composites, universe_percentiles
+from services.hyperliquid.models import ScreenerAsset
+from services.hyperliquid.ranking_engine import _MODE_WEIGHTS
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Synthetic universe
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _make_assets(n: int, rng: random.Random) -> list[ScreenerAsset]:
+    return [
+        ScreenerAsset(
+            coin=f"C{i:05d}", display_name=f"C{i:05d}",
+            day_ntl_vlm=rng.lognormvariate(15, 2),
+            open_interest_usd=rng.lognormvariate(14, 2) if rng.random() > 0.05 else None,
+            funding=rng.uniform(-5e-4, 5e-4),
+            realized_volatility_medium=rng.uniform(5, 250) if rng.random() > 0.2 else None,
+            momentum_score=rng.uniform(0, 100),
+            flow_score=rng.uniform(0, 100),
+            breakout_score=rng.uniform(0, 100),
+            mean_reversion_score=rng.uniform(0, 100),
+            liquidity_score=rng.uniform(0, 100),
+            volatility_score=rng.uniform(0, 100),
+        )
+        for i in range(n)
+    ]
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# "before": scalar logic (verbatim from the pre-vectorized engine)
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _percentile_rank(value: float, population: list[float]) -> float:
+    if not population:
+        return 0.5
+    below = sum(1 for v in population if v < value)
+    return below / len(population)
+
+
+def _scalar_percentiles(perps: list[ScreenerAsset], queries: list[ScreenerAsset]) -> list[dict]:
+    vlm_pop  = [a.day_ntl_vlm         for a in perps if a.day_ntl_vlm         is not None]
+    oi_pop   = [a.open_interest_usd   for a in perps if a.open_interest_usd   is not None]
+    fund_pop = [abs(a.funding or 0)   for a in perps]
+    vol_pop  = [a.realized_volatility_medium for a in perps if a.realized_volatility_medium is not None]
+    out = []
+    for asset in queries:
+        updates: dict = {}
+        if asset.day_ntl_vlm is not None and vlm_pop:
+            updates["volume_percentile"] = round(_percentile_rank(asset.day_ntl_vlm, vlm_pop), 3)
+        if asset.open_interest_usd is not None and oi_pop:
+            updates["oi_percentile"] = round(_percentile_rank(asset.open_interest_usd, oi_pop), 3)
+        if asset.funding is not None and fund_pop:
+            updates["funding_percentile"] = round(_percentile_rank(abs(asset.funding), fund_pop), 3)
+        if asset.realized_volatility_medium is not None and vol_pop:
+            updates["volatility_percentile"] = round(_percentile_rank(asset.realized_volatility_medium, vol_pop), 3)
+        out.append(updates)
+    return out
+
+
+def _scalar_composites(assets: list[ScreenerAsset]) -> dict[str, list[float]]:
+    out = {}
+    for mode, weights in _MODE_WEIGHTS.items():
+        scores = []
+        for asset in assets:
+            total = 0.0
+            for field, w in weights.items():
+                total += (getattr(asset, field, None) or 50.0) * w
+            scores.append(max(0.0, min(100.0, total)))
+        out[mode] = scores
+    return out
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Runner
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _timed(fn, *args):
+    t0 = time.perf_counter()
+    result = fn(*args)
+    return result, (time.perf_counter() - t0) * 1000
+
+
+def _run(n: int, scalar_max: int, sample: int, rng: random.Random) -> dict:
+    assets = _make_assets(n, rng)
+
+    queries = assets if n <= scalar_max else rng.sample(assets, sample)
+    scalar_pct, t_pct = _timed(_scalar_percentiles, assets, queries)
+    if queries is not assets:
+        t_pct *= n / len(queries)
+    scalar_comp, t_comp = _timed(_scalar_composites, assets)
+
+    vec_pct, v_pct = _timed(universe_percentiles, assets)
+    vec_comp, v_comp = _timed(mode_composites, assets, _MODE_WEIGHTS)
+
+    # Agreement on the queried sample
+    index = {a.coin: i for i, a in enumerate(assets)}
+    mismatches = 0
+    for asset, expected in zip(queries, scalar_pct):
+        i = index[asset.coin]
+        got = {f: vals[i] for f, vals in vec_pct.items() if vals[i] is not None}
+        mismatches += got != expected
+    for mode, scores in scalar_comp.items():
+        mismatches += vec_comp[mode].tolist() != scores
+
+    return {
+        "n": n,
+        "estimated": queries is not assets,
+        "before_ms": t_pct + t_comp,
+        "after_ms": v_pct + v_comp,
+        "mismatches": mismatches,
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", type=int, nargs="+", default=[500, 5000, 50000])
+    ap.add_argument("--scalar-max", type=int, default=5000,
+                    help="largest universe timed with the full O(n²) scalar path")
+    ap.add_argument("--sample", type=int, default=500,
+                    help="query sample for estimating the scalar path above --scalar-max")
+    args = ap.parse_args()
+
+    rng = random.Random(11)
+    print(f"\n  {'assets':>8}{'before ms':>14}{'after ms':>12}{'speedup':>10}{'mismatches':>12}")
+    for n in args.sizes:
+        r = _run(n, args.scalar_max, args.sample, rng)
+        before = f"{r['before_ms']:.1f}" + (" est." if r["estimated"] else "")
+        print(f"  {r['n']:>8}{before:>14}{r['after_ms']:>12.1f}"
+              f"{r['before_ms'] / r['after_ms']:>9.0f}×{r['mismatches']:>12}")
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+"""
+Hyperliquid replay benchmark — recorded stream through the live pipeline.
+
+Replays a capture (HL_RECORD_PATH=... on a live process, see recorder.py)
+as fast as possible through boot, the WS applier and the incremental
+feature pass (replay.py), requesting /snapshot after every applied batch,
+and reports:
+
+  msgs/s            sustained applier throughput (frames / time in _apply_batch)
+  feature pass      incremental pass latency p50 / p99 (ms)
+  /snapshot         request latency p50 / p99 (ms), through the router, with
+                    view staleness off (every request renders the new generation)
+
+--synthetic writes a generated capture first, so the suite runs without a
+recording.  --save stores the results as JSON; --baseline compares against
+a saved run and exits 1 when a metric is worse by more than --tolerance,
+so regressions in feature_engine.py / normalizer.py fail before deploy.
+
+Run:  python scripts/bench_hl_replay.py CAPTURE.jsonl.gz [--speed 0] [--save out.json]
+      python scripts/bench_hl_replay.py --synthetic [--assets 300] [--seconds 60] [--baseline out.json]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from services.hyperliquid import codec, router
+from services.hyperliquid.recorder import StreamRecorder
+from services.hyperliquid.replay import replay
+from services.hyperliquid.state import HyperliquidState
+
+# metric → True when higher is better
+_METRICS = {
+    "msgs_per_s":         True,
+    "feature_pass_p50_ms": False,
+    "feature_pass_p99_ms": False,
+    "snapshot_p50_ms":     False,
+    "snapshot_p99_ms":     False,
+}
+
+_INTERVAL_MS = {"1h": 3_600_000, "5m": 300_000, "1d": 86_400_000}
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Synthetic capture
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _bars(interval: str, n: int, px: float, end_ms: float, rng: random.Random) -> list[dict]:
+    step = _INTERVAL_MS[interval]
+    first = int(end_ms // step) - n + 1
+    out = []
+    for i in range(n):
+        o, px = px, px * rng.uniform(0.98, 1.02)
+        t = (first + i) * step
+        out.append({"t": t, "T": t + step - 1, "o": str(o), "h": str(max(o, px) * 1.005),
+                    "l": str(min(o, px) * 0.995), "c": str(px), "v": str(rng.uniform(1, 1000)), "n": 10})
+    return out
+
+
+def write_synthetic(path: str, n_assets: int, seconds: float, rng: random.Random):
+    """A capture with a perp universe, boot candles / books and `seconds` of WS traffic."""
+    rec = StreamRecorder(path)
+    coins = [f"C{i}" for i in range(n_assets)]
+    px = {c: rng.uniform(0.01, 60_000) for c in coins}
+    now = time.time()
+    start = now - seconds
+
+    uni = {"universe": [{"name": c, "szDecimals": 2, "maxLeverage": 20} for c in coins]}
+    ctxs = [{
+        "markPx": str(px[c]), "oraclePx": str(px[c] * 1.0004), "midPx": str(px[c]), "prevDayPx": str(px[c] * 0.97),
+        "funding": str(rng.uniform(-1e-4, 1e-4)), "openInterest": str(rng.uniform(1e3, 1e6)),
+        "dayNtlVlm": str(rng.uniform(1e5, 1e9)), "premium": "0.0001",
+        "impactPxs": [str(px[c] * 0.999), str(px[c] * 1.001)], "dayBaseVlm": "1000",
+    } for c in coins]
+    rec.rest("get_meta_and_asset_ctxs", [uni, ctxs], args=[])
+    rec.rest("get_spot_meta_and_asset_ctxs", [], args=[])
+    rec.rest("get_all_mids", {c: str(px[c]) for c in coins}, args=[])
+    for interval, n in (("1h", 50), ("5m", 50), ("1d", 120)):
+        rec.rest("candles", {c: _bars(interval, n, px[c], start * 1000, rng) for c in coins}, interval=interval)
+    rec.rest("books", {c: {"coin": c, "levels": [
+        [{"px": str(px[c] * (1 - 1e-4 * k)), "sz": str(rng.uniform(1, 50)), "n": 1} for k in range(1, 21)],
+        [{"px": str(px[c] * (1 + 1e-4 * k)), "sz": str(rng.uniform(1, 50)), "n": 1} for k in range(1, 21)],
+    ]} for c in coins[:20]}, args=[])
+
+    def frame(t: float, channel: str, data):
+        rec.frame(t, codec.dumps_str({"channel": channel, "data": data}))
+
+    hot = coins[:60]
+    t = start
+    while t < now:
+        for c in coins:
+            px[c] *= rng.uniform(0.9995, 1.0005)
+        frame(t, "allMids", {"mids": {c: str(px[c]) for c in coins}})
+        for _ in range(40):
+            c = rng.choice(hot)
+            frame(t + rng.random() * 0.5, "bbo", {"coin": c,
+                                                  "bid": [{"px": str(px[c] * 0.9999), "sz": "1", "n": 1}],
+                                                  "ask": [{"px": str(px[c] * 1.0001), "sz": "1", "n": 1}]})
+        for _ in range(20):
+            c = rng.choice(hot)
+            frame(t + rng.random() * 0.5, "activeAssetCtx", {"coin": c, "ctx": {
+                "markPx": str(px[c]), "funding": str(rng.uniform(-1e-4, 1e-4)),
+                "openInterest": str(rng.uniform(1e3, 1e6)), "dayNtlVlm": str(rng.uniform(1e5, 1e9))}})
+        for _ in range(30):
+            c = rng.choice(hot)
+            ts = t + rng.random() * 0.5
+            frame(ts, "trades", [{"coin": c, "side": rng.choice("AB"), "px": str(px[c]),
+                                  "sz": str(rng.uniform(0.01, 5)), "time": int(ts * 1000), "tid": rng.getrandbits(48)}])
+        t += 0.5
+    rec.close()
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Runner
+# ─────────────────────────────────────────────────────────────────────────────
+
+async def run(path: str, speed: float) -> dict:
+    snapshot_ms: list[float] = []
+
+    async def snapshot(state):
+        t0 = time.perf_counter()
+        await router.get_snapshot()
+        snapshot_ms.append((time.perf_counter() - t0) * 1000)
+
+    # Played faster than real time every batch would land inside the views'
+    # staleness window and be a cache hit
+    router._snapshot_views.max_staleness_s = 0
+    state = HyperliquidState()
+    router.set_state(state)
+    state, report = await replay(path, state=state, speed=speed or None, on_batch=snapshot)
+    passes = np.array(report.feature_pass_s) * 1000
+    snaps = np.array(snapshot_ms)
+
+    def pct(xs: np.ndarray, q: float) -> float:
+        return round(float(np.percentile(xs, q)), 3) if len(xs) else 0.0
+
+    return {
+        "assets":              len(state.assets),
+        "frames":              report.frames,
+        "batches":             report.batches,
+        "boot_s":              round(report.boot_s, 3),
+        "replay_wall_s":       round(report.wall_s, 3),
+        "recorded_s":          round(report.recorded_s, 3),
+        "msgs_per_s":          round(report.msgs_per_s, 1),
+        "feature_passes":      len(passes),
+        "feature_pass_p50_ms": pct(passes, 50),
+        "feature_pass_p99_ms": pct(passes, 99),
+        "snapshot_p50_ms":     pct(snaps, 50),
+        "snapshot_p99_ms":     pct(snaps, 99),
+    }
+
+
+def compare(result: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Metrics worse than the baseline by more than `tolerance` (fraction)."""
+    regressions = []
+    for name, higher_better in _METRICS.items():
+        new, old = result.get(name), baseline.get(name)
+        if not old or new is None:
+            continue
+        change = (old - new) / old if higher_better else (new - old) / old
+        if change > tolerance:
+            regressions.append(f"{name}: {old} → {new} ({change * 100:+.0f}% worse)")
+    return regressions
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("capture", nargs="?", help="recorded .jsonl.gz (omit with --synthetic)")
+    ap.add_argument("--synthetic", action="store_true", help="generate a capture first")
+    ap.add_argument("--assets", type=int, default=300)
+    ap.add_argument("--seconds", type=float, default=60.0)
+    ap.add_argument("--speed", type=float, default=0.0, help="1 = recorded pacing, 0 = as fast as possible")
+    ap.add_argument("--save", help="write results JSON here")
+    ap.add_argument("--baseline", help="results JSON to compare against")
+    ap.add_argument("--tolerance", type=float, default=0.25)
+    args = ap.parse_args()
+
+    path = args.capture
+    if args.synthetic:
+        path = path or os.path.join(tempfile.mkdtemp(), "hl_synthetic.jsonl.gz")
+        write_synthetic(path, args.assets, args.seconds, random.Random(11))
+    if not path:
+        ap.error("a capture path or --synthetic is required")
+
+    result = asyncio.run(run(path, args.speed))
+    print(f"\nReplay of {path}")
+    for key, value in result.items():
+        print(f"  {key:<22}{value:>12}")
+    print()
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(result, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(result, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"  REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+        print(f"  no regressions beyond {args.tolerance * 100:.0f}% vs {args.baseline}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Hyperliquid /snapshot benchmark — per-request rebuild vs versioned views.
+
+  rebuild — filter + sort + _asset_to_row + serialize on every request
+            (what get_snapshot did before SnapshotViews)
+  cold    — first request after a table generation change (views rebuilt)
+  resort  — same generation, a sort/filter not requested yet (cached row
+            bytes re-ranked, new index array)
+  hit     — repeat of an already-served query (cached body)
+
+Run:  python scripts/bench_hl_snapshot.py [--assets 500] [--repeat 50]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from bench_hl_codec import _snapshot_state
+
+from services.hyperliquid import codec, router
+from services.hyperliquid.snapshot_views import SnapshotViews
+
+
+def _rebuild(state, limit: int) -> bytes:
+    assets = [a for a in state.all_assets() if a.market_status == "active" and state.in_universe(a.coin)]
+    assets.sort(key=lambda a: (a.overall_score or 0) if a.overall_score is not None else -1e18, reverse=True)
+    rows = [router._asset_to_row(a, rank=i + 1) for i, a in enumerate(assets[:limit])]
+    return codec.dumps({"rows": rows, "meta": router._build_meta(rows, state)})
+
+
+def _ms(fn, repeat: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - t0) / repeat * 1000
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--assets", type=int, default=500)
+    ap.add_argument("--limit", type=int, default=200)
+    ap.add_argument("--repeat", type=int, default=50)
+    args = ap.parse_args()
+
+    state = _snapshot_state(args.assets, random.Random(3))
+    views = SnapshotViews(router._asset_to_row, router._build_meta, max_staleness_s=0)
+    slot = state.assets.slot(next(iter(state.assets)))
+
+    def cold():
+        state.assets.touch([slot])      # new generation
+        views.render(state, "all", args.limit, "overall_score", True)
+
+    sorts = list(router._SORT_MAP.values())
+
+    def resort():
+        cold()
+        for field in sorts:
+            views.render(state, "perp", args.limit, field, False)
+
+    views.render(state, "all", args.limit, "overall_score", True)
+    rebuild_ms = _ms(lambda: _rebuild(state, args.limit), args.repeat)
+    cold_ms = _ms(cold, args.repeat)
+    resort_ms = (_ms(resort, max(args.repeat // 5, 1)) - cold_ms) / len(sorts)
+    hit_ms = _ms(lambda: views.render(state, "all", args.limit, "overall_score", True), args.repeat * 20)
+
+    print(f"\n/snapshot, {args.assets} assets, limit {args.limit}")
+    print(f"  {'path':<10}{'ms/request':>12}{'vs rebuild':>12}")
+    for name, ms in (("rebuild", rebuild_ms), ("cold", cold_ms), ("resort", resort_ms), ("hit", hit_ms)):
+        print(f"  {name:<10}{ms:>12.3f}{rebuild_ms / ms:>11.0f}×")
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""
+Hyperliquid WS patch benchmark — allMids + bbo burst replay.
+
+Replays a synthetic burst of allMids frames (whole universe per frame) and
+per-coin bbo frames against:
+  before — the old dict[str, ScreenerAsset] + model_copy(update=...) patches
+  after  — HyperliquidState's columnar AssetTable + in-place column patches
+
+Reports µs per message and memory allocated during the replay (tracemalloc
+peak), plus the cost of materializing every row once at the end, which is
+what the router pays on the next /snapshot.
+
+Run:  python scripts/bench_hl_ws_patch.py [--assets 400] [--frames 50] [--bbo 2000]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from services.hyperliquid.models import ScreenerAsset
+from services.hyperliquid.normalizer import _f, patch_from_all_mids, patch_from_bbo
+from services.hyperliquid.state import HyperliquidState
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Synthetic universe + frames
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _make_assets(n: int, rng: random.Random) -> dict[str, ScreenerAsset]:
+    out = {}
+    for i in range(n):
+        coin = f"C{i:04d}"
+        px = rng.uniform(0.01, 50_000)
+        out[coin] = ScreenerAsset(
+            coin=coin, display_name=coin, canonical_coin_id=coin, display_symbol=coin,
+            mark_px=px, mid_px=px, oracle_px=px, prev_day_px=px * 0.98,
+            funding=rng.uniform(-1e-4, 1e-4), open_interest=rng.uniform(1e3, 1e6),
+            day_ntl_vlm=rng.uniform(1e5, 1e9),
+        )
+    return out
+
+
+def _make_frames(assets: dict[str, ScreenerAsset], n_mids: int, n_bbo: int, rng: random.Random):
+    coins = list(assets)
+    mids_frames = [
+        {c: str(assets[c].mark_px * rng.uniform(0.999, 1.001)) for c in coins}
+        for _ in range(n_mids)
+    ]
+    bbo_frames = []
+    for _ in range(n_bbo):
+        c = rng.choice(coins[:30])
+        px = assets[c].mark_px
+        bbo_frames.append((c, {
+            "bid": [{"px": str(px * 0.9999), "sz": "1.0", "n": 1}],
+            "ask": [{"px": str(px * 1.0001), "sz": "1.0", "n": 1}],
+        }))
+    return mids_frames, bbo_frames
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# "before": legacy model_copy patches (verbatim logic from the dict-backed state)
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _legacy_all_mids(assets: dict[str, ScreenerAsset], mids: dict[str, str]):
+    now = time.time()
+    for coin, px_str in mids.items():
+        mid = _f(px_str)
+        if mid is None:
+            continue
+        asset = assets.get(coin)
+        if asset is None:
+            continue
+        mark = asset.mark_px
+        dist = (mark - mid) / mid * 100 if (mark and mid) else None
+        assets[coin] = asset.model_copy(update={
+            "mid_px": mid,
+            "distance_mark_mid_pct": round(dist, 4) if dist is not None else None,
+            "last_updated_ts": now,
+        })
+
+
+def _legacy_bbo(assets: dict[str, ScreenerAsset], coin: str, bbo_data: dict):
+    asset = assets.get(coin)
+    if asset is None:
+        return
+    bids = bbo_data.get("bid") or []
+    asks = bbo_data.get("ask") or []
+    bid_px = _f(bids[0].get("px")) if bids else None
+    ask_px = _f(asks[0].get("px")) if asks else None
+    spread_abs = (ask_px - bid_px) if (bid_px and ask_px) else None
+    mid = (bid_px + ask_px) / 2 if (bid_px and ask_px) else None
+    spread_bps = spread_abs / mid * 10_000 if (spread_abs and mid and mid != 0) else None
+    assets[coin] = asset.model_copy(update={
+        "bid_px": bid_px,
+        "ask_px": ask_px,
+        "spread_abs": round(spread_abs, 6) if spread_abs is not None else None,
+        "spread_bps": round(spread_bps, 2) if spread_bps is not None else None,
+        "mid_px": round(mid, 6) if mid is not None else asset.mid_px,
+        "last_updated_ts": time.time(),
+    })
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Runner
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _measure(label: str, replay, materialize) -> dict:
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    base, _ = tracemalloc.get_traced_memory()
+    t0 = time.perf_counter()
+    n_msgs = replay()
+    elapsed = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    t1 = time.perf_counter()
+    materialize()
+    mat = time.perf_counter() - t1
+    return {
+        "label": label,
+        "msgs": n_msgs,
+        "us_per_msg": elapsed / n_msgs * 1e6,
+        "alloc_peak_kib": (peak - base) / 1024,
+        "materialize_ms": mat * 1000,
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--assets", type=int, default=400)
+    ap.add_argument("--frames", type=int, default=50, help="allMids frames")
+    ap.add_argument("--bbo", type=int, default=2000, help="bbo frames")
+    args = ap.parse_args()
+
+    rng = random.Random(7)
+    universe = _make_assets(args.assets, rng)
+    mids_frames, bbo_frames = _make_frames(universe, args.frames, args.bbo, rng)
+
+    # before
+    legacy = dict(universe)
+
+    def _replay_before():
+        for i, mids in enumerate(mids_frames):
+            _legacy_all_mids(legacy, mids)
+            for c, d in bbo_frames[i::len(mids_frames)]:
+                _legacy_bbo(legacy, c, d)
+        return len(mids_frames) + len(bbo_frames)
+
+    before = _measure("before (model_copy)", _replay_before, lambda: list(legacy.values()))
+
+    # after
+    state = HyperliquidState()
+    for coin, asset in universe.items():
+        state.assets[coin] = asset
+
+    def _replay_after():
+        for i, mids in enumerate(mids_frames):
+            patch_from_all_mids(state, mids)
+            for c, d in bbo_frames[i::len(mids_frames)]:
+                patch_from_bbo(state, c, d)
+        return len(mids_frames) + len(bbo_frames)
+
+    after = _measure("after (columnar)", _replay_after, state.all_assets)
+
+    print(f"\nUniverse={args.assets} assets  allMids frames={args.frames}  bbo frames={args.bbo}\n")
+    print(f"  {'':<22}{'µs/msg':>10}{'alloc peak KiB':>17}{'materialize ms':>17}")
+    for r in (before, after):
+        print(f"  {r['label']:<22}{r['us_per_msg']:>10.1f}{r['alloc_peak_kib']:>17.1f}{r['materialize_ms']:>17.2f}")
+    print(f"\n  speedup: {before['us_per_msg'] / after['us_per_msg']:.1f}×\n")
+
+    # Sanity: both paths must agree on the live fields they patched
+    mismatches = 0
+    for coin, old in legacy.items():
+        new = state.assets[coin]
+        for field in ("mid_px", "bid_px", "ask_px", "spread_abs", "spread_bps"):
+            a, b = getattr(old, field), getattr(new, field)
+            if (a is None) != (b is None) or (a is not None and abs(a - b) > 1e-9 * max(1.0, abs(a))):
+                mismatches += 1
+    print(f"  field mismatches before vs after: {mismatches}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+HTTP pool benchmark — wide_scan_and_rank latency with and without the
+shared per-host clients of data/http_pool.py.
+
+Each round clears the response cache and runs one wide_scan_and_rank per
+category, alternating pooled / unpooled (HTTP_POOL=0 behaviour: a fresh
+client per call) so both see the same upstream conditions, and reports
+p50 / p99 scan latency per mode.  Needs the provider API keys in the
+environment, like the app.
+
+--local needs no network or keys: it serves a small keep-alive HTTP/1.1
+server on localhost and times bursts of concurrent GETs through pooled
+and unpooled sessions, isolating connection setup cost (no TLS, so the
+live gap is larger).
+
+Run:  python scripts/bench_http_pool.py [--rounds 5] [--categories market_scan,squeeze]
+      python scripts/bench_http_pool.py --local [--requests 200] [--concurrency 20]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from data import http_pool
+from data.cache import cache
+
+
+def _pct(xs: list[float], q: float) -> float:
+    return round(float(np.percentile(xs, q)), 1) if xs else 0.0
+
+
+def _report(title: str, results: dict[str, list[float]]):
+    print(f"\n{title}")
+    print(f"  {'mode':<10}{'n':>6}{'p50 ms':>12}{'p99 ms':>12}")
+    for mode, xs in results.items():
+        print(f"  {mode:<10}{len(xs):>6}{_pct(xs, 50):>12}{_pct(xs, 99):>12}")
+    print()
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# wide_scan_and_rank against the live upstreams
+# ─────────────────────────────────────────────────────────────────────────────
+
+async def bench_wide_scan(rounds: int, categories: list[str]) -> dict[str, list[float]]:
+    from config import (ALTFINS_API_KEY, CMC_API_KEY, COINGECKO_API_KEY, FMP_API_KEY,
+                        POLYGON_API_KEY, TWELVEDATA_API_KEY, XAI_API_KEY)
+    from data.market_data_service import MarketDataService
+
+    service = MarketDataService(polygon_key=POLYGON_API_KEY, fmp_key=FMP_API_KEY,
+                                coingecko_key=COINGECKO_API_KEY, cmc_key=CMC_API_KEY,
+                                altfins_key=ALTFINS_API_KEY, xai_key=XAI_API_KEY,
+                                twelvedata_key=TWELVEDATA_API_KEY)
+    results: dict[str, list[float]] = {"unpooled": [], "pooled": []}
+    for _ in range(rounds):
+        for mode in results:
+            http_pool._ENABLED = mode == "pooled"
+            for category in categories:
+                cache.clear()
+                t0 = time.perf_counter()
+                await service.wide_scan_and_rank(category, {})
+                results[mode].append((time.perf_counter() - t0) * 1000)
+    await http_pool.close_all()
+    return results
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Local keep-alive server
+# ─────────────────────────────────────────────────────────────────────────────
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = b'{"ok":true}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+async def bench_local(n_requests: int, concurrency: int, bursts: int) -> dict[str, list[float]]:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/quote"
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one(latencies: list[float]):
+        # One session per call, as the providers open them
+        async with sem:
+            t0 = time.perf_counter()
+            async with http_pool.session(timeout=5) as client:
+                resp = await client.get(url)
+                resp.raise_for_status()
+            latencies.append((time.perf_counter() - t0) * 1000)
+
+    results: dict[str, list[float]] = {"unpooled": [], "pooled": []}
+    for _ in range(bursts):
+        for mode, xs in results.items():
+            http_pool._ENABLED = mode == "pooled"
+            await asyncio.gather(*[one(xs) for _ in range(n_requests)])
+    await http_pool.close_all()
+    server.shutdown()
+    return results
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--local", action="store_true", help="localhost server instead of wide_scan_and_rank")
+    ap.add_argument("--rounds", type=int, default=5)
+    ap.add_argument("--categories", default="market_scan,squeeze,volume_spikes")
+    ap.add_argument("--requests", type=int, default=200)
+    ap.add_argument("--concurrency", type=int, default=20)
+    ap.add_argument("--bursts", type=int, default=5)
+    args = ap.parse_args()
+
+    if args.local:
+        results = asyncio.run(bench_local(args.requests, args.concurrency, args.bursts))
+        _report(f"Local GET latency ({args.requests} requests × {args.bursts} bursts, "
+                f"concurrency {args.concurrency})", results)
+    else:
+        categories = [c for c in args.categories.split(",") if c]
+        results = asyncio.run(bench_wide_scan(args.rounds, categories))
+        _report(f"wide_scan_and_rank latency ({args.rounds} rounds × {', '.join(categories)})", results)
+
+
+if __name__ == "__main__":
+    main()
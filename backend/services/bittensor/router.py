@@ -25,6 +25,7 @@ from datetime import datetime, timedelta, timezone
 from typing import Any
 
 import httpx
+from data import http_pool
 from fastapi import APIRouter, HTTPException, Query
 from fastapi.responses import JSONResponse
 
@@ -91,7 +92,7 @@ def _taoapp_headers() -> dict[str, str]:
 
 
 async def _taostats_get(
-    client: httpx.AsyncClient,
+    client: http_pool.PooledSession,
     path: str,
     params: dict | None = None,
     retry_on_429: bool = True,
@@ -127,7 +128,7 @@ async def _taostats_get(
 
 
 async def _taoapp_get(
-    client: httpx.AsyncClient,
+    client: http_pool.PooledSession,
     path: str,
     params: dict | None = None,
 ) -> Any:
@@ -454,7 +455,7 @@ async def _fetch_dashboard_data() -> dict:
     prev_entry = _cache.get("dashboard")
     prev: dict[str, Any] = prev_entry["data"] if prev_entry else {}
 
-    async with httpx.AsyncClient() as client:
+    async with http_pool.session() as client:
         # Fire all calls in parallel — TaoApp 10 req/min limit is comfortable
         (
             current_raw,
@@ -753,7 +754,7 @@ async def debug_endpoint():
 
     if TAOAPP_API_KEY:
         try:
-            async with httpx.AsyncClient() as client:
+            async with http_pool.session() as client:
                 taoapp_raw = await _taoapp_get(client, "/api/beta/current")
             if taoapp_raw is not None:
                 result["taoapp_test_result"] = "OK"
@@ -766,7 +767,7 @@ async def debug_endpoint():
 
     if TAOSTATS_API_KEY:
         try:
-            async with httpx.AsyncClient() as client:
+            async with http_pool.session() as client:
                 raw = await _taostats_get(client, "/api/price/latest/v1", {"asset": "tao"}, retry_on_429=False)
             if raw is not None:
                 result["test_result"] = "OK"
@@ -799,7 +800,7 @@ async def blocks_history_endpoint(
     frequency = "by_day" if scale == "days" else "by_hour"
     data_points: list[dict[str, Any]] = []
 
-    async with httpx.AsyncClient() as client:
+    async with http_pool.session() as client:
         interval_raw = await _taostats_get(client, "/api/block/interval/v1", {
             "frequency": frequency, "limit": points + 1,
         }, retry_on_429=False)
@@ -912,7 +913,7 @@ async def metagraph_endpoint(netuid: int):
     if cached is not None:
         return cached
 
-    async with httpx.AsyncClient() as client:
+    async with http_pool.session() as client:
         raw = await _taostats_get(client, "/api/metagraph/latest/v1", {
             "netuid": netuid, "limit": 256,
         }, retry_on_429=False)
@@ -958,7 +959,7 @@ async def price_history_endpoint():
     if cached is not None:
         return cached
 
-    async with httpx.AsyncClient() as client:
+    async with http_pool.session() as client:
         raw = await _taostats_get(client, "/api/price/ohlc/v1", {
             "asset": "tao", "period": "1d", "limit": 30,
         }, retry_on_429=False)
@@ -998,7 +999,7 @@ async def subnet_social_endpoint(netuid: int):
     if cached is not None:
         return cached
 
-    async with httpx.AsyncClient() as client:
+    async with http_pool.session() as client:
         raw = await _taoapp_get(
             client,
             f"/api/beta/analytics/subnets/social/{netuid}/latest",
@@ -1021,7 +1022,7 @@ async def sparklines_endpoint():
     if cached is not None:
         return cached
 
-    async with httpx.AsyncClient() as client:
+    async with http_pool.session() as client:
         raw = await _taoapp_get(
             client,
             "/api/beta/subnets/sparklines",
@@ -1100,7 +1101,7 @@ async def dynamic_history_endpoint(netuids: str = Query("1,2,3,5,9,18,19,64")):
     end_dt = datetime.now(timezone.utc)
     start_dt = end_dt - timedelta(hours=24)
 
-    async with httpx.AsyncClient() as client:
+    async with http_pool.session() as client:
         raw = await _taoapp_get(client, "/api/beta/analytics/dynamic-info/aggregated", {
             "interval": "1hour",
             "netuid": netuids,
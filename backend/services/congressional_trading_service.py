@@ -16,7 +16,7 @@ from datetime import date, datetime, timedelta
 from decimal import Decimal
 from typing import Any, Optional
 
-import httpx
+from data import http_pool
 import psycopg2
 from psycopg2 import pool as _pg_pool
 from psycopg2.extras import execute_batch
@@ -306,7 +306,7 @@ async def _get_current_prices_batch(tickers: list[str]) -> dict[str, float]:
     if _TRADIER_KEY and remaining:
         try:
             symbols_str = ",".join(remaining[:50])
-            async with httpx.AsyncClient(timeout=15) as client:
+            async with http_pool.session(timeout=15) as client:
                 resp = await client.get(
                     "https://sandbox.tradier.com/v1/markets/quotes",
                     params={"symbols": symbols_str},
@@ -400,7 +400,7 @@ async def _fetch_from_fmp(endpoint: str, source_label: str) -> list[dict]:
         logger.warning("[CONG_TRADE] FMP_API_KEY_CONGRESS not set")
         return []
     try:
-        async with httpx.AsyncClient(timeout=20) as client:
+        async with http_pool.session(timeout=20) as client:
             resp = await client.get(
                 f"{_FMP_BASE}/{endpoint}",
                 params={"apikey": _FMP_KEY, "limit": _REFRESH_LIMIT},
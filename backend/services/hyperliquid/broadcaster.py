@@ -0,0 +1,232 @@
+"""
+Hyperliquid Screener — frontend WebSocket fan-out.
+
+ScreenerBroadcaster pushes row deltas to every connected /ws client:
+
+  - Once per tick it builds the ranked top-N rows (one sort per cycle is the
+    rank index — no per-asset re-sort), diffs them against the previous
+    cycle and encodes a single rows_delta frame carrying only changed fields.
+    The same encoded frame is handed to every client.
+  - Each client has its own bounded queue drained by its own sender task, so
+    a slow browser only ever delays itself.
+  - A client whose queue overflows has its backlog dropped and is resynced
+    with a full snapshot_ready frame.  Every frame carries the cycle `seq`;
+    deltas at or below the seq of the snapshot a client received are skipped.
+
+Frames:
+  snapshot_ready  {event, seq, data: {rows, meta}, ts}
+  rows_delta      {event, seq, data: {rows: [partial row], removed: [id], meta}, ts}
+Partial rows always include coin + canonicalCoinId (the diff key).
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any, Callable, Optional
+
+from fastapi import WebSocket
+
+from . import codec
+
+# Sentinel queued in place of a backlog: "send a fresh snapshot next"
+_SNAPSHOT = object()
+
+_ROW_KEY = "canonicalCoinId"
+
+
+class _Client:
+    __slots__ = ("ws", "queue", "task", "synced_seq")
+
+    def __init__(self, ws: WebSocket, queue_max: int):
+        self.ws = ws
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_max)
+        self.task: Optional[asyncio.Task] = None
+        self.synced_seq = -1
+
+
+class ScreenerBroadcaster:
+    """
+    build_rows() → ranked row dicts for the current state (top-N, rank set)
+    build_meta(rows) → ScreenerMeta for those rows
+    ready() → False while the screener is still booting (no cycles run)
+    on_cycle(sent) → called after every cycle with whether a delta went out
+                     (also once with False when the cycle loop starts)
+    """
+
+    def __init__(
+        self,
+        build_rows: Callable[[], list[dict]],
+        build_meta: Callable[[list[dict]], dict],
+        ready: Callable[[], bool],
+        interval_s: float = 1.0,
+        queue_max: int = 32,
+        on_cycle: Optional[Callable[[bool], None]] = None,
+    ):
+        self._build_rows = build_rows
+        self._build_meta = build_meta
+        self._ready = ready
+        self._on_cycle = on_cycle
+        self.interval_s = interval_s
+        self.queue_max = queue_max
+
+        self._clients: dict[WebSocket, _Client] = {}
+        self._loop_task: Optional[asyncio.Task] = None
+
+        # Last published cycle
+        self.seq = 0
+        self._rows: Optional[dict[str, dict]] = None     # row key → row
+        self._ordered: list[dict] = []
+        self._meta: dict = {}
+        self._snapshot_cache: Optional[tuple[int, str]] = None
+
+        # Counters
+        self.deltas_sent = 0
+        self.resyncs = 0
+        self.frames_dropped = 0
+
+    # ── Client lifecycle ──────────────────────────────────────────────────
+
+    def add(self, ws: WebSocket):
+        """Register a connected socket; it gets a snapshot (or status) first."""
+        client = _Client(ws, self.queue_max)
+        self._clients[ws] = client
+        client.task = asyncio.create_task(self._sender(client))
+        if self._ready():
+            client.queue.put_nowait(_SNAPSHOT)
+        else:
+            self.send(ws, {"event": "connection_status", "data": {"status": "initializing"}, "ts": time.time()})
+        if self._loop_task is None or self._loop_task.done():
+            self._loop_task = asyncio.create_task(self._run())
+
+    def remove(self, ws: WebSocket):
+        client = self._clients.pop(ws, None)
+        if client and client.task and client.task is not asyncio.current_task():
+            client.task.cancel()
+
+    def send(self, ws: WebSocket, payload: dict):
+        """Queue an out-of-band frame (ping, status, error) for one client."""
+        client = self._clients.get(ws)
+        if client:
+            self._offer(client, (None, codec.dumps_str(payload)))
+
+    def request_snapshot(self, ws: WebSocket):
+        client = self._clients.get(ws)
+        if client:
+            self._offer(client, _SNAPSHOT)
+
+    @property
+    def client_count(self) -> int:
+        return len(self._clients)
+
+    def stats(self) -> dict:
+        return {
+            "clients":        len(self._clients),
+            "seq":            self.seq,
+            "deltas_sent":    self.deltas_sent,
+            "resyncs":        self.resyncs,
+            "frames_dropped": self.frames_dropped,
+        }
+
+    # ── Per-client queue + sender ─────────────────────────────────────────
+
+    def _offer(self, client: _Client, item: Any):
+        try:
+            client.queue.put_nowait(item)
+        except asyncio.QueueFull:
+            # Fell behind: drop the backlog, resync with a snapshot instead
+            while not client.queue.empty():
+                client.queue.get_nowait()
+                self.frames_dropped += 1
+            client.queue.put_nowait(_SNAPSHOT)
+            self.resyncs += 1
+
+    async def _sender(self, client: _Client):
+        try:
+            while True:
+                item = await client.queue.get()
+                if item is _SNAPSHOT:
+                    seq, frame = self._snapshot_frame()
+                    client.synced_seq = seq
+                else:
+                    seq, frame = item
+                    if seq is not None and seq <= client.synced_seq:
+                        continue   # already covered by the snapshot it got
+                await client.ws.send_text(frame)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self.remove(client.ws)
+
+    # ── Cycle: rank, diff, encode once, fan out ───────────────────────────
+
+    async def _run(self):
+        if self._on_cycle:
+            self._on_cycle(False)
+        while self._clients:
+            await asyncio.sleep(self.interval_s)
+            if not self._ready():
+                continue
+            try:
+                self.publish()
+            except Exception as e:
+                print(f"[HL][ws_out] Publish error: {e}")
+
+    def _capture(self) -> tuple[list[dict], dict[str, dict], dict]:
+        rows = self._build_rows()
+        return rows, {r[_ROW_KEY]: r for r in rows}, self._build_meta(rows)
+
+    def publish(self) -> Optional[dict]:
+        """Run one cycle; returns the delta payload (None if nothing changed)."""
+        delta = self._cycle()
+        if self._on_cycle:
+            self._on_cycle(delta is not None)
+        return delta
+
+    def _cycle(self) -> Optional[dict]:
+        ordered, rows, meta = self._capture()
+        prev = self._rows
+        self._ordered, self._rows, self._meta = ordered, rows, meta
+        if prev is None:
+            # First cycle after boot: clients that connected while the
+            # screener was initializing get their first snapshot now
+            for client in list(self._clients.values()):
+                if client.synced_seq < 0:
+                    self._offer(client, _SNAPSHOT)
+            return None
+
+        changed: list[dict] = []
+        for key, row in rows.items():
+            old = prev.get(key)
+            if old is None:
+                changed.append(row)
+                continue
+            diff = {k: v for k, v in row.items() if old.get(k) != v}
+            if diff:
+                diff["coin"] = row["coin"]
+                diff[_ROW_KEY] = key
+                changed.append(diff)
+        removed = [key for key in prev if key not in rows]
+        if not changed and not removed:
+            return None
+
+        self.seq += 1
+        delta = {"rows": changed, "removed": removed, "meta": meta}
+        frame = codec.dumps_str({"event": "rows_delta", "seq": self.seq, "data": delta, "ts": time.time()})
+        for client in list(self._clients.values()):
+            self._offer(client, (self.seq, frame))
+        self.deltas_sent += 1
+        return delta
+
+    def _snapshot_frame(self) -> tuple[int, str]:
+        if self._rows is None:
+            self._ordered, self._rows, self._meta = self._capture()
+        cached = self._snapshot_cache
+        if cached is None or cached[0] != self.seq:
+            frame = codec.dumps_str({
+                "event": "snapshot_ready",
+                "seq":   self.seq,
+                "data":  {"rows": self._ordered, "meta": self._meta},
+                "ts":    time.time(),
+            })
+            cached = self._snapshot_cache = (self.seq, frame)
+        return cached
@@ -0,0 +1,279 @@
+"""
+Hyperliquid Screener — typed candle storage.
+
+Each (coin, interval) series is a CandleRing: a fixed-capacity buffer of
+float64 OHLCV rows, kept in open-time order.  Raw Hyperliquid candle dicts
+(string prices) are parsed once when they arrive; readers get zero-copy,
+read-only row views and index columns with the constants below:
+
+  window = state.candle_window(coin, "1h", n=50)
+  closes = window[:, CLOSE]
+
+Storage is a 2×capacity block written append-only; when the write head hits
+the end the live rows are moved back to the front (one memcpy per
+`capacity` appends), so every window stays a contiguous slice.
+
+Upserts are timestamp-ordered: a bar whose open time is already stored
+replaces that row (a forming bar updating, a REST refresh finalizing it),
+newer bars append, and late bars are inserted in place.
+
+Live aggregation: trades from the WS feed are bucketed into 1m bars
+(bars_from_trades), rolled up to the longer intervals (roll_up) and folded
+into the forming bars with CandleRing.accumulate — high / low / close move,
+volume and trade count add up, a new bucket opens the next bar.
+"""
+from __future__ import annotations
+
+from typing import Any, Optional
+
+import numpy as np
+
+# Row layout; missing values are NaN
+CANDLE_FIELDS: tuple[str, ...] = ("t", "T", "o", "h", "l", "c", "v", "n")
+T, CLOSE_T, OPEN, HIGH, LOW, CLOSE, VOLUME, TRADES = range(len(CANDLE_FIELDS))
+N_FIELDS = len(CANDLE_FIELDS)
+
+# Milliseconds per candle interval (all bars open on multiples of these)
+INTERVAL_MS: dict[str, int] = {
+    "1m": 60_000,
+    "3m": 180_000,
+    "5m": 300_000,
+    "15m": 900_000,
+    "30m": 1_800_000,
+    "1h": 3_600_000,
+    "4h": 14_400_000,
+    "1d": 86_400_000,
+}
+
+EMPTY = np.empty((0, N_FIELDS))
+EMPTY.flags.writeable = False
+
+
+def _num(v: Any) -> float:
+    try:
+        if v is None or v == "":
+            return np.nan
+        return float(v)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def parse_candles(candles: list[dict]) -> np.ndarray:
+    """Raw candle dicts → float64 rows in CANDLE_FIELDS order (NaN = missing)."""
+    flat: list[float] = []
+    for c in candles:
+        try:
+            flat += (float(c["t"]), float(c["T"]), float(c["o"]), float(c["h"]),
+                     float(c["l"]), float(c["c"]), float(c["v"]), float(c["n"]))
+        except (KeyError, TypeError, ValueError):
+            flat += [_num(c.get(k)) for k in CANDLE_FIELDS]
+    return np.array(flat, dtype=np.float64).reshape(-1, N_FIELDS)
+
+
+def present(column: np.ndarray) -> list[float]:
+    """Non-missing values of one column, as Python floats."""
+    return column[~np.isnan(column)].tolist()
+
+
+def value_or_zero(v: float) -> float:
+    """A single cell, 0.0 when missing."""
+    return 0.0 if v != v else float(v)
+
+
+def bars_from_trades(trades: list[dict], interval_ms: int = 60_000) -> np.ndarray:
+    """WS trade dicts → one partial bar per interval bucket, in open-time order."""
+    bars: dict[float, list[float]] = {}
+    for tr in sorted(trades, key=lambda tr: tr.get("time") or 0):
+        t, px, sz = _num(tr.get("time")), _num(tr.get("px")), _num(tr.get("sz"))
+        if t != t or px != px:
+            continue
+        sz = 0.0 if sz != sz else sz
+        bar = bars.get(t - t % interval_ms)
+        if bar is None:
+            open_ms = t - t % interval_ms
+            bars[open_ms] = [open_ms, open_ms + interval_ms - 1, px, px, px, px, sz, 1.0]
+        else:
+            bar[HIGH] = max(bar[HIGH], px)
+            bar[LOW] = min(bar[LOW], px)
+            bar[CLOSE] = px
+            bar[VOLUME] += sz
+            bar[TRADES] += 1
+    return np.array(sorted(bars.values()), dtype=np.float64).reshape(-1, N_FIELDS)
+
+
+def roll_up(rows: np.ndarray, interval_ms: int) -> np.ndarray:
+    """Combine consecutive shorter bars into interval_ms bars."""
+    out: list[list[float]] = []
+    for r in rows.tolist():
+        open_ms = r[T] - r[T] % interval_ms
+        if out and out[-1][T] == open_ms:
+            bar = out[-1]
+            bar[HIGH] = max(bar[HIGH], r[HIGH])
+            bar[LOW] = min(bar[LOW], r[LOW])
+            bar[CLOSE] = r[CLOSE]
+            bar[VOLUME] += r[VOLUME]
+            bar[TRADES] += r[TRADES]
+        else:
+            out.append([open_ms, open_ms + interval_ms - 1] + r[OPEN:])
+    return np.array(out, dtype=np.float64).reshape(-1, N_FIELDS)
+
+
+def _same_rows(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    return ((a == b) | (np.isnan(a) & np.isnan(b))).all(axis=1)
+
+
+class CandleRing:
+    """Fixed-capacity, open-time-ordered candle rows for one (coin, interval)."""
+
+    __slots__ = ("capacity", "_buf", "_lo", "_hi")
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._buf = np.empty((2 * capacity, N_FIELDS))
+        self._lo = 0
+        self._hi = 0
+
+    def __len__(self) -> int:
+        return self._hi - self._lo
+
+    def window(self, n: Optional[int] = None) -> np.ndarray:
+        """Read-only view of the last n rows (all rows when n is None)."""
+        lo = self._lo if n is None else max(self._lo, self._hi - n)
+        view = self._buf[lo:self._hi]
+        view.flags.writeable = False
+        return view
+
+    @property
+    def last_open_ms(self) -> Optional[float]:
+        return float(self._buf[self._hi - 1, T]) if self._hi > self._lo else None
+
+    # ── Writes ────────────────────────────────────────────────────────────
+
+    def _append(self, rows: np.ndarray):
+        """Append rows that are all newer than the last stored bar."""
+        cap = self.capacity
+        k = len(rows)
+        if k >= cap:
+            self._buf[:cap] = rows[-cap:]
+            self._lo, self._hi = 0, cap
+            return
+        if self._hi + k > 2 * cap:
+            keep = min(len(self), cap - k)
+            self._buf[:keep] = self._buf[self._hi - keep:self._hi]
+            self._lo, self._hi = 0, keep
+        self._buf[self._hi:self._hi + k] = rows
+        self._hi += k
+        self._lo = max(self._lo, self._hi - cap)
+
+    def _replace_all(self, rows: np.ndarray):
+        rows = rows[-self.capacity:]
+        self._buf[:len(rows)] = rows
+        self._lo, self._hi = 0, len(rows)
+
+    def upsert(self, rows: np.ndarray) -> bool:
+        """
+        Merge parsed rows by open time (later rows win on duplicates).
+        Returns True if the stored series changed.
+        """
+        if len(rows) == 1:
+            return self._upsert_one(rows[0])
+        t = rows[:, T]
+        if not (t[1:] > t[:-1]).all():     # unsorted, duplicates or NaN open times
+            rows = rows[~np.isnan(t)]
+            rows = rows[np.argsort(rows[:, T], kind="stable")]
+            # Duplicates inside the batch: keep the last occurrence
+            rows = rows[np.append(rows[1:, T] != rows[:-1, T], True)]
+            if not len(rows):
+                return False
+        return self._merge(rows)
+
+    def _merge(self, rows: np.ndarray) -> bool:
+        """Merge rows with unique, increasing open times."""
+        if self._hi == self._lo or rows[0, T] > self._buf[self._hi - 1, T]:
+            self._append(rows)
+            return True
+
+        stored_t = self._buf[self._lo:self._hi, T]
+        pos = np.searchsorted(stored_t, rows[:, T])
+        exists = pos < len(stored_t)
+        exists[exists] = stored_t[pos[exists]] == rows[exists, T]
+
+        changed = False
+        if exists.any():
+            idx = self._lo + pos[exists]
+            new = rows[exists]
+            diff = ~_same_rows(self._buf[idx], new)
+            if diff.any():
+                self._buf[idx[diff]] = new[diff]
+                changed = True
+
+        if not exists.all():
+            fresh = rows[~exists]
+            last_t = self._buf[self._hi - 1, T]
+            late = fresh[fresh[:, T] < last_t]
+            if len(self) >= self.capacity:
+                # A full ring would trim bars older than its first straight back off
+                late = late[late[:, T] > self._buf[self._lo, T]]
+            if len(late):
+                # Rare: bars older than the head arrive — rebuild in order
+                merged = np.concatenate([self._buf[self._lo:self._hi], late])
+                self._replace_all(merged[np.argsort(merged[:, T], kind="stable")])
+                changed = True
+            newer = fresh[fresh[:, T] > last_t]
+            if len(newer):
+                self._append(newer)
+                changed = True
+        return changed
+
+    def accumulate(self, rows: np.ndarray) -> bool:
+        """
+        Fold partial bars (open-time ordered, e.g. roll_up of trade buckets)
+        into the series: a stored bar extends its high / low, takes the new
+        close and adds volume and trade count; a newer bar is appended with
+        the partial values; a bar older than the series start is ignored.
+        """
+        changed = False
+        for row in rows.tolist():
+            t = row[T]
+            idx = None
+            if self._hi > self._lo:
+                head_t = self._buf[self._hi - 1, T]
+                if t == head_t:
+                    idx = self._hi - 1
+                elif t < head_t:
+                    stored_t = self._buf[self._lo:self._hi, T]
+                    i = int(np.searchsorted(stored_t, t))
+                    if stored_t[i] != t:
+                        continue
+                    idx = self._lo + i
+            if idx is None:
+                self._append(np.array([row]))
+            else:
+                bar = self._buf[idx].tolist()
+                # NaN-aware: a missing stored value takes the new one
+                bar[HIGH] = bar[HIGH] if bar[HIGH] >= row[HIGH] else row[HIGH]
+                bar[LOW] = bar[LOW] if bar[LOW] <= row[LOW] else row[LOW]
+                bar[CLOSE] = row[CLOSE]
+                bar[VOLUME] = value_or_zero(bar[VOLUME]) + row[VOLUME]
+                bar[TRADES] = value_or_zero(bar[TRADES]) + row[TRADES]
+                self._buf[idx] = bar
+            changed = True
+        return changed
+
+    def _upsert_one(self, row: np.ndarray) -> bool:
+        """Single bar — the live WS path: update the forming bar or append."""
+        t = row[T]
+        if t != t:
+            return False
+        if self._hi > self._lo:
+            head = self._buf[self._hi - 1]
+            if t == head[T]:
+                # List compare: a bar with NaN cells always counts as changed
+                if head.tolist() == row.tolist():
+                    return False
+                head[:] = row
+                return True
+            if t < head[T]:
+                return self._merge(row[None, :])
+        self._append(row[None, :])
+        return True
@@ -4,50 +4,55 @@ Hyperliquid REST client.
 All Hyperliquid market data endpoints are accessed via a single POST to
 https://api.hyperliquid.xyz/info with a typed JSON payload.
 No authentication is required for public market data.
+
+Requests are paced, retried and de-duplicated by an InfoScheduler
+(scheduler.py) that tracks Hyperliquid's per-IP weight budget.
 """
 from __future__ import annotations
 
+import asyncio
 import time
-from typing import Any
+from typing import Any, Callable, Optional
 
 import httpx
 
+from .candles import INTERVAL_MS
+from .scheduler import BulkReport, InfoScheduler, request_weight
+
 _INFO_URL = "https://api.hyperliquid.xyz/info"
 _TIMEOUT = 20.0
-
-# Milliseconds per candle interval
-_INTERVAL_MS: dict[str, int] = {
-    "1m": 60_000,
-    "3m": 180_000,
-    "5m": 300_000,
-    "15m": 900_000,
-    "30m": 1_800_000,
-    "1h": 3_600_000,
-    "4h": 14_400_000,
-    "1d": 86_400_000,
-}
+_MAX_CONNECTIONS = 20
 
 
 class HyperliquidRestClient:
     """
     Async REST client for Hyperliquid's Info API.
     Uses a single shared httpx.AsyncClient for connection pooling.
+
+    Bulk helpers take an optional progress(report) callback, called with the
+    call's BulkReport after each coin completes (report.finished is set on
+    the last call).
     """
 
-    def __init__(self):
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None, **scheduler_opts):
         self._http = httpx.AsyncClient(
             timeout=_TIMEOUT,
             headers={"Content-Type": "application/json"},
-            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+            limits=httpx.Limits(max_connections=_MAX_CONNECTIONS, max_keepalive_connections=10),
+            transport=transport,
         )
+        self.scheduler = InfoScheduler(self._send, max_concurrency=_MAX_CONNECTIONS, **scheduler_opts)
 
     # ── Core transport ────────────────────────────────────────────────────
 
-    async def _post(self, payload: dict) -> Any:
+    async def _send(self, payload: dict) -> Any:
         resp = await self._http.post(_INFO_URL, json=payload)
         resp.raise_for_status()
         return resp.json()
 
+    async def _post(self, payload: dict, n_items: int = 0, report: Optional[BulkReport] = None) -> Any:
+        return await self.scheduler.request(payload, request_weight(payload, n_items), report)
+
     # ── Universe / metadata ───────────────────────────────────────────────
 
     async def get_meta(self) -> dict:
@@ -104,23 +109,33 @@ class HyperliquidRestClient:
         Each candle dict has: t (open ms), T (close ms), s (symbol),
         i (interval), o, h, l, c (OHLC prices), v (base volume), n (trades).
         """
-        bar_ms = _INTERVAL_MS.get(interval, 3_600_000)
-        end_ms = int(time.time() * 1000)
-        start_ms = end_ms - bar_ms * (n_bars + 2)   # +2 buffer for boundary bars
         try:
-            data = await self._post({
-                "type": "candleSnapshot",
-                "req": {
-                    "coin": coin,
-                    "interval": interval,
-                    "startTime": start_ms,
-                    "endTime": end_ms,
-                },
-            })
-            return data if isinstance(data, list) else []
+            return await self._candle_snapshot(coin, interval, n_bars)
         except Exception:
             return []
 
+    async def _candle_snapshot(
+        self,
+        coin: str,
+        interval: str,
+        n_bars: int,
+        report: Optional[BulkReport] = None,
+    ) -> list[dict]:
+        bar_ms = INTERVAL_MS.get(interval, 3_600_000)
+        # Whole seconds, so concurrent identical fetches share one request
+        end_ms = -(-int(time.time() * 1000) // 1000) * 1000
+        start_ms = end_ms - bar_ms * (n_bars + 2)   # +2 buffer for boundary bars
+        data = await self._post({
+            "type": "candleSnapshot",
+            "req": {
+                "coin": coin,
+                "interval": interval,
+                "startTime": start_ms,
+                "endTime": end_ms,
+            },
+        }, n_items=n_bars + 2, report=report)
+        return data if isinstance(data, list) else []
+
     # ── Order book ────────────────────────────────────────────────────────
 
     async def get_l2_book(self, coin: str) -> dict:
@@ -134,6 +149,32 @@ class HyperliquidRestClient:
         except Exception:
             return {}
 
+    async def _bulk(
+        self,
+        label: str,
+        coins: list[str],
+        fetch: Callable[[str, BulkReport], Any],
+        empty: Any,
+        progress: Optional[Callable[[BulkReport], None]],
+    ) -> dict:
+        report = BulkReport(label, len(coins))
+
+        async def one(coin: str):
+            try:
+                res = await fetch(coin, report)
+            except Exception:
+                res = None
+            ok = isinstance(res, type(empty))
+            report.record(ok, empty=ok and not res)
+            if progress is not None:
+                progress(report)
+            return res if ok else empty
+
+        results = await asyncio.gather(*[one(c) for c in coins])
+        if not coins and progress is not None:
+            progress(report)
+        return dict(zip(coins, results))
+
     # ── Bulk helpers ─────────────────────────────────────────────────────
 
     async def get_candles_multi(
@@ -141,32 +182,30 @@ class HyperliquidRestClient:
         coins: list[str],
         interval: str,
         n_bars: int = 50,
+        progress: Optional[Callable[[BulkReport], None]] = None,
     ) -> dict[str, list[dict]]:
         """
-        Fetch candles for multiple coins concurrently.
-        Returns {coin: [candle, ...]} — missing coins return empty list.
+        Fetch candles for multiple coins, paced by the scheduler.
+        Returns {coin: [candle, ...]} — missing coins return empty list
+        (failures are counted in the progress report).
         """
-        import asyncio
-        results = await asyncio.gather(
-            *[self.get_candle_snapshot(c, interval, n_bars) for c in coins],
-            return_exceptions=True,
+        return await self._bulk(
+            f"{interval} candles", coins,
+            lambda coin, report: self._candle_snapshot(coin, interval, n_bars, report),
+            [], progress,
         )
-        return {
-            coin: (res if isinstance(res, list) else [])
-            for coin, res in zip(coins, results)
-        }
-
-    async def get_l2_books_multi(self, coins: list[str]) -> dict[str, dict]:
-        """Fetch L2 books for multiple coins concurrently."""
-        import asyncio
-        results = await asyncio.gather(
-            *[self.get_l2_book(c) for c in coins],
-            return_exceptions=True,
+
+    async def get_l2_books_multi(
+        self,
+        coins: list[str],
+        progress: Optional[Callable[[BulkReport], None]] = None,
+    ) -> dict[str, dict]:
+        """Fetch L2 books for multiple coins, paced by the scheduler."""
+        return await self._bulk(
+            "L2 books", coins,
+            lambda coin, report: self._post({"type": "l2Book", "coin": coin}, report=report),
+            {}, progress,
         )
-        return {
-            coin: (res if isinstance(res, dict) else {})
-            for coin, res in zip(coins, results)
-        }
 
     async def close(self):
         await self._http.aclose()
@@ -0,0 +1,125 @@
+"""
+Hyperliquid Screener — JSON codec.
+
+One place for every JSON encode/decode on the screener's hot paths: WS
+frame ingest, the frontend /ws broadcaster and the REST responses.
+
+Backends:
+  orjson — used when importable (Rust encoder/decoder, ~5-10× stdlib)
+  json   — stdlib fallback, byte-for-byte what Starlette's JSONResponse emits
+
+HL_JSON_CODEC=json|orjson forces a backend; use_backend() switches at runtime
+(benchmarks, tests).
+
+Differences worth knowing: orjson writes NaN/Infinity as null where the stdlib
+backend raises (Starlette's allow_nan=False), and its float repr may pick a
+different but equivalent spelling (1e-05 vs 1e-5).
+"""
+from __future__ import annotations
+
+import json
+import os
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Callable
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # optional — stdlib fallback below
+    orjson = None
+
+
+def _default(obj: Any) -> Any:
+    """Types neither backend encodes natively (what jsonable_encoder used to handle)."""
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump(mode="json")
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if hasattr(obj, "tolist"):    # NumPy scalars and arrays
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Backends
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _json_dumps(obj: Any) -> bytes:
+    return json.dumps(
+        obj, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":"), default=_default,
+    ).encode("utf-8")
+
+
+def _json_loads(data: str | bytes) -> Any:
+    return json.loads(data)
+
+
+_BACKENDS: dict[str, tuple[Callable[[Any], bytes], Callable[[str | bytes], Any]]] = {
+    "json": (_json_dumps, _json_loads),
+}
+
+if orjson is not None:
+    _ORJSON_OPTS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+    def _orjson_dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, default=_default, option=_ORJSON_OPTS)
+
+    _BACKENDS["orjson"] = (_orjson_dumps, orjson.loads)
+
+
+_dumps: Callable[[Any], bytes]
+_loads: Callable[[str | bytes], Any]
+BACKEND: str = ""
+
+
+def use_backend(name: str) -> str:
+    """Switch the active backend; unknown / unavailable names fall back to the best available."""
+    global _dumps, _loads, BACKEND
+    if name not in _BACKENDS:
+        name = "orjson" if "orjson" in _BACKENDS else "json"
+    _dumps, _loads = _BACKENDS[name]
+    BACKEND = name
+    return name
+
+
+def available_backends() -> list[str]:
+    return list(_BACKENDS)
+
+
+use_backend(os.getenv("HL_JSON_CODEC", "orjson").lower())
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Public API
+# ─────────────────────────────────────────────────────────────────────────────
+
+def dumps(obj: Any) -> bytes:
+    """Compact UTF-8 JSON."""
+    return _dumps(obj)
+
+
+def dumps_str(obj: Any) -> str:
+    """Compact JSON as str (WS text frames)."""
+    return _dumps(obj).decode("utf-8")
+
+
+def loads(data: str | bytes) -> Any:
+    return _loads(data)
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered through the active codec backend.
+
+    Return it directly from an endpoint (return FastJSONResponse(payload)) to
+    also skip FastAPI's jsonable_encoder walk over the payload.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return _dumps(content)
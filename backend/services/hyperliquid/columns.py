@@ -0,0 +1,280 @@
+"""
+Hyperliquid Screener — columnar asset table.
+
+AssetTable backs HyperliquidState.assets.  It behaves like the plain
+dict[str, ScreenerAsset] it replaces (get / [] / items / values / len / in),
+but the numeric fields that WebSocket ticks touch are held in a preallocated
+NumPy struct-of-arrays indexed by a coin → slot map:
+
+  _data[field_idx, slot]   float64, NaN = None
+
+WS patch functions write straight into those columns and flag the slot dirty.
+A ScreenerAsset is only rebuilt (one model_copy) when somebody actually reads
+that coin, and the rebuilt model is cached until the next patch.  An allMids
+frame therefore costs a handful of vectorized array ops instead of several
+hundred Pydantic reallocations.
+
+Non-live fields (other scores, flags, tags, metadata) stay on the cached model and
+are replaced wholesale through table[coin] = asset, exactly as before.
+"""
+from __future__ import annotations
+
+from collections.abc import MutableMapping
+from typing import Iterator, Optional
+
+import numpy as np
+
+from .models import ScreenerAsset
+
+# Fields patched by the WS consumer.  Order is the row order in _data.
+LIVE_FIELDS: tuple[str, ...] = (
+    # Price surface
+    "mark_px",
+    "mid_px",
+    "oracle_px",
+    "bid_px",
+    "ask_px",
+    "spread_abs",
+    "spread_bps",
+    "prev_day_px",
+    "pct_change_24h",
+    "momentum_24h",
+    # Perp ctx
+    "funding",
+    "premium",
+    "open_interest",
+    "open_interest_usd",
+    "day_ntl_vlm",
+    "day_base_vlm",
+    # Dislocation
+    "distance_mark_oracle_pct",
+    "distance_mark_mid_pct",
+    "distance_mark_prev_day_pct",
+    # Book
+    "orderbook_bid_depth",
+    "orderbook_ask_depth",
+    "orderbook_imbalance",
+    # Trade flow
+    "recent_trade_count",
+    "recent_trade_buy_volume",
+    "recent_trade_sell_volume",
+    "recent_trade_imbalance",
+    "recent_trade_vwap",
+    "trade_imbalance_1m",
+    "trade_imbalance_15m",
+    # Snapshot-history changes (written a column at a time, see history.py)
+    "oi_change_5m",
+    "oi_change_15m",
+    "oi_change_1h",
+    "oi_change_4h",
+    "oi_change_24h",
+    "score_change",
+    # Scores read column-wide by the snapshot-history writers
+    "composite_signal_score",
+    # Bookkeeping
+    "last_updated_ts",
+)
+
+FIELD_INDEX: dict[str, int] = {f: i for i, f in enumerate(LIVE_FIELDS)}
+
+# Non-Optional model fields: NaN must never leak into these
+_NON_NULL_DEFAULTS: dict[str, float] = {
+    "recent_trade_count": 0,
+    "last_updated_ts": 0.0,
+}
+
+_INITIAL_CAPACITY = 512
+
+
+def _nan_if_none(v) -> float:
+    return np.nan if v is None else float(v)
+
+
+class AssetTable(MutableMapping):
+    """
+    dict-compatible {coin: ScreenerAsset} with a columnar live-field store.
+
+    Hot-path API (used by normalizer.py):
+      slot(coin)              → int | None
+      slots(coins)            → (coins_found, int ndarray)
+      col(field)              → writable float64 view of one column
+      value(slot, field)      → float | None
+      patch(slot, **fields)   → write scalars + mark dirty
+      touch(slots)            → mark an index array dirty after direct column writes
+
+    generation is bumped by every write path (patch / touch / set / delete), so
+    readers can cache anything derived from the table and compare a single int
+    to know whether it is still current.
+    """
+
+    def __init__(self, capacity: int = _INITIAL_CAPACITY, generation: int = 0):
+        self.generation = generation
+        self._slot_of: dict[str, int] = {}
+        self._coins: list[Optional[str]] = []
+        self._rows: list[Optional[ScreenerAsset]] = []
+        self._free: list[int] = []
+        self._cap = capacity
+        self._data = np.full((len(LIVE_FIELDS), capacity), np.nan)
+        self._dirty = np.zeros(capacity, dtype=bool)
+        self._is_perp = np.zeros(capacity, dtype=bool)
+
+    # ── Slot management ───────────────────────────────────────────────────
+
+    def _grow(self):
+        new_cap = self._cap * 2
+        data = np.full((len(LIVE_FIELDS), new_cap), np.nan)
+        data[:, : self._cap] = self._data
+        self._data = data
+        for name in ("_dirty", "_is_perp"):
+            old = getattr(self, name)
+            arr = np.zeros(new_cap, dtype=bool)
+            arr[: self._cap] = old
+            setattr(self, name, arr)
+        self._cap = new_cap
+
+    def _alloc(self, coin: str) -> int:
+        if self._free:
+            slot = self._free.pop()
+            self._coins[slot] = coin
+            self._rows[slot] = None
+        else:
+            slot = len(self._coins)
+            if slot >= self._cap:
+                self._grow()
+            self._coins.append(coin)
+            self._rows.append(None)
+        self._slot_of[coin] = slot
+        return slot
+
+    def slot(self, coin: str) -> Optional[int]:
+        return self._slot_of.get(coin)
+
+    def slots(self, coins) -> tuple[list[str], np.ndarray]:
+        """Resolve many coins at once; unknown coins are dropped."""
+        lookup = self._slot_of
+        found = [c for c in coins if c in lookup]
+        return found, np.fromiter((lookup[c] for c in found), dtype=np.intp, count=len(found))
+
+    # ── Column access ─────────────────────────────────────────────────────
+
+    def col(self, field: str) -> np.ndarray:
+        """
+        Writable view of one live column.  Do not hold on to it across
+        inserts — the backing array is reallocated when the table grows.
+        """
+        return self._data[FIELD_INDEX[field]]
+
+    def value(self, slot: int, field: str) -> Optional[float]:
+        v = self._data[FIELD_INDEX[field], slot]
+        return None if v != v else float(v)
+
+    def patch(self, slot: int, **fields):
+        """Write live scalar fields for one slot (None → NaN) and mark it dirty."""
+        data = self._data
+        for field, v in fields.items():
+            data[FIELD_INDEX[field], slot] = np.nan if v is None else v
+        self._dirty[slot] = True
+        self.generation += 1
+
+    def touch(self, slots: np.ndarray):
+        self._dirty[slots] = True
+        self.generation += 1
+
+    # ── Materialization ───────────────────────────────────────────────────
+
+    def _materialize(self, slot: int) -> ScreenerAsset:
+        asset = self._rows[slot]
+        if self._dirty[slot]:
+            raw = self._data[:, slot].tolist()
+            update = {f: (None if v != v else v) for f, v in zip(LIVE_FIELDS, raw)}
+            for f, default in _NON_NULL_DEFAULTS.items():
+                if update[f] is None:
+                    update[f] = default
+            update["recent_trade_count"] = int(update["recent_trade_count"])
+            asset = asset.model_copy(update=update)
+            self._rows[slot] = asset
+            self._dirty[slot] = False
+        return asset
+
+    def _store(self, slot: int, asset: ScreenerAsset):
+        self._rows[slot] = asset
+        self._data[:, slot] = [_nan_if_none(getattr(asset, f)) for f in LIVE_FIELDS]
+        self._dirty[slot] = False
+        self._is_perp[slot] = asset.market_type == "perp"
+
+    # ── MutableMapping protocol ───────────────────────────────────────────
+
+    def __getitem__(self, coin: str) -> ScreenerAsset:
+        return self._materialize(self._slot_of[coin])
+
+    def __setitem__(self, coin: str, asset: ScreenerAsset):
+        slot = self._slot_of.get(coin)
+        if slot is None:
+            slot = self._alloc(coin)
+        self._store(slot, asset)
+        self.generation += 1
+
+    def __delitem__(self, coin: str):
+        slot = self._slot_of.pop(coin)
+        self._coins[slot] = None
+        self._rows[slot] = None
+        self._data[:, slot] = np.nan
+        self._dirty[slot] = False
+        self._is_perp[slot] = False
+        self._free.append(slot)
+        self.generation += 1
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._slot_of))
+
+    def __len__(self) -> int:
+        return len(self._slot_of)
+
+    def __contains__(self, coin) -> bool:
+        return coin in self._slot_of
+
+    def get(self, coin: str, default=None):
+        slot = self._slot_of.get(coin)
+        return default if slot is None else self._materialize(slot)
+
+    def values(self) -> list[ScreenerAsset]:
+        return [self._materialize(s) for s in list(self._slot_of.values())]
+
+    def items(self) -> list[tuple[str, ScreenerAsset]]:
+        return [(c, self._materialize(s)) for c, s in list(self._slot_of.items())]
+
+    def keys(self) -> list[str]:
+        return list(self._slot_of)
+
+    def clear(self):
+        self.__init__(self._cap, self.generation + 1)
+
+    # ── Column-native queries ─────────────────────────────────────────────
+
+    def coins_and_slots(self) -> tuple[list[str], np.ndarray]:
+        """All coins and their slots, in insertion order."""
+        return list(self._slot_of), np.fromiter(self._slot_of.values(), dtype=np.intp,
+                                                count=len(self._slot_of))
+
+    def perps(self) -> tuple[list[str], np.ndarray]:
+        """All perp coins and their slots, in insertion order."""
+        idx = np.fromiter(self._slot_of.values(), dtype=np.intp, count=len(self._slot_of))
+        idx = idx[self._is_perp[idx]]
+        coins = self._coins
+        return [coins[s] for s in idx.tolist()], idx
+
+    def top_perps_by(self, field: str, n: int) -> list[str]:
+        """Top-n perp coins by a live column (None counts as 0), descending."""
+        # Walk slots in insertion order so ties break exactly like the old
+        # dict-backed list.sort did.
+        idx = np.fromiter(self._slot_of.values(), dtype=np.intp, count=len(self._slot_of))
+        idx = idx[self._is_perp[idx]]
+        if idx.size == 0:
+            return []
+        vals = np.nan_to_num(self._data[FIELD_INDEX[field], idx], nan=0.0)
+        order = np.argsort(-vals, kind="stable")[:n]
+        coins = self._coins
+        return [coins[s] for s in idx[order].tolist()]
+
+    def dirty_count(self) -> int:
+        return int(self._dirty.sum())
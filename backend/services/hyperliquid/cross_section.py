@@ -0,0 +1,94 @@
+"""
+Hyperliquid Screener — vectorized cross-sectional ranking.
+
+Universe-wide statistics computed over NumPy columns instead of per-asset
+Python loops:
+  - Percentile ranks (volume, OI, |funding|, volatility): each population is
+    sorted once and searchsorted gives every asset's "count strictly below"
+    in O(n log n) rather than one O(n) scan per asset.
+  - Mode composites: one weighted column sum per ranking mode over a score
+    matrix that is built once for every mode requested.
+
+Results are identical to the scalar formulas they replace — same strict "<"
+count, same accumulation order for the weighted sums, and Python round() for
+the stored 3-dp percentiles.
+"""
+from __future__ import annotations
+
+from typing import Optional
+
+import numpy as np
+
+from .models import ScreenerAsset
+
+# percentile field → source field on ScreenerAsset
+PERCENTILE_FIELDS: tuple[tuple[str, str], ...] = (
+    ("volume_percentile",     "day_ntl_vlm"),
+    ("oi_percentile",         "open_interest_usd"),
+    ("funding_percentile",    "funding"),
+    ("volatility_percentile", "realized_volatility_medium"),
+)
+
+
+def _column(assets: list[ScreenerAsset], field: str) -> np.ndarray:
+    """One model field as float64 (None → NaN)."""
+    return np.array([getattr(a, field) for a in assets], dtype=float)
+
+
+def percentile_ranks(values: np.ndarray, population: np.ndarray) -> np.ndarray:
+    """Fraction of population strictly below each value (0..1); 0.5 if population is empty."""
+    if population.size == 0:
+        return np.full(values.shape, 0.5)
+    below = np.searchsorted(np.sort(population), values, side="left")
+    return below / population.size
+
+
+def universe_percentiles(perps: list[ScreenerAsset]) -> dict[str, list[Optional[float]]]:
+    """
+    Percentile ranks for every perp across the perp universe.
+
+    Returns {percentile_field: [value per asset]} rounded to 3 dp; an entry is
+    None where the asset's own metric is None (no rank is assigned).
+    Funding ranks |funding|, with missing funding counted as 0 in the population.
+    """
+    n = len(perps)
+    out: dict[str, list[Optional[float]]] = {}
+    for pct_field, src in PERCENTILE_FIELDS:
+        values = _column(perps, src)
+        has = ~np.isnan(values)
+        if src == "funding":
+            values = np.abs(values)
+            population = np.where(has, values, 0.0)
+        else:
+            population = values[has]
+        if population.size == 0 or not has.any():
+            out[pct_field] = [None] * n
+            continue
+        pct = percentile_ranks(np.where(has, values, 0.0), population)
+        out[pct_field] = [round(p, 3) if h else None for p, h in zip(pct.tolist(), has.tolist())]
+    return out
+
+
+def mode_composites(
+    assets: list[ScreenerAsset],
+    modes: dict[str, dict[str, float]],
+) -> dict[str, np.ndarray]:
+    """
+    Mode-weighted composite score per asset for each {mode: {score_field: weight}}.
+
+    Missing or zero component scores count as 50 (neutral); the weighted sum
+    is accumulated in weight order and clipped to 0..100.
+    """
+    fields = list(dict.fromkeys(f for weights in modes.values() for f in weights))
+    matrix = {}
+    for field in fields:
+        col = np.nan_to_num(_column(assets, field), nan=0.0)
+        matrix[field] = np.where(col == 0.0, 50.0, col)
+
+    out: dict[str, np.ndarray] = {}
+    for mode, weights in modes.items():
+        total = np.zeros(len(assets))
+        for field, w in weights.items():
+            total += matrix[field] * w
+        out[mode] = np.clip(total, 0, 100)
+    return out
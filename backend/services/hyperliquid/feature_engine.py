@@ -14,12 +14,18 @@ Computes all derived market signals from the normalized asset data:
 """
 from __future__ import annotations
 
+import asyncio
 import math
 import time
 from typing import Optional
 
+import numpy as np
+
+from .candles import CLOSE, HIGH, LOW, OPEN, VOLUME, present, value_or_zero
+from .cross_section import universe_percentiles
+from .metrics import NULL_CLOCK, Clock
 from .models import ScreenerAsset
-from .state import HyperliquidState
+from .state import DIRTY_CANDLES, HyperliquidState
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -78,25 +84,18 @@ def _linear_slope(values: list[float]) -> float:
     return (n * sxy - sx * sy) / denom
 
 
-def _percentile_rank(value: float, population: list[float]) -> float:
-    """Percentile rank of value in population (0..1)."""
-    if not population:
-        return 0.5
-    below = sum(1 for v in population if v < value)
-    return below / len(population)
-
-
 # ─────────────────────────────────────────────────────────────────────────────
 # Per-asset feature computation
 # ─────────────────────────────────────────────────────────────────────────────
 
 def compute_candle_features(
     asset: ScreenerAsset,
-    candles_1h: list[dict],
-    candles_5m: list[dict],
+    candles_1h: np.ndarray,
+    candles_5m: np.ndarray,
 ) -> dict:
     """
-    Compute volatility and momentum features from candle data.
+    Compute volatility and momentum features from candle rows
+    (state.candle_window views; columns per candles.py).
     Returns a partial dict suitable for model_copy(update=...).
     """
     updates: dict = {}
@@ -104,7 +103,7 @@ def compute_candle_features(
     # ── Realized volatility ────────────────────────────────────────────────
     # Short: from 5m candles over ~1h (12 bars of 5m)
     if len(candles_5m) >= 4:
-        closes_5m = [float(c["c"]) for c in candles_5m[-24:] if c.get("c")]
+        closes_5m = present(candles_5m[-24:, CLOSE])
         rets_5m = _returns(closes_5m)
         # 5m bars → periods_per_year = 365 * 24 * 12 = 105120
         rv_short = _annualized_vol(rets_5m, periods_per_year=105120)
@@ -113,7 +112,7 @@ def compute_candle_features(
 
     # Medium: from 1h candles over ~24h (24 bars)
     if len(candles_1h) >= 4:
-        closes_1h = [float(c["c"]) for c in candles_1h[-48:] if c.get("c")]
+        closes_1h = present(candles_1h[-48:, CLOSE])
         rets_1h = _returns(closes_1h)
         rv_medium = _annualized_vol(rets_1h, periods_per_year=8760)
         if rv_medium is not None:
@@ -122,22 +121,22 @@ def compute_candle_features(
     # ── Momentum ───────────────────────────────────────────────────────────
     # 5m momentum: last close vs 1 bar ago (5m)
     if len(candles_5m) >= 2:
-        c_now  = float(candles_5m[-1].get("c", 0) or 0)
-        c_prev = float(candles_5m[-2].get("c", 0) or 0)
+        c_now  = value_or_zero(candles_5m[-1, CLOSE])
+        c_prev = value_or_zero(candles_5m[-2, CLOSE])
         if c_prev > 0:
             updates["momentum_5m"] = round((c_now - c_prev) / c_prev * 100, 4)
 
     # 1h momentum: last 1h close vs 1 bar ago
     if len(candles_1h) >= 2:
-        c_now  = float(candles_1h[-1].get("c", 0) or 0)
-        c_prev = float(candles_1h[-2].get("c", 0) or 0)
+        c_now  = value_or_zero(candles_1h[-1, CLOSE])
+        c_prev = value_or_zero(candles_1h[-2, CLOSE])
         if c_prev > 0:
             updates["momentum_1h"] = round((c_now - c_prev) / c_prev * 100, 4)
 
     # 4h momentum: last close vs close 4 bars ago in 1h candles
     if len(candles_1h) >= 5:
-        c_now  = float(candles_1h[-1].get("c", 0) or 0)
-        c_4ago = float(candles_1h[-5].get("c", 0) or 0)
+        c_now  = value_or_zero(candles_1h[-1, CLOSE])
+        c_4ago = value_or_zero(candles_1h[-5, CLOSE])
         if c_4ago > 0:
             updates["momentum_4h"] = round((c_now - c_4ago) / c_4ago * 100, 4)
 
@@ -145,7 +144,7 @@ def compute_candle_features(
     # Compare last 1h candle volume vs rolling average of prior N candles.
     # impulse > 1.0 = elevated volume, < 1.0 = quiet
     if len(candles_1h) >= 6:
-        vol_series = [float(c.get("v", 0) or 0) for c in candles_1h if c.get("v")]
+        vol_series = present(candles_1h[:, VOLUME])
         if vol_series and vol_series[-1] > 0:
             prior_avg = sum(vol_series[-7:-1]) / max(len(vol_series[-7:-1]), 1)
             if prior_avg > 0:
@@ -154,16 +153,16 @@ def compute_candle_features(
     return updates
 
 
-def compute_volume_impulse_5m(candles_5m: list[dict]) -> dict:
+def compute_volume_impulse_5m(candles_5m: np.ndarray) -> dict:
     """
-    Compute short-term volume impulse from 5m candle data.
+    Compute short-term volume impulse from 5m candle rows.
     Returns volume_impulse_5m (last bar vs rolling avg) and
     volume_impulse_15m (last 3 bars' sum vs rolling avg of prior 12 bars).
     """
     if len(candles_5m) < 6:
         return {}
 
-    vols = [float(c.get("v", 0) or 0) for c in candles_5m if c.get("v") is not None]
+    vols = present(candles_5m[:, VOLUME])
     if not vols or len(vols) < 6:
         return {}
 
@@ -499,34 +498,14 @@ def compute_scores(asset: ScreenerAsset) -> dict:
 # Structural quality + regime classification
 # ─────────────────────────────────────────────────────────────────────────────
 
-def compute_structural_quality(asset: ScreenerAsset, candles_1h: list[dict]) -> dict:
+def compute_structural_factors(candles_1h: np.ndarray) -> dict:
     """
-    Compute structural quality score and asset regime from 1h candle history.
-
-    With up to 200 1h bars (~8 days) we approximate multi-day structure:
-      - Long-window OLS slope (last 100 bars ≈ 4 days) → trend direction & strength
-      - Short-window OLS slope (last 24 bars ≈ 1 day)  → recent momentum vs HT trend
-      - Pct of bars above rolling median               → proxy for "above trend"
-      - Higher-high / higher-low in synthetic 4h bars  → HH/HL persistence
-      - Range tightening                               → base/consolidation quality
-      - Momentum persistence (green bars ratio)        → sustained vs spike
+    Candle-only half of compute_structural_quality().
 
-    Returns a dict of new fields for model_copy(update=...).
+    Depends on nothing but the 1h candle history, so the incremental feature
+    pass caches the result per coin and only recomputes it when new 1h
+    candles arrive.
     """
-    ex   = asset.exhaustion_score    or 0
-    cr   = asset.collapse_risk_score or 0
-    liq  = asset.liquidity_score     or 50
-    tp   = asset.tradability_penalty or 30
-    flow = asset.flow_score          or 50
-    mom  = asset.momentum_score      or 50
-    vlm  = asset.day_ntl_vlm        or 0
-
-    liq_quality = _clip(
-        liq * 0.60 + (100 - tp) * 0.30 +
-        (_clip(math.log10(vlm + 1) / math.log10(1e9) * 100, 0, 100)) * 0.10,
-        0, 100
-    )
-
     slope_long_norm  = 0.0
     slope_short_norm = 0.0
     range_tightening = 0.5
@@ -534,10 +513,10 @@ def compute_structural_quality(asset: ScreenerAsset, candles_1h: list[dict]) ->
     sq_score         = 50.0
 
     if len(candles_1h) >= 20:
-        closes = [float(c["c"]) for c in candles_1h if c.get("c")]
-        highs  = [float(c["h"]) for c in candles_1h if c.get("h")]
-        lows   = [float(c["l"]) for c in candles_1h if c.get("l")]
-        opens  = [float(c["o"]) for c in candles_1h if c.get("o")]
+        closes = present(candles_1h[:, CLOSE])
+        highs  = present(candles_1h[:, HIGH])
+        lows   = present(candles_1h[:, LOW])
+        opens  = present(candles_1h[:, OPEN])
         n = len(closes)
 
         if n >= 20:
@@ -595,6 +574,58 @@ def compute_structural_quality(asset: ScreenerAsset, candles_1h: list[dict]) ->
             ], default=50.0)
             sq_score = _clip(sq_raw, 0, 100)
 
+    return {
+        "slope_long_norm":  slope_long_norm,
+        "slope_short_norm": slope_short_norm,
+        "range_tightening": range_tightening,
+        "hh_hl_score":      hh_hl_score,
+        "sq_score":         sq_score,
+    }
+
+
+def compute_structural_quality(
+    asset: ScreenerAsset,
+    candles_1h: np.ndarray,
+    factors: Optional[dict] = None,
+) -> dict:
+    """
+    Compute structural quality score and asset regime from 1h candle history.
+
+    With up to 200 1h bars (~8 days) we approximate multi-day structure:
+      - Long-window OLS slope (last 100 bars ≈ 4 days) → trend direction & strength
+      - Short-window OLS slope (last 24 bars ≈ 1 day)  → recent momentum vs HT trend
+      - Pct of bars above rolling median               → proxy for "above trend"
+      - Higher-high / higher-low in synthetic 4h bars  → HH/HL persistence
+      - Range tightening                               → base/consolidation quality
+      - Momentum persistence (green bars ratio)        → sustained vs spike
+
+    factors: precomputed compute_structural_factors(candles_1h) — pass it to
+    skip re-deriving the candle factors when the history hasn't changed.
+
+    Returns a dict of new fields for model_copy(update=...).
+    """
+    ex   = asset.exhaustion_score    or 0
+    cr   = asset.collapse_risk_score or 0
+    liq  = asset.liquidity_score     or 50
+    tp   = asset.tradability_penalty or 30
+    flow = asset.flow_score          or 50
+    mom  = asset.momentum_score      or 50
+    vlm  = asset.day_ntl_vlm        or 0
+
+    liq_quality = _clip(
+        liq * 0.60 + (100 - tp) * 0.30 +
+        (_clip(math.log10(vlm + 1) / math.log10(1e9) * 100, 0, 100)) * 0.10,
+        0, 100
+    )
+
+    if factors is None:
+        factors = compute_structural_factors(candles_1h)
+    slope_long_norm  = factors["slope_long_norm"]
+    slope_short_norm = factors["slope_short_norm"]
+    range_tightening = factors["range_tightening"]
+    hh_hl_score      = factors["hh_hl_score"]
+    sq_score         = factors["sq_score"]
+
     # ── Asset regime classification ────────────────────────────────────────
     # Thresholds tuned so the regime is meaningful with 1h-bar proxies
     long_uptrend   = slope_long_norm  >  0.15   # clear multi-day uptrend
@@ -713,23 +744,14 @@ def compute_universe_ranks(assets: list[ScreenerAsset]) -> list[ScreenerAsset]:
 
     result_map: dict[str, ScreenerAsset] = {}
 
-    # Population vectors for percentile ranks
-    vlm_pop  = [a.day_ntl_vlm         for a in perps if a.day_ntl_vlm         is not None]
-    oi_pop   = [a.open_interest_usd   for a in perps if a.open_interest_usd   is not None]
-    fund_pop = [abs(a.funding or 0)   for a in perps]
-    vol_pop  = [a.realized_volatility_medium for a in perps if a.realized_volatility_medium is not None]
-
-    for asset in perps:
-        updates: dict = {}
-        if asset.day_ntl_vlm            is not None and vlm_pop:
-            updates["volume_percentile"]      = round(_percentile_rank(asset.day_ntl_vlm,           vlm_pop),  3)
-        if asset.open_interest_usd       is not None and oi_pop:
-            updates["oi_percentile"]          = round(_percentile_rank(asset.open_interest_usd,      oi_pop),   3)
-        if asset.funding                 is not None and fund_pop:
-            updates["funding_percentile"]     = round(_percentile_rank(abs(asset.funding),           fund_pop), 3)
-        if asset.realized_volatility_medium is not None and vol_pop:
-            updates["volatility_percentile"]  = round(_percentile_rank(asset.realized_volatility_medium, vol_pop), 3)
-        result_map[asset.coin] = asset.model_copy(update=updates)
+    # Percentile ranks for the whole perp universe in one vectorized pass
+    pcts = universe_percentiles(perps)
+
+    for i, asset in enumerate(perps):
+        updates = {f: vals[i] for f, vals in pcts.items() if vals[i] is not None}
+        # Unchanged ranks keep the same object so callers can skip the write-back
+        changed = any(getattr(asset, k) != v for k, v in updates.items())
+        result_map[asset.coin] = asset.model_copy(update=updates) if changed else asset
 
     # Spot: minimal scoring (score already set by compute_scores)
     for asset in spots:
@@ -773,60 +795,148 @@ def _weighted_avg(parts: list[tuple[str, float, float]], default: float = 50.0)
 
 
 # ─────────────────────────────────────────────────────────────────────────────
-# Full feature pass over all state assets
+# Feature passes over state assets (full + dirty-set incremental)
 # ─────────────────────────────────────────────────────────────────────────────
 
+def _featurize_asset(
+    state: HyperliquidState,
+    coin: str,
+    asset: ScreenerAsset,
+    candles_changed: bool,
+    clock: Clock = NULL_CLOCK,
+) -> ScreenerAsset:
+    """
+    Run the per-asset feature chain for one coin.
+
+    Candle-derived features are served from state.candle_features unless the
+    coin's candles changed (or it has never been featurized); scores and
+    structural quality are always recomputed from the current live fields.
+    clock gets a lap per stage (candle_features / scores / structural).
+    """
+    cached = state.candle_features.get(coin)
+    if cached is None or candles_changed:
+        # Fetch more 1h candles for structural quality analysis (≤120 bars ≈ 5 days)
+        candles_1h = state.candle_window(coin, "1h", n=120)
+        candles_5m = state.candle_window(coin, "5m", n=50)
+        cached = {
+            "candle":     compute_candle_features(asset, candles_1h, candles_5m),
+            # 5m volume impulse from 5m candle series
+            "vol_5m":     compute_volume_impulse_5m(candles_5m),
+            "structural": compute_structural_factors(candles_1h),
+        }
+        state.candle_features[coin] = cached
+
+    candle_feats = {**cached["candle"], **cached["vol_5m"]}
+    if candle_feats:
+        asset = asset.model_copy(update=candle_feats)
+    clock.lap("candle_features")
+
+    score_feats = compute_scores(asset)
+    if score_feats:
+        asset = asset.model_copy(update=score_feats)
+    clock.lap("scores")
+
+    # Structural quality + regime (uses existing scores + cached candle factors)
+    struct_feats = compute_structural_quality(asset, [], factors=cached["structural"])
+    if struct_feats:
+        asset = asset.model_copy(update=struct_feats)
+    clock.lap("structural")
+
+    return asset
+
+
+def _in_universe(state: HyperliquidState, coin: str) -> bool:
+    return not state.universe_allowlist or coin in state.universe_allowlist
+
+
+def _apply_universe_ranks(state: HyperliquidState):
+    """Universe-wide pass (percentile ranks) over every scored asset."""
+    scored = {c: a for c, a in state.assets.items() if _in_universe(state, c)}
+    for ranked in compute_universe_ranks(list(scored.values())):
+        if ranked is not scored[ranked.coin]:
+            state.assets[ranked.coin] = ranked
+
+
 def run_full_feature_pass(state: HyperliquidState):
     """
     Compute all features for every asset in state.
     Mutates state.assets in place.
     Should be called:
       - after boot candle/book data is loaded
-      - periodically (every ~60s) to refresh scores
+      - after bulk universe changes (HIP-3 admission)
+    The periodic refresh uses run_incremental_feature_pass() instead.
 
     Universe gate: only assets in state.universe_allowlist are scored.
     Any asset not in the allowlist (should not exist post-boot, but guarded
     defensively) is skipped and not included in percentile calculations.
     """
-    updated: list[ScreenerAsset] = []
+    t0 = time.perf_counter()
+    clock = state.metrics.clock()
+    # Everything is recomputed below — pending dirty marks are satisfied
+    state.take_dirty()
+    updated = 0
     skipped_non_universe = 0
 
     for coin, asset in list(state.assets.items()):
         # ── Universe gate ────────────────────────────────────────────────
-        if state.universe_allowlist and coin not in state.universe_allowlist:
+        if not _in_universe(state, coin):
             skipped_non_universe += 1
             continue
-        # Fetch more 1h candles for structural quality analysis (≤120 bars ≈ 5 days)
-        candles_1h = state.get_candles(coin, "1h", n=120)
-        candles_5m = state.get_candles(coin, "5m", n=50)
+        state.assets[coin] = _featurize_asset(state, coin, asset, candles_changed=True, clock=clock)
+        updated += 1
 
-        candle_feats = compute_candle_features(asset, candles_1h, candles_5m)
-        if candle_feats:
-            asset = asset.model_copy(update=candle_feats)
+    clock.restart()
+    _apply_universe_ranks(state)
+    clock.lap("universe_ranks")
+    state.features_updated()
+    clock.lap("listeners")
+    state.metrics.record_pass("full", time.perf_counter() - t0, clock)
 
-        # 5m volume impulse from 5m candle series
-        vol_5m_feats = compute_volume_impulse_5m(candles_5m)
-        if vol_5m_feats:
-            asset = asset.model_copy(update=vol_5m_feats)
+    if skipped_non_universe:
+        print(f"[HL][feature] Skipped {skipped_non_universe} non-universe assets during feature pass")
 
-        score_feats = compute_scores(asset)
-        if score_feats:
-            asset = asset.model_copy(update=score_feats)
+    return updated
 
-        # Structural quality + regime (uses existing scores + candle history)
-        struct_feats = compute_structural_quality(asset, candles_1h)
-        if struct_feats:
-            asset = asset.model_copy(update=struct_feats)
 
-        state.assets[coin] = asset
-        updated.append(asset)
+async def run_incremental_feature_pass(state: HyperliquidState, yield_every: int = 64) -> int:
+    """
+    Recompute features only for coins whose inputs changed since the last pass.
 
-    # Universe-wide pass (percentile ranks + composite)
-    ranked = compute_universe_ranks(updated)
-    for asset in ranked:
-        state.assets[asset.coin] = asset
+    Drains state.dirty: coins with new candles get their candle features
+    rebuilt, coins with new ctx / mids / book / trade / OI data are re-scored
+    from cached candle features, untouched coins keep their previous row.
+    Percentile ranks are then recomputed once over the merged universe.
 
-    if skipped_non_universe:
-        print(f"[HL][feature] Skipped {skipped_non_universe} non-universe assets during feature pass")
-
-    return len(updated)
+    Each asset is read, featurized and written back without an await in
+    between, so a WS patch can never be overwritten by a stale row; the loop
+    yields to the event loop every `yield_every` assets.
+    """
+    t0 = time.perf_counter()
+    clock = state.metrics.clock()
+    dirty = state.take_dirty()
+    candles_changed = dirty.get(DIRTY_CANDLES, set())
+    coins: set[str] = set().union(*dirty.values()) if dirty else set()
+    # Assets admitted since the last pass have never been featurized
+    coins.update(c for c in state.assets if c not in state.candle_features)
+
+    updated = 0
+    for coin in coins:
+        if not _in_universe(state, coin):
+            continue
+        asset = state.assets.get(coin)
+        if asset is None:
+            continue
+        state.assets[coin] = _featurize_asset(state, coin, asset, coin in candles_changed, clock)
+        updated += 1
+        if updated % yield_every == 0:
+            await asyncio.sleep(0)
+            clock.restart()
+
+    if updated:
+        clock.restart()
+        _apply_universe_ranks(state)
+        clock.lap("universe_ranks")
+        state.features_updated()
+        clock.lap("listeners")
+        state.metrics.record_pass("incremental", time.perf_counter() - t0, clock)
+    return updated
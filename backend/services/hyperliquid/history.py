@@ -0,0 +1,164 @@
+"""
+Hyperliquid Screener — universe-wide snapshot history.
+
+OI and composite-score snapshots are taken for every coin at the same
+moment (~60s apart), so a history is stored as one timestamp vector plus a
+value matrix with a row per snapshot and a column per coin:
+
+  ts       float64[rows]          snapshot times, increasing
+  values   float64[rows, coins]   NaN = coin had no value at that snapshot
+
+As-of lookups are a binary search over the timestamps, and a whole horizon
+("OI 1h ago for every perp") is one row gather, so change computations are
+vectorized across the universe instead of scanning per-coin deques.
+
+Like CandleRing, rows live in a 2×capacity block written append-only and
+moved back to the front when the write head reaches the end, so the live
+window is always a contiguous slice.
+"""
+from __future__ import annotations
+
+from typing import Optional
+
+import numpy as np
+
+# Change horizons: field → (min age, max age) in seconds of the snapshot a
+# change is measured against.  The newest snapshot at least `min age` old is
+# used, if it is no older than `max age`.
+OI_CHANGE_WINDOWS: dict[str, tuple[float, float]] = {
+    "oi_change_5m":  (270,    450),
+    "oi_change_15m": (810,    1_200),
+    "oi_change_1h":  (3_300,  4_500),
+    "oi_change_4h":  (13_800, 15_600),
+    "oi_change_24h": (84_600, 88_200),
+}
+
+_INITIAL_COLUMNS = 256
+
+
+class SnapshotHistory:
+    """Fixed-capacity snapshot rows (ts + one value per coin)."""
+
+    def __init__(self, capacity: int, min_spacing_s: float = 0.0):
+        self.capacity = capacity
+        self.min_spacing_s = min_spacing_s
+        self._col_of: dict[str, int] = {}
+        self._ts = np.empty(2 * capacity)
+        self._values = np.full((2 * capacity, _INITIAL_COLUMNS), np.nan)
+        self._lo = 0
+        self._hi = 0
+
+    def __len__(self) -> int:
+        return self._hi - self._lo
+
+    @property
+    def coins(self) -> list[str]:
+        return list(self._col_of)
+
+    @property
+    def last_ts(self) -> Optional[float]:
+        return float(self._ts[self._hi - 1]) if self._hi > self._lo else None
+
+    def timestamps(self) -> np.ndarray:
+        view = self._ts[self._lo:self._hi]
+        view.flags.writeable = False
+        return view
+
+    # ── Writes ────────────────────────────────────────────────────────────
+
+    def _columns(self, coins: list[str]) -> np.ndarray:
+        """Column index per coin, allocating columns for new coins."""
+        col_of = self._col_of
+        cols = [col_of.get(c) for c in coins]
+        if None in cols:
+            for i, (coin, col) in enumerate(zip(coins, cols)):
+                if col is None:
+                    cols[i] = col_of.setdefault(coin, len(col_of))
+            width = self._values.shape[1]
+            if len(col_of) > width:
+                while width < len(col_of):
+                    width *= 2
+                values = np.full((2 * self.capacity, width), np.nan)
+                values[:, :self._values.shape[1]] = self._values
+                self._values = values
+        return np.array(cols, dtype=np.intp)
+
+    def record(self, ts: float, coins: list[str], values: np.ndarray) -> bool:
+        """
+        Append one snapshot; coins not listed are NaN in it.  Skipped (returns
+        False) when it is closer than min_spacing_s to the previous one.
+        """
+        last = self.last_ts
+        if last is not None and ts - last < self.min_spacing_s:
+            return False
+        cols = self._columns(coins)
+        if self._hi == 2 * self.capacity:
+            keep = self.capacity - 1
+            self._ts[:keep] = self._ts[self._hi - keep:self._hi]
+            self._values[:keep] = self._values[self._hi - keep:self._hi]
+            self._lo, self._hi = 0, keep
+        row = self._hi
+        self._ts[row] = ts
+        self._values[row] = np.nan
+        self._values[row, cols] = values
+        self._hi += 1
+        self._lo = max(self._lo, self._hi - self.capacity)
+        return True
+
+    def load(self, coins: list[str], ts: np.ndarray, values: np.ndarray):
+        """Replace the contents with rows ts[i] → values[i, j] for coins[j]."""
+        ts, values = ts[-self.capacity:], values[-self.capacity:]
+        self._col_of = {}
+        self._values = np.full((2 * self.capacity, self._values.shape[1]), np.nan)
+        cols = self._columns(coins)
+        self._ts[:len(ts)] = ts
+        self._values[:len(ts), cols] = values
+        self._lo, self._hi = 0, len(ts)
+
+    # ── Reads ─────────────────────────────────────────────────────────────
+
+    def matrix(self, coins: Optional[list[str]] = None) -> np.ndarray:
+        """[rows, coins] values of the live window (all known coins by default)."""
+        rows = self._values[self._lo:self._hi]
+        if coins is None:
+            return rows[:, :len(self._col_of)]
+        return self._gather(rows, coins)
+
+    def _gather(self, rows: np.ndarray, coins: list[str]) -> np.ndarray:
+        col_of = self._col_of
+        known = np.array([c in col_of for c in coins], dtype=bool)
+        cols = np.array([col_of.get(c, 0) for c in coins], dtype=np.intp)
+        out = rows[..., cols]
+        out[..., ~known] = np.nan
+        return out
+
+    def asof(self, t: float, coins: list[str], oldest: Optional[float] = None) -> np.ndarray:
+        """
+        Values per coin from the newest snapshot taken at or before t; all NaN
+        when there is none, or when it was taken before `oldest`.
+        """
+        i = int(np.searchsorted(self._ts[self._lo:self._hi], t, side="right")) - 1
+        if i < 0 or (oldest is not None and self._ts[self._lo + i] < oldest):
+            return np.full(len(coins), np.nan)
+        return self._gather(self._values[self._lo + i], coins)
+
+    def latest(self, coins: list[str]) -> np.ndarray:
+        """Values per coin from the newest snapshot (NaN when empty)."""
+        if self._hi == self._lo:
+            return np.full(len(coins), np.nan)
+        return self._gather(self._values[self._hi - 1], coins)
+
+    def points(self, coin: str) -> list[tuple[float, float]]:
+        """(ts, value) pairs of one coin, oldest first, missing snapshots skipped."""
+        col = self._col_of.get(coin)
+        if col is None:
+            return []
+        ts = self._ts[self._lo:self._hi]
+        vals = self._values[self._lo:self._hi, col]
+        ok = ~np.isnan(vals)
+        return list(zip(ts[ok].tolist(), vals[ok].tolist()))
+
+    def coins_with(self, min_points: int) -> int:
+        """Number of coins with at least min_points values in the window."""
+        counts = (~np.isnan(self.matrix())).sum(axis=0)
+        return int((counts >= min_points).sum())
@@ -0,0 +1,203 @@
+"""
+Hyperliquid Screener — hot-path metrics in Prometheus text format.
+
+PipelineMetrics (state.metrics) follows a frame from the WS applier to the
+frontend /ws fan-out:
+
+  hl_ws_frames_total{channel}              decoded frames per WS channel
+  hl_ws_apply_latency_seconds              receive → applied, oldest frame per batch
+  hl_normalizer_seconds_total{fn}          time in each patch function (+ decode)
+  hl_normalizer_calls_total{fn}            calls of each patch function
+  hl_feature_pass_seconds{pass, stage}     feature pass wall time per stage
+  hl_event_loop_lag_seconds                late wake-ups of a fixed-period sleep
+  hl_broadcast_latency_seconds             receive → rows_delta queued to clients
+
+Frame counts, batch / pass totals and loop lag cost one dict or bucket
+increment per batch and are always kept.  The per-function and per-stage
+clocks (two perf_counter calls per lap) only run while someone is
+scraping: a scrape turns them on and they switch off again after
+_DETAIL_IDLE_S without one, so an unscraped process pays nothing for them.
+
+render() also flattens the numeric fields of the existing stats() dicts
+(ingest, broadcaster, views, TSMOM, subscriptions) into hl_<section>_<key>
+lines.
+"""
+from __future__ import annotations
+
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Optional, Union
+
+# Seconds; shared by every histogram here (sub-ms patches up to multi-second stalls)
+_BUCKETS_S = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Per-stage clocks stay on this long after the last scrape
+_DETAIL_IDLE_S = 600.0
+
+
+class Histogram:
+    """Fixed-bucket histogram (Prometheus `le` semantics)."""
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: tuple[float, ...] = _BUCKETS_S):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)     # last slot: +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def lines(self, name: str, labels: str = "") -> list[str]:
+        sep = "," if labels else ""
+        out, cumulative = [], 0
+        for bound, n in zip((*self.buckets, "+Inf"), self.counts):
+            cumulative += n
+            out.append(f'{name}_bucket{{{labels}{sep}le="{bound}"}} {cumulative}')
+        suffix = f"{{{labels}}}" if labels else ""
+        out.append(f"{name}_sum{suffix} {self.sum:.6f}")
+        out.append(f"{name}_count{suffix} {self.count}")
+        return out
+
+
+class StageClock:
+    """Accumulates perf_counter laps per stage name."""
+
+    __slots__ = ("laps", "_t")
+
+    def __init__(self):
+        self.laps: dict[str, float] = defaultdict(float)
+        self._t = time.perf_counter()
+
+    def lap(self, stage: str):
+        now = time.perf_counter()
+        self.laps[stage] += now - self._t
+        self._t = now
+
+    def restart(self):
+        """Exclude the time since the last lap (e.g. an await) from every stage."""
+        self._t = time.perf_counter()
+
+
+class _NullClock:
+    __slots__ = ()
+    laps: dict[str, float] = {}
+
+    def lap(self, stage: str):
+        pass
+
+    def restart(self):
+        pass
+
+
+NULL_CLOCK = _NullClock()
+
+Clock = Union[StageClock, _NullClock]
+
+
+class PipelineMetrics:
+    """Hot-path counters and histograms for one HyperliquidState."""
+
+    def __init__(self):
+        self.frames: dict[str, int] = defaultdict(int)
+        self.apply_latency = Histogram()
+        self.patch_seconds: dict[str, float] = defaultdict(float)
+        self.patch_calls: dict[str, int] = defaultdict(int)
+        self.feature_pass: dict[tuple[str, str], Histogram] = {}
+        self.loop_lag = Histogram()
+        self.broadcast_latency = Histogram()
+        # Receive time of the oldest frame applied since the last broadcast cycle
+        self.unbroadcast_since: Optional[float] = None
+
+        self.detailed = False
+        self.last_scrape: Optional[float] = None
+        self.scrapes = 0
+
+    # ── Detail switch ─────────────────────────────────────────────────────
+
+    def clock(self) -> Clock:
+        """A live StageClock while scraped recently, else the no-op clock."""
+        if self.detailed and time.time() - self.last_scrape > _DETAIL_IDLE_S:
+            self.detailed = False
+        return StageClock() if self.detailed else NULL_CLOCK
+
+    # ── Recording ─────────────────────────────────────────────────────────
+
+    def record_batch(self, recv_ts: float, latency_s: float, clock: Clock, calls: dict[str, int]):
+        """One applied WS batch: its oldest frame's receive time and latency, patch laps / calls."""
+        self.apply_latency.observe(latency_s)
+        if self.unbroadcast_since is None:
+            self.unbroadcast_since = recv_ts
+        for fn, seconds in clock.laps.items():
+            self.patch_seconds[fn] += seconds
+        if clock is not NULL_CLOCK:
+            for fn, n in calls.items():
+                self.patch_calls[fn] += n
+
+    def record_pass(self, kind: str, total_s: float, clock: Clock):
+        """A feature pass ("full" / "incremental"): total wall time plus stage laps."""
+        self._pass_hist(kind, "total").observe(total_s)
+        for stage, seconds in clock.laps.items():
+            self._pass_hist(kind, stage).observe(seconds)
+
+    def _pass_hist(self, kind: str, stage: str) -> Histogram:
+        hist = self.feature_pass.get((kind, stage))
+        if hist is None:
+            hist = self.feature_pass[(kind, stage)] = Histogram()
+        return hist
+
+    def record_broadcast(self, sent: bool):
+        """Broadcaster cycle finished; a sent delta carries every frame applied since the last one."""
+        since, self.unbroadcast_since = self.unbroadcast_since, None
+        if sent and since is not None:
+            self.broadcast_latency.observe(max(0.0, time.time() - since))
+
+    # ── Exposition ────────────────────────────────────────────────────────
+
+    def render(self, sections: dict[str, dict]) -> str:
+        """Prometheus text format; a render counts as a scrape (turns the clocks on)."""
+        self.last_scrape = time.time()
+        self.detailed = True
+        self.scrapes += 1
+
+        out: list[str] = []
+
+        def family(name: str, kind: str, help_: str):
+            out.append(f"# HELP {name} {help_}")
+            out.append(f"# TYPE {name} {kind}")
+
+        family("hl_ws_frames_total", "counter", "Decoded WS frames per channel")
+        out.extend(f'hl_ws_frames_total{{channel="{ch}"}} {n}' for ch, n in sorted(self.frames.items()))
+
+        family("hl_ws_apply_latency_seconds", "histogram", "Receive to applied, oldest frame of each batch")
+        out.extend(self.apply_latency.lines("hl_ws_apply_latency_seconds"))
+
+        family("hl_normalizer_seconds_total", "counter", "Time spent per patch function while detailed timing is on")
+        out.extend(f'hl_normalizer_seconds_total{{fn="{fn}"}} {s:.6f}' for fn, s in sorted(self.patch_seconds.items()))
+        family("hl_normalizer_calls_total", "counter", "Calls per patch function while detailed timing is on")
+        out.extend(f'hl_normalizer_calls_total{{fn="{fn}"}} {n}' for fn, n in sorted(self.patch_calls.items()))
+
+        family("hl_feature_pass_seconds", "histogram", "Feature pass wall time by stage")
+        for (kind, stage), hist in sorted(self.feature_pass.items()):
+            out.extend(hist.lines("hl_feature_pass_seconds", f'pass="{kind}",stage="{stage}"'))
+
+        family("hl_event_loop_lag_seconds", "histogram", "Event loop wake-up lag")
+        out.extend(self.loop_lag.lines("hl_event_loop_lag_seconds"))
+
+        family("hl_broadcast_latency_seconds", "histogram", "Receive to rows_delta queued to /ws clients")
+        out.extend(self.broadcast_latency.lines("hl_broadcast_latency_seconds"))
+
+        for section, stats in sections.items():
+            for key, value in stats.items():
+                if isinstance(value, bool):
+                    value = int(value)
+                if isinstance(value, (int, float)):
+                    name = f"hl_{section}_{key}"
+                    family(name, "gauge", f"{section} {key}")
+                    out.append(f"{name} {value}")
+        out.append("")
+        return "\n".join(out)
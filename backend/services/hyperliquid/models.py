@@ -53,6 +53,8 @@ class ScreenerAsset(BaseModel):
     oi_change_5m: Optional[float] = None               # 5-min OI % change (decimal)
     oi_change_15m: Optional[float] = None              # 15-min OI % change (decimal)
     oi_change_1h: Optional[float] = None               # 1-hour OI % change (decimal)
+    oi_change_4h: Optional[float] = None               # 4-hour OI % change (decimal)
+    oi_change_24h: Optional[float] = None              # 24-hour OI % change (decimal)
     day_ntl_vlm: Optional[float] = None         # 24h notional USD
     day_base_vlm: Optional[float] = None        # 24h base volume
     volume_impulse: Optional[float] = None      # recent 1h vol vs rolling avg
@@ -72,6 +74,9 @@ class ScreenerAsset(BaseModel):
     recent_trade_buy_volume: Optional[float] = None
     recent_trade_sell_volume: Optional[float] = None
     recent_trade_imbalance: Optional[float] = None  # -1..+1 (+1 = all buys)
+    recent_trade_vwap: Optional[float] = None       # VWAP over the same window
+    trade_imbalance_1m: Optional[float] = None      # -1..+1 over the last 1 min
+    trade_imbalance_15m: Optional[float] = None     # -1..+1 over the last 15 min
 
     # ── Derived volatility ────────────────────────────────────────────────
     realized_volatility_short: Optional[float] = None   # ~1h annualized %
@@ -262,6 +267,7 @@ class HeroSignal(BaseModel):
 # ─────────────────────────────────────────────────────────────────────────────
 
 class WsEvent(BaseModel):
-    event: str          # snapshot_ready|asset_update|rank_update|connection_status|error
+    event: str          # snapshot_ready|rows_delta|connection_status|error|ping
     data: Any
+    seq: Optional[int] = None   # broadcaster cycle (snapshot_ready / rows_delta)
     ts: float = Field(default_factory=time.time)
@@ -25,8 +25,10 @@ import os
 import time
 from typing import Any, Optional
 
+import numpy as np
+
 from .models import ScreenerAsset
-from .state import HyperliquidState
+from .state import DIRTY_BOOK, DIRTY_CTX, DIRTY_MIDS, DIRTY_TRADES, HyperliquidState
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Config
@@ -286,23 +288,27 @@ def patch_from_all_mids(state: HyperliquidState, mids: dict[str, str]):
     """
     allMids WS update → patch mid_px on all assets.
     Also recompute distance_mark_mid_pct when both mark and mid are known.
+
+    Vectorized over the whole frame: mids are written straight into the
+    asset table's columns, no ScreenerAsset is rebuilt here.
     """
     now = time.time()
-    for coin, px_str in mids.items():
-        mid = _f(px_str)
-        if mid is None:
-            continue
-        asset = state.get_asset(coin)
-        if asset is None:
-            continue
-        mark = asset.mark_px
-        dist = (mark - mid) / mid * 100 if (mark and mid) else None
-        # Direct dict patch (avoids re-parsing the whole Pydantic model for speed)
-        state.assets[coin] = asset.model_copy(update={
-            "mid_px": mid,
-            "distance_mark_mid_pct": round(dist, 4) if dist is not None else None,
-            "last_updated_ts": now,
-        })
+    table = state.assets
+    coins, slots = table.slots(mids.keys())
+    if slots.size:
+        mid = np.array([_f(mids[c]) for c in coins], dtype=float)   # None → NaN
+        ok = ~np.isnan(mid)
+        slots, mid = slots[ok], mid[ok]
+        changed = table.col("mid_px")[slots] != mid
+        mark = table.col("mark_px")[slots]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            dist = np.where((mark != 0) & (mid != 0), (mark - mid) / mid * 100, np.nan)
+        table.col("mid_px")[slots] = mid
+        table.col("distance_mark_mid_pct")[slots] = np.round(dist, 4)
+        table.col("last_updated_ts")[slots] = now
+        table.touch(slots)
+        # Only coins whose mid actually moved need re-scoring
+        state.mark_dirty_many((coins[i] for i in np.flatnonzero(ok)[changed]), DIRTY_MIDS)
     state.last_mids_ts = now
 
 
@@ -311,9 +317,11 @@ def patch_from_active_asset_ctx(state: HyperliquidState, coin: str, ctx: dict):
     activeAssetCtx WS update → full ctx refresh for one coin.
     This carries funding, OI, mark, oracle, mid, volume — patch everything.
     """
-    asset = state.get_asset(coin)
-    if asset is None:
+    table = state.assets
+    slot = table.slot(coin)
+    if slot is None:
         return
+    cur = table.value
 
     mark   = _f(ctx.get("markPx"))
     oracle = _f(ctx.get("oraclePx"))
@@ -326,40 +334,43 @@ def patch_from_active_asset_ctx(state: HyperliquidState, coin: str, ctx: dict):
     basevlm = _f(ctx.get("dayBaseVlm"))
 
     # If the ctx message only has partial fields, keep existing values
-    mark   = mark   if mark   is not None else asset.mark_px
-    oracle = oracle if oracle is not None else asset.oracle_px
-    mid    = mid    if mid    is not None else asset.mid_px
-    prev   = prev   if prev   is not None else asset.prev_day_px
-    fund   = fund   if fund   is not None else asset.funding
-    prem   = prem   if prem   is not None else asset.premium
-    oi     = oi     if oi     is not None else asset.open_interest
-    ntlvlm = ntlvlm if ntlvlm is not None else asset.day_ntl_vlm
-
-    pct_24h = (mark - prev) / prev * 100 if (mark and prev and prev != 0) else asset.pct_change_24h
-    oi_usd  = oi * mark if (oi and mark) else asset.open_interest_usd
-    dist_mo = (mark - oracle) / oracle * 100 if (mark and oracle and oracle != 0) else asset.distance_mark_oracle_pct
-    dist_mm = (mark - mid) / mid * 100 if (mark and mid and mid != 0) else asset.distance_mark_mid_pct
-    dist_mp = (mark - prev) / prev * 100 if (mark and prev and prev != 0) else asset.distance_mark_prev_day_pct
-
-    state.assets[coin] = asset.model_copy(update={
-        "mark_px": mark,
-        "oracle_px": oracle,
-        "mid_px": mid,
-        "prev_day_px": prev,
-        "funding": fund,
-        "premium": prem,
-        "open_interest": oi,
-        "open_interest_usd": round(oi_usd, 2) if oi_usd else None,
-        "day_ntl_vlm": ntlvlm,
-        "day_base_vlm": basevlm if basevlm is not None else asset.day_base_vlm,
-        "pct_change_24h": round(pct_24h, 4) if pct_24h is not None else None,
-        "momentum_24h": round(pct_24h, 4) if pct_24h is not None else None,
-        "distance_mark_oracle_pct": round(dist_mo, 4) if dist_mo is not None else None,
-        "distance_mark_mid_pct": round(dist_mm, 4) if dist_mm is not None else None,
-        "distance_mark_prev_day_pct": round(dist_mp, 4) if dist_mp is not None else None,
-        "last_updated_ts": time.time(),
-    })
-    state.last_ctx_ts = time.time()
+    mark   = mark   if mark   is not None else cur(slot, "mark_px")
+    oracle = oracle if oracle is not None else cur(slot, "oracle_px")
+    mid    = mid    if mid    is not None else cur(slot, "mid_px")
+    prev   = prev   if prev   is not None else cur(slot, "prev_day_px")
+    fund   = fund   if fund   is not None else cur(slot, "funding")
+    prem   = prem   if prem   is not None else cur(slot, "premium")
+    oi     = oi     if oi     is not None else cur(slot, "open_interest")
+    ntlvlm = ntlvlm if ntlvlm is not None else cur(slot, "day_ntl_vlm")
+
+    pct_24h = (mark - prev) / prev * 100 if (mark and prev and prev != 0) else cur(slot, "pct_change_24h")
+    oi_usd  = oi * mark if (oi and mark) else cur(slot, "open_interest_usd")
+    dist_mo = (mark - oracle) / oracle * 100 if (mark and oracle and oracle != 0) else cur(slot, "distance_mark_oracle_pct")
+    dist_mm = (mark - mid) / mid * 100 if (mark and mid and mid != 0) else cur(slot, "distance_mark_mid_pct")
+    dist_mp = (mark - prev) / prev * 100 if (mark and prev and prev != 0) else cur(slot, "distance_mark_prev_day_pct")
+
+    now = time.time()
+    table.patch(
+        slot,
+        mark_px=mark,
+        oracle_px=oracle,
+        mid_px=mid,
+        prev_day_px=prev,
+        funding=fund,
+        premium=prem,
+        open_interest=oi,
+        open_interest_usd=round(oi_usd, 2) if oi_usd else None,
+        day_ntl_vlm=ntlvlm,
+        day_base_vlm=basevlm if basevlm is not None else cur(slot, "day_base_vlm"),
+        pct_change_24h=round(pct_24h, 4) if pct_24h is not None else None,
+        momentum_24h=round(pct_24h, 4) if pct_24h is not None else None,
+        distance_mark_oracle_pct=round(dist_mo, 4) if dist_mo is not None else None,
+        distance_mark_mid_pct=round(dist_mm, 4) if dist_mm is not None else None,
+        distance_mark_prev_day_pct=round(dist_mp, 4) if dist_mp is not None else None,
+        last_updated_ts=now,
+    )
+    state.mark_dirty(coin, DIRTY_CTX)
+    state.last_ctx_ts = now
 
 
 def patch_from_bbo(state: HyperliquidState, coin: str, bbo_data: dict):
@@ -368,8 +379,9 @@ def patch_from_bbo(state: HyperliquidState, coin: str, bbo_data: dict):
     bbo_data may be {"bid": [{px, sz}], "ask": [{px, sz}], "ts": ...}
     or just the data sub-field from the WS message.
     """
-    asset = state.get_asset(coin)
-    if asset is None:
+    table = state.assets
+    slot = table.slot(coin)
+    if slot is None:
         return
 
     bids = bbo_data.get("bid") or bbo_data.get("bids") or []
@@ -382,14 +394,16 @@ def patch_from_bbo(state: HyperliquidState, coin: str, bbo_data: dict):
     mid = (bid_px + ask_px) / 2 if (bid_px and ask_px) else None
     spread_bps = spread_abs / mid * 10_000 if (spread_abs and mid and mid != 0) else None
 
-    state.assets[coin] = asset.model_copy(update={
-        "bid_px": bid_px,
-        "ask_px": ask_px,
-        "spread_abs": round(spread_abs, 6) if spread_abs is not None else None,
-        "spread_bps": round(spread_bps, 2) if spread_bps is not None else None,
-        "mid_px": round(mid, 6) if mid is not None else asset.mid_px,
-        "last_updated_ts": time.time(),
-    })
+    table.patch(
+        slot,
+        bid_px=bid_px,
+        ask_px=ask_px,
+        spread_abs=round(spread_abs, 6) if spread_abs is not None else None,
+        spread_bps=round(spread_bps, 2) if spread_bps is not None else None,
+        mid_px=round(mid, 6) if mid is not None else table.value(slot, "mid_px"),
+        last_updated_ts=time.time(),
+    )
+    state.mark_dirty(coin, DIRTY_BOOK)
 
 
 def patch_from_l2(state: HyperliquidState, coin: str, levels: list):
@@ -428,49 +442,62 @@ def patch_from_l2(state: HyperliquidState, coin: str, levels: list):
     mid = (best_bid + best_ask) / 2 if (best_bid and best_ask) else None
     spread_bps = spread_abs / mid * 10_000 if (spread_abs and mid and mid != 0) else None
 
-    asset = state.get_asset(coin)
-    if asset is None:
+    table = state.assets
+    slot = table.slot(coin)
+    if slot is None:
         return
-
-    state.assets[coin] = asset.model_copy(update={
-        "orderbook_bid_depth": round(bid_depth, 2),
-        "orderbook_ask_depth": round(ask_depth, 2),
-        "orderbook_imbalance": round(imbalance, 4),
+    cur_bid = table.value(slot, "bid_px")
+    cur_ask = table.value(slot, "ask_px")
+    cur_spread_abs = table.value(slot, "spread_abs")
+    cur_spread_bps = table.value(slot, "spread_bps")
+
+    table.patch(
+        slot,
+        orderbook_bid_depth=round(bid_depth, 2),
+        orderbook_ask_depth=round(ask_depth, 2),
+        orderbook_imbalance=round(imbalance, 4),
         # Populate BBO from L2 if not already set via BBO subscription
-        "bid_px": best_bid if (asset.bid_px is None and best_bid) else asset.bid_px,
-        "ask_px": best_ask if (asset.ask_px is None and best_ask) else asset.ask_px,
-        "spread_abs": round(spread_abs, 6) if (asset.spread_abs is None and spread_abs is not None) else asset.spread_abs,
-        "spread_bps": round(spread_bps, 2) if (asset.spread_bps is None and spread_bps is not None) else asset.spread_bps,
-        "last_updated_ts": time.time(),
-    })
+        bid_px=best_bid if (cur_bid is None and best_bid) else cur_bid,
+        ask_px=best_ask if (cur_ask is None and best_ask) else cur_ask,
+        spread_abs=round(spread_abs, 6) if (cur_spread_abs is None and spread_abs is not None) else cur_spread_abs,
+        spread_bps=round(spread_bps, 2) if (cur_spread_bps is None and spread_bps is not None) else cur_spread_bps,
+        last_updated_ts=time.time(),
+    )
 
     # Also store raw book
     state.set_book(coin, {"levels": levels})
 
 
-def patch_trade_flow(state: HyperliquidState, coin: str, max_age_s: float = 300.0):
+def patch_trade_flow(state: HyperliquidState, coin: str, max_age_s: int = 300):
     """
-    Recompute trade flow aggregates from the rolling trade window.
-    Called after new trades are added to state.
+    Publish trade flow aggregates from the coin's running TradeFlow windows.
+    Called after new trades are added to state.  max_age_s selects the
+    window behind the recent_trade_* fields (must be one of
+    TRADE_FLOW_WINDOWS_S); the 1m / 15m imbalances are published alongside.
     """
-    asset = state.get_asset(coin)
-    if asset is None:
+    table = state.assets
+    slot = table.slot(coin)
+    if slot is None:
         return
 
-    recent = state.get_recent_trades(coin, max_age_s)
-    count = len(recent)
-    buy_vol = sum(_f(t.get("sz")) or 0 for t in recent if t.get("side") in ("B", "buy"))
-    sell_vol = sum(_f(t.get("sz")) or 0 for t in recent if t.get("side") in ("A", "sell"))
-    total = buy_vol + sell_vol
-    imbalance = (buy_vol - sell_vol) / total if total > 0 else 0.0
-
-    state.assets[coin] = asset.model_copy(update={
-        "recent_trade_count": count,
-        "recent_trade_buy_volume": round(buy_vol, 4),
-        "recent_trade_sell_volume": round(sell_vol, 4),
-        "recent_trade_imbalance": round(imbalance, 4),
-        "last_updated_ts": time.time(),
-    })
+    flow = state.trade_flow[coin]
+    now_ms = time.time() * 1000
+    main = flow.stats(max_age_s, now_ms)
+    fast = flow.stats(60, now_ms)
+    slow = flow.stats(900, now_ms)
+
+    table.patch(
+        slot,
+        recent_trade_count=main.count,
+        recent_trade_buy_volume=round(main.buy_volume, 4),
+        recent_trade_sell_volume=round(main.sell_volume, 4),
+        recent_trade_imbalance=round(main.imbalance, 4),
+        recent_trade_vwap=round(main.vwap, 6) if main.vwap is not None else None,
+        trade_imbalance_1m=round(fast.imbalance, 4),
+        trade_imbalance_15m=round(slow.imbalance, 4),
+        last_updated_ts=now_ms / 1000,
+    )
+    state.mark_dirty(coin, DIRTY_TRADES)
 
 
 # ─────────────────────────────────────────────────────────────────────────────
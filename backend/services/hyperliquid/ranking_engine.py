@@ -10,7 +10,10 @@ from __future__ import annotations
 import time
 from typing import Any, Optional
 
-from .feature_engine import _clip, _compute_composite
+import numpy as np
+
+from .cross_section import mode_composites
+from .feature_engine import _compute_composite
 from .models import AgentRankRequest, AgentRankResponse, ScreenerAsset
 from .state import HyperliquidState
 
@@ -84,14 +87,12 @@ def rank_assets(
     weights = _MODE_WEIGHTS[mode]
     candidates = _apply_filters(assets, filters or {})
 
-    scored: list[tuple[float, ScreenerAsset]] = []
-    for asset in candidates:
-        # Recompute composite under the chosen mode
-        score = _composite_for_mode(asset, weights)
-        scored.append((score, asset))
+    # Recompute composite under the chosen mode (vectorized over candidates)
+    scores = mode_composites(candidates, {mode: weights})[mode]
 
-    # Sort descending by score
-    scored.sort(key=lambda x: -x[0])
+    # Sort descending by score (stable — ties keep candidate order)
+    order = np.argsort(-scores, kind="stable")
+    scored = [(float(scores[i]), candidates[i]) for i in order.tolist()]
 
     prev_ranks = prev_ranks or {}
     ranked: list[ScreenerAsset] = []
@@ -116,14 +117,6 @@ def rank_assets(
     return ranked
 
 
-def _composite_for_mode(asset: ScreenerAsset, weights: dict[str, float]) -> float:
-    total = 0.0
-    for field, w in weights.items():
-        val = getattr(asset, field, None) or 50.0
-        total += val * w
-    return _clip(total, 0, 100)
-
-
 # ─────────────────────────────────────────────────────────────────────────────
 # Filter application
 # ─────────────────────────────────────────────────────────────────────────────
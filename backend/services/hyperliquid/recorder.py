@@ -0,0 +1,122 @@
+"""
+Hyperliquid Screener — stream capture for offline replay.
+
+With HL_RECORD_PATH set, boot_and_run records everything the screener
+reads from Hyperliquid into one gzip'd JSON-lines file:
+
+  {"rest": "candles", "interval": "1h", "result": {coin: [bar, ...]}, "t": ts}
+  {"rest": "books", "result": {coin: book}, "t": ts}
+  {"rest": <method>, "args": [...], "result": ..., "t": ts}   other REST calls
+  {"ws": <raw frame>, "t": recv_ts}
+
+RecordingRestClient wraps HyperliquidRestClient; the WS reader hands every
+raw frame to StreamRecorder.frame() before buffering it.  replay.py plays a
+capture back through the boot sequence and the WS applier.
+
+The file is flushed every _FLUSH_INTERVAL_S, so a killed process loses at
+most that much; read_records() stops quietly at a truncated tail.
+"""
+from __future__ import annotations
+
+import gzip
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional
+
+from . import codec
+from .scheduler import BulkReport
+
+_FLUSH_INTERVAL_S = 5.0
+
+
+class StreamRecorder:
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._f = gzip.open(self.path, "wb", compresslevel=6)
+        self._last_flush = time.time()
+        self.frames = 0
+        self.rest_calls = 0
+
+    def _write(self, record: dict):
+        self._f.write(codec.dumps(record) + b"\n")
+        now = time.time()
+        if now - self._last_flush >= _FLUSH_INTERVAL_S:
+            self._f.flush()
+            self._last_flush = now
+
+    def frame(self, recv_ts: float, raw: str | bytes):
+        if isinstance(raw, bytes):
+            raw = raw.decode()
+        self._write({"ws": raw, "t": recv_ts})
+        self.frames += 1
+
+    def rest(self, method: str, result: Any, **fields):
+        self._write({"rest": method, **fields, "result": result, "t": time.time()})
+        self.rest_calls += 1
+
+    def close(self):
+        self._f.close()
+
+
+def read_records(path: str | Path) -> Iterator[dict]:
+    """Records of a capture in file order."""
+    with gzip.open(path, "rb") as f:
+        try:
+            for line in f:
+                if line.strip():
+                    yield codec.loads(line)
+        except (EOFError, gzip.BadGzipFile, zlib.error):
+            return     # capture cut off mid-write
+
+
+class RecordingRestClient:
+    """Pass-through to a HyperliquidRestClient that records every response."""
+
+    def __init__(self, client, recorder: StreamRecorder):
+        self._client = client
+        self._recorder = recorder
+
+    async def _call(self, method: str, *args) -> Any:
+        result = await getattr(self._client, method)(*args)
+        self._recorder.rest(method, result, args=list(args))
+        return result
+
+    async def get_meta_and_asset_ctxs(self) -> list:
+        return await self._call("get_meta_and_asset_ctxs")
+
+    async def get_spot_meta_and_asset_ctxs(self) -> list:
+        return await self._call("get_spot_meta_and_asset_ctxs")
+
+    async def get_all_mids(self) -> dict[str, str]:
+        return await self._call("get_all_mids")
+
+    async def get_all_perp_metas(self) -> list:
+        return await self._call("get_all_perp_metas")
+
+    async def get_dex_meta_and_asset_ctxs(self, dex: str) -> list:
+        return await self._call("get_dex_meta_and_asset_ctxs", dex)
+
+    async def get_candles_multi(
+        self,
+        coins: list[str],
+        interval: str,
+        n_bars: int = 50,
+        progress: Optional[Callable[[BulkReport], None]] = None,
+    ) -> dict[str, list[dict]]:
+        result = await self._client.get_candles_multi(coins, interval, n_bars=n_bars, progress=progress)
+        self._recorder.rest("candles", result, interval=interval)
+        return result
+
+    async def get_l2_books_multi(
+        self,
+        coins: list[str],
+        progress: Optional[Callable[[BulkReport], None]] = None,
+    ) -> dict[str, dict]:
+        result = await self._client.get_l2_books_multi(coins, progress=progress)
+        self._recorder.rest("books", result)
+        return result
+
+    async def close(self):
+        await self._client.close()
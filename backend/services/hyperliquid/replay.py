@@ -0,0 +1,197 @@
+"""
+Hyperliquid Screener — offline replay of a recorded stream.
+
+Plays a capture written by recorder.py through the live code paths:
+
+  1. _boot_sequence against ReplayRestClient (recorded REST responses),
+     then the HIP-3 enrichment if the capture has it
+  2. the recorded WS frames, in order, through _enqueue_frame + _apply_batch
+     in _APPLY_TICK_S windows of recorded time — the applier's batching
+  3. run_incremental_feature_pass every _FEATURE_PASS_INTERVAL_S of recorded
+     time, as _periodic_feature_recompute does
+
+speed=1.0 keeps the recorded pacing, 10.0 plays it 10× faster and None as
+fast as the pipeline goes (the throughput measurement).  Frames are
+restamped with the replay receive time, so ingest / metrics latencies
+mean what they mean live.  on_batch(state) runs after every applied batch
+and may be a coroutine function (benchmarks time endpoint requests there).
+"""
+from __future__ import annotations
+
+import asyncio
+import inspect
+import time
+from collections import defaultdict, deque
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from .feature_engine import run_incremental_feature_pass
+from .recorder import read_records
+from .scheduler import BulkReport
+from .state import HyperliquidState
+from .websocket_manager import (
+    _APPLY_TICK_S,
+    _FEATURE_PASS_INTERVAL_S,
+    _apply_batch,
+    _boot_sequence,
+    _enqueue_frame,
+    _enrich_hip3,
+)
+
+
+class ReplayRestClient:
+    """
+    HyperliquidRestClient stand-in serving recorded responses.  Candles and
+    books are indexed per coin (a replayed boot may group coins differently);
+    other calls are replayed per (method, args) in recorded order, the last
+    response repeating once they run out.
+    """
+
+    def __init__(self, records: list[dict]):
+        self._candles: dict[tuple[str, str], list[dict]] = {}
+        self._books: dict[str, dict] = {}
+        self._calls: dict[tuple, deque] = defaultdict(deque)
+        for rec in records:
+            method = rec["rest"]
+            if method == "candles":
+                for coin, bars in rec["result"].items():
+                    if bars:
+                        self._candles.setdefault((rec["interval"], coin), bars)
+            elif method == "books":
+                for coin, book in rec["result"].items():
+                    if book:
+                        self._books.setdefault(coin, book)
+            else:
+                self._calls[(method, *rec.get("args", ()))].append(rec["result"])
+        self.calls = 0
+
+    @property
+    def methods(self) -> set[str]:
+        return {key[0] for key in self._calls}
+
+    def _next(self, method: str, *args) -> Any:
+        self.calls += 1
+        queue = self._calls.get((method, *args))
+        if not queue:
+            raise LookupError(f"no recorded response for {method}{args}")
+        return queue.popleft() if len(queue) > 1 else queue[0]
+
+    async def get_meta_and_asset_ctxs(self) -> list:
+        return self._next("get_meta_and_asset_ctxs")
+
+    async def get_spot_meta_and_asset_ctxs(self) -> list:
+        return self._next("get_spot_meta_and_asset_ctxs")
+
+    async def get_all_mids(self) -> dict[str, str]:
+        return self._next("get_all_mids")
+
+    async def get_all_perp_metas(self) -> list:
+        return self._next("get_all_perp_metas")
+
+    async def get_dex_meta_and_asset_ctxs(self, dex: str) -> list:
+        return self._next("get_dex_meta_and_asset_ctxs", dex)
+
+    async def get_candles_multi(
+        self,
+        coins: list[str],
+        interval: str,
+        n_bars: int = 50,
+        progress: Optional[Callable[[BulkReport], None]] = None,
+    ) -> dict[str, list[dict]]:
+        self.calls += 1
+        return {c: self._candles.get((interval, c), [])[-n_bars:] for c in coins}
+
+    async def get_l2_books_multi(
+        self,
+        coins: list[str],
+        progress: Optional[Callable[[BulkReport], None]] = None,
+    ) -> dict[str, dict]:
+        self.calls += 1
+        return {c: self._books.get(c, {}) for c in coins}
+
+    async def close(self):
+        pass
+
+
+class ReplayReport:
+    """
+    apply_s    — time inside _apply_batch
+    wall_s     — the whole frame phase, incl. pacing and feature passes
+    recorded_s — span of the recorded frames
+    """
+
+    __slots__ = ("frames", "batches", "boot_s", "apply_s", "wall_s", "recorded_s", "feature_pass_s")
+
+    def __init__(self):
+        self.frames = self.batches = 0
+        self.boot_s = self.apply_s = self.wall_s = self.recorded_s = 0.0
+        self.feature_pass_s: list[float] = []
+
+    @property
+    def msgs_per_s(self) -> float:
+        """Sustained applier throughput (frames / time spent applying them)."""
+        return self.frames / self.apply_s if self.apply_s else 0.0
+
+
+async def replay(
+    path: str | Path,
+    state: Optional[HyperliquidState] = None,
+    speed: Optional[float] = None,
+    on_batch: Optional[Callable[[HyperliquidState], Any]] = None,
+) -> tuple[HyperliquidState, ReplayReport]:
+    """Boot from the capture's REST responses, then play its WS frames (see module docstring)."""
+    rest: list[dict] = []
+    frames: list[tuple[float, str]] = []
+    for rec in read_records(path):
+        if "ws" in rec:
+            frames.append((rec["t"], rec["ws"]))
+        elif "rest" in rec:
+            rest.append(rec)
+    frames.sort(key=lambda f: f[0])
+
+    state = state or HyperliquidState()
+    report = ReplayReport()
+    client = ReplayRestClient(rest)
+
+    t0 = time.perf_counter()
+    await _boot_sequence(state, client)
+    if "get_all_perp_metas" in client.methods:
+        await _enrich_hip3(state, client)
+    report.boot_s = time.perf_counter() - t0
+    if not frames:
+        return state, report
+
+    first_t = frames[0][0]
+    report.recorded_s = frames[-1][0] - first_t
+    queue: deque = deque()
+    next_pass = first_t + _FEATURE_PASS_INTERVAL_S
+    wall0 = time.perf_counter()
+    i = 0
+    while i < len(frames):
+        window_end = frames[i][0] + _APPLY_TICK_S
+        if speed:
+            delay = (window_end - first_t) / speed - (time.perf_counter() - wall0)
+            if delay > 0:
+                await asyncio.sleep(delay)
+        while i < len(frames) and frames[i][0] < window_end:
+            _enqueue_frame(state, queue, frames[i][1])
+            i += 1
+        batch = list(queue)
+        queue.clear()
+        state.ingest.queue_depth = 0
+
+        t = time.perf_counter()
+        _apply_batch(state, batch)
+        report.apply_s += time.perf_counter() - t
+        report.frames += len(batch)
+        report.batches += 1
+        if on_batch is not None and inspect.isawaitable(result := on_batch(state)):
+            await result
+
+        if window_end >= next_pass:
+            t = time.perf_counter()
+            await run_incremental_feature_pass(state)
+            report.feature_pass_s.append(time.perf_counter() - t)
+            next_pass = window_end + _FEATURE_PASS_INTERVAL_S
+    report.wall_s = time.perf_counter() - wall0
+    return state, report
@@ -6,28 +6,39 @@ Response shapes match the frontend data contract exactly:
 GET  /api/hyperliquid/screener/snapshot  → { rows: [ScreenerRow], meta: ScreenerMeta }
 POST /api/hyperliquid/screener/agent-rank → { rankedCoins, longs, shorts, breakouts, meanReversions, avoid, summary, generatedAt }
 GET  /api/hyperliquid/screener/asset/{coin} → { coin, priceHistory, orderBook, recentTrades, ... }
+GET  /api/hyperliquid/screener/status → { ready, ws_connected, freshness_s, ingest, ... }
+GET  /api/hyperliquid/screener/metrics → Prometheus text format
 WS   /api/hyperliquid/screener/ws
 """
 from __future__ import annotations
 
 import asyncio
-import json
 import os
 import time
 from datetime import datetime, timezone
 from typing import Any, Optional
 
-from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, HTTPException, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import JSONResponse, Response
 from pydantic import BaseModel, Field
 
+from . import codec
+from .broadcaster import ScreenerBroadcaster
+from .candles import CLOSE, T
+from .codec import FastJSONResponse
 from .models import HeroSignal, ScreenerAsset
 from .ranking_engine import generate_rationale, rank_assets
 from .signals import build_signal_sections, build_summary_cards, generate_agent_briefing, generate_hero_signals
-from .state import HyperliquidState
-from .tsmom import compute_tsmom_signals
+from .signal_views import SignalViews
+from .snapshot_views import SnapshotViews, etag_matches
+from .state import READY_CANDLE_FEATURES, READY_PRICES, READY_TSMOM, HyperliquidState
+from .tsmom import TsmomEngine
 
-router = APIRouter(prefix="/api/hyperliquid/screener", tags=["hyperliquid"])
+router = APIRouter(
+    prefix="/api/hyperliquid/screener",
+    tags=["hyperliquid"],
+    default_response_class=FastJSONResponse,
+)
 
 _state: Optional[HyperliquidState] = None
 
@@ -35,6 +46,12 @@ _state: Optional[HyperliquidState] = None
 def set_state(state: HyperliquidState):
     global _state
     _state = state
+    state.on_feature_pass(_rebuild_signal_views)
+
+
+def current_state() -> Optional[HyperliquidState]:
+    """The state being served (replaced on every load in shared-state reader workers)."""
+    return _state
 
 
 def _get_state() -> HyperliquidState:
@@ -141,6 +158,8 @@ def _asset_to_row(asset: ScreenerAsset, rank: int) -> dict:
         "oiChange5m":    asset.oi_change_5m,
         "oiChange15m":   asset.oi_change_15m,
         "oiChange1h":    asset.oi_change_1h,
+        "oiChange4h":    asset.oi_change_4h,
+        "oiChange24h":   asset.oi_change_24h,
 
         # ── Volume ────────────────────────────────────────────────────────
         "volume24h":        asset.day_ntl_vlm,
@@ -150,8 +169,11 @@ def _asset_to_row(asset: ScreenerAsset, rank: int) -> dict:
         "volumeImpulse15m": asset.volume_impulse_15m,
 
         # ── Trade flow ────────────────────────────────────────────────────
-        "tradeCount":      asset.recent_trade_count if asset.recent_trade_count > 0 else None,
-        "tradeImbalance":  asset.recent_trade_imbalance,
+        "tradeCount":        asset.recent_trade_count if asset.recent_trade_count > 0 else None,
+        "tradeImbalance":    asset.recent_trade_imbalance,
+        "tradeImbalance1m":  asset.trade_imbalance_1m,
+        "tradeImbalance15m": asset.trade_imbalance_15m,
+        "tradeVwap":         asset.recent_trade_vwap,
 
         # ── Order book ────────────────────────────────────────────────────
         "bidDepth":        asset.orderbook_bid_depth,
@@ -249,15 +271,61 @@ def _build_meta(rows: list[dict], state: HyperliquidState) -> dict:
         "lowestFundingCoin":  lowest_fund[0],
         "lastUpdated":        now_iso,
         "serverTs":           now_iso,
+        "readiness": {
+            "prices":         state.has(READY_PRICES),
+            "candleFeatures": state.has(READY_CANDLE_FEATURES),
+            "tsmom":          state.has(READY_TSMOM),
+            "stale":          state.is_stale,
+        },
     }
 
 
+# Sort keys accepted by /snapshot → internal ScreenerAsset field
+_SORT_MAP = {
+    "overallScore":       "overall_score",
+    "compositeSignal":    "composite_signal_score",
+    "volume24h":          "day_ntl_vlm",
+    "openInterest":       "open_interest_usd",
+    "change24hPct":       "pct_change_24h",
+    "funding":            "funding",
+    "spreadBps":          "spread_bps",
+    "momentum":           "momentum_score",
+    "breakoutScore":      "breakout_score",
+    "liquidityScore":     "liquidity_score",
+    "structuralQuality":  "structural_quality_score",
+}
+
+_snapshot_views = SnapshotViews(build_row=_asset_to_row, build_meta=_build_meta)
+
+# /hero, /sections and /agent-rank payloads, memoized per feature pass.
+# Briefing and sections are re-rendered in a loop task after each pass (for
+# the defaults and recently requested params, while clients poll them);
+# agent-rank advances prev_ranks, so it is only built on request.
+_signal_views = SignalViews(
+    builders={
+        "briefing": lambda state, max_ideas, min_volume_usd: codec.dumps(
+            generate_agent_briefing(state, max_ideas=max_ideas, min_volume_usd=min_volume_usd)),
+        "sections": lambda state, rows_per_section: _build_sections(state, rows_per_section),
+        "agent_rank": lambda state, mode, rationales: _build_agent_rank(state, mode, rationales),
+    },
+    eager=frozenset({"briefing", "sections"}),
+)
+_signal_views.remember("briefing", 20, 5_000_000)
+_signal_views.remember("sections", 6)
+
+
+def _rebuild_signal_views(state: HyperliquidState):
+    if state is _state and state.has(READY_CANDLE_FEATURES):
+        _signal_views.rebuild(state)
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # GET /api/hyperliquid/screener/snapshot
 # ─────────────────────────────────────────────────────────────────────────────
 
 @router.get("/snapshot")
 async def get_snapshot(
+    request: Request,
     market_type: str = "all",
     limit: int = 200,
     sort_by: str = "overallScore",
@@ -268,64 +336,23 @@ async def get_snapshot(
     """
     Full screener snapshot.
     Returns { rows: [ScreenerRow], meta: ScreenerMeta }
+
+    Served from SnapshotViews (cached per asset-table generation) with an
+    ETag; a matching If-None-Match gets 304 Not Modified.
     """
     state = _get_state()
 
-    assets = state.all_assets()
-
-    # Filter
-    if market_type in ("perp", "spot"):
-        assets = [a for a in assets if a.market_type == market_type]
-    assets = [a for a in assets if a.market_status == "active"]
-
-    # Universe gate (defensive — state should only contain universe assets after boot)
-    if state.universe_allowlist:
-        assets = [a for a in assets if state.in_universe(a.coin)]
-
-    # Volume gate: explicit parameter overrides; default minimum keeps junk tokens off the board.
-    # Spot markets have a lower default since many legit spots are smaller than major perps.
-    _default_spot_min   = 50_000     # $50K/day — eliminates user-created junk spot tokens
-    _default_perp_min   = 0          # no default perp floor (perp universe is already clean)
-    if min_volume_usd is not None:
-        assets = [a for a in assets if (a.day_ntl_vlm or 0) >= min_volume_usd]
-    else:
-        assets = [
-            a for a in assets
-            if a.market_type != "spot" or (a.day_ntl_vlm or 0) >= _default_spot_min
-        ]
-    if max_spread_bps is not None:
-        assets = [a for a in assets if (a.spread_bps or 0) <= max_spread_bps]
-
-    # Sort by internal field, then convert to rows
-    _SORT_MAP = {
-        "overallScore":       "overall_score",
-        "compositeSignal":    "composite_signal_score",
-        "volume24h":          "day_ntl_vlm",
-        "openInterest":       "open_interest_usd",
-        "change24hPct":       "pct_change_24h",
-        "funding":            "funding",
-        "spreadBps":          "spread_bps",
-        "momentum":           "momentum_score",
-        "breakoutScore":      "breakout_score",
-        "liquidityScore":     "liquidity_score",
-        "structuralQuality":  "structural_quality_score",
-    }
     sort_field = _SORT_MAP.get(sort_by, "overall_score")
     reverse = sort_dir.lower() != "asc"
-    try:
-        assets.sort(
-            key=lambda a: (getattr(a, sort_field) or 0) if getattr(a, sort_field) is not None else -1e18,
-            reverse=reverse,
-        )
-    except AttributeError:
-        assets.sort(key=lambda a: a.overall_score or 0, reverse=True)
-
-    assets = assets[:limit]
-
-    rows = [_asset_to_row(a, rank=i + 1) for i, a in enumerate(assets)]
-    meta = _build_meta(rows, state)
+    etag, body = _snapshot_views.render(
+        state, market_type, limit, sort_field, reverse,
+        min_volume_usd=min_volume_usd, max_spread_bps=max_spread_bps,
+    )
 
-    return {"rows": rows, "meta": meta}
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type="application/json", headers=headers)
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -372,13 +399,15 @@ async def get_hero_signals(max_ideas: int = 20, min_volume_usd: float = 5_000_00
     thesis_title, thesis_summary, reasons[], what_to_watch[],
     invalidation_notes[], risk_flags[], metrics, scores (all components).
 
-    No LLM calls — 100% deterministic scoring.
+    No LLM calls — 100% deterministic scoring.  Memoized per feature pass
+    (see _signal_views).
     """
     state = _get_state()
-    if not state.is_ready:
+    if not state.has(READY_CANDLE_FEATURES):
         raise HTTPException(503, "Screener is still initializing")
 
-    return generate_agent_briefing(state, max_ideas=max_ideas, min_volume_usd=min_volume_usd)
+    body = _signal_views.get(state, "briefing", max_ideas, min_volume_usd)
+    return Response(body, media_type="application/json")
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -396,17 +425,22 @@ async def get_sections(rows_per_section: int = 6):
     `available: false` until enough history has accumulated.
     """
     state = _get_state()
-    if not state.is_ready:
+    if not state.has(READY_CANDLE_FEATURES):
         raise HTTPException(503, "Screener is still initializing")
 
+    body = _signal_views.get(state, "sections", rows_per_section)
+    return Response(body, media_type="application/json")
+
+
+def _build_sections(state: HyperliquidState, rows_per_section: int) -> bytes:
     sections     = build_signal_sections(state, rows_per_section=rows_per_section)
     summary_cards = build_summary_cards(state)
     hero_signals  = generate_hero_signals(state, top_n=5)
 
     perps = [a for a in state.perp_assets() if a.market_status == "active"]
-    has_oi_history = sum(1 for c in state.oi_history if len(state.oi_history[c]) >= 5) >= 10
+    has_oi_history = state.oi_history.coins_with(5) >= 10
 
-    return {
+    return codec.dumps({
         "heroAgentSignals": [s.model_dump() for s in hero_signals],
         "summaryCards":     summary_cards,
         "signalSections":   sections,
@@ -415,11 +449,11 @@ async def get_sections(rows_per_section: int = 6):
             "totalSpots":         len(state.spot_assets()),
             "oiHistoryAvailable": has_oi_history,
             "volImpulseAvailable": sum(1 for a in perps if a.volume_impulse_5m is not None) >= 10,
-            "scoreHistoryAvailable": sum(1 for c in state.score_history if len(state.score_history[c]) >= 2) >= 10,
+            "scoreHistoryAvailable": state.score_history.coins_with(2) >= 10,
             "generatedAt":        _iso_now(),
             "scoreVersion":       "2.0",
         },
-    }
+    })
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -431,17 +465,22 @@ async def get_asset(coin: str):
     """
     Single asset detail.
     Returns { coin, priceHistory, orderBook, recentTrades, summaries, scoreHistory }
+    An open detail view keeps the coin's ctx / bbo / trades feeds subscribed.
     """
     state = _get_state()
     coin = coin.upper()
     asset = state.get_asset(coin)
     if asset is None:
         raise HTTPException(404, f"Asset '{coin}' not found in screener universe")
+    state.detail_views[coin] = time.time()
 
     # Price history from 1h candles → simple {t, p} pairs
-    candles_1h = state.get_candles(coin, "1h", n=50)
-    candles_5m = state.get_candles(coin, "5m", n=50)
-    price_history = [{"t": int(c["t"]), "p": float(c["c"])} for c in candles_1h if c.get("t") and c.get("c")]
+    candles_1h = state.candle_window(coin, "1h", n=50)
+    price_history = [
+        {"t": int(t), "p": p}
+        for t, p in candles_1h[:, [T, CLOSE]].tolist()
+        if t and p == p
+    ]
 
     # Order book → [[price, size], ...]
     book = state.get_book(coin) or {}
@@ -559,8 +598,8 @@ def _structure_summary(a: ScreenerAsset) -> Optional[str]:
 async def _fetch_fear_greed() -> dict:
     """Fetch Crypto Fear & Greed Index from alternative.me (free, no auth)."""
     try:
-        import httpx
-        async with httpx.AsyncClient(timeout=4.0) as http:
+        from data import http_pool
+        async with http_pool.session(timeout=4.0) as http:
             r = await http.get("https://api.alternative.me/fng/?limit=1")
             data = r.json()
             items = data.get("data", [])
@@ -655,9 +694,10 @@ async def agent_rank(req: AgentRankIn):
     """
     Agent ranking + LLM market analysis.
     Returns deterministic ranked coins + Claude Haiku analysis of the current regime.
+    The deterministic ranking is memoized per feature pass and ranking mode.
     """
     state = _get_state()
-    if not state.is_ready:
+    if not state.has(READY_CANDLE_FEATURES):
         raise HTTPException(503, "Screener is still initializing. Please retry in a moment.")
 
     mode = req.rankingMode if req.rankingMode in ("balanced", "momentum", "breakout", "mean_reversion", "crowding_dislocation") else "balanced"
@@ -665,18 +705,34 @@ async def agent_rank(req: AgentRankIn):
     # Start Fear & Greed fetch concurrently while ranking runs (synchronous CPU work)
     fg_task = asyncio.create_task(_fetch_fear_greed())
 
+    ranking, ranked = _signal_views.get(state, "agent_rank", mode, req.includeRationales)
+
+    # Await Fear & Greed (should already be done by now) then call LLM
+    fear_greed = await fg_task
+    llm_analysis = await _generate_llm_analysis(ranked, fear_greed)
+
+    return {
+        **ranking,
+        "llmAnalysis":   llm_analysis,
+        "fearGreed":     fear_greed,
+        "generatedAt":   _iso_now(),
+    }
+
+
+def _build_agent_rank(state: HyperliquidState, mode: str, include_rationales: bool) -> tuple[dict, list[ScreenerAsset]]:
+    """Deterministic part of /agent-rank → (payload fields, ranked assets)."""
     # Rank using our internal state (real-time, richer than frontend rows)
     all_assets = [a for a in state.all_assets() if a.market_status == "active" and a.market_type == "perp"]
     ranked = rank_assets(all_assets, mode=mode, prev_ranks=state.prev_ranks)
 
-    # Update prev ranks for next call
+    # Update prev ranks for the next ranking (built once per feature pass)
     state.prev_ranks = {a.coin: a.rank for a in ranked if a.rank is not None}
 
     def _to_ranked_item(a: ScreenerAsset, direction_override: Optional[str] = None) -> dict:
         signal_dir = direction_override or a.signal_direction or "neutral"
         dir_out = {"long": "long", "short": "short", "neutral": "neutral"}.get(signal_dir, "neutral")
 
-        rationale = generate_rationale(a, mode) if req.includeRationales else None
+        rationale = generate_rationale(a, mode) if include_rationales else None
         rank_movement = None
         if a.prev_rank is not None and a.rank is not None:
             rank_movement = a.prev_rank - a.rank   # positive = moved up
@@ -719,10 +775,6 @@ async def agent_rank(req: AgentRankIn):
         f"Most extreme funding: {extreme_fund[0]} ({extreme_fund[1]:+.0%} ann.)."
     )
 
-    # Await Fear & Greed (should already be done by now) then call LLM
-    fear_greed = await fg_task
-    llm_analysis = await _generate_llm_analysis(ranked, fear_greed)
-
     return {
         "rankedCoins":   ranked_coins,
         "longs":         longs,
@@ -731,92 +783,153 @@ async def agent_rank(req: AgentRankIn):
         "meanReversions": mean_revs,
         "avoid":         avoid,
         "summary":       summary,
-        "llmAnalysis":   llm_analysis,
-        "fearGreed":     fear_greed,
-        "generatedAt":   _iso_now(),
-    }
+    }, ranked
 
 
 # ─────────────────────────────────────────────────────────────────────────────
 # WS /api/hyperliquid/screener/ws  — live push to frontend
 # ─────────────────────────────────────────────────────────────────────────────
 
-_ws_clients: set[WebSocket] = set()
-_ws_lock = asyncio.Lock()
+def _ws_rows() -> list[dict]:
+    """Top-300 active rows ranked by overall score (the /ws rank index)."""
+    state = _get_state()
+    assets = [a for a in state.all_assets() if a.market_status == "active"]
+    assets.sort(key=lambda a: a.overall_score or 0, reverse=True)
+    return [_asset_to_row(a, rank=i + 1) for i, a in enumerate(assets[:300])]
+
+
+_broadcaster = ScreenerBroadcaster(
+    build_rows=_ws_rows,
+    build_meta=lambda rows: _build_meta(rows, _get_state()),
+    ready=lambda: _state is not None and _state.is_ready,
+    on_cycle=lambda sent: _state.metrics.record_broadcast(sent),
+)
 
 
 @router.websocket("/ws")
 async def screener_ws(websocket: WebSocket):
     """
     Backend → frontend WebSocket.
-    Events: snapshot_ready | asset_update | connection_status | error | ping
+    Events: snapshot_ready | rows_delta | connection_status | error | ping
+
+    Every outbound frame goes through the client's queue in the shared
+    ScreenerBroadcaster; this handler only reads client messages.
     """
+    _get_state()
     await websocket.accept()
-    async with _ws_lock:
-        _ws_clients.add(websocket)
-
-    state = _get_state()
+    _broadcaster.add(websocket)
 
     try:
-        # Send initial snapshot or initializing status
-        if state.is_ready:
-            await websocket.send_json(_build_ws_snapshot(state))
-        else:
-            await websocket.send_json({"event": "connection_status", "data": {"status": "initializing"}, "ts": time.time()})
-
         # Keep alive — forward client messages
         while True:
             try:
                 raw = await asyncio.wait_for(websocket.receive_text(), timeout=30.0)
-                msg = json.loads(raw)
+                msg = codec.loads(raw)
                 msg_type = msg.get("type", "")
                 if msg_type == "refresh":
-                    await websocket.send_json(_build_ws_snapshot(state))
+                    _broadcaster.request_snapshot(websocket)
                 elif msg_type == "pong":
                     pass
             except asyncio.TimeoutError:
-                await websocket.send_json({"event": "ping", "ts": time.time()})
+                _broadcaster.send(websocket, {"event": "ping", "ts": time.time()})
     except WebSocketDisconnect:
         pass
     except Exception as e:
-        try:
-            await websocket.send_json({"event": "error", "data": {"message": str(e)}, "ts": time.time()})
-        except Exception:
-            pass
+        _broadcaster.send(websocket, {"event": "error", "data": {"message": str(e)}, "ts": time.time()})
+        # Give the sender a moment to flush the error frame
+        await asyncio.sleep(0.1)
     finally:
-        async with _ws_lock:
-            _ws_clients.discard(websocket)
+        _broadcaster.remove(websocket)
 
 
-def _build_ws_snapshot(state: HyperliquidState) -> dict:
-    assets = [a for a in state.all_assets() if a.market_status == "active"]
-    assets.sort(key=lambda a: a.overall_score or 0, reverse=True)
-    rows = [_asset_to_row(a, rank=i + 1) for i, a in enumerate(assets[:300])]
-    meta = _build_meta(rows, state)
+# ─────────────────────────────────────────────────────────────────────────────
+# GET /api/hyperliquid/screener/status
+# ─────────────────────────────────────────────────────────────────────────────
+
+@router.get("/status")
+async def get_status():
+    """
+    Feed health: readiness, WS connectivity, data freshness and the WS
+    ingest pipeline counters (queue depth, dropped / coalesced frames,
+    apply latency) for spotting backpressure.  `stale` is true while a
+    warm-start snapshot is served and the boot backfill is still running.
+    `readiness` is per capability; `boot` has the per-stage timings and the
+    seconds from boot start to each capability (time to first snapshot =
+    ready_after_s.prices).  `subscriptions` has the WS shard sizes and the
+    subscribe / unsubscribe counts of the rotation.  `shared` is this
+    worker's role and segment counters in HL_SHARED_STATE mode.
+    """
+    state = _get_state()
+    freshness = state.freshness_seconds()
     return {
-        "event": "snapshot_ready",
-        "data": {"rows": rows, "meta": meta},
-        "ts": time.time(),
+        "ready":            state.is_ready,
+        "readiness":        state.readiness(),
+        "stale":            state.is_stale,
+        "warm_start_at":    _iso_ts(state.warm_start_ts) if state.warm_start_ts else None,
+        "ws_connected":     state.ws_connected,
+        "subscriptions":    state.subscription_stats,
+        "shared":           state.shared_stats,
+        "assets":           len(state.assets),
+        "freshness_s":      round(freshness, 2) if freshness is not None else None,
+        "ingest":           state.ingest.as_dict(),
+        "ws_clients":       _broadcaster.stats(),
+        "snapshot_views":   _snapshot_views.stats(),
+        "signal_views":     _signal_views.stats(),
+        "tsmom":            _tsmom.stats(),
+        "boot":             state.boot_report(),
+        "generated_at":     _iso_now(),
     }
 
 
+# ─────────────────────────────────────────────────────────────────────────────
+# GET /api/hyperliquid/screener/metrics
+# ─────────────────────────────────────────────────────────────────────────────
+
+@router.get("/metrics")
+async def get_metrics():
+    """
+    Prometheus text exposition of the hot-path metrics (metrics.py) plus the
+    numeric /status counters.  A scrape also turns on the per-patch and
+    per-stage timings until scrapes stop for a while.
+    """
+    state = _get_state()
+    body = state.metrics.render({
+        "ingest":         state.ingest.as_dict(),
+        "subscriptions":  state.subscription_stats,
+        "ws_clients":     _broadcaster.stats(),
+        "snapshot_views": _snapshot_views.stats(),
+        "signal_views":   _signal_views.stats(),
+        "tsmom":          _tsmom.stats(),
+    })
+    return Response(body, media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # GET /api/hyperliquid/screener/tsmom-signals
 # ─────────────────────────────────────────────────────────────────────────────
 
+_tsmom = TsmomEngine()
+
+# top_n beyond this is the whole universe anyway; clamped so clients can't
+# mint unbounded distinct cache entries
+_TSMOM_MAX_TOP_N = 500
+
+
 @router.get("/tsmom-signals")
-async def get_tsmom_signals(top_n: int = 60):
+async def get_tsmom_signals(top_n: Optional[int] = None):
     """
-    Time-Series Momentum (TSMOM) signals for top perps.
+    Time-Series Momentum (TSMOM) signals for every main-DEX perp with enough
+    1d history (or the top_n by volume).
 
     Returns multi-lookback z-score signals, funding-adjusted and vol-targeted.
-    1d candle data is loaded in the post-boot enrichment task (~30-60s after boot).
+    Cached per 1d candle generation (see TsmomEngine); 1d candle data for the
+    full universe is loaded in the post-boot enrichment task.
     Returns empty signals (not 503) while data is loading to avoid frontend error state.
     """
     state = _get_state()
     # Return empty response during boot rather than 503 — frontend shows
     # a friendly "loading" message and auto-refreshes every 60s.
-    if not state.is_ready:
+    if not state.has(READY_TSMOM):
         return {
             "signals": [],
             "meta": {
@@ -829,26 +942,6 @@ async def get_tsmom_signals(top_n: int = 60):
             },
         }
 
-    return compute_tsmom_signals(state, top_n=top_n)
-
-
-async def broadcast_asset_update(coin: str, state: HyperliquidState):
-    """Push a single asset update to all connected frontend WS clients."""
-    if not _ws_clients:
-        return
-    asset = state.get_asset(coin)
-    if asset is None:
-        return
-    # Find approximate rank
-    all_sorted = sorted(state.all_assets(), key=lambda a: a.overall_score or 0, reverse=True)
-    rank = next((i + 1 for i, a in enumerate(all_sorted) if a.coin == coin), 0)
-    row = _asset_to_row(asset, rank=rank)
-    payload = {"event": "asset_update", "data": row, "ts": time.time()}
-    dead = set()
-    async with _ws_lock:
-        for ws in list(_ws_clients):
-            try:
-                await ws.send_json(payload)
-            except Exception:
-                dead.add(ws)
-        _ws_clients -= dead
+    if top_n is not None:
+        top_n = max(1, min(top_n, _TSMOM_MAX_TOP_N))
+    return _tsmom.signals(state, top_n=top_n)
@@ -0,0 +1,300 @@
+"""
+Hyperliquid Screener — Info API request scheduler.
+
+Hyperliquid rate-limits REST by weight per IP (1200 / minute): most info
+requests cost 20, l2Book / allMids cost 2, candleSnapshot adds 1 per 60 bars
+returned.  Every HyperliquidRestClient request goes through one
+InfoScheduler, which:
+
+  - charges the request's weight against a token bucket refilled at the
+    per-minute budget, so bulk fetches are paced instead of bursting;
+  - caps in-flight requests with an adaptive (AIMD) limit: +1 after a
+    limit's worth of successes, halved on 429 / 5xx / transport errors;
+  - retries 429, 5xx and transport errors with full-jitter exponential
+    backoff (Retry-After wins when the server sends one); a 429 also drains
+    the bucket so every queued request backs off, not just the one that hit;
+  - coalesces concurrent identical payloads into one request.
+
+Bulk helpers account their requests in a BulkReport, which callers receive
+through a progress callback (done / ok / empty / failed, retries, weight,
+throughput, time spent waiting for budget).
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import math
+import os
+import random
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+import httpx
+
+# Weight budget per minute (Hyperliquid allows 1200 per IP)
+INFO_WEIGHT_PER_MIN = float(os.getenv("HL_INFO_WEIGHT_PER_MIN", "1200"))
+
+_LIGHT_TYPES = frozenset({
+    "l2Book", "allMids", "clearinghouseState", "orderStatus",
+    "spotClearinghouseState", "exchangeStatus",
+})
+_DEFAULT_WEIGHT = 20
+_LIGHT_WEIGHT = 2
+_CANDLES_PER_WEIGHT = 60
+
+
+def request_weight(payload: dict, n_items: int = 0) -> int:
+    """Rate-limit weight of an Info request expected to return n_items rows."""
+    kind = payload.get("type")
+    if kind in _LIGHT_TYPES:
+        return _LIGHT_WEIGHT
+    if kind == "candleSnapshot":
+        return _DEFAULT_WEIGHT + math.ceil(n_items / _CANDLES_PER_WEIGHT)
+    return _DEFAULT_WEIGHT
+
+
+def _retry_after(exc: Exception) -> Optional[float]:
+    if isinstance(exc, httpx.HTTPStatusError):
+        try:
+            return float(exc.response.headers.get("retry-after", ""))
+        except ValueError:
+            return None
+    return None
+
+
+def _is_throttle(exc: Exception) -> bool:
+    return isinstance(exc, httpx.HTTPStatusError) and exc.response.status_code == 429
+
+
+def _is_retryable(exc: Exception) -> bool:
+    if isinstance(exc, httpx.HTTPStatusError):
+        code = exc.response.status_code
+        return code == 429 or code >= 500
+    return isinstance(exc, httpx.TransportError)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Bulk progress
+# ─────────────────────────────────────────────────────────────────────────────
+
+class BulkReport:
+    """Progress / throughput of one bulk fetch; finished once done == total."""
+
+    __slots__ = ("label", "total", "done", "ok", "empty", "failed", "retries",
+                 "weight", "waited_s", "started", "finished")
+
+    def __init__(self, label: str, total: int):
+        self.label = label
+        self.total = total
+        self.done = self.ok = self.empty = self.failed = self.retries = self.weight = 0
+        self.waited_s = 0.0
+        self.started = time.monotonic()
+        self.finished: Optional[float] = None if total else self.started
+
+    def record(self, ok: bool, empty: bool = False):
+        self.done += 1
+        if ok:
+            self.ok += 1
+            self.empty += empty
+        else:
+            self.failed += 1
+        if self.done >= self.total:
+            self.finished = time.monotonic()
+
+    @property
+    def elapsed_s(self) -> float:
+        return (self.finished or time.monotonic()) - self.started
+
+    @property
+    def rate(self) -> float:
+        """Completed requests per second."""
+        return self.done / self.elapsed_s if self.elapsed_s > 0 else 0.0
+
+    def summary(self) -> str:
+        return (f"{self.label}: {self.ok}/{self.total} ok ({self.empty} empty), {self.failed} failed | "
+                f"{self.retries} retries, weight {self.weight} | {self.elapsed_s:.2f}s, "
+                f"{self.rate:.1f} req/s, {self.waited_s:.2f}s waiting for budget")
+
+    def as_dict(self) -> dict:
+        return {
+            "label": self.label, "total": self.total, "done": self.done, "ok": self.ok,
+            "empty": self.empty, "failed": self.failed, "retries": self.retries,
+            "weight": self.weight, "waited_s": round(self.waited_s, 3),
+            "elapsed_s": round(self.elapsed_s, 3), "req_per_s": round(self.rate, 2),
+        }
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Budget + concurrency
+# ─────────────────────────────────────────────────────────────────────────────
+
+class _WeightBucket:
+    """Token bucket over request weight; waiters are served in arrival order."""
+
+    def __init__(self, per_min: float):
+        self.capacity = per_min
+        self.rate = per_min / 60.0
+        self.tokens = per_min
+        self._last = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    async def acquire(self, weight: float) -> float:
+        """Take `weight` tokens, sleeping until they are available; returns seconds waited."""
+        waited = 0.0
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= weight:
+                    self.tokens -= weight
+                    return waited
+                delay = (weight - self.tokens) / self.rate
+                await asyncio.sleep(delay)
+                waited += delay
+
+    def drain(self, pause_s: float):
+        """Throttled by the server: empty the bucket and owe `pause_s` of refill."""
+        self._refill()
+        self.tokens = min(self.tokens, 0.0) - pause_s * self.rate
+
+
+class _AdaptiveLimit:
+    """In-flight cap that grows by one per `limit` successes and halves on pressure."""
+
+    def __init__(self, initial: int, maximum: int, minimum: int = 1):
+        self.limit = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self.active = 0
+        self._streak = 0
+        self._cond = asyncio.Condition()
+
+    async def acquire(self):
+        async with self._cond:
+            await self._cond.wait_for(lambda: self.active < self.limit)
+            self.active += 1
+
+    async def release(self, pressure: Optional[bool]):
+        """pressure: True = back off, False = success, None = neutral (client error)."""
+        async with self._cond:
+            self.active -= 1
+            if pressure:
+                self.limit = max(self.minimum, self.limit // 2)
+                self._streak = 0
+            elif pressure is False:
+                self._streak += 1
+                if self._streak >= self.limit:
+                    self.limit = min(self.maximum, self.limit + 1)
+                    self._streak = 0
+            self._cond.notify_all()
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Scheduler
+# ─────────────────────────────────────────────────────────────────────────────
+
+class InfoScheduler:
+    """
+    send(payload) → decoded response; raises httpx errors.
+    One instance per HyperliquidRestClient (it owns the connection pool the
+    concurrency limit is sized for).
+    """
+
+    def __init__(
+        self,
+        send: Callable[[dict], Awaitable[Any]],
+        weight_per_min: float = INFO_WEIGHT_PER_MIN,
+        max_concurrency: int = 20,
+        initial_concurrency: int = 8,
+        max_attempts: int = 4,
+        backoff_base_s: float = 0.5,
+        backoff_cap_s: float = 8.0,
+    ):
+        self._send = send
+        self._bucket = _WeightBucket(weight_per_min)
+        self._limit = _AdaptiveLimit(min(initial_concurrency, max_concurrency), max_concurrency)
+        self.max_attempts = max_attempts
+        self.backoff_base_s = backoff_base_s
+        self.backoff_cap_s = backoff_cap_s
+        self._inflight: dict[str, asyncio.Task] = {}
+
+        self.requests = 0
+        self.retries = 0
+        self.throttled = 0
+        self.failures = 0
+        self.deduped = 0
+        self.weight_used = 0
+
+    async def request(self, payload: dict, weight: int, report: Optional[BulkReport] = None) -> Any:
+        key = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+        task = self._inflight.get(key)
+        if task is not None:
+            self.deduped += 1
+        else:
+            task = asyncio.ensure_future(self._run(payload, weight, report))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._done(key, t))
+        # Shielded: one caller giving up must not cancel the shared request
+        return await asyncio.shield(task)
+
+    def _done(self, key: str, task: asyncio.Task):
+        self._inflight.pop(key, None)
+        if not task.cancelled():
+            task.exception()        # retrieved even if every caller went away
+
+    async def _run(self, payload: dict, weight: int, report: Optional[BulkReport]) -> Any:
+        for attempt in range(self.max_attempts):
+            waited = await self._bucket.acquire(weight)
+            self.weight_used += weight
+            if report is not None:
+                report.waited_s += waited
+                report.weight += weight
+                report.retries += attempt > 0
+
+            await self._limit.acquire()
+            self.requests += 1
+            error: Optional[Exception] = None
+            pressure: Optional[bool] = None     # stays neutral if the send is cancelled
+            try:
+                result = await self._send(payload)
+                pressure = False
+            except Exception as e:
+                error = e
+                pressure = True if _is_retryable(e) else None
+            finally:
+                # Always give the slot back, including on cancellation
+                await self._limit.release(pressure)
+            if error is not None:
+                if pressure is None or attempt == self.max_attempts - 1:
+                    self.failures += 1
+                    raise error
+                self.retries += 1
+                retry_after = _retry_after(error)
+                backoff = min(self.backoff_cap_s, self.backoff_base_s * 2 ** attempt)
+                if _is_throttle(error):
+                    # The drained bucket holds everyone back; just de-synchronize the retries
+                    self.throttled += 1
+                    self._bucket.drain(retry_after if retry_after is not None else backoff)
+                    delay = random.uniform(0, self.backoff_base_s)
+                else:
+                    delay = retry_after if retry_after is not None else random.uniform(0, backoff)
+                await asyncio.sleep(delay)
+                continue
+            return result
+
+    def stats(self) -> dict:
+        return {
+            "requests":     self.requests,
+            "retries":      self.retries,
+            "throttled":    self.throttled,
+            "failures":     self.failures,
+            "deduped":      self.deduped,
+            "weight_used":  self.weight_used,
+            "concurrency":  self._limit.limit,
+            "in_flight":    self._limit.active,
+            "budget":       round(max(self._bucket.tokens, 0.0), 1),
+        }
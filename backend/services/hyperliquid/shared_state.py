@@ -0,0 +1,402 @@
+"""
+Hyperliquid Screener — single ingester, multi-reader shared state.
+
+With several app workers (uvicorn --workers / gunicorn) every process would
+otherwise boot its own copy of the screener: N× the REST weight, N× the WS
+connections and N× the feature passes for identical data.  With
+HL_SHARED_STATE=1 the workers elect one ingester through an exclusive
+flock on <path>.lock:
+
+  ingester — runs boot_and_run as usual and, every _PUBLISH_INTERVAL_S
+             while the state is ready and has changed, publishes it into
+             the shared segment
+  readers  — never touch Hyperliquid; they attach the segment read-only,
+             decode each new generation into a fresh HyperliquidState off
+             the event loop and swap it into the router (set_state), so
+             /api/hyperliquid/screener/* is served from the ingester's data.
+             Every _ELECTION_INTERVAL_S they retry the lock, and the first
+             to get it after the ingester died takes over
+
+Segment (a file, on /dev/shm where available), never shrunk:
+
+  header   b"HLSS" | uint32 version | uint64 seq | uint64 generation |
+           uint64 slot capacity | uint64 active slot | uint64 length |
+           float64 published_at                         (padded to 64 bytes)
+  slot 0   payload bytes
+  slot 1   payload bytes
+
+A payload is a warm-start encoding (warm_start.py) of the state plus a
+"live" block (books, recent trades, readiness / freshness, ingest stats).
+Publishing writes the inactive slot and flips the header under a seqlock:
+seq is odd while a publish is in progress and every publish adds 2 (4 when
+it grows the file and moves the slots).  A reader takes a consistent
+header between two equal, even seq reads, copies the active slot and
+accepts the copy if seq advanced by at most 2 meanwhile — that publish
+wrote the other slot; anything more may have overwritten the one read.
+
+Reader-side state that the ingester would need (e.g. detail_views for
+subscription planning) is not sent back.
+"""
+from __future__ import annotations
+
+import asyncio
+import mmap
+import os
+import struct
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows — run_shared falls back to a private ingester
+    fcntl = None
+
+from .metrics import PipelineMetrics
+from .state import HyperliquidState
+from .warm_start import collect_warm_start, decode_header, encode_snapshot, restore_snapshot
+from .websocket_manager import boot_and_run
+
+_SHM_DIR = Path("/dev/shm") if Path("/dev/shm").is_dir() else Path(tempfile.gettempdir())
+
+SHARED_STATE_ENABLED = os.getenv("HL_SHARED_STATE", "0") == "1"
+SHARED_STATE_PATH = Path(os.getenv("HL_SHARED_STATE_PATH", str(_SHM_DIR / "hl_screener_state.bin")))
+
+# Ingester publish cadence (skipped while nothing changed); readers poll at
+# the same rate and retry the ingester lock every _ELECTION_INTERVAL_S
+_PUBLISH_INTERVAL_S = float(os.getenv("HL_SHARED_PUBLISH_S", "2.0"))
+_ELECTION_INTERVAL_S = 5.0
+
+_MAGIC = b"HLSS"
+_VERSION = 1
+_HEADER = struct.Struct("<4sIQQQQQd")
+_SEQ = struct.Struct("<Q")
+_SEQ_OFFSET = 8
+_HEADER_SIZE = 64
+_INITIAL_CAPACITY = 8 << 20
+
+# Torn reads retried per poll
+_READ_ATTEMPTS = 5
+
+# Trades per coin carried to readers (what /asset/{coin} serves)
+_SHARED_TRADES = 100
+
+# HyperliquidState attributes copied verbatim into reader states
+_LIVE_ATTRS = (
+    "is_ready", "is_stale", "ws_connected", "boot_ts", "boot_started_ts", "last_mids_ts",
+    "last_ctx_ts", "warm_start_ts", "ready_at", "boot_stages", "subscription_stats", "feature_generation",
+)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Segment
+# ─────────────────────────────────────────────────────────────────────────────
+
+class SharedStateWriter:
+    """The ingester's side of the segment: double-buffered seqlock publishes."""
+
+    def __init__(self, path: Path = SHARED_STATE_PATH, initial_capacity: int = _INITIAL_CAPACITY):
+        self.path = path
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        self.seq = self.generation = 0
+        self.slot = 0
+        self.capacity = initial_capacity
+        if os.fstat(self._fd).st_size >= _HEADER_SIZE:
+            # Continue the previous ingester's sequence so readers see a new generation
+            with mmap.mmap(self._fd, _HEADER_SIZE) as mm:
+                magic, version, seq, generation, capacity, slot, _, _ = _HEADER.unpack_from(mm, 0)
+            if magic == _MAGIC and version == _VERSION:
+                self.seq = seq + (seq & 1) + 2
+                # Same slot layout: the active slot stays readable until the next publish
+                self.generation, self.slot, self.capacity = generation, slot, capacity
+        self._mm = self._map()
+        _SEQ.pack_into(self._mm, _SEQ_OFFSET, self.seq)
+
+        self.publishes = 0
+        self.bytes_last = 0
+        self.publish_ms_last: Optional[float] = None
+        self.published_at: Optional[float] = None
+
+    def _map(self) -> mmap.mmap:
+        size = _HEADER_SIZE + 2 * self.capacity
+        if os.fstat(self._fd).st_size < size:
+            os.ftruncate(self._fd, size)
+        return mmap.mmap(self._fd, size)
+
+    def stats(self) -> dict:
+        return {
+            "role":            "ingester",
+            "path":            str(self.path),
+            "generation":      self.generation,
+            "publishes":       self.publishes,
+            "bytes_last":      self.bytes_last,
+            "capacity":        self.capacity,
+            "publish_ms_last": self.publish_ms_last,
+            "published_at":    self.published_at,
+        }
+
+    def publish(self, payload: bytes) -> int:
+        """Write payload as the next generation; returns that generation."""
+        t0 = time.perf_counter()
+        mm = self._mm
+        seq = self.seq + 1
+        _SEQ.pack_into(mm, _SEQ_OFFSET, seq)
+        if len(payload) > self.capacity:
+            # Slots move: the extra 2 invalidates reads that overlapped the resize
+            seq += 2
+            _SEQ.pack_into(mm, _SEQ_OFFSET, seq)
+            mm.close()
+            self.capacity = max(2 * self.capacity, len(payload) + (len(payload) >> 2))
+            self._mm = mm = self._map()
+        slot = 1 - self.slot
+        start = _HEADER_SIZE + slot * self.capacity
+        mm[start:start + len(payload)] = payload
+        self.generation += 1
+        self.slot = slot
+        self.published_at = time.time()
+        _HEADER.pack_into(mm, 0, _MAGIC, _VERSION, seq, self.generation, self.capacity, slot,
+                          len(payload), self.published_at)
+        self.seq = seq + 1
+        _SEQ.pack_into(mm, _SEQ_OFFSET, self.seq)
+
+        self.publishes += 1
+        self.bytes_last = len(payload)
+        self.publish_ms_last = round((time.perf_counter() - t0) * 1000, 3)
+        return self.generation
+
+    def close(self):
+        self._mm.close()
+        os.close(self._fd)
+
+
+class SharedStateReader:
+    """A worker's read-only view of the segment."""
+
+    def __init__(self, path: Path = SHARED_STATE_PATH):
+        self.path = path
+        self._mm: Optional[mmap.mmap] = None
+        self.generation: Optional[int] = None
+        self.published_at: Optional[float] = None
+        self.loads = 0
+        self.retries = 0
+
+    def _map(self) -> bool:
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        try:
+            with open(self.path, "rb") as f:
+                if os.fstat(f.fileno()).st_size < _HEADER_SIZE:
+                    return False
+                self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except FileNotFoundError:
+            return False
+        return True
+
+    def stats(self) -> dict:
+        return {
+            "role":         "reader",
+            "path":         str(self.path),
+            "generation":   self.generation,
+            "loads":        self.loads,
+            "retries":      self.retries,
+            "published_at": self.published_at,
+        }
+
+    def read(self) -> Optional[tuple[int, float, bytes]]:
+        """
+        (generation, published_at, payload copy) of the newest publish, or
+        None when there is none newer than the last one returned (or no
+        consistent copy could be taken this time).
+        """
+        for _ in range(_READ_ATTEMPTS):
+            if self._mm is None and not self._map():
+                return None
+            mm = self._mm
+            seq = _SEQ.unpack_from(mm, _SEQ_OFFSET)[0]
+            magic, version, _, generation, capacity, slot, length, published_at = _HEADER.unpack_from(mm, 0)
+            if _SEQ.unpack_from(mm, _SEQ_OFFSET)[0] != seq or seq & 1:
+                self.retries += 1
+                time.sleep(0.001)
+                continue
+            if magic != _MAGIC or version != _VERSION or generation == 0:
+                return None
+            if generation == self.generation:
+                return None
+            start = _HEADER_SIZE + slot * capacity
+            if start + length > len(mm):
+                # The ingester grew the file since it was mapped
+                self._map()
+                continue
+            payload = mm[start:start + length]
+            if _SEQ.unpack_from(mm, _SEQ_OFFSET)[0] - seq > 2:
+                self.retries += 1
+                continue
+            self.generation = generation
+            self.published_at = published_at
+            self.loads += 1
+            return generation, published_at, payload
+        return None
+
+    def close(self):
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+
+
+def try_ingester_lock(path: Path) -> Optional[int]:
+    """Non-blocking exclusive flock; the fd (held for the process lifetime) or None."""
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        os.close(fd)
+        return None
+    return fd
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# State ↔ payload
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _shallow_copy(value):
+    return dict(value) if isinstance(value, dict) else value
+
+
+def collect_shared(state: HyperliquidState) -> dict:
+    """Warm-start snapshot plus the live fields readers serve (event loop)."""
+    snapshot = collect_warm_start(state)
+    # Everything is copied here: the encode runs in a worker thread while the
+    # loop keeps mutating the state (dicts shallow-copied, like books)
+    snapshot["live"] = {
+        **{name: _shallow_copy(getattr(state, name)) for name in _LIVE_ATTRS},
+        "books":             dict(state.books),
+        "trades":            {coin: list(trades)[-_SHARED_TRADES:]
+                              for coin, trades in list(state.trades.items()) if trades},
+        "candle_generation": dict(state.candle_generation),
+        "ingest":            state.ingest.as_dict(),
+    }
+    return snapshot
+
+
+def decode_shared(payload) -> HyperliquidState:
+    """A fresh reader state from a published payload (forming bars kept)."""
+    state = HyperliquidState()
+    header, offset = decode_header(payload)
+    restore_snapshot(state, payload, header, offset, closed_only=False)
+    live = header["live"]
+    for name in _LIVE_ATTRS:
+        setattr(state, name, live[name])
+    state.books = live["books"]
+    for coin, trades in live["trades"].items():
+        state.trades[coin].extend(trades)
+    state.candle_generation.update(live["candle_generation"])
+    for name, value in live["ingest"].items():
+        setattr(state.ingest, name, value)
+    return state
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Roles
+# ─────────────────────────────────────────────────────────────────────────────
+
+async def run_shared(
+    state: HyperliquidState,
+    set_state: Callable[[HyperliquidState], None],
+    path: Path = SHARED_STATE_PATH,
+):
+    """
+    Lifespan entry point for HL_SHARED_STATE mode: ingest into `state` if
+    this worker wins the election, otherwise follow the segment (and take
+    over as ingester if the current one goes away).
+    """
+    if fcntl is None:
+        print("[HL][shared] flock unavailable — running a private ingester")
+        await boot_and_run(state)
+        return
+    lock_path = path.with_name(path.name + ".lock")
+    # The lock fd is never closed: the flock is released when the process exits
+    if try_ingester_lock(lock_path) is None:
+        print(f"[HL][shared] pid {os.getpid()}: reader of {path}")
+        metrics = state.metrics
+        await _follow(path, lock_path, set_state, metrics)
+        # Took over: keep serving the last published state until the new one is ready
+        state = HyperliquidState()
+        state.metrics = metrics
+    print(f"[HL][shared] pid {os.getpid()}: ingester, publishing to {path}")
+    writer = SharedStateWriter(path)
+    try:
+        await asyncio.gather(boot_and_run(state), _publish_loop(state, writer, set_state))
+    finally:
+        writer.close()
+
+
+async def _publish_loop(
+    state: HyperliquidState,
+    writer: SharedStateWriter,
+    set_state: Callable[[HyperliquidState], None],
+):
+    """Publish the state whenever it changed (encoding + copy off the loop)."""
+    published: Optional[tuple] = None
+    served = False
+    while True:
+        await asyncio.sleep(_PUBLISH_INTERVAL_S)
+        if not state.is_ready:
+            continue
+        if not served:
+            set_state(state)
+            served = True
+        key = (state.generation, state.feature_generation, state.is_stale, state.ws_connected)
+        if key == published:
+            continue
+        try:
+            snapshot = collect_shared(state)
+            await asyncio.to_thread(lambda: writer.publish(encode_snapshot(snapshot)))
+            published = key
+            state.shared_stats = writer.stats()
+        except Exception as e:
+            print(f"[HL][shared] Publish error: {e}")
+
+
+async def _follow(
+    path: Path,
+    lock_path: Path,
+    set_state: Callable[[HyperliquidState], None],
+    metrics: PipelineMetrics,
+):
+    """
+    Serve each new published generation; returns once this worker holds the
+    lock.  Every swapped-in state shares this process's `metrics`, so its
+    /metrics counters keep counting up across swaps.
+    """
+    reader = SharedStateReader(path)
+    next_election = time.monotonic() + _ELECTION_INTERVAL_S
+    try:
+        while True:
+            if time.monotonic() >= next_election:
+                if try_ingester_lock(lock_path) is not None:
+                    print(f"[HL][shared] pid {os.getpid()}: ingester lock acquired — taking over")
+                    return
+                next_election = time.monotonic() + _ELECTION_INTERVAL_S
+            try:
+                state = await asyncio.to_thread(_read_state, reader)
+            except Exception as e:
+                print(f"[HL][shared] Read error: {e}")
+                state = None
+            if state is not None:
+                state.metrics = metrics
+                set_state(state)
+            await asyncio.sleep(_PUBLISH_INTERVAL_S)
+    finally:
+        reader.close()
+
+
+def _read_state(reader: SharedStateReader) -> Optional[HyperliquidState]:
+    got = reader.read()
+    if got is None:
+        return None
+    t0 = time.perf_counter()
+    state = decode_shared(got[2])
+    state.shared_stats = {**reader.stats(), "decode_ms_last": round((time.perf_counter() - t0) * 1000, 3)}
+    return state
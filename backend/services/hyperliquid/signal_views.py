@@ -0,0 +1,151 @@
+"""
+Hyperliquid Screener — memoized signal payloads.
+
+/hero (agent briefing), /sections and /agent-rank rebuild every reason,
+thesis and invalidation note from the whole universe, yet their inputs only
+change when a feature pass rewrites the scores.  SignalViews keeps each
+payload per (kind, params) for one state.feature_generation:
+
+  views.get(state, "sections", rows_per_section)   → cached payload
+
+The feature engine bumps the generation at the end of every pass that
+updated an asset and calls the state's feature-pass listeners; rebuild()
+is registered as one.  It does not render inside the pass: it schedules a
+task on the event loop that re-renders the eager kinds for the endpoint
+defaults (remember()) and for parameter sets requested within the last
+few passes, one payload per loop turn, and gives up as soon as a newer
+pass lands.  A parameter set nobody asks for again ages out instead of
+being rebuilt forever, and a kind nobody asked for within max_idle_passes
+is not rebuilt at all, defaults included.  Builders read the live state,
+so they stay on the loop rather than in a worker thread.  Kinds with side
+effects on the state (agent-rank advances prev_ranks) are built on demand,
+at most once per generation.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+from .state import HyperliquidState
+
+# Requested parameter sets per kind kept for eager rebuilds (most recent kept)
+_MAX_REMEMBERED = 8
+# ... and dropped once not requested for this many feature passes
+_MAX_IDLE_PASSES = 3
+
+
+class SignalViews:
+    """
+    builders: kind → build(state, *params) → payload
+    eager:    kinds rebuilt by rebuild() right after a feature pass
+    """
+
+    def __init__(
+        self,
+        builders: dict[str, Callable[..., Any]],
+        eager: frozenset[str] = frozenset(),
+        max_remembered: int = _MAX_REMEMBERED,
+        max_idle_passes: int = _MAX_IDLE_PASSES,
+    ):
+        self._builders = builders
+        self._eager = eager
+        self.max_remembered = max_remembered
+        self.max_idle_passes = max_idle_passes
+
+        self._state: Optional[HyperliquidState] = None
+        self.generation: Optional[int] = None
+        self._payloads: dict[tuple, Any] = {}
+        # kind → params always rebuilt (endpoint defaults)
+        self._pinned: dict[str, set[tuple]] = {k: set() for k in builders}
+        # kind → recently requested params → generation last requested, oldest first
+        self._requested: dict[str, OrderedDict[tuple, int]] = {k: OrderedDict() for k in builders}
+        # kind → generation it was last requested at (any params)
+        self._last_requested: dict[str, int] = {}
+        self._task: Optional[asyncio.Task] = None
+
+        self.builds = 0
+        self.eager_builds = 0
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> dict:
+        return {
+            "generation":    self.generation,
+            "payloads":      len(self._payloads),
+            "builds":        self.builds,
+            "eager_builds":  self.eager_builds,
+            "hits":          self.hits,
+            "misses":        self.misses,
+        }
+
+    def _sync(self, state: HyperliquidState):
+        if state is not self._state or state.feature_generation != self.generation:
+            self._state = state
+            self.generation = state.feature_generation
+            self._payloads = {}
+
+    def remember(self, kind: str, *params):
+        """Always rebuild this parameter set eagerly (the endpoint defaults)."""
+        self._pinned[kind].add(params)
+
+    def _requested_now(self, kind: str, params: tuple):
+        requested = self._requested[kind]
+        requested[params] = self.generation
+        requested.move_to_end(params)
+        self._last_requested[kind] = self.generation
+        while len(requested) > self.max_remembered:
+            requested.popitem(last=False)
+
+    def get(self, state: HyperliquidState, kind: str, *params) -> Any:
+        self._sync(state)
+        self._requested_now(kind, params)
+        key = (kind, params)
+        if key in self._payloads:
+            self.hits += 1
+            return self._payloads[key]
+        self.misses += 1
+        payload = self._builders[kind](state, *params)
+        self.builds += 1
+        self._payloads[key] = payload
+        return payload
+
+    def rebuild(self, state: HyperliquidState):
+        """Feature-pass listener: schedule the eager kinds for the new generation."""
+        self._sync(state)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:            # scripts and tests without a loop: render inline
+            for key in self._due():
+                self._build_eager(state, key)
+            return
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+        self._task = loop.create_task(self._rebuild_async(state, self.generation))
+
+    async def _rebuild_async(self, state: HyperliquidState, generation: int):
+        for key in self._due():
+            await asyncio.sleep(0)      # one payload per loop turn
+            if state is not self._state or self.generation != generation:
+                return                  # a newer pass (or state) superseded this one
+            self._build_eager(state, key)
+
+    def _due(self) -> list[tuple]:
+        """(kind, params) to render eagerly, after ageing out idle parameter sets."""
+        due = []
+        for kind in self._eager:
+            requested = self._requested[kind]
+            for params in [p for p, gen in requested.items()
+                           if self.generation - gen > self.max_idle_passes]:
+                del requested[params]
+            last = self._last_requested.get(kind)
+            if last is None or self.generation - last > self.max_idle_passes:
+                continue                # nobody is polling this kind
+            due += [(kind, params) for params in self._pinned[kind] | requested.keys()]
+        return due
+
+    def _build_eager(self, state: HyperliquidState, key: tuple):
+        if key not in self._payloads:
+            kind, params = key
+            self._payloads[key] = self._builders[kind](state, *params)
+            self.eager_builds += 1
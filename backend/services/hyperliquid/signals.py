@@ -1077,7 +1077,7 @@ def build_signal_sections(
             "available": True,
         }
 
-    oi_history_ready = sum(1 for c in state.oi_history if len(state.oi_history[c]) >= 5) >= 10
+    oi_history_ready = state.oi_history.coins_with(5) >= 10
     sections: dict = {}
 
     # Perps-only for gainers/losers — removes spot noise from signal board
@@ -0,0 +1,230 @@
+"""
+Hyperliquid Screener — versioned snapshot views.
+
+GET /snapshot used to filter, sort, convert and serialize every asset on every
+request.  Its output only changes when the asset table does, so SnapshotViews
+keeps everything derived from one table generation (AssetTable.generation):
+
+  - the gated asset list (active + in universe) captured once per generation
+  - one sorted index array per (market_type, sort field, direction)
+  - each asset's row serialized once, without its rank: rows are stored as
+    the bytes after '{"rank":0' and re-prefixed with the real rank, so the
+    same bytes serve every sort order, limit and filter.  The table hands out
+    a new ScreenerAsset object whenever a coin changes, so rows are carried
+    across generations while the asset object is the same one
+  - the final response body + ETag per distinct query
+
+The body also carries meta that the generation does not cover (readiness,
+the stale flag, serverTs), so cached bodies are dropped whenever the
+readiness set or stale flag changes and every meta_interval_s seconds.
+
+A new generation is only picked up once the current views are at least
+max_staleness_s old, so a WS tick every 50ms does not rebuild on every poll;
+identical polls in between get the same ETag (→ 304 with If-None-Match).
+"""
+from __future__ import annotations
+
+import os
+import time
+import zlib
+from typing import Callable, Optional
+
+import numpy as np
+
+from . import codec
+from .models import ScreenerAsset
+from .state import HyperliquidState
+
+# Oldest a served view may be once the table has moved on
+_MAX_STALENESS_S = float(os.getenv("HL_SNAPSHOT_MAX_STALENESS_S", "1.0"))
+
+# Oldest a body's meta (serverTs / lastUpdated) may be on a quiet table
+_META_INTERVAL_S = float(os.getenv("HL_SNAPSHOT_META_INTERVAL_S", "15.0"))
+
+# Distinct query bodies kept per generation (limit / filter combinations)
+_MAX_BODIES = 64
+
+# Default liquidity floor for spot rows when no min_volume_usd is given —
+# eliminates user-created junk spot tokens (perp universe is already clean)
+_DEFAULT_SPOT_MIN_VOLUME = 50_000
+
+_RANK_PREFIX = b'{"rank":'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """RFC 9110 weak comparison of an If-None-Match header against one ETag."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    bare = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == bare for tag in if_none_match.split(","))
+
+
+class SnapshotViews:
+    """
+    build_row(asset, rank) → ScreenerRow dict ("rank" must be its first key)
+    build_meta(rows, state) → ScreenerMeta dict for a row list
+    """
+
+    def __init__(
+        self,
+        build_row: Callable[[ScreenerAsset, int], dict],
+        build_meta: Callable[[list[dict], HyperliquidState], dict],
+        max_staleness_s: float = _MAX_STALENESS_S,
+        meta_interval_s: float = _META_INTERVAL_S,
+    ):
+        self._build_row = build_row
+        self._build_meta = build_meta
+        self.max_staleness_s = max_staleness_s
+        self.meta_interval_s = meta_interval_s
+
+        self._state: Optional[HyperliquidState] = None
+        self.generation: Optional[int] = None
+        self._built_at = 0.0
+
+        # Per generation
+        self._assets: list[ScreenerAsset] = []
+        self._volume = np.empty(0)
+        self._spread = np.empty(0)
+        self._is_spot = np.empty(0, dtype=bool)
+        self._market: dict[str, np.ndarray] = {}
+        self._orders: dict[tuple[str, str, bool], np.ndarray] = {}
+        self._bodies: dict[tuple, tuple[str, bytes]] = {}
+        # (readiness, stale flag, time bucket) the cached bodies' meta was built at
+        self._meta_epoch: Optional[tuple] = None
+
+        # coin → (asset the row was built from, row dict, bytes after '{"rank":0')
+        self._row_cache: dict[str, tuple[ScreenerAsset, dict, bytes]] = {}
+
+        # Counters
+        self.builds = 0
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> dict:
+        return {
+            "generation": self.generation,
+            "builds":     self.builds,
+            "hits":       self.hits,
+            "misses":     self.misses,
+            "views":      len(self._orders),
+            "bodies":     len(self._bodies),
+        }
+
+    # ── Generation capture ────────────────────────────────────────────────
+
+    def _refresh(self, state: HyperliquidState):
+        if state is self._state:
+            if state.generation == self.generation:
+                return
+            if time.monotonic() - self._built_at < self.max_staleness_s:
+                return
+        self._state = state
+        self.generation = state.generation
+        self._built_at = time.monotonic()
+        self.builds += 1
+
+        assets = [a for a in state.all_assets() if a.market_status == "active"]
+        # Universe gate (defensive — state should only contain universe assets after boot)
+        if state.universe_allowlist:
+            assets = [a for a in assets if state.in_universe(a.coin)]
+        self._assets = assets
+        self._volume = np.array([a.day_ntl_vlm or 0 for a in assets], dtype=float)
+        self._spread = np.array([a.spread_bps or 0 for a in assets], dtype=float)
+        types = np.array([a.market_type for a in assets], dtype=object)
+        self._is_spot = types == "spot"
+        self._market = {"perp": np.flatnonzero(types == "perp"), "spot": np.flatnonzero(self._is_spot)}
+        if len(self._row_cache) > 2 * len(assets):
+            live = {a.coin for a in assets}
+            self._row_cache = {c: v for c, v in self._row_cache.items() if c in live}
+        self._orders = {}
+        self._bodies = {}
+
+    def _refresh_meta(self, state: HyperliquidState):
+        """Drop cached bodies whose meta no longer describes `state`."""
+        bucket = int(time.time() // self.meta_interval_s)
+        epoch = (frozenset(state.ready_at), state.is_stale, bucket)
+        if epoch != self._meta_epoch:
+            self._meta_epoch = epoch
+            self._bodies = {}
+
+    def _order(self, market_type: str, sort_field: str, reverse: bool) -> np.ndarray:
+        """Sorted index array for one (market_type, field, direction) view."""
+        key = (market_type, sort_field, reverse)
+        order = self._orders.get(key)
+        if order is None:
+            idx = self._market.get(market_type)
+            if idx is None:
+                idx = np.arange(len(self._assets))
+            assets = self._assets
+            # None sorts below every value (incl. 0) in either direction
+            values = np.array([
+                (getattr(assets[i], sort_field) or 0) if getattr(assets[i], sort_field) is not None else -1e18
+                for i in idx.tolist()
+            ], dtype=float)
+            # Stable in both directions, like list.sort(reverse=...)
+            order = idx[np.argsort(-values if reverse else values, kind="stable")]
+            self._orders[key] = order
+        return order
+
+    def _row(self, i: int) -> tuple[dict, bytes]:
+        """Row dict (rank 0) + its serialized bytes after '{"rank":0'."""
+        asset = self._assets[i]
+        cached = self._row_cache.get(asset.coin)
+        if cached is not None and cached[0] is asset:
+            return cached[1], cached[2]
+        row = self._build_row(asset, 0)
+        encoded = codec.dumps(row)
+        head = _RANK_PREFIX + b"0"
+        if not encoded.startswith(head):
+            raise ValueError("build_row must put rank first in the row")
+        tail = encoded[len(head):]
+        self._row_cache[asset.coin] = (asset, row, tail)
+        return row, tail
+
+    # ── Render ────────────────────────────────────────────────────────────
+
+    def render(
+        self,
+        state: HyperliquidState,
+        market_type: str,
+        limit: int,
+        sort_field: str,
+        reverse: bool,
+        min_volume_usd: Optional[float] = None,
+        max_spread_bps: Optional[float] = None,
+    ) -> tuple[str, bytes]:
+        """(etag, body) of {"rows": [...], "meta": {...}} for one snapshot query."""
+        self._refresh(state)
+        self._refresh_meta(state)
+        key = (market_type, limit, sort_field, reverse, min_volume_usd, max_spread_bps)
+        cached = self._bodies.get(key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+        self.misses += 1
+
+        order = self._order(market_type, sort_field, reverse)
+        # Volume gate: explicit parameter overrides; by default only spot has a floor
+        if min_volume_usd is not None:
+            keep = self._volume[order] >= min_volume_usd
+        else:
+            keep = ~self._is_spot[order] | (self._volume[order] >= _DEFAULT_SPOT_MIN_VOLUME)
+        if max_spread_bps is not None:
+            keep &= self._spread[order] <= max_spread_bps
+        selected = order[keep][:limit].tolist()
+
+        rows, parts = [], []
+        for rank, i in enumerate(selected, start=1):
+            row, tail = self._row(i)
+            rows.append(row)
+            parts.append(_RANK_PREFIX + str(rank).encode() + tail)
+        meta = self._build_meta(rows, state)
+        body = b'{"rows":[' + b",".join(parts) + b'],"meta":' + codec.dumps(meta) + b"}"
+        etag = f'"{zlib.crc32(body):08x}{len(body):x}"'
+
+        if len(self._bodies) >= _MAX_BODIES:
+            self._bodies.clear()
+        self._bodies[key] = (etag, body)
+        return etag, body
@@ -9,14 +9,99 @@ from __future__ import annotations
 import asyncio
 import time
 from collections import defaultdict, deque
-from typing import Optional
+from typing import Callable, Optional
 
+import numpy as np
+
+from .candles import EMPTY, INTERVAL_MS, CandleRing, bars_from_trades, parse_candles, roll_up
+from .columns import AssetTable
+from .history import SnapshotHistory
+from .metrics import PipelineMetrics
 from .models import ScreenerAsset
+from .trade_flow import TradeFlow
 
 # Max trades kept per asset in the rolling window (covers ~5–30 min at avg pace)
 _TRADE_WINDOW = 500
 # Max candle bars stored per (coin, interval) in memory
 _MAX_CANDLES = 200
+# Intervals kept current from the trades feed (1m is the base bucket)
+_LIVE_INTERVALS = ("5m", "1h", "1d")
+
+# Dirty-set kinds — which input family changed for a coin since the last
+# feature pass.  Candle changes invalidate the cached candle-derived features;
+# every other kind only requires re-scoring from live fields.
+DIRTY_CANDLES = "candles"
+DIRTY_CTX     = "ctx"
+DIRTY_MIDS    = "mids"
+DIRTY_BOOK    = "book"
+DIRTY_TRADES  = "trades"
+DIRTY_OI      = "oi"
+
+# Boot readiness capabilities, in the order a boot normally reaches them:
+# universe + mids scored, candle-derived features computed, 1d bars for TSMOM
+READY_PRICES          = "prices"
+READY_CANDLE_FEATURES = "candle_features"
+READY_TSMOM           = "tsmom"
+READY_CAPABILITIES = (READY_PRICES, READY_CANDLE_FEATURES, READY_TSMOM)
+
+
+class IngestStats:
+    """
+    Counters for the WS reader → applier pipeline in websocket_manager.
+
+    queue_depth        — raw frames waiting for the next apply tick
+    frames_dropped     — oldest frames evicted because the queue was full
+    frames_coalesced   — bbo / l2Book / activeAssetCtx / allMids frames
+                         superseded by a newer frame for the same key
+                         within one batch (never applied)
+    apply_latency_ms_* — receive → applied for the oldest frame in a batch
+    """
+
+    _EWMA_ALPHA = 0.1
+
+    def __init__(self, queue_max: int = 0):
+        self.queue_max = queue_max
+        self.queue_depth = 0
+        self.frames_received = 0
+        self.frames_dropped = 0
+        self.frames_coalesced = 0
+        self.frames_applied = 0
+        self.decode_errors = 0
+        self.batches = 0
+        self.last_batch_size = 0
+        self.batch_apply_ms_last: Optional[float] = None
+        self.apply_latency_ms_last: Optional[float] = None
+        self.apply_latency_ms_avg: Optional[float] = None
+        self.apply_latency_ms_max: float = 0.0
+
+    def record_batch(self, size: int, applied: int, coalesced: int, apply_ms: float, latency_ms: float):
+        self.batches += 1
+        self.last_batch_size = size
+        self.frames_applied += applied
+        self.frames_coalesced += coalesced
+        self.batch_apply_ms_last = round(apply_ms, 3)
+        self.apply_latency_ms_last = round(latency_ms, 3)
+        avg = self.apply_latency_ms_avg
+        a = self._EWMA_ALPHA
+        self.apply_latency_ms_avg = round(latency_ms if avg is None else avg + a * (latency_ms - avg), 3)
+        self.apply_latency_ms_max = max(self.apply_latency_ms_max, round(latency_ms, 3))
+
+    def as_dict(self) -> dict:
+        return {
+            "queue_depth":           self.queue_depth,
+            "queue_max":             self.queue_max,
+            "frames_received":       self.frames_received,
+            "frames_dropped":        self.frames_dropped,
+            "frames_coalesced":      self.frames_coalesced,
+            "frames_applied":        self.frames_applied,
+            "decode_errors":         self.decode_errors,
+            "batches":               self.batches,
+            "last_batch_size":       self.last_batch_size,
+            "batch_apply_ms_last":   self.batch_apply_ms_last,
+            "apply_latency_ms_last": self.apply_latency_ms_last,
+            "apply_latency_ms_avg":  self.apply_latency_ms_avg,
+            "apply_latency_ms_max":  self.apply_latency_ms_max,
+        }
 
 
 class HyperliquidState:
@@ -25,50 +110,78 @@ class HyperliquidState:
 
     Layout:
       assets        — canonical ScreenerAsset map keyed by coin name
+                      (AssetTable: dict-like, live fields held in NumPy columns)
       meta          — raw universe metadata from Hyperliquid
-      candles       — {coin: {interval: deque[candle_dict]}}
-      trades        — {coin: deque[trade_dict]}   rolling window
+      candles       — {coin: {interval: CandleRing}}  typed OHLCV rows (candles.py);
+                      REST-seeded series are kept current from the trades feed
+      trades        — {coin: deque[trade_dict]}   rolling window (raw, for display)
+      trade_flow    — {coin: TradeFlow}  running 1m/5m/15m flow aggregates
       books         — {coin: {"levels": [[bids], [asks]]}}
       prev_ranks    — previous rank ordering for rank_change computation
+      dirty         — {kind: set[coin]} changed since the last feature pass
+      candle_features — per-coin cache of candle-derived features
       boot_ts       — unix timestamp of last successful boot
-      ws_connected  — True while the WS consumer is alive
+      ws_connected  — True while at least one WS connection is alive
+      detail_views  — {coin: unix ts} of the last /asset/{coin} request; open
+                      detail views keep a coin subscribed (subscriptions.py)
+      ingest        — IngestStats for the WS reader → applier pipeline
+      metrics       — PipelineMetrics: hot-path counters / histograms (metrics.py)
+      is_stale      — True while serving a warm-start snapshot (warm_start.py)
+                      whose gap since warm_start_ts is still being backfilled
+      ready_at      — {capability: unix ts} per READY_* capability reached
+      boot_stages   — {stage: {start_s, duration_s, ok}} from the boot graph
     """
 
     def __init__(self):
         self._lock = asyncio.Lock()
 
-        # Core screener rows
-        self.assets: dict[str, ScreenerAsset] = {}
+        # Core screener rows — live WS fields are patched in place in the
+        # table's columns; ScreenerAsset objects are materialized on read.
+        self.assets: AssetTable = AssetTable()
 
         # Raw universe metadata {coin: {szDecimals, maxLeverage, ...}}
         self.meta: dict[str, dict] = {}
 
-        # Candle cache: coin → interval → deque of candle dicts
-        self.candles: dict[str, dict[str, deque]] = defaultdict(
-            lambda: defaultdict(lambda: deque(maxlen=_MAX_CANDLES))
+        # Candle cache: coin → interval → ring of parsed OHLCV rows
+        self.candles: dict[str, dict[str, CandleRing]] = defaultdict(
+            lambda: defaultdict(lambda: CandleRing(_MAX_CANDLES))
         )
+        # Per interval, bumped whenever a REST / candle-channel upsert changes a
+        # series (trade folding into forming bars does not count)
+        self.candle_generation: dict[str, int] = defaultdict(int)
 
         # Rolling recent trades per coin
         self.trades: dict[str, deque] = defaultdict(lambda: deque(maxlen=_TRADE_WINDOW))
 
+        # Running trade-flow aggregates per coin, fed as trades arrive
+        self.trade_flow: dict[str, TradeFlow] = defaultdict(TradeFlow)
+
         # Latest L2 book snapshot per coin
         self.books: dict[str, dict] = {}
 
         # Previous ranking order {coin: rank_int}
         self.prev_ranks: dict[str, int] = {}
 
-        # OI history for change computation: coin → deque[(ts_unix, oi_usd)]
-        # Stored at ~60s intervals; 130 entries ≈ 2h+ of history
-        self.oi_history: dict[str, deque] = defaultdict(lambda: deque(maxlen=130))
+        # Perp OI (USD) snapshots for the oi_change_* horizons (history.py)
+        # Stored at ~60s intervals; 1500 rows ≈ 25h, enough for oi_change_24h
+        self.oi_history = SnapshotHistory(capacity=1500)
 
-        # Score history for score_change computation: coin → deque[(ts_unix, composite_score)]
-        # 60 entries ≈ 1h of snapshots
-        self.score_history: dict[str, deque] = defaultdict(lambda: deque(maxlen=60))
+        # Composite score snapshots for score_change; 60 rows ≈ 1h
+        self.score_history = SnapshotHistory(capacity=60, min_spacing_s=50)
 
         # Volume impulse history from 5m candles: coin → deque[(ts_unix, volume_5m_bar)]
         # Used to compute volume_impulse_5m and volume_impulse_15m
         self.volume_5m_history: dict[str, deque] = defaultdict(lambda: deque(maxlen=30))
 
+        # Dirty-set tracking for the incremental feature pass: kind → coins
+        # whose inputs changed since the pass last drained it (take_dirty).
+        self.dirty: dict[str, set[str]] = defaultdict(set)
+
+        # Candle-derived features cached per coin, recomputed only when the
+        # coin is marked DIRTY_CANDLES: coin → {"candle": {...}, "vol_5m": {...},
+        # "structural": {...}}
+        self.candle_features: dict[str, dict] = {}
+
         # Timing
         self.boot_ts: Optional[float] = None
         self.last_mids_ts: Optional[float] = None
@@ -81,7 +194,31 @@ class HyperliquidState:
 
         # Connectivity
         self.ws_connected: bool = False
-        self.is_ready: bool = False     # True after boot sequence completes
+        # Coins with a live trades subscription, and the start of the current
+        # gap in trade coverage (disconnect time) until REST backfills it
+        self.trade_coins: set[str] = set()
+        self.candle_gap_since: Optional[float] = None
+        # Coins that just gained a trades subscription: their candles missed
+        # the trades since the last REST refresh
+        self.candle_resync: set[str] = set()
+        self.detail_views: dict[str, float] = {}
+        self.subscription_stats: dict = {}
+        # HL_SHARED_STATE mode: segment publisher / reader stats (shared_state.py)
+        self.shared_stats: dict = {}
+        self.ingest = IngestStats()
+        self.metrics = PipelineMetrics()
+        self.is_ready: bool = False     # True once READY_PRICES is reached
+        # Warm start: serving a disk snapshot until the boot backfill finishes
+        self.is_stale: bool = False
+        self.warm_start_ts: Optional[float] = None
+        # Boot progress: capability → ts reached; stage → offsets from boot start
+        self.boot_started_ts: Optional[float] = None
+        self.ready_at: dict[str, float] = {}
+        self.boot_stages: dict[str, dict] = {}
+        # Bumped by every feature pass that rewrote scores — cache key for
+        # payloads derived from them (signal_views.py); listeners run after
+        self.feature_generation: int = 0
+        self._feature_listeners: list[Callable[[HyperliquidState], None]] = []
 
     # ── Thread-safe accessors ─────────────────────────────────────────────
 
@@ -115,38 +252,91 @@ class HyperliquidState:
     def spot_assets(self) -> list[ScreenerAsset]:
         return [a for a in self.assets.values() if a.market_type == "spot"]
 
+    @property
+    def generation(self) -> int:
+        """Bumped on every asset write — cache key for derived views."""
+        return self.assets.generation
+
+    # ── Feature passes ────────────────────────────────────────────────────
+
+    def on_feature_pass(self, listener: Callable[[HyperliquidState], None]):
+        if listener not in self._feature_listeners:
+            self._feature_listeners.append(listener)
+
+    def features_updated(self):
+        """Called by the feature engine after a pass that updated assets."""
+        self.feature_generation += 1
+        for listener in list(self._feature_listeners):
+            try:
+                listener(self)
+            except Exception as e:
+                print(f"[HL][state] Feature-pass listener error: {e}")
+
+    # ── Dirty-set tracking ────────────────────────────────────────────────
+
+    def mark_dirty(self, coin: str, kind: str):
+        self.dirty[kind].add(coin)
+
+    def mark_dirty_many(self, coins, kind: str):
+        self.dirty[kind].update(coins)
+
+    def take_dirty(self) -> dict[str, set[str]]:
+        """Return and reset the dirty sets accumulated since the last call."""
+        dirty, self.dirty = self.dirty, defaultdict(set)
+        return dirty
+
     # ── Candle helpers ────────────────────────────────────────────────────
 
     def add_candles(self, coin: str, interval: str, candles: list[dict]):
-        """Bulk-add candles, deduplicating by open timestamp."""
-        dq = self.candles[coin][interval]
-        existing_ts = {c["t"] for c in dq}
-        for c in sorted(candles, key=lambda x: x.get("t", 0)):
-            if c.get("t") not in existing_ts:
-                dq.append(c)
-                existing_ts.add(c["t"])
+        """Bulk-upsert raw candle dicts by open timestamp (parsed once here)."""
+        if candles:
+            self.add_candle_rows(coin, interval, parse_candles(candles))
+
+    def add_candle_rows(self, coin: str, interval: str, rows: np.ndarray):
+        """Bulk-upsert already-parsed rows (CANDLE_FIELDS order)."""
+        if self.candles[coin][interval].upsert(rows):
+            self.dirty[DIRTY_CANDLES].add(coin)
+            self.candle_generation[interval] += 1
 
     def upsert_candle(self, coin: str, interval: str, candle: dict):
-        """Insert or update the most recent candle (live update)."""
-        dq = self.candles[coin][interval]
-        t = candle.get("t")
-        if dq and dq[-1].get("t") == t:
-            dq[-1] = candle   # update in-place (candle still forming)
-        else:
-            dq.append(candle)
-
-    def get_candles(self, coin: str, interval: str, n: int = 50) -> list[dict]:
-        """Return the most recent n candles for a coin/interval."""
-        dq = self.candles[coin][interval]
-        bars = list(dq)
-        return bars[-n:] if len(bars) > n else bars
+        """Insert or update one candle (live update of the forming bar)."""
+        self.add_candles(coin, interval, [candle])
+
+    def candle_window(self, coin: str, interval: str, n: Optional[int] = 50) -> np.ndarray:
+        """Read-only view of the most recent n candle rows for a coin/interval."""
+        ring = self.candles.get(coin, {}).get(interval)
+        return ring.window(n) if ring is not None else EMPTY
 
     # ── Trade helpers ─────────────────────────────────────────────────────
 
     def add_trades(self, coin: str, trades: list[dict]):
-        dq = self.trades[coin]
-        for t in trades:
-            dq.append(t)
+        if not trades:
+            return
+        self.trades[coin].extend(trades)
+        self.trade_flow[coin].add(trades, time.time() * 1000)
+        self.dirty[DIRTY_TRADES].add(coin)
+        self._fold_trades(coin, trades)
+
+    def _fold_trades(self, coin: str, trades: list[dict]):
+        """
+        Aggregate trades into 1m buckets (local, never stored) and roll
+        them into the coin's forming 5m / 1h / 1d bars.  Only series that
+        REST seeded are extended — a series started from trades alone would
+        begin with a partial bar.
+        """
+        series = self.candles.get(coin)
+        if not series:
+            return
+        bars = bars_from_trades(trades, INTERVAL_MS["1m"])
+        if not len(bars):
+            return
+        changed = False
+        for interval in _LIVE_INTERVALS:
+            ring = series.get(interval)
+            if ring is not None and len(ring):
+                changed |= ring.accumulate(roll_up(bars, INTERVAL_MS[interval]))
+        if changed:
+            self.dirty[DIRTY_CANDLES].add(coin)
 
     def get_recent_trades(self, coin: str, max_age_s: float = 300.0) -> list[dict]:
         """Return trades from the last max_age_s seconds."""
@@ -157,6 +347,7 @@ class HyperliquidState:
 
     def set_book(self, coin: str, book: dict):
         self.books[coin] = book
+        self.dirty[DIRTY_BOOK].add(coin)
 
     def get_book(self, coin: str) -> Optional[dict]:
         return self.books.get(coin)
@@ -172,13 +363,30 @@ class HyperliquidState:
         )
         return time.time() - latest
 
+    def mark_ready(self, *capabilities: str):
+        now = time.time()
+        for cap in capabilities:
+            self.ready_at.setdefault(cap, now)
+        if READY_PRICES in capabilities:
+            self.is_ready = True
+
+    def has(self, capability: str) -> bool:
+        return capability in self.ready_at
+
+    def readiness(self) -> dict[str, bool]:
+        return {cap: cap in self.ready_at for cap in READY_CAPABILITIES}
+
+    def boot_report(self) -> dict:
+        """Per-stage timings and seconds from boot start to each capability."""
+        start = self.boot_started_ts
+        return {
+            "ready_after_s": {cap: round(ts - start, 3) for cap, ts in self.ready_at.items()} if start else {},
+            "stages":        dict(self.boot_stages),
+        }
+
     def top_coins_by_volume(self, n: int = 40) -> list[str]:
         """Return top-N coins sorted by 24h notional volume."""
-        perps = [(a.coin, a.day_ntl_vlm or 0) for a in self.assets.values() if a.market_type == "perp"]
-        perps.sort(key=lambda x: -x[1])
-        return [coin for coin, _ in perps[:n]]
+        return self.assets.top_perps_by("day_ntl_vlm", n)
 
     def top_coins_by_oi(self, n: int = 40) -> list[str]:
-        perps = [(a.coin, a.open_interest_usd or 0) for a in self.assets.values() if a.market_type == "perp"]
-        perps.sort(key=lambda x: -x[1])
-        return [coin for coin, _ in perps[:n]]
+        return self.assets.top_perps_by("open_interest_usd", n)
@@ -0,0 +1,127 @@
+"""
+Hyperliquid Screener — WS subscription manager.
+
+The set of live feeds is recomputed periodically instead of being fixed at
+connect time:
+
+  allMids          always (one subscription covers every asset)
+  activeAssetCtx   top-N perps by OI, plus score movers and open detail views
+  bbo              top-N perps by volume, plus score movers and detail views
+  trades           top-N perps by volume, plus detail views
+
+SubscriptionManager diffs the desired set against what each connection
+holds and returns incremental subscribe / unsubscribe lists.  Subscriptions
+are spread over up to HL_WS_CONNECTIONS connections of at most
+HL_WS_SUBS_PER_CONN each (new ones go to the least-loaded shard); anything
+past the total capacity is left out and counted in `overflow`.
+"""
+from __future__ import annotations
+
+import os
+import time
+from typing import Any, Optional
+
+from .state import HyperliquidState
+
+# (type, coin); coin is "" for allMids
+Subscription = tuple[str, str]
+
+ALL_MIDS: Subscription = ("allMids", "")
+
+# Desired-set sizes
+_CTX_SUBS    = 50    # activeAssetCtx — top N by OI
+_BBO_SUBS    = 30    # bbo — top N by volume
+_TRADE_SUBS  = 400   # trades — every liquid perp (flow is O(1) per trade, and feeds live candles)
+_MOVER_SUBS  = 10    # largest |score_change| perps get ctx + bbo even outside the top N
+_DETAIL_TTL_S = 300  # /asset/{coin} views keep a coin fully subscribed this long
+
+WS_CONNECTIONS  = max(1, int(os.getenv("HL_WS_CONNECTIONS", "1")))
+WS_SUBS_PER_CONN = int(os.getenv("HL_WS_SUBS_PER_CONN", "1000"))
+
+
+def subscription_message(sub: Subscription, method: str = "subscribe") -> dict:
+    kind, coin = sub
+    body = {"type": kind, "coin": coin} if coin else {"type": kind}
+    return {"method": method, "subscription": body}
+
+
+def _score_movers(state: HyperliquidState, n: int) -> list[str]:
+    movers = [
+        (abs(a.score_change), a.coin) for a in state.perp_assets()
+        if a.score_change and state.in_universe(a.coin)
+    ]
+    movers.sort(reverse=True)
+    return [coin for _, coin in movers[:n]]
+
+
+def desired_subscriptions(state: HyperliquidState, now: Optional[float] = None) -> set[Subscription]:
+    now = time.time() if now is None else now
+    viewed = [c for c, ts in state.detail_views.items() if now - ts <= _DETAIL_TTL_S and c in state.assets]
+    movers = _score_movers(state, _MOVER_SUBS)
+
+    subs: set[Subscription] = {ALL_MIDS}
+    subs.update(("activeAssetCtx", c) for c in state.top_coins_by_oi(_CTX_SUBS) + movers + viewed)
+    subs.update(("bbo", c) for c in state.top_coins_by_volume(_BBO_SUBS) + movers + viewed)
+    subs.update(("trades", c) for c in state.top_coins_by_volume(_TRADE_SUBS) + viewed)
+    return subs
+
+
+def _priority(sub: Subscription) -> tuple[int, str]:
+    # When capacity runs out, keep allMids, then ctx, bbo, trades
+    return ({"allMids": 0, "activeAssetCtx": 1, "bbo": 2}.get(sub[0], 3), sub[1])
+
+
+class SubscriptionManager:
+    """Assignment of subscriptions to WS connection shards."""
+
+    def __init__(self, n_connections: int = WS_CONNECTIONS, per_connection: int = WS_SUBS_PER_CONN):
+        self.per_connection = per_connection
+        self.shards: list[set[Subscription]] = [set() for _ in range(n_connections)]
+        # Live websocket per shard index, registered by its consumer while connected
+        self.connections: dict[int, Any] = {}
+        self.overflow = 0
+        self.rotations = 0
+        self.subscribes = 0
+        self.unsubscribes = 0
+
+    def assigned(self) -> set[Subscription]:
+        return set().union(*self.shards)
+
+    def coins(self, kind: str) -> set[str]:
+        return {coin for shard in self.shards for k, coin in shard if k == kind}
+
+    def plan(self, desired: set[Subscription]) -> list[tuple[list[Subscription], list[Subscription]]]:
+        """
+        Move the assignment to `desired`.  Returns per shard the
+        (subscribe, unsubscribe) lists that take it there.
+        """
+        changes: list[tuple[list[Subscription], list[Subscription]]] = []
+        for shard in self.shards:
+            gone = sorted(shard - desired)
+            shard.difference_update(gone)
+            changes.append(([], gone))
+
+        self.overflow = 0
+        for sub in sorted(desired - self.assigned(), key=_priority):
+            i = min(range(len(self.shards)), key=lambda j: len(self.shards[j]))
+            if len(self.shards[i]) >= self.per_connection:
+                self.overflow += 1
+                continue
+            self.shards[i].add(sub)
+            changes[i][0].append(sub)
+
+        self.rotations += 1
+        self.subscribes += sum(len(add) for add, _ in changes)
+        self.unsubscribes += sum(len(gone) for _, gone in changes)
+        return changes
+
+    def stats(self) -> dict:
+        return {
+            "connections":   len(self.shards),
+            "connected":     len(self.connections),
+            "per_shard":     [len(s) for s in self.shards],
+            "overflow":      self.overflow,
+            "rotations":     self.rotations,
+            "subscribes":    self.subscribes,
+            "unsubscribes":  self.unsubscribes,
+        }
@@ -0,0 +1,120 @@
+"""
+Hyperliquid Screener — rolling trade-flow windows.
+
+TradeFlow keeps running buy/sell volume, trade count and VWAP for several
+time windows per coin (1m / 5m / 15m).  Each trade is parsed once on arrival,
+appended to every window's queue and added to its running sums; expired
+trades are popped from the queue heads and subtracted.  Updating a coin costs
+O(1) amortized per trade, independent of how many trades the windows hold —
+no deque copies, no re-summing, no string parsing on read.
+"""
+from __future__ import annotations
+
+from collections import deque
+from typing import Any, NamedTuple, Optional
+
+# Window spans tracked per coin, in seconds
+TRADE_FLOW_WINDOWS_S: tuple[int, ...] = (60, 300, 900)
+
+_BUY_SIDES  = ("B", "buy")
+_SELL_SIDES = ("A", "sell")
+
+
+def _num(v: Any) -> Optional[float]:
+    """Safe float conversion — returns None for missing/null/empty."""
+    try:
+        if v is None or v == "" or v == "null":
+            return None
+        return float(v)
+    except (TypeError, ValueError):
+        return None
+
+
+class FlowStats(NamedTuple):
+    count: int
+    buy_volume: float
+    sell_volume: float
+    imbalance: float          # -1..+1 (+1 = all buys)
+    vwap: Optional[float]     # None when the window holds no priced size
+
+
+class _Window:
+    """Running aggregates over trades with time >= now - span."""
+
+    __slots__ = ("span_ms", "queue", "count", "buy_vol", "sell_vol", "volume", "notional")
+
+    def __init__(self, span_s: int):
+        self.span_ms = span_s * 1000
+        # (time_ms, side, sz, px): side +1 buy, -1 sell, 0 other
+        self.queue: deque[tuple[float, int, float, float]] = deque()
+        self._reset()
+
+    def _reset(self):
+        self.count = 0
+        self.buy_vol = 0.0
+        self.sell_vol = 0.0
+        self.volume = 0.0
+        self.notional = 0.0
+
+    def _apply(self, trade: tuple[float, int, float, float], sign: int):
+        _, side, sz, px = trade
+        self.count += sign
+        if side > 0:
+            self.buy_vol += sign * sz
+        elif side < 0:
+            self.sell_vol += sign * sz
+        if px:
+            self.volume += sign * sz
+            self.notional += sign * sz * px
+
+    def add(self, trade: tuple[float, int, float, float]):
+        self.queue.append(trade)
+        self._apply(trade, +1)
+
+    def evict(self, now_ms: float):
+        cutoff = now_ms - self.span_ms
+        q = self.queue
+        while q and q[0][0] < cutoff:
+            self._apply(q.popleft(), -1)
+        if not q:
+            # Drop accumulated float drift whenever the window drains
+            self._reset()
+
+    def stats(self) -> FlowStats:
+        buy = max(self.buy_vol, 0.0)
+        sell = max(self.sell_vol, 0.0)
+        total = buy + sell
+        return FlowStats(
+            count=self.count,
+            buy_volume=buy,
+            sell_volume=sell,
+            imbalance=(buy - sell) / total if total > 0 else 0.0,
+            vwap=self.notional / self.volume if self.volume > 0 else None,
+        )
+
+
+class TradeFlow:
+    """Per-coin rolling trade-flow aggregates over TRADE_FLOW_WINDOWS_S."""
+
+    __slots__ = ("windows",)
+
+    def __init__(self, windows_s: tuple[int, ...] = TRADE_FLOW_WINDOWS_S):
+        self.windows: dict[int, _Window] = {s: _Window(s) for s in windows_s}
+
+    def add(self, trades: list[dict], now_ms: float):
+        """Parse raw WS trade dicts once and fold them into every window."""
+        for w in self.windows.values():
+            w.evict(now_ms)
+        for t in trades:
+            ts = _num(t.get("time")) or 0.0
+            side_raw = t.get("side")
+            side = 1 if side_raw in _BUY_SIDES else (-1 if side_raw in _SELL_SIDES else 0)
+            trade = (ts, side, _num(t.get("sz")) or 0.0, _num(t.get("px")) or 0.0)
+            for w in self.windows.values():
+                if ts >= now_ms - w.span_ms:
+                    w.add(trade)
+
+    def stats(self, window_s: int, now_ms: float) -> FlowStats:
+        w = self.windows[window_s]
+        w.evict(now_ms)
+        return w.stats()
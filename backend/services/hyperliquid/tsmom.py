@@ -5,52 +5,252 @@ Computes momentum-based trading signals for Hyperliquid perps using
 multi-lookback z-score returns, funding-adjusted for carry cost,
 and vol-targeted for position sizing.
 
-Signal computation:
-  1. Fetch 1d candle close prices from state
-  2. Compute log returns
+Signal computation, vectorized over every main-DEX perp with 1d candles:
+  1. Align closed 1d candle closes into a day × coin matrix (NaN = no bar)
+  2. Compute log returns down the day axis
   3. For each lookback (10d, 30d, 90d): cumulative return / vol → z-score, clip [-2, 2]
   4. Average z-scores → s_raw
   5. Subtract funding cost adjustment → s_adj
   6. Vol-target position sizing → w_scaled
 
+Steps 1-4 only depend on closed daily bars, so TsmomEngine keeps them per
+1d candle generation (and UTC day); steps 5-6 read live funding and are
+redone at most every _RESULT_MAX_AGE_S.
+
 Reference: Gajesh2007/momentum-trading (Hyperliquid TSMOM strategy)
 """
 from __future__ import annotations
 
-import math
 import time
 from typing import Optional
 
+import numpy as np
+
+from .candles import CLOSE, CLOSE_T, INTERVAL_MS, T
 from .state import HyperliquidState
 
 # Signal config
 _LOOKBACKS    = [10, 30, 90]   # days
 _Z_CLIP       = 2.0            # clip z-scores to [-2, +2]
 _VOL_TARGET   = 0.40           # 40% annualized target portfolio vol
+_VOL_WINDOW   = 30             # days of returns for realized vol
 _FUND_HORIZON = 10             # funding cost horizon in days
 _MIN_BARS     = 20             # minimum 1d bars needed
 _SIGNAL_THRESH = 0.15          # |s_adj| threshold for long/short vs flat
+_WINDOW_DAYS  = 120            # closes aligned into the matrix
+
+# Funding / activity / volume ranking are re-read at most this often
+_RESULT_MAX_AGE_S = 60.0
+_MAX_RESULTS = 16               # distinct top_n responses kept; oldest dropped first
 
+_DAY_MS = INTERVAL_MS["1d"]
 
-def _std(values: list[float]) -> float:
-    """Population std of a list. Returns 0 if fewer than 2 elements."""
-    n = len(values)
-    if n < 2:
-        return 0.0
-    mean = sum(values) / n
-    return math.sqrt(sum((x - mean) ** 2 for x in values) / n)
 
+def _nanstd(x: np.ndarray) -> np.ndarray:
+    """Population std down axis 0 ignoring NaN; NaN where fewer than 2 values."""
+    n = (~np.isnan(x)).sum(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.nansum(x, axis=0) / n
+        var = np.nansum((x - mean) ** 2, axis=0) / n
+    return np.where(n >= 2, np.sqrt(var), np.nan)
 
-def _log_return(a: float, b: float) -> Optional[float]:
-    """log(b/a). Returns None if a or b <= 0."""
-    if a <= 0 or b <= 0:
-        return None
-    return math.log(b / a)
+
+def close_matrix(state: HyperliquidState, now_ms: float) -> tuple[list[str], np.ndarray]:
+    """
+    Closed 1d closes of every main-DEX perp as a [day, coin] matrix ending
+    at the last closed day (_WINDOW_DAYS rows, NaN where a coin has no bar).
+    """
+    last_day = int(now_ms // _DAY_MS) - 1
+    first_day = last_day - _WINDOW_DAYS + 1
+    coins = [
+        coin for coin, series in list(state.candles.items())
+        if ":" not in coin and series.get("1d") and (a := state.get_asset(coin)) is not None and a.market_type == "perp"
+    ]
+    closes = np.full((_WINDOW_DAYS, len(coins)), np.nan)
+    for j, coin in enumerate(coins):
+        rows = state.candle_window(coin, "1d", n=_WINDOW_DAYS + 1)
+        rows = rows[rows[:, CLOSE_T] < now_ms]
+        day = (rows[:, T] // _DAY_MS).astype(np.int64) - first_day
+        ok = (day >= 0) & (day < _WINDOW_DAYS)
+        closes[day[ok], j] = rows[ok, CLOSE]
+    return coins, closes
+
+
+def momentum_scores(closes: np.ndarray) -> dict[str, np.ndarray]:
+    """
+    Candle-only part of the signal for a [day, coin] close matrix: per coin
+    s_raw, daily / annualized vol, 10d / 30d momentum and bar count.
+    `eligible` marks the coins with enough history for a signal.
+    """
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rets = np.diff(np.log(np.where(closes > 0, closes, np.nan)), axis=0)
+    n_bars = (~np.isnan(closes)).sum(axis=0)
+    n_rets = (~np.isnan(rets)).sum(axis=0)
+
+    sigma_daily = _nanstd(rets[-_VOL_WINDOW:])
+    sigma_ann = sigma_daily * np.sqrt(365)
+
+    z_sum = np.zeros(closes.shape[1])
+    z_n = np.zeros(closes.shape[1])
+    mom: dict[int, np.ndarray] = {}
+    for lb in _LOOKBACKS:
+        window = rets[-lb:]
+        full = (~np.isnan(window)).sum(axis=0) == lb
+        ret_lb = np.nansum(window, axis=0)
+        vol_lb = _nanstd(window) * np.sqrt(lb)
+        ok = full & (vol_lb >= 1e-10)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            z = np.clip(ret_lb / vol_lb, -_Z_CLIP, _Z_CLIP)
+        z_sum += np.where(ok, z, 0.0)
+        z_n += ok
+        mom[lb] = np.where(ok, np.round(ret_lb * 100, 2), np.nan)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        s_raw = z_sum / z_n
+    eligible = (n_bars >= _MIN_BARS) & (n_rets >= _MIN_BARS - 1) & (sigma_ann >= 1e-8) & (z_n > 0)
+    return {
+        "s_raw":        s_raw,
+        "sigma_daily":  sigma_daily,
+        "sigma_ann":    sigma_ann,
+        "momentum_10d": mom[10],
+        "momentum_30d": mom[30],
+        "bars_used":    n_bars,
+        "eligible":     eligible,
+    }
 
 
-def compute_tsmom_signals(state: HyperliquidState, top_n: int = 60) -> dict:
+class TsmomEngine:
     """
-    Compute TSMOM signals for the top_n perps by volume.
+    Cached TSMOM signals.  The close matrix and momentum scores are rebuilt
+    when the 1d candle generation or the UTC day changes; the response per
+    top_n is reused until either changes or it is _RESULT_MAX_AGE_S old.
+    """
+
+    def __init__(self, result_max_age_s: float = _RESULT_MAX_AGE_S):
+        self.result_max_age_s = result_max_age_s
+        self._state: Optional[HyperliquidState] = None
+        self._key: Optional[tuple[int, int]] = None
+        self._coins: list[str] = []
+        self._scores: dict[str, np.ndarray] = {}
+        self._results: dict[Optional[int], tuple[float, dict]] = {}
+
+        self.builds = 0
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> dict:
+        return {
+            "candle_generation": self._key[0] if self._key else None,
+            "coins":             len(self._coins),
+            "builds":            self.builds,
+            "hits":              self.hits,
+            "misses":            self.misses,
+        }
+
+    def _refresh(self, state: HyperliquidState, now_ms: float):
+        key = (state.candle_generation["1d"], int(now_ms // _DAY_MS))
+        if state is self._state and key == self._key:
+            return
+        self._state = state
+        self._key = key
+        self._coins, closes = close_matrix(state, now_ms)
+        self._scores = momentum_scores(closes)
+        self._results = {}
+        self.builds += 1
+
+    def signals(self, state: HyperliquidState, top_n: Optional[int] = None) -> dict:
+        """
+        TSMOM signals for every main-DEX perp with enough 1d history, or for
+        the top_n of them by volume.  Same shape as compute_tsmom_signals.
+        """
+        now = time.time()
+        self._refresh(state, now * 1000)
+        cached = self._results.get(top_n)
+        if cached is not None and now - cached[0] < self.result_max_age_s:
+            self.hits += 1
+            return cached[1]
+        self.misses += 1
+        result = self._build(state, top_n)
+        self._results.pop(top_n, None)
+        if len(self._results) >= _MAX_RESULTS:
+            del self._results[next(iter(self._results))]
+        self._results[top_n] = (now, result)
+        return result
+
+    def _build(self, state: HyperliquidState, top_n: Optional[int]) -> dict:
+        coins, sc = self._coins, self._scores
+        table = state.assets
+        active = np.array([(a := state.get_asset(c)) is not None and a.market_status == "active" for c in coins],
+                          dtype=bool)
+        keep = sc["eligible"] & active if coins else np.zeros(0, dtype=bool)
+        if top_n is not None:
+            ranked = [c for c in state.top_coins_by_volume(len(table))
+                      if ":" not in c and (a := state.get_asset(c)) is not None and a.market_status == "active"]
+            top = set(ranked[:top_n])
+            keep &= np.array([c in top for c in coins], dtype=bool)
+
+        idx = np.flatnonzero(keep)
+        selected = [coins[i] for i in idx.tolist()]
+        _, slots = table.slots(selected)
+        fund = np.nan_to_num(table.col("funding")[slots], nan=0.0)
+        s_raw = sc["s_raw"][idx]
+        sigma_daily = sc["sigma_daily"][idx]
+        sigma_ann = sc["sigma_ann"][idx]
+
+        # Funding cost adjustment
+        # Positive funding = longs pay shorts → penalizes long signal
+        # Daily funding cost for a long = fund * 24 (hourly rate × 24)
+        # Over _FUND_HORIZON days, normalized by daily vol, capped at 1 vol unit
+        fund_adj = np.clip(fund * 24 * _FUND_HORIZON / sigma_daily, -1.0, 1.0)
+        s_adj = s_raw - fund_adj
+
+        # Vol-targeted weight: w = s_adj * vol_target / sigma_ann, capped at ±20%
+        w_scaled = np.clip(s_adj * _VOL_TARGET / sigma_ann, -0.20, 0.20)
+        side = np.where(s_adj > _SIGNAL_THRESH, "long", np.where(s_adj < -_SIGNAL_THRESH, "short", "flat"))
+
+        def _opt(v: float) -> Optional[float]:
+            return None if v != v else v
+
+        columns = zip(
+            selected, np.round(s_raw, 3).tolist(), np.round(s_adj, 3).tolist(),
+            np.round(sigma_ann * 100, 1).tolist(), fund.tolist(), np.round(w_scaled * 100, 2).tolist(),
+            side.tolist(), sc["momentum_10d"][idx].tolist(), sc["momentum_30d"][idx].tolist(),
+            sc["bars_used"][idx].tolist(),
+        )
+        results = [{
+            "coin":            coin,
+            "s_raw":           raw,
+            "s_adj":           adj,
+            "sigma":           sigma,                           # annualized vol as %
+            "funding_bps":     round(f * 10_000, 3),           # bps per hour
+            "funding_ann_pct": round(f * 8760 * 100, 2),       # annualized funding %
+            "w_scaled":        w,                               # target weight %
+            "side":            sd,
+            "momentum_10d":    _opt(m10),
+            "momentum_30d":    _opt(m30),
+            "bars_used":       int(bars),
+        } for coin, raw, adj, sigma, f, w, sd, m10, m30, bars in columns]
+
+        # Sort by absolute adjusted signal strength (strongest first)
+        results.sort(key=lambda x: abs(x["s_adj"]), reverse=True)
+
+        sides = side.tolist()
+        return {
+            "signals": results,
+            "meta": {
+                "total_signals": len(results),
+                "long_count":    sides.count("long"),
+                "short_count":   sides.count("short"),
+                "flat_count":    sides.count("flat"),
+                "generated_at":  time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            },
+        }
+
+
+def compute_tsmom_signals(state: HyperliquidState, top_n: Optional[int] = None) -> dict:
+    """
+    Compute TSMOM signals (uncached; the router serves them through a
+    TsmomEngine).  top_n=None covers every main-DEX perp.
 
     Returns:
       {
@@ -66,7 +266,7 @@ def compute_tsmom_signals(state: HyperliquidState, top_n: int = 60) -> dict:
             "side": "long"|"short"|"flat",
             "momentum_10d": float|None,   # 10d cum log return (%)
             "momentum_30d": float|None,   # 30d cum log return (%)
-            "bars_used": int,
+            "bars_used": int,             # closed 1d bars in the window
           },
           ...
         ],
@@ -79,120 +279,4 @@ def compute_tsmom_signals(state: HyperliquidState, top_n: int = 60) -> dict:
         }
       }
     """
-    # Only use main-DEX crypto perps for TSMOM (they have richer candle history)
-    perps = sorted(
-        [a for a in state.perp_assets() if a.market_status == "active" and ":" not in a.coin],
-        key=lambda a: -(a.day_ntl_vlm or 0),
-    )[:top_n]
-
-    results = []
-
-    for asset in perps:
-        candles = state.get_candles(asset.coin, "1d", n=120)
-        if len(candles) < _MIN_BARS:
-            continue
-
-        closes = [float(c["c"]) for c in candles if c.get("c")]
-        if len(closes) < _MIN_BARS:
-            continue
-
-        # Log returns
-        log_rets: list[float] = []
-        for i in range(1, len(closes)):
-            lr = _log_return(closes[i - 1], closes[i])
-            if lr is not None:
-                log_rets.append(lr)
-
-        if len(log_rets) < _MIN_BARS - 1:
-            continue
-
-        # Realized vol — use last 30 days (or all available)
-        vol_window = min(30, len(log_rets))
-        sigma_daily = _std(log_rets[-vol_window:])
-        sigma_ann   = sigma_daily * math.sqrt(365)
-
-        if sigma_ann < 1e-8:
-            continue
-
-        # Multi-lookback z-scores
-        z_scores: list[float] = []
-        mom_10d: Optional[float] = None
-        mom_30d: Optional[float] = None
-
-        for lb in _LOOKBACKS:
-            if len(log_rets) < lb:
-                continue
-            ret_lb = sum(log_rets[-lb:])
-            vol_lb = _std(log_rets[-lb:]) * math.sqrt(lb) if len(log_rets[-lb:]) > 2 else sigma_daily * math.sqrt(lb)
-            if vol_lb < 1e-10:
-                continue
-            z = max(-_Z_CLIP, min(_Z_CLIP, ret_lb / vol_lb))
-            z_scores.append(z)
-
-            # Store human-readable momentum
-            if lb == 10:
-                mom_10d = round(ret_lb * 100, 2)
-            elif lb == 30:
-                mom_30d = round(ret_lb * 100, 2)
-
-        if not z_scores:
-            continue
-
-        s_raw = sum(z_scores) / len(z_scores)
-
-        # Funding cost adjustment
-        # Positive funding = longs pay shorts → penalizes long signal
-        fund = asset.funding or 0.0
-        # Daily funding cost for a long = fund * 24 (hourly rate × 24)
-        # Over _FUND_HORIZON days: fund * 24 * _FUND_HORIZON
-        # Normalized by daily vol: adjustment = (fund * 24 * horizon) / sigma_daily
-        fund_10d = fund * 24 * _FUND_HORIZON
-        fund_adj_raw = fund_10d / sigma_daily if sigma_daily > 0 else 0.0
-        # Cap adjustment at 1 vol unit
-        fund_adj = max(-1.0, min(1.0, fund_adj_raw))
-
-        s_adj = s_raw - fund_adj
-
-        # Vol-targeted weight: w = s_adj * vol_target / sigma_ann, capped at ±20%
-        w_raw    = (s_adj * _VOL_TARGET / sigma_ann) if sigma_ann > 0 else 0.0
-        w_scaled = max(-0.20, min(0.20, w_raw))
-
-        side: str
-        if s_adj > _SIGNAL_THRESH:
-            side = "long"
-        elif s_adj < -_SIGNAL_THRESH:
-            side = "short"
-        else:
-            side = "flat"
-
-        results.append({
-            "coin":           asset.coin,
-            "s_raw":          round(s_raw, 3),
-            "s_adj":          round(s_adj, 3),
-            "sigma":          round(sigma_ann * 100, 1),       # annualized vol as %
-            "funding_bps":    round(fund * 10_000, 3),         # bps per hour
-            "funding_ann_pct": round(fund * 8760 * 100, 2),    # annualized funding %
-            "w_scaled":       round(w_scaled * 100, 2),        # target weight %
-            "side":           side,
-            "momentum_10d":   mom_10d,
-            "momentum_30d":   mom_30d,
-            "bars_used":      len(closes),
-        })
-
-    # Sort by absolute adjusted signal strength (strongest first)
-    results.sort(key=lambda x: abs(x["s_adj"]), reverse=True)
-
-    long_count  = sum(1 for r in results if r["side"] == "long")
-    short_count = sum(1 for r in results if r["side"] == "short")
-    flat_count  = sum(1 for r in results if r["side"] == "flat")
-
-    return {
-        "signals": results,
-        "meta": {
-            "total_signals": len(results),
-            "long_count":    long_count,
-            "short_count":   short_count,
-            "flat_count":    flat_count,
-            "generated_at":  time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
-        },
-    }
+    return TsmomEngine().signals(state, top_n=top_n)
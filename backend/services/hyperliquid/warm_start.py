@@ -0,0 +1,250 @@
+"""
+Hyperliquid Screener — warm-start persistence.
+
+A cold boot refetches every universe, candle set and book and leaves
+oi_history / score_history empty, so oi_change_1h and score_change stay null
+for an hour after each restart.  The WS manager periodically writes a compact
+snapshot of the state to disk; the next boot loads it, serves it immediately
+(is_ready + is_stale) and only backfills the gap since it was written.
+
+File layout (one file, replaced atomically):
+
+  b"HLWS" | uint32 version | uint64 header_len | header JSON | pad to 8
+  candles  float64[n_bars, 8]   t, T, o, h, l, c, v, n   (NaN = missing)
+  history  float64[...]         per SnapshotHistory: [rows, 1 + n_coins]
+                                ts, one value per coin (NaN = missing)
+
+The candle block is the CandleRing rows as stored (candles.py), and each
+history is its SnapshotHistory window (history.py), so saving is a copy and
+loading a bulk upsert / load.  The header carries the asset table, the
+allowlists and, per candle series, its (row offset, row count), per history
+its coins and (offset, rows) into the flat history block; both blocks are
+read back in place from an mmap of the file.  encode_snapshot /
+decode_header / restore_snapshot work on any buffer, so the shared-state
+segment (shared_state.py) reuses the same layout.  Bars still forming when the snapshot
+was written are dropped on load so the backfill replaces them with their
+final values.
+"""
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+import time
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from . import codec
+from .candles import CLOSE_T, N_FIELDS
+from .models import ScreenerAsset
+from .state import HyperliquidState
+
+_DEFAULT_PATH = Path(__file__).resolve().parent.parent.parent / "data" / "hl_warm_start" / "state.bin"
+WARM_START_PATH = Path(os.getenv("HL_WARM_START_PATH", str(_DEFAULT_PATH)))
+
+# Snapshots older than this are ignored (candle gaps exceed the boot fetch
+# windows and the history buffers no longer cover their change windows)
+WARM_START_MAX_AGE_S = float(os.getenv("HL_WARM_START_MAX_AGE_S", str(6 * 3600)))
+
+_MAGIC = b"HLWS"
+_VERSION = 2
+_PREFIX = struct.Struct("<4sIQ")
+
+_HISTORIES = ("oi_history", "score_history")
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Save
+# ─────────────────────────────────────────────────────────────────────────────
+
+def collect_warm_start(state: HyperliquidState) -> dict:
+    """
+    Take what the snapshot needs from the live state.  Cheap enough for the
+    event loop: candle rows are copied out of their rings, and assets are
+    never mutated in place (they are replaced), so write_warm_start can
+    encode them from a worker thread while the state keeps moving.
+    """
+    return {
+        "saved_at":       time.time(),
+        "assets":         state.assets.values(),
+        "perp_allowlist": sorted(state.perp_allowlist),
+        "spot_allowlist": sorted(state.spot_allowlist),
+        "universe":       sorted(state.universe_allowlist),
+        "prev_ranks":     dict(state.prev_ranks),
+        "candles":        [(coin, interval, ring.window().copy())
+                           for coin, by_interval in list(state.candles.items())
+                           for interval, ring in list(by_interval.items()) if len(ring)],
+        "histories":      {name: _history_block(getattr(state, name)) for name in _HISTORIES},
+    }
+
+
+def _history_block(history) -> tuple[list[str], np.ndarray]:
+    """SnapshotHistory → (coins, [rows, 1 + n_coins] copy with ts first)."""
+    return history.coins, np.column_stack([history.timestamps(), history.matrix()])
+
+
+def encode_snapshot(snapshot: dict) -> bytes:
+    """Encode a collected snapshot into the file layout above."""
+    candle_index: list[tuple[str, str, int, int]] = []
+    offset = 0
+    for coin, interval, rows in snapshot["candles"]:
+        candle_index.append((coin, interval, offset, len(rows)))
+        offset += len(rows)
+    blocks = [rows for _, _, rows in snapshot["candles"]]
+    candles = np.concatenate(blocks) if blocks else np.empty((0, N_FIELDS))
+
+    history_index: dict[str, dict] = {}
+    history_blocks: list[np.ndarray] = []
+    offset = 0
+    for name, (coins, rows) in snapshot["histories"].items():
+        history_index[name] = {"coins": coins, "offset": offset, "rows": len(rows)}
+        history_blocks.append(rows.ravel())
+        offset += rows.size
+    history = np.concatenate(history_blocks) if history_blocks else np.empty(0)
+    header = dict(
+        snapshot,
+        assets=[a.model_dump(mode="json") for a in snapshot["assets"]],
+        candles=candle_index,
+        histories=history_index,
+        candles_shape=candles.shape,
+        history_shape=history.shape,
+    )
+    blob = codec.dumps(header)
+    pad = -(_PREFIX.size + len(blob)) % 8
+    return b"".join((
+        _PREFIX.pack(_MAGIC, _VERSION, len(blob)), blob, b"\0" * pad, candles.tobytes(), history.tobytes(),
+    ))
+
+
+def write_warm_start(snapshot: dict, path: Path = WARM_START_PATH) -> int:
+    """Encode a collected snapshot and write it atomically; returns the file size."""
+    data = encode_snapshot(snapshot)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    return len(data)
+
+
+def save_warm_start(state: HyperliquidState, path: Path = WARM_START_PATH) -> int:
+    return write_warm_start(collect_warm_start(state), path)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Load
+# ─────────────────────────────────────────────────────────────────────────────
+
+def decode_header(buf) -> tuple[dict, int]:
+    """
+    Header of an encoded snapshot (bytes / mmap) and the offset of its
+    candle block.  ValueError when buf is not a snapshot of this version.
+    """
+    magic, version, header_len = _PREFIX.unpack_from(buf, 0)
+    if magic != _MAGIC or version != _VERSION:
+        raise ValueError("unknown format")
+    header = codec.loads(bytes(buf[_PREFIX.size:_PREFIX.size + header_len]))
+    return header, _PREFIX.size + header_len + (-(_PREFIX.size + header_len) % 8)
+
+
+def restore_snapshot(state: HyperliquidState, buf, header: dict, offset: int, closed_only: bool = True) -> int:
+    """
+    Load assets, allowlists, candles and OI / score history of an encoded
+    snapshot into an empty state; the blocks are read in place from buf.
+    closed_only drops the bars still forming at saved_at.  Returns the
+    number of history points loaded.
+    """
+    n_candles, n_history = header["candles_shape"][0], header["history_shape"][0]
+    candles = (np.frombuffer(buf, dtype=np.float64, count=n_candles * N_FIELDS, offset=offset)
+               .reshape(tuple(header["candles_shape"])) if n_candles else np.empty((0, N_FIELDS)))
+    offset += candles.nbytes
+    history = (np.frombuffer(buf, dtype=np.float64, count=n_history, offset=offset)
+               if n_history else np.empty(0))
+
+    for raw in header["assets"]:
+        asset = ScreenerAsset.model_validate(raw)
+        state.assets[asset.coin] = asset
+    state.perp_allowlist = set(header["perp_allowlist"])
+    state.spot_allowlist = set(header["spot_allowlist"])
+    state.universe_allowlist = set(header["universe"])
+    state.prev_ranks = dict(header["prev_ranks"])
+
+    saved_ms = header["saved_at"] * 1000
+    for coin, interval, start, count in header["candles"]:
+        block = candles[start:start + count]
+        if closed_only:
+            # Drop bars that were still forming when the snapshot was taken
+            block = block[~(block[:, CLOSE_T] >= saved_ms)]
+        state.add_candle_rows(coin, interval, np.array(block))
+
+    n_points = 0
+    for name in _HISTORIES:
+        entry = header["histories"].get(name)
+        if not entry or not entry["rows"]:
+            continue
+        coins, start = entry["coins"], entry["offset"]
+        rows = np.array(history[start:start + entry["rows"] * (1 + len(coins))]).reshape(entry["rows"], -1)
+        getattr(state, name).load(coins, rows[:, 0], rows[:, 1:])
+        n_points += int((~np.isnan(rows[:, 1:])).sum())
+    return n_points
+
+
+# Everything restore_snapshot writes into the state
+_RESTORED = ("assets", "perp_allowlist", "spot_allowlist", "universe_allowlist", "prev_ranks",
+             "candles", "candle_generation", "dirty") + _HISTORIES
+
+
+def _discard_restored(state: HyperliquidState):
+    """Put the fields restore_snapshot touches back to their empty defaults."""
+    fresh = HyperliquidState()
+    for name in _RESTORED:
+        setattr(state, name, getattr(fresh, name))
+
+
+def load_warm_start(
+    state: HyperliquidState,
+    path: Path = WARM_START_PATH,
+    max_age_s: float = WARM_START_MAX_AGE_S,
+) -> Optional[float]:
+    """
+    Restore assets, allowlists, candles and OI / score history from a
+    snapshot into an empty state.  Returns the snapshot's saved_at, or None
+    when there is no usable snapshot (missing, unreadable, too old, corrupt)
+    and the state is left empty.
+    """
+    try:
+        with open(path, "rb") as f:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        header, offset = decode_header(buf)
+    except FileNotFoundError:
+        return None
+    except ValueError:
+        print(f"[HL][warm] Ignoring {path}: unknown format")
+        return None
+    except Exception as e:
+        print(f"[HL][warm] Could not read {path}: {e}")
+        return None
+
+    saved_at = header["saved_at"]
+    age = time.time() - saved_at
+    if age > max_age_s:
+        print(f"[HL][warm] Snapshot is {age / 3600:.1f}h old — cold boot")
+        return None
+
+    try:
+        n_points = restore_snapshot(state, buf, header, offset)
+    except Exception as e:
+        # Truncated or schema-incompatible: a half-loaded state is worse
+        # than none, and raising here would fail every boot until the file
+        # is deleted
+        _discard_restored(state)
+        print(f"[HL][warm] Discarding corrupt snapshot {path}: {type(e).__name__}: {e} — cold boot")
+        return None
+    state.warm_start_ts = saved_at
+    print(f"[HL][warm] Loaded snapshot from {age:.0f}s ago: {len(header['assets'])} assets, "
+          f"{len(header['candles'])} candle series, {n_points} history points")
+    return saved_at
@@ -1,38 +1,68 @@
 """
 Hyperliquid Screener — WebSocket consumer + boot sequence.
 
-Boot sequence (fast path — sets is_ready in ~30-60s):
-  1. REST: fetch metaAndAssetCtxs → initialize crypto perp assets
-  2. REST: fetch spotMetaAndAssetCtxs → extend with spot assets
-  3. REST: fetch allMids → patch mid prices
-  4. REST: fetch 1h candles for top-40 assets → volatility/momentum
-  5. REST: fetch 5m candles for top-20 assets → short-term vol/momentum
-  6. REST: fetch L2 books for top-20 assets → book depth features
-  7. Run full feature pass → compute all signals
-  8. Mark state.is_ready = True  ← fast: crypto perps only
-  9. Connect WebSocket → subscribe to allMids + activeAssetCtx + bbo + trades
+Warm start: if a recent disk snapshot exists (warm_start.py) it is loaded
+first and served immediately (is_ready + is_stale); the boot sequence below
+then only fetches candle bars for the gap since the snapshot and refreshes
+universes / books, and clears is_stale when it finishes.
+
+HL_RECORD_PATH captures every REST response and raw WS frame to a file that
+replay.py plays back offline (scripts/bench_hl_replay.py).
+
+Boot sequence — a stage graph (_boot_sequence); independent stages overlap
+and readiness is marked per capability (state.READY_*) as soon as its
+inputs are in:
+  1. REST: metaAndAssetCtxs → crypto perp assets
+  2. REST: spotMetaAndAssetCtxs → spot assets        (fetched alongside 1)
+  3. REST: allMids → patch mid prices                 (fetched alongside 1)
+  4. Feature pass → READY_PRICES, state.is_ready      (after 1-3)
+  5. REST: 1h candles top-40, 5m candles top-20, 1d candles top-15 TSMOM,
+     L2 books top-20 — concurrently, once the volume ranking is known
+     (immediately after a warm start, otherwise after 1)
+  6. Feature pass → READY_CANDLE_FEATURES              (after 1-3, 1h, 5m, books)
+  7. READY_TSMOM                                       (after 1d candles)
+  8. Connect WebSocket(s) → subscribe to allMids + activeAssetCtx + bbo + trades
+     (reader buffers raw frames; applier decodes + coalesces every 50ms);
+     the subscription set is recomputed every 30s and rotated with
+     incremental (un)subscribe messages (subscriptions.py)
+Stage timings land in state.boot_stages (/status "boot").
+
+REST calls are paced by the client's weight-aware InfoScheduler; each bulk
+fetch logs one progress summary (ok / failed / retries / weight / req/s).
 
 Post-boot enrichment (background, non-blocking):
- 10. Load HIP-3 DEX universes (equity/commodity/index/pre-IPO perps)
- 11. Load 1d candles for top-50 crypto perps (TSMOM signals)
- 12. Run feature pass to include new HIP-3 assets
+  9. Load HIP-3 DEX universes (equity/commodity/index/pre-IPO perps)
+ 10. Run feature pass to include new HIP-3 assets
 
 Background tasks (continuous):
- 13. Periodic candle refresh (every 5 min) — refreshes 1h, 5m, 1d
- 14. Periodic feature recompute (every 60s)
+ 11. Live candles — the trades feed keeps the REST-seeded 5m / 1h / 1d
+     series current (HyperliquidState._fold_trades); REST only seeds coins
+     entering the candle universe (1d: every main-DEX perp, for TSMOM),
+     backfills the gap after a WS reconnect or since the warm snapshot and
+     refreshes coins without a trades subscription every 5 min
+ 12. Incremental feature pass over dirty coins (every 5s); OI / score
+     snapshots on a 60s cadence
+ 13. Warm-start snapshot to disk (every 5 min, and on shutdown)
+ 14. Event-loop lag probe (state.metrics, served by /metrics)
 """
 from __future__ import annotations
 
 import asyncio
-import json
+import math
+import os
 import time
-from typing import Optional
+from collections import deque
+from typing import Awaitable, Callable, Optional
 
+import numpy as np
 import websockets
 import websockets.exceptions
 
+from . import codec
+from .candles import INTERVAL_MS
 from .client import HyperliquidRestClient
-from .feature_engine import run_full_feature_pass
+from .feature_engine import run_full_feature_pass, run_incremental_feature_pass
+from .history import OI_CHANGE_WINDOWS
 from .normalizer import (
     build_hip3_universe,
     build_perp_universe,
@@ -43,14 +73,24 @@ from .normalizer import (
     patch_from_l2,
     patch_trade_flow,
 )
-from .state import HyperliquidState
+from .models import ScreenerAsset
+from .recorder import RecordingRestClient, StreamRecorder
+from .scheduler import BulkReport
+from .subscriptions import SubscriptionManager, desired_subscriptions, subscription_message
+from .state import (
+    DIRTY_OI,
+    READY_CANDLE_FEATURES,
+    READY_CAPABILITIES,
+    READY_PRICES,
+    READY_TSMOM,
+    HyperliquidState,
+)
+from .warm_start import collect_warm_start, load_warm_start, save_warm_start, write_warm_start
 
 _WS_URL = "wss://api.hyperliquid.xyz/ws"
 
-# Subscription thresholds
-_CTX_SUBS   = 50   # activeAssetCtx subscriptions (top N by OI)
-_BBO_SUBS   = 30   # BBO subscriptions
-_TRADE_SUBS = 30   # trades subscriptions
+# Desired WS subscriptions are recomputed this often (subscriptions.py)
+_SUBS_ROTATE_S = 30.0
 
 # Reconnect backoff
 _RECONNECT_MIN_S = 3.0
@@ -59,6 +99,33 @@ _RECONNECT_MAX_S = 60.0
 # Heartbeat interval
 _PING_INTERVAL_S = 20.0
 
+# Reader → applier pipeline: raw frames are buffered (oldest dropped when
+# full) and applied in coalesced batches on a fixed tick
+_INGEST_QUEUE_MAX = 5000
+_APPLY_TICK_S     = 0.05
+
+# Event-loop lag probe period (metrics.py)
+_LOOP_LAG_TICK_S = 0.5
+
+# Capture REST responses + raw WS frames for offline replay (recorder.py)
+_RECORD_PATH = os.getenv("HL_RECORD_PATH")
+_recorder: Optional[StreamRecorder] = None
+
+# Incremental feature pass cadence; OI / score history snapshots stay at ~60s
+# because the change windows in _compute_oi_changes assume that spacing
+_FEATURE_PASS_INTERVAL_S = 5.0
+_SNAPSHOT_INTERVAL_S     = 60.0
+
+# Warm-start snapshot to disk (HL_WARM_START=0 disables load and save)
+_WARM_START = os.getenv("HL_WARM_START", "1") != "0"
+_WARM_SNAPSHOT_INTERVAL_S = 300.0
+
+# Candle maintenance: bars per REST seed, check cadence, and how often
+# series without a live trades subscription are refreshed over REST
+_CANDLE_BARS = {"1h": 50, "5m": 50, "1d": 120}
+_CANDLE_CHECK_S = 30.0
+_UNCOVERED_REFRESH_S = 300.0
+
 _shutdown = False
 
 
@@ -68,126 +135,265 @@ async def boot_and_run(state: HyperliquidState):
     Runs the boot sequence, then starts the WebSocket consumer
     and periodic background tasks concurrently.
     """
+    global _recorder
     client = HyperliquidRestClient()
+    if _RECORD_PATH:
+        _recorder = StreamRecorder(_RECORD_PATH)
+        client = RecordingRestClient(client, _recorder)
+        print(f"[HL] Recording REST responses and WS frames to {_RECORD_PATH}")
+    state.boot_started_ts = time.time()
     try:
-        print("[HL] Starting boot sequence...")
-        await _boot_sequence(state, client)
+        warm_ts = _warm_boot(state) if _WARM_START else None
+        print("[HL] Starting boot sequence..." + (" (backfilling since warm snapshot)" if warm_ts else ""))
+        await _boot_sequence(state, client, since_ts=warm_ts)
         print(f"[HL] Boot complete — {len(state.assets)} assets ready. Starting WS...")
-        state.is_ready = True
+        state.is_stale = False
         state.boot_ts = time.time()
+        # Trades between the boot candle fetch (or the warm snapshot, for
+        # series the boot did not refetch) and the WS connect are missed
+        state.candle_gap_since = warm_ts or state.boot_started_ts
+        print(f"[HL][boot] Ready after (s): {state.boot_report()['ready_after_s']}")
 
         # Run all long-lived tasks concurrently
         # Launch post-boot enrichment as a concurrent task alongside the infinite loops.
         # It loads HIP-3 DEX assets and 1d candles without blocking is_ready.
+        frames: deque = deque(maxlen=_INGEST_QUEUE_MAX)
+        state.ingest.queue_max = _INGEST_QUEUE_MAX
+        subs = SubscriptionManager()
+        _plan_subscriptions(state, subs)
         await asyncio.gather(
-            _ws_consumer(state),
-            _periodic_candle_refresh(state, client),
+            *(_ws_consumer(state, frames, subs, shard) for shard in range(len(subs.shards))),
+            _rotate_subscriptions(state, subs),
+            _ws_applier(state, frames),
+            _candle_backfill(state, client),
             _periodic_feature_recompute(state),
             _post_boot_enrich(state, client),
+            _periodic_warm_snapshot(state),
+            _loop_lag_probe(state),
             return_exceptions=True,
         )
     except Exception as e:
         print(f"[HL] boot_and_run fatal error: {e}")
     finally:
+        if _WARM_START and state.is_ready and not state.is_stale:
+            try:
+                save_warm_start(state)
+            except Exception as e:
+                print(f"[HL][warm] Save on shutdown failed: {e}")
         await client.close()
+        if _recorder is not None:
+            _recorder.close()
+            _recorder = None
+
+
+def _warm_boot(state: HyperliquidState) -> Optional[float]:
+    """Load the disk snapshot and serve it right away, flagged stale."""
+    saved_at = load_warm_start(state)
+    if saved_at is None:
+        return None
+    run_full_feature_pass(state)
+    state.mark_ready(*READY_CAPABILITIES)
+    state.is_stale = True
+    state.boot_ts = saved_at
+    return saved_at
 
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Boot sequence
 # ─────────────────────────────────────────────────────────────────────────────
 
-async def _boot_sequence(state: HyperliquidState, client: HyperliquidRestClient):
-    # 1. Perp universe
-    print("[HL][boot] Fetching perp universe...")
-    try:
+def _bulk_logger(tag: str) -> Callable[[BulkReport], None]:
+    """Progress callback for the client's bulk fetches: one summary line per call."""
+    def progress(report: BulkReport):
+        if report.finished is not None and report.total:
+            print(f"[HL][{tag}] {report.summary()}")
+    return progress
+
+
+def _merge_asset(prev: Optional[ScreenerAsset], fresh: ScreenerAsset) -> ScreenerAsset:
+    """Fresh universe / ctx fields over a warm-start asset, keeping its scores."""
+    if prev is None:
+        return fresh
+    return prev.model_copy(update={f: getattr(fresh, f) for f in fresh.model_fields_set})
+
+
+def _drop_unlisted(state: HyperliquidState, market_type: str, old: set[str], new: set[str]):
+    """Remove warm-start assets that are no longer in the fetched universe."""
+    for coin in old - new:
+        asset = state.assets.get(coin)
+        if asset is not None and asset.market_type == market_type:
+            del state.assets[coin]
+        state.universe_allowlist.discard(coin)
+
+
+async def _fetch_candles(
+    state: HyperliquidState,
+    client: HyperliquidRestClient,
+    coins: list[str],
+    interval: str,
+    n_bars: int,
+    since_ts: Optional[float],
+    progress: Optional[Callable[[BulkReport], None]] = None,
+) -> dict[str, list[dict]]:
+    """
+    client.get_candles_multi, except that after a warm start the coins that
+    already hold bars for `interval` only fetch the bars since the snapshot.
+    """
+    if since_ts is None:
+        return await client.get_candles_multi(coins, interval, n_bars=n_bars, progress=progress)
+    gap_bars = min(n_bars, math.ceil((time.time() - since_ts) * 1000 / INTERVAL_MS[interval]) + 1)
+    have = {c for c in coins if (state.candles.get(c) or {}).get(interval)}
+    gap, full = await asyncio.gather(
+        client.get_candles_multi([c for c in coins if c in have], interval, n_bars=gap_bars, progress=progress),
+        client.get_candles_multi([c for c in coins if c not in have], interval, n_bars=n_bars, progress=progress),
+    )
+    return {**gap, **full}
+
+
+async def _run_stages(
+    state: HyperliquidState,
+    stages: list[tuple[str, tuple[str, ...], Callable[[], Awaitable[None]]]],
+):
+    """
+    Run (name, deps, fn) boot stages as a dependency graph: each stage starts
+    as soon as the stages it depends on have finished, failed or not (a
+    failed universe fetch still leaves the rest of the boot useful).
+    Stages must be listed after their dependencies.  Records timings in
+    state.boot_stages, as offsets from the start of the graph.
+    """
+    t0 = time.monotonic()
+    tasks: dict[str, asyncio.Task] = {}
+
+    async def run(name: str, deps: tuple[str, ...], fn: Callable[[], Awaitable[None]]):
+        if deps:
+            await asyncio.gather(*(tasks[d] for d in deps))
+        started = time.monotonic()
+        ok = True
+        try:
+            await fn()
+        except Exception as e:
+            ok = False
+            print(f"[HL][boot] {name} error: {e}")
+        state.boot_stages[name] = {
+            "start_s":    round(started - t0, 3),
+            "duration_s": round(time.monotonic() - started, 3),
+            "ok":         ok,
+        }
+
+    for name, deps, fn in stages:
+        tasks[name] = asyncio.create_task(run(name, deps, fn))
+    await asyncio.gather(*tasks.values())
+
+
+def _stages_ok(state: HyperliquidState, *names: str) -> bool:
+    return all(state.boot_stages.get(name, {}).get("ok") for name in names)
+
+
+async def _boot_sequence(
+    state: HyperliquidState,
+    client: HyperliquidRestClient,
+    since_ts: Optional[float] = None,
+):
+    """
+    Boot as a stage graph.  Network fetches that need nothing start at once
+    (perp + spot universes, allMids); applying spot / mids waits for the perp
+    universe so name collisions and mid patches resolve as before.  Candle and
+    book fetches need the volume ranking: after a warm start the snapshot's
+    ranking is used and they start immediately, otherwise they wait for the
+    perp universe.  Readiness is marked per capability as soon as its inputs
+    are in: prices (is_ready), candle features, TSMOM.
+    """
+    report = _bulk_logger("boot")
+    warm = since_ts is not None and bool(state.assets)
+    spot_fetch = asyncio.create_task(client.get_spot_meta_and_asset_ctxs())
+    mids_fetch = asyncio.create_task(client.get_all_mids())
+
+    async def perp():
         meta_ctxs = await client.get_meta_and_asset_ctxs()
         perp_assets = build_perp_universe(meta_ctxs)
         for coin, asset in perp_assets.items():
-            state.assets[coin] = asset
+            state.assets[coin] = _merge_asset(state.assets.get(coin), asset)
             state.meta[coin] = {}
         # Build perp allowlist from admitted assets
+        _drop_unlisted(state, "perp", state.perp_allowlist, set(perp_assets))
         state.perp_allowlist = set(perp_assets.keys())
         state.universe_allowlist.update(state.perp_allowlist)
         print(f"[HL][boot] Loaded {len(perp_assets)} perp assets | allowlist size={len(state.perp_allowlist)}")
-    except Exception as e:
-        print(f"[HL][boot] Perp universe error: {e}")
 
-    # 2. Spot universe
-    print("[HL][boot] Fetching spot universe...")
-    try:
-        spot_ctxs = await client.get_spot_meta_and_asset_ctxs()
-        spot_assets = build_spot_universe(spot_ctxs)
+    async def spot():
+        spot_assets = build_spot_universe(await spot_fetch)
         for coin, asset in spot_assets.items():
-            if coin not in state.assets:   # don't overwrite a perp with same name
-                state.assets[coin] = asset
+            existing = state.assets.get(coin)
+            if existing is None or existing.market_type == "spot":   # don't overwrite a perp with same name
+                state.assets[coin] = _merge_asset(existing, asset)
         # Build spot allowlist from canonical admitted assets only
+        _drop_unlisted(state, "spot", state.spot_allowlist, set(spot_assets))
         state.spot_allowlist = set(spot_assets.keys())
         state.universe_allowlist.update(state.spot_allowlist)
         print(f"[HL][boot] Loaded {len(spot_assets)} spot assets | universe total={len(state.universe_allowlist)}")
-    except Exception as e:
-        print(f"[HL][boot] Spot universe error: {e}")
 
-    # 3. All mids
-    try:
-        mids = await client.get_all_mids()
-        patch_from_all_mids(state, mids)
-        print(f"[HL][boot] Patched mids for {len(mids)} coins")
-    except Exception as e:
-        print(f"[HL][boot] allMids error: {e}")
-
-    # 4. 1h candles for top-40 by volume
-    top40 = state.top_coins_by_volume(40)
-    print(f"[HL][boot] Fetching 1h candles for {len(top40)} assets...")
-    try:
-        candles_1h = await client.get_candles_multi(top40, "1h", n_bars=50)
-        for coin, bars in candles_1h.items():
-            if bars:
-                state.add_candles(coin, "1h", bars)
-        print(f"[HL][boot] 1h candles loaded for {sum(1 for b in candles_1h.values() if b)} coins")
-    except Exception as e:
-        print(f"[HL][boot] 1h candle error: {e}")
-
-    # 5. 5m candles for top-20
-    top20 = top40[:20]
-    print(f"[HL][boot] Fetching 5m candles for {len(top20)} assets...")
-    try:
-        candles_5m = await client.get_candles_multi(top20, "5m", n_bars=50)
-        for coin, bars in candles_5m.items():
-            if bars:
-                state.add_candles(coin, "5m", bars)
-    except Exception as e:
-        print(f"[HL][boot] 5m candle error: {e}")
-
-    # 5b. 1d candles for top-15 crypto perps — loaded at boot so TSMOM is
-    #     ready immediately when is_ready flips True (no waiting for post-boot).
-    top15_crypto = [c for c in top20 if ":" not in c][:15]
-    print(f"[HL][boot] Fetching 1d candles for {len(top15_crypto)} TSMOM assets...")
-    try:
-        candles_1d_boot = await client.get_candles_multi(top15_crypto, "1d", n_bars=120)
-        loaded_1d = sum(1 for bars in candles_1d_boot.values() if bars)
-        for coin, bars in candles_1d_boot.items():
-            if bars:
-                state.add_candles(coin, "1d", bars)
-        print(f"[HL][boot] 1d candles loaded for {loaded_1d} / {len(top15_crypto)} coins")
-    except Exception as e:
-        print(f"[HL][boot] 1d candle error: {e}")
-
-    # 6. L2 books for top-20
-    print(f"[HL][boot] Fetching L2 books for {len(top20)} assets...")
-    try:
-        books = await client.get_l2_books_multi(top20)
-        for coin, book in books.items():
+    async def mids():
+        all_mids = await mids_fetch
+        patch_from_all_mids(state, all_mids)
+        print(f"[HL][boot] Patched mids for {len(all_mids)} coins")
+
+    async def prices_ready():
+        n = run_full_feature_pass(state)
+        state.mark_ready(READY_PRICES)
+        print(f"[HL][boot] Prices ready — {n} assets scored")
+
+    # Candle / book coin sets, taken from the warm ranking or the fresh universe
+    top: dict[str, list[str]] = {}
+
+    async def rank():
+        top40 = state.top_coins_by_volume(40)
+        top["40"], top["20"] = top40, top40[:20]
+        top["tsmom"] = [c for c in top40[:20] if ":" not in c][:15]
+
+    def candle_stage(key: str, interval: str, n_bars: int):
+        async def fetch():
+            bars = await _fetch_candles(state, client, top[key], interval, n_bars, since_ts, progress=report)
+            for coin, coin_bars in bars.items():
+                if coin_bars:
+                    state.add_candles(coin, interval, coin_bars)
+        return fetch
+
+    async def books():
+        for coin, book in (await client.get_l2_books_multi(top["20"], progress=report)).items():
             levels = book.get("levels") or []
             if levels:
                 patch_from_l2(state, coin, levels)
                 state.set_book(coin, book)
-    except Exception as e:
-        print(f"[HL][boot] L2 books error: {e}")
 
-    # 7. Initial feature pass
-    print("[HL][boot] Running feature pass...")
-    n = run_full_feature_pass(state)
-    print(f"[HL][boot] Features computed for {n} assets")
+    # A capability whose candle stage failed stays unready here; the first
+    # _candle_backfill pass after boot seeds its series and marks it.
+    async def candle_features_ready():
+        n = run_full_feature_pass(state)
+        if _stages_ok(state, "candles_1h", "candles_5m"):
+            state.mark_ready(READY_CANDLE_FEATURES)
+            print(f"[HL][boot] Candle features ready — {n} assets")
+        else:
+            print(f"[HL][boot] Candle features not ready — candle fetch failed, {n} assets scored")
+
+    async def tsmom_ready():
+        # 1d bars for the top TSMOM coins are in; the rest arrive via _candle_backfill
+        if _stages_ok(state, "candles_1d"):
+            state.mark_ready(READY_TSMOM)
+
+    universe = ("perp", "spot", "mids")
+    await _run_stages(state, [
+        ("perp",            (),                                   perp),
+        ("spot",            ("perp",),                            spot),
+        ("mids",            ("perp", "spot"),                     mids),
+        ("prices",          universe,                             prices_ready),
+        ("rank",            () if warm else ("perp",),            rank),
+        ("candles_1h",      ("rank",),                            candle_stage("40", "1h", 50)),
+        ("candles_5m",      ("rank",),                            candle_stage("20", "5m", 50)),
+        ("candles_1d",      ("rank",),                            candle_stage("tsmom", "1d", 120)),
+        ("books",           ("rank",),                            books),
+        ("candle_features", universe + ("candles_1h", "candles_5m", "books"), candle_features_ready),
+        ("tsmom",           ("candles_1d",),                      tsmom_ready),
+    ])
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -201,16 +407,12 @@ async def _boot_sequence(state: HyperliquidState, client: HyperliquidRestClient)
 async def _post_boot_enrich(state: HyperliquidState, client: HyperliquidRestClient):
     """
     Non-blocking post-boot enrichment. Runs once after is_ready=True.
-    HIP-3 DEX loading and extended 1d candle fetching run concurrently so
-    TSMOM signals are not blocked waiting for HIP-3 DEX calls to finish.
+    (1d candles for the rest of the TSMOM universe are seeded by
+    _candle_backfill.)
     """
     await asyncio.sleep(3)  # let WS subscribe first
-    print("[HL][enrich] Starting post-boot enrichment (HIP-3 + 1d candles in parallel)...")
-    await asyncio.gather(
-        _enrich_hip3(state, client),
-        _enrich_1d_candles(state, client),
-        return_exceptions=True,
-    )
+    print("[HL][enrich] Starting post-boot enrichment (HIP-3)...")
+    await _enrich_hip3(state, client)
     print("[HL][enrich] Post-boot enrichment complete.")
 
 
@@ -258,88 +460,99 @@ async def _enrich_hip3(state: HyperliquidState, client: HyperliquidRestClient):
         print(f"[HL][enrich] HIP-3 error: {e}")
 
 
-async def _enrich_1d_candles(state: HyperliquidState, client: HyperliquidRestClient):
-    """Load extended 1d candles for top-50 crypto perps (TSMOM breadth)."""
-    await asyncio.sleep(2)  # let boot mids settle
-    try:
-        tsmom_coins = [
-            c for c in state.top_coins_by_volume(60)
-            if ":" not in c
-        ][:50]
-        print(f"[HL][enrich] Fetching extended 1d candles for {len(tsmom_coins)} coins...")
-        candles_1d = await client.get_candles_multi(tsmom_coins, "1d", n_bars=120)
-        loaded = sum(1 for bars in candles_1d.values() if bars)
-        for coin, bars in candles_1d.items():
-            if bars:
-                state.add_candles(coin, "1d", bars)
-        print(f"[HL][enrich] Extended 1d candles: {loaded} / {len(tsmom_coins)} coins")
-    except Exception as e:
-        print(f"[HL][enrich] 1d candle error: {e}")
-
-
-
-async def _ws_consumer(state: HyperliquidState):
+async def _ws_consumer(state: HyperliquidState, frames: deque, subs: SubscriptionManager, shard: int = 0):
     """
-    Connect to Hyperliquid WebSocket, subscribe to live feeds,
-    and process incoming messages indefinitely with auto-reconnect.
+    Hold one WS connection — shard `shard` of the subscription assignment —
+    and receive raw frames into `frames` indefinitely with auto-reconnect.
+    Decoding and state patching happen in _ws_applier.
     """
+    tag = f"[HL][ws{shard}]" if len(subs.shards) > 1 else "[HL][ws]"
     backoff = _RECONNECT_MIN_S
     while not _shutdown:
         try:
-            print("[HL][ws] Connecting...")
+            print(f"{tag} Connecting...")
             async with websockets.connect(
                 _WS_URL,
                 ping_interval=None,     # we handle pings manually
                 open_timeout=15,
                 close_timeout=10,
             ) as ws:
+                # Registered first so rotations during the initial subscribe
+                # reach this connection too (a duplicate subscribe is harmless)
+                subs.connections[shard] = ws
                 state.ws_connected = True
                 backoff = _RECONNECT_MIN_S
-                print("[HL][ws] Connected. Subscribing...")
-                await _subscribe_all(ws, state)
-                print("[HL][ws] Subscriptions sent. Consuming messages...")
+                print(f"{tag} Connected. Subscribing...")
+                await _subscribe_all(ws, list(subs.shards[shard]))
+                print(f"{tag} {len(subs.shards[shard])} subscriptions sent. Consuming messages...")
 
                 ping_task = asyncio.create_task(_ping_loop(ws))
                 try:
                     async for raw in ws:
-                        await _handle_message(state, raw)
+                        _enqueue_frame(state, frames, raw)
                 finally:
                     ping_task.cancel()
 
         except websockets.exceptions.ConnectionClosed as e:
-            print(f"[HL][ws] Connection closed: {e}. Reconnecting in {backoff}s...")
+            print(f"{tag} Connection closed: {e}. Reconnecting in {backoff}s...")
         except Exception as e:
-            print(f"[HL][ws] Error: {e}. Reconnecting in {backoff}s...")
+            print(f"{tag} Error: {e}. Reconnecting in {backoff}s...")
         finally:
-            state.ws_connected = False
+            subs.connections.pop(shard, None)
+            state.ws_connected = bool(subs.connections)
+            if state.candle_gap_since is None:
+                state.candle_gap_since = time.time()
 
         await asyncio.sleep(backoff)
         backoff = min(backoff * 1.5, _RECONNECT_MAX_S)
 
 
-async def _subscribe_all(ws, state: HyperliquidState):
-    """Send all subscription requests on a fresh connection."""
-    # 1. allMids — one sub covers every asset
-    await _subscribe(ws, {"type": "allMids"})
-
-    # 2. activeAssetCtx for top-N perps (funding, OI, mark updates)
-    top_ctx = state.top_coins_by_oi(_CTX_SUBS)
-    for coin in top_ctx:
-        await _subscribe(ws, {"type": "activeAssetCtx", "coin": coin})
+async def _subscribe_all(ws, subscriptions: list[tuple[str, str]]):
+    """Send every subscription of a shard on a fresh connection."""
+    for sub in subscriptions:
+        await ws.send(codec.dumps_str(subscription_message(sub)))
 
-    # 3. BBO for top-N
-    top_bbo = state.top_coins_by_volume(_BBO_SUBS)
-    for coin in top_bbo:
-        await _subscribe(ws, {"type": "bbo", "coin": coin})
 
-    # 4. Trades for top-N
-    top_trades = state.top_coins_by_volume(_TRADE_SUBS)
-    for coin in top_trades:
-        await _subscribe(ws, {"type": "trades", "coin": coin})
+def _plan_subscriptions(state: HyperliquidState, subs: SubscriptionManager) -> list:
+    """Recompute the desired feeds and move the shard assignment to them."""
+    before = subs.coins("trades")
+    changes = subs.plan(desired_subscriptions(state))
+    state.trade_coins = subs.coins("trades")
+    # Coins that just gained a trades feed missed trades since their last REST refresh
+    state.candle_resync.update(state.trade_coins - before)
+    state.subscription_stats = subs.stats()
+    return changes
 
 
-async def _subscribe(ws, subscription: dict):
-    await ws.send(json.dumps({"method": "subscribe", "subscription": subscription}))
+async def _rotate_subscriptions(state: HyperliquidState, subs: SubscriptionManager):
+    """
+    Every _SUBS_ROTATE_S: recompute the desired subscriptions and send the
+    incremental unsubscribe / subscribe messages to each live connection.
+    Shards that are down pick up their new assignment when they reconnect.
+    """
+    while not _shutdown:
+        await asyncio.sleep(_SUBS_ROTATE_S)
+        try:
+            changes = _plan_subscriptions(state, subs)
+        except Exception as e:
+            print(f"[HL][subs] Rotation error: {e}")
+            continue
+        added = removed = 0
+        for shard, (add, gone) in enumerate(changes):
+            ws = subs.connections.get(shard)
+            if ws is None or not (add or gone):
+                continue
+            try:
+                for sub in gone:
+                    await ws.send(codec.dumps_str(subscription_message(sub, "unsubscribe")))
+                for sub in add:
+                    await ws.send(codec.dumps_str(subscription_message(sub)))
+            except Exception as e:
+                print(f"[HL][subs] Send on shard {shard} failed: {e}")   # the reconnect resubscribes
+            added += len(add)
+            removed += len(gone)
+        if added or removed:
+            print(f"[HL][subs] Rotated: +{added} / -{removed} subscriptions")
 
 
 async def _ping_loop(ws):
@@ -347,191 +560,372 @@ async def _ping_loop(ws):
     while True:
         await asyncio.sleep(_PING_INTERVAL_S)
         try:
-            await ws.send(json.dumps({"method": "ping"}))
+            await ws.send(codec.dumps_str({"method": "ping"}))
         except Exception:
             break
 
 
 # ─────────────────────────────────────────────────────────────────────────────
-# Message dispatch
+# Message pipeline: reader → bounded buffer → coalescing applier
 # ─────────────────────────────────────────────────────────────────────────────
 
-async def _handle_message(state: HyperliquidState, raw: str):
-    try:
-        msg = json.loads(raw)
-    except Exception:
-        return
+def _enqueue_frame(state: HyperliquidState, frames: deque, raw: str):
+    """Reader side: buffer one raw frame; a full buffer drops its oldest frame."""
+    stats = state.ingest
+    stats.frames_received += 1
+    if len(frames) == frames.maxlen:
+        stats.frames_dropped += 1
+        _mark_candle_gap(state, frames[0][0])
+    now = time.time()
+    frames.append((now, raw))
+    stats.queue_depth = len(frames)
+    if _recorder is not None:
+        _recorder.frame(now, raw)
 
-    channel = msg.get("channel", "")
-    data    = msg.get("data", {})
 
-    if channel == "allMids":
-        mids = data.get("mids", {}) if isinstance(data, dict) else data
-        if isinstance(mids, dict):
-            patch_from_all_mids(state, mids)
+async def _ws_applier(state: HyperliquidState, frames: deque):
+    """Every _APPLY_TICK_S: drain the frame buffer and apply it as one batch."""
+    while not _shutdown:
+        await asyncio.sleep(_APPLY_TICK_S)
+        if not frames:
+            continue
+        batch = list(frames)
+        frames.clear()
+        state.ingest.queue_depth = 0
+        try:
+            _apply_batch(state, batch)
+        except Exception as e:
+            print(f"[HL][ws] Apply error: {e}")
+            _mark_candle_gap(state, batch[0][0])
+
 
-    elif channel == "activeAssetCtx":
-        coin = data.get("coin", "")
-        ctx  = data.get("ctx", {})
-        if coin and ctx:
-            patch_from_active_asset_ctx(state, coin, ctx)
+def _mark_candle_gap(state: HyperliquidState, since: float):
+    """
+    Frames from `since` on were lost (dropped or failed to apply).  Trade
+    coins' bars are otherwise never refetched, so let the candle backfill
+    repair every series from there, as after a reconnect.
+    """
+    if state.candle_gap_since is None or since < state.candle_gap_since:
+        state.candle_gap_since = since
+
+
+def _apply_batch(state: HyperliquidState, batch: list[tuple[float, str]]):
+    """
+    Decode a batch of (recv_ts, raw) frames and apply it.
+
+    Snapshot-style channels are coalesced so each key is patched once per
+    batch: allMids and activeAssetCtx (merged, later frames win per coin /
+    field), bbo and l2Book (latest snapshot per coin).  allMids and bbo
+    both set mid_px, so between them the later frame still wins per coin:
+    mids that arrived after a coin's bbo are applied after the bbos.
+    Trades are concatenated per coin in arrival order; candles are applied
+    in order since a bar rollover must not be collapsed.
+    """
+    t0 = time.time()
+    stats = state.ingest
+    metrics = state.metrics
+    frames = metrics.frames
+    clock = metrics.clock()
+
+    mids: Optional[dict] = None
+    ctxs: dict[str, dict] = {}
+    books: dict[str, list] = {}
+    bbos: dict[str, dict] = {}
+    late_mids: set[str] = set()     # coins whose allMids mid came after their bbo
+    trades: dict[str, list[dict]] = {}
+    candles: list[tuple[str, str, dict]] = []
+    coalesced = 0
+    errors = 0
+
+    for _, raw in batch:
+        try:
+            msg = codec.loads(raw)
+        except Exception:
+            errors += 1
+            continue
 
-    elif channel == "bbo":
-        # data = {"coin": "BTC", "data": {...}} or {"coin": "BTC", "bid": [...], ...}
-        if isinstance(data, dict):
+        channel = msg.get("channel", "")
+        data    = msg.get("data", {})
+        frames[channel] += 1
+
+        if channel == "allMids":
+            m = data.get("mids", {}) if isinstance(data, dict) else data
+            if isinstance(m, dict):
+                if mids is None:
+                    mids = dict(m)
+                else:
+                    coalesced += 1
+                    mids.update(m)
+                if bbos:
+                    late_mids.update(c for c in m if c in bbos)
+
+        elif channel == "activeAssetCtx":
             coin = data.get("coin", "")
-            inner = data.get("data", data)
-            if coin and inner:
-                patch_from_bbo(state, coin, inner)
-
-    elif channel == "l2Book":
-        coin   = data.get("coin", "")
-        levels = data.get("levels", [])
-        if coin and levels:
-            patch_from_l2(state, coin, levels)
-
-    elif channel == "trades":
-        # data = list of trade dicts
-        trades = data if isinstance(data, list) else []
-        affected: set[str] = set()
-        for trade in trades:
-            coin = trade.get("coin", "")
-            if coin:
-                state.add_trades(coin, [trade])
-                affected.add(coin)
-        for coin in affected:
-            patch_trade_flow(state, coin)
-
-    elif channel == "candle":
-        # data = {coin, interval, candle_data}
-        if isinstance(data, dict):
-            coin     = data.get("coin", "") or data.get("s", "")
-            interval = data.get("interval", "") or data.get("i", "")
-            candle   = data.get("data", data)
-            if coin and interval and candle:
-                state.upsert_candle(coin, interval, candle)
-
-    elif channel in ("pong", "subscriptionResponse"):
-        pass   # ignore heartbeats and ack messages
-
-    # else: unknown channel — silently ignore
+            ctx  = data.get("ctx", {})
+            if coin and ctx:
+                if coin in ctxs:
+                    coalesced += 1
+                    ctxs[coin].update(ctx)
+                else:
+                    ctxs[coin] = dict(ctx)
+
+        elif channel == "bbo":
+            # data = {"coin": "BTC", "data": {...}} or {"coin": "BTC", "bid": [...], ...}
+            if isinstance(data, dict):
+                coin = data.get("coin", "")
+                inner = data.get("data", data)
+                if coin and inner:
+                    coalesced += coin in bbos
+                    bbos[coin] = inner
+                    late_mids.discard(coin)
+
+        elif channel == "l2Book":
+            coin   = data.get("coin", "")
+            levels = data.get("levels", [])
+            if coin and levels:
+                coalesced += coin in books
+                books[coin] = levels
+
+        elif channel == "trades":
+            # data = list of trade dicts
+            for trade in data if isinstance(data, list) else []:
+                coin = trade.get("coin", "")
+                if coin:
+                    trades.setdefault(coin, []).append(trade)
+
+        elif channel == "candle":
+            # data = {coin, interval, candle_data}
+            if isinstance(data, dict):
+                coin     = data.get("coin", "") or data.get("s", "")
+                interval = data.get("interval", "") or data.get("i", "")
+                candle   = data.get("data", data)
+                if coin and interval and candle:
+                    candles.append((coin, interval, candle))
+
+        # pong / subscriptionResponse / unknown channels are ignored
+    clock.lap("decode")
+
+    for coin, ctx in ctxs.items():
+        patch_from_active_asset_ctx(state, coin, ctx)
+    clock.lap("patch_from_active_asset_ctx")
+    late = {c: mids.pop(c) for c in late_mids} if late_mids else None
+    if mids is not None:
+        patch_from_all_mids(state, mids)
+    clock.lap("patch_from_all_mids")
+    for coin, levels in books.items():
+        patch_from_l2(state, coin, levels)
+    clock.lap("patch_from_l2")
+    for coin, inner in bbos.items():
+        patch_from_bbo(state, coin, inner)
+    if late:
+        patch_from_all_mids(state, late)
+    clock.lap("patch_from_bbo")
+    for coin, coin_trades in trades.items():
+        state.add_trades(coin, coin_trades)
+        patch_trade_flow(state, coin)
+    clock.lap("patch_trade_flow")
+    for coin, interval, candle in candles:
+        state.upsert_candle(coin, interval, candle)
+    clock.lap("upsert_candle")
+
+    done = time.time()
+    stats.decode_errors += errors
+    stats.record_batch(
+        size=len(batch),
+        applied=len(batch) - coalesced - errors,
+        coalesced=coalesced,
+        apply_ms=(done - t0) * 1000,
+        latency_ms=(done - batch[0][0]) * 1000,
+    )
+    metrics.record_batch(batch[0][0], done - batch[0][0], clock, {
+        "decode":                      len(batch),
+        "patch_from_active_asset_ctx": len(ctxs),
+        "patch_from_all_mids":         int(mids is not None),
+        "patch_from_l2":               len(books),
+        "patch_from_bbo":              len(bbos),
+        "patch_trade_flow":            len(trades),
+        "upsert_candle":               len(candles),
+    })
 
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Periodic background tasks
 # ─────────────────────────────────────────────────────────────────────────────
 
-async def _periodic_candle_refresh(state: HyperliquidState, client: HyperliquidRestClient):
+def _tsmom_coins(state: HyperliquidState) -> list[str]:
+    """Every main-DEX perp, by volume — the TSMOM universe."""
+    return [c for c in state.top_coins_by_volume(len(state.assets)) if ":" not in c]
+
+
+def _candle_targets(state: HyperliquidState) -> dict[str, list[str]]:
+    """Coins whose candles the screener tracks, per interval."""
+    top40 = state.top_coins_by_volume(40)
+    return {"1h": top40, "5m": top40[:20], "1d": _tsmom_coins(state)}
+
+
+async def _candle_backfill_once(
+    state: HyperliquidState,
+    client: HyperliquidRestClient,
+    last_refresh: dict[str, float],
+    progress: Optional[Callable[[BulkReport], None]] = None,
+):
     """
-    Every 5 minutes: refresh 1h and 5m candles for the full top-40 universe.
-    This keeps volatility and momentum features fresh even for assets without
-    WS candle subscriptions.
+    One candle maintenance pass.  Per interval, REST fetches only:
+      - coins that entered the candle universe (full window);
+      - after a WS reconnect: every tracked series, bars since the gap;
+      - coins that just gained a trades subscription (rotation) and, every
+        _UNCOVERED_REFRESH_S, series of coins without one (bars since
+        their last refresh).
     """
+    now = time.time()
+    gap_since = state.candle_gap_since if state.ws_connected else None
+    targets = _candle_targets(state)
+    resync, state.candle_resync = state.candle_resync, set()
+    for interval, n_bars in _CANDLE_BARS.items():
+        seeded = [c for c, series in list(state.candles.items()) if series.get(interval)]
+        have = set(seeded)
+        fresh = [c for c in targets[interval] if c not in have]
+        due = now - last_refresh[interval] >= _UNCOVERED_REFRESH_S
+        if gap_since is not None:
+            coins, since = seeded + fresh, gap_since
+        elif due or resync:
+            stale = [c for c in seeded if c in resync or (due and c not in state.trade_coins)]
+            coins, since = stale + fresh, last_refresh[interval]
+        else:
+            coins, since = fresh, None
+        if coins:
+            bars = await _fetch_candles(state, client, coins, interval, n_bars, since, progress=progress)
+            for coin, coin_bars in bars.items():
+                if coin_bars:
+                    state.add_candles(coin, interval, coin_bars)
+        if gap_since is not None or due:
+            last_refresh[interval] = now
+    if gap_since is not None and state.candle_gap_since == gap_since:
+        state.candle_gap_since = None
+
+
+async def _candle_backfill(state: HyperliquidState, client: HyperliquidRestClient):
+    """Keep the REST side of live candles up to date (see _candle_backfill_once)."""
+    report = _bulk_logger("candles")
+    last_refresh = {interval: time.time() for interval in _CANDLE_BARS}
     while not _shutdown:
-        await asyncio.sleep(300)
+        await asyncio.sleep(_CANDLE_CHECK_S)
         if not state.assets:
             continue
         try:
-            top40 = state.top_coins_by_volume(40)
-            candles = await client.get_candles_multi(top40, "1h", n_bars=50)
-            for coin, bars in candles.items():
-                if bars:
-                    state.add_candles(coin, "1h", bars)
-
-            top20 = top40[:20]
-            candles5 = await client.get_candles_multi(top20, "5m", n_bars=50)
-            for coin, bars in candles5.items():
-                if bars:
-                    state.add_candles(coin, "5m", bars)
-
-            # Refresh 1d candles for TSMOM
-            tsmom_coins = [c for c in top40 if ":" not in c][:50]
-            candles1d = await client.get_candles_multi(tsmom_coins, "1d", n_bars=120)
-            for coin, bars in candles1d.items():
-                if bars:
-                    state.add_candles(coin, "1d", bars)
+            await _candle_backfill_once(state, client, last_refresh, progress=report)
         except Exception as e:
-            print(f"[HL][candle_refresh] Error: {e}")
+            print(f"[HL][candles] Backfill error: {e}")
+            continue
+        _mark_candles_ready(state)
+
+
+def _mark_candles_ready(state: HyperliquidState):
+    """After a backfill pass: capabilities left unready by a failed boot candle stage."""
+    pending = [cap for cap in (READY_CANDLE_FEATURES, READY_TSMOM) if not state.has(cap)]
+    if pending:
+        state.mark_ready(*pending)
+        print(f"[HL][candles] Ready after backfill: {', '.join(pending)}")
 
 
 async def _periodic_feature_recompute(state: HyperliquidState):
     """
-    Every 60 seconds: save OI snapshots, compute OI changes, recompute all features.
-    This ensures composite scores, percentile ranks, and flags stay current
-    even for assets that haven't received a live WS update recently.
+    Every 5 seconds: incremental feature pass over the coins whose candles,
+    ctx, mids, book, trades or OI changed since the previous pass.
+    Every 60 seconds: also save OI snapshots, compute OI changes and record
+    score snapshots for score_change.
     """
+    last_snapshot = time.time()
     while not _shutdown:
-        await asyncio.sleep(60)
+        await asyncio.sleep(_FEATURE_PASS_INTERVAL_S)
         if not state.is_ready:
             continue
         try:
-            _save_oi_snapshots(state)
-            _compute_oi_changes(state)
-            run_full_feature_pass(state)
-            _save_score_snapshots(state)
+            snapshot_due = time.time() - last_snapshot >= _SNAPSHOT_INTERVAL_S
+            if snapshot_due:
+                _save_oi_snapshots(state)
+                _compute_oi_changes(state)
+            await run_incremental_feature_pass(state)
+            if snapshot_due:
+                _save_score_snapshots(state)
+                last_snapshot = time.time()
         except Exception as e:
             print(f"[HL][feature_recompute] Error: {e}")
 
 
-def _save_oi_snapshots(state: HyperliquidState):
-    """Record current OI for all perp assets for change computation."""
-    now = time.time()
-    for asset in state.perp_assets():
-        if asset.open_interest_usd:
-            state.oi_history[asset.coin].append((now, asset.open_interest_usd))
-
-
-def _compute_oi_changes(state: HyperliquidState):
-    """Compute 5m, 15m, and 1h OI changes from stored history and patch assets."""
-    now = time.time()
-    for coin, history in state.oi_history.items():
-        asset = state.get_asset(coin)
-        if asset is None:
-            continue
-        snaps = list(history)
-        if not snaps:
-            continue
-        current_oi = asset.open_interest_usd
-        if not current_oi:
+async def _periodic_warm_snapshot(state: HyperliquidState):
+    """Every 5 minutes: write the warm-start snapshot (file I/O off the loop)."""
+    if not _WARM_START:
+        return
+    while not _shutdown:
+        await asyncio.sleep(_WARM_SNAPSHOT_INTERVAL_S)
+        if not state.is_ready or state.is_stale:
             continue
+        try:
+            snapshot = collect_warm_start(state)
+            await asyncio.to_thread(write_warm_start, snapshot)
+        except Exception as e:
+            print(f"[HL][warm] Snapshot save error: {e}")
 
-        def _find(lo, hi):
-            return next((s for s in reversed(snaps) if lo <= (now - s[0]) <= hi), None)
 
-        snap_5m  = _find(270,  450)    # ~5 min ago
-        snap_15m = _find(810, 1200)    # ~15 min ago
-        snap_1h  = _find(3300, 4500)   # ~1 hour ago
+async def _loop_lag_probe(state: HyperliquidState):
+    """Event-loop lag: how late a _LOOP_LAG_TICK_S sleep wakes up."""
+    lag = state.metrics.loop_lag
+    while not _shutdown:
+        t0 = time.perf_counter()
+        await asyncio.sleep(_LOOP_LAG_TICK_S)
+        lag.observe(max(0.0, time.perf_counter() - t0 - _LOOP_LAG_TICK_S))
 
-        def pct(new, old):
-            return round((new - old) / old, 6) if old and old != 0 else None
 
-        patch = {}
-        if (v := pct(current_oi, snap_5m[1]  if snap_5m  else None)) is not None: patch["oi_change_5m"]  = v
-        if (v := pct(current_oi, snap_15m[1] if snap_15m else None)) is not None: patch["oi_change_15m"] = v
-        if (v := pct(current_oi, snap_1h[1]  if snap_1h  else None)) is not None: patch["oi_change_1h"]  = v
+def _save_oi_snapshots(state: HyperliquidState):
+    """Record current OI for all perp assets for change computation."""
+    coins, slots = state.assets.perps()
+    oi = state.assets.col("open_interest_usd")[slots]
+    has = (oi != 0) & ~np.isnan(oi)
+    state.oi_history.record(time.time(), [c for c, ok in zip(coins, has.tolist()) if ok], oi[has])
 
-        if patch:
-            state.assets[coin] = asset.model_copy(update=patch)
+
+def _compute_oi_changes(state: HyperliquidState):
+    """
+    Compute the OI_CHANGE_WINDOWS changes from stored history and patch
+    assets — one as-of row lookup per horizon, vectorized over all perps.
+    """
+    now = time.time()
+    table = state.assets
+    coins, slots = table.perps()
+    if not coins:
+        return
+    current = table.col("open_interest_usd")[slots]
+    changed = np.zeros(len(coins), dtype=bool)
+    for field, (min_age, max_age) in OI_CHANGE_WINDOWS.items():
+        old = state.oi_history.asof(now - min_age, coins, oldest=now - max_age)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            pct = np.round((current - old) / old, 6)
+        ok = (current != 0) & (old != 0) & ~np.isnan(pct)
+        if ok.any():
+            table.col(field)[slots[ok]] = pct[ok]
+            changed |= ok
+    if changed.any():
+        table.touch(slots[changed])
+        state.mark_dirty_many((coins[i] for i in np.flatnonzero(changed)), DIRTY_OI)
 
 
 def _save_score_snapshots(state: HyperliquidState):
     """Record current composite score for all assets and compute score_change."""
-    now = time.time()
-    for coin, asset in state.assets.items():
-        score = asset.composite_signal_score
-        if score is None:
-            continue
-        hist = state.score_history[coin]
-        # Compute score_change vs prior snapshot
-        score_change = None
-        if hist:
-            last_ts, last_score = hist[-1]
-            if now - last_ts >= 50:  # at least 50s between snapshots
-                score_change = round(score - last_score, 2)
-                hist.append((now, score))
-        else:
-            hist.append((now, score))
-            score_change = None
-
-        if score_change is not None:
-            state.assets[coin] = asset.model_copy(update={"score_change": score_change})
+    table = state.assets
+    coins, slots = table.coins_and_slots()
+    scores = table.col("composite_signal_score")[slots]
+    has = ~np.isnan(scores)
+    if not has.any():
+        return
+    coins = [c for c, ok in zip(coins, has.tolist()) if ok]
+    slots, scores = slots[has], scores[has]
+    prev = state.score_history.latest(coins)
+    # Skipped (no score_change update) when the last snapshot is under 50s old
+    if not state.score_history.record(time.time(), coins, scores):
+        return
+    change = np.round(scores - prev, 2)
+    ok = ~np.isnan(change)
+    if ok.any():
+        table.col("score_change")[slots[ok]] = change[ok]
+        table.touch(slots[ok])
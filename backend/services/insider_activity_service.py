@@ -17,7 +17,7 @@ from decimal import Decimal
 from typing import Any, Optional
 from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
 
-import httpx
+from data import http_pool
 import psycopg2
 from psycopg2 import pool as _pg_pool
 from psycopg2.extras import Json, execute_batch
@@ -686,7 +686,7 @@ async def _get_price_context_batch(tickers: list[str]) -> dict[str, dict]:
     if _TRADIER_KEY and remaining:
         try:
             symbols_str = ",".join(remaining[:50])
-            async with httpx.AsyncClient(timeout=15) as client:
+            async with http_pool.session(timeout=15) as client:
                 resp = await client.get(
                     "https://sandbox.tradier.com/v1/markets/quotes",
                     params={"symbols": symbols_str},
@@ -727,7 +727,7 @@ async def _get_price_context_batch(tickers: list[str]) -> dict[str, dict]:
     if _FINNHUB_KEY and remaining:
         for sym in remaining[:]:
             try:
-                async with httpx.AsyncClient(timeout=10) as client:
+                async with http_pool.session(timeout=10) as client:
                     q_resp = await client.get(
                         "https://finnhub.io/api/v1/quote",
                         params={"symbol": sym, "token": _FINNHUB_KEY},
@@ -941,7 +941,7 @@ async def _check_earnings_nearby(ticker: str, tx_date: date) -> bool:
     try:
         from_dt = (tx_date - timedelta(days=14)).isoformat()
         to_dt = (tx_date + timedelta(days=14)).isoformat()
-        async with httpx.AsyncClient(timeout=8) as client:
+        async with http_pool.session(timeout=8) as client:
             resp = await client.get(
                 "https://finnhub.io/api/v1/calendar/earnings",
                 params={"symbol": ticker, "from": from_dt, "to": to_dt, "token": _FINNHUB_KEY},
@@ -1628,7 +1628,7 @@ async def run_perplexity_analysis() -> dict:
                 _PPLX_MODEL, len(top_buys), len(top_sells))
 
     try:
-        async with httpx.AsyncClient(timeout=90) as client:
+        async with http_pool.session(timeout=90) as client:
             resp = await client.post(
                 f"{_PPLX_BASE_URL}/chat/completions",
                 headers={
@@ -28,7 +28,7 @@ import math
 from datetime import datetime, timezone
 from typing import Optional
 
-import httpx
+from data import http_pool
 
 from data.cache import cache
 
@@ -501,7 +501,7 @@ class PolymarketIntelligence:
         if tag:
             params["tag_slug"] = tag
         try:
-            async with httpx.AsyncClient(timeout=15.0, follow_redirects=True) as client:
+            async with http_pool.session(timeout=15.0, follow_redirects=True) as client:
                 resp = await client.get(f"{GAMMA_BASE}/markets", params=params, headers=_HEADERS)
                 resp.raise_for_status()
                 data = resp.json()
@@ -512,7 +512,7 @@ class PolymarketIntelligence:
 
     async def _fetch_market_by_condition(self, condition_id: str) -> Optional[dict]:
         try:
-            async with httpx.AsyncClient(timeout=12.0, follow_redirects=True) as client:
+            async with http_pool.session(timeout=12.0, follow_redirects=True) as client:
                 resp = await client.get(
                     f"{GAMMA_BASE}/markets",
                     params={"condition_id": condition_id},
@@ -534,7 +534,7 @@ class PolymarketIntelligence:
         Returns None silently if no book exists (many markets don't have one).
         """
         try:
-            async with httpx.AsyncClient(timeout=8.0) as client:
+            async with http_pool.session(timeout=8.0) as client:
                 resp = await client.get(
                     f"{CLOB_BASE}/book",
                     params={"market": condition_id},
@@ -551,7 +551,7 @@ class PolymarketIntelligence:
     async def _fetch_events_for_categories(self, limit: int = 200) -> list[dict]:
         """Fetch events (which carry proper tag arrays) for category breakdown."""
         try:
-            async with httpx.AsyncClient(timeout=15.0, follow_redirects=True) as client:
+            async with http_pool.session(timeout=15.0, follow_redirects=True) as client:
                 resp = await client.get(
                     f"{GAMMA_BASE}/events",
                     params={
@@ -29,7 +29,7 @@ import time
 from datetime import datetime, timezone
 from typing import Optional
 
-import httpx
+from data import http_pool
 
 from data.cache import cache
 
@@ -74,7 +74,7 @@ async def _call_gemini(
         body["tools"] = [{"google_search": {}}]
 
     try:
-        async with httpx.AsyncClient(timeout=_AGENT_TIMEOUT) as client:
+        async with http_pool.session(timeout=_AGENT_TIMEOUT) as client:
             resp = await client.post(
                 _gemini_url(),
                 headers={"Content-Type": "application/json"},
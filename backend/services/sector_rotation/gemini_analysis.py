@@ -14,6 +14,7 @@ from pathlib import Path
 from typing import Optional
 
 import httpx
+from data import http_pool
 
 from services.sector_rotation.schemas import (
     AIAnalysis,
@@ -246,7 +247,7 @@ async def get_or_generate_analysis(
         }
 
         try:
-            async with httpx.AsyncClient(timeout=90.0) as client:
+            async with http_pool.session(timeout=90.0) as client:
                 resp = await client.post(
                     f"https://generativelanguage.googleapis.com/v1beta/models/gemini-3-flash-preview:generateContent?key={key}",
                     headers={"Content-Type": "application/json"},
@@ -11,7 +11,7 @@ from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional
 
-import httpx
+from data import http_pool
 
 from data.cache import cache, FINNHUB_TTL
 from services.sector_rotation.schemas import SECTOR_ETF_MAP
@@ -29,7 +29,7 @@ def _finnhub_key() -> str:
     return os.getenv("FINNHUB_API_KEY", "")
 
 
-async def _finnhub_quote(ticker: str, session: httpx.AsyncClient) -> tuple[str, dict]:
+async def _finnhub_quote(ticker: str, session: http_pool.PooledSession) -> tuple[str, dict]:
     """Fetch real-time quote from Finnhub for a single ticker."""
     cache_key = f"sr_fh_q:{ticker}"
     hit = cache.get(cache_key)
@@ -66,7 +66,7 @@ async def _finnhub_quote(ticker: str, session: httpx.AsyncClient) -> tuple[str,
 
 async def fetch_etf_quotes() -> dict[str, dict]:
     """Fetch real-time quotes for all sector + benchmark tickers via Finnhub."""
-    async with httpx.AsyncClient() as session:
+    async with http_pool.session() as session:
         results = await asyncio.gather(
             *[_finnhub_quote(t, session) for t in ALL_TICKERS],
             return_exceptions=True,
@@ -18,7 +18,7 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional
 from xml.etree import ElementTree as ET
 
-import httpx
+from data import http_pool
 
 # ── Persistence (JSON file store) ────────────────────────────────────────────
 
@@ -227,7 +227,7 @@ async def _fetch_news_perplexity(ticker: str) -> List[Dict[str, Any]]:
     if not api_key:
         return []
     try:
-        async with httpx.AsyncClient(timeout=20.0) as client:
+        async with http_pool.session(timeout=20.0) as client:
             resp = await client.post(
                 "https://api.perplexity.ai/chat/completions",
                 headers={
@@ -276,7 +276,7 @@ async def _fetch_news_perplexity(ticker: str) -> List[Dict[str, Any]]:
         return []
 
 
-async def fetch_news_for_ticker(ticker: str, client: httpx.AsyncClient) -> List[Dict[str, Any]]:
+async def fetch_news_for_ticker(ticker: str, client: http_pool.PooledSession) -> List[Dict[str, Any]]:
     """Fetch news for a single ticker. Tries RSS feeds first, falls back to Perplexity."""
     # Check cache
     cached = _news_cache.get(ticker)
@@ -320,7 +320,7 @@ async def fetch_news_for_ticker(ticker: str, client: httpx.AsyncClient) -> List[
 
 async def fetch_news_for_tickers(tickers: List[str]) -> Dict[str, List[Dict[str, Any]]]:
     """Fetch news for all tickers concurrently."""
-    async with httpx.AsyncClient(
+    async with http_pool.session(
         follow_redirects=True,
         headers={"User-Agent": "Mozilla/5.0 (compatible; CaelynAI/1.0)"},
     ) as client:
@@ -559,7 +559,7 @@ async def get_stock_detail(ticker: str, agent: Any, watchlist_id: Optional[str]
         return {"error": f"Ticker {ticker} not found in saved watchlist."}
 
     # Fetch news for this ticker
-    async with httpx.AsyncClient(
+    async with http_pool.session(
         follow_redirects=True,
         headers={"User-Agent": "Mozilla/5.0 (compatible; CaelynAI/1.0)"},
     ) as client:
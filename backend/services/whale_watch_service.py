@@ -21,7 +21,7 @@ from datetime import date, datetime, timedelta
 from typing import Any, Optional
 from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
 
-import httpx
+from data import http_pool
 import psycopg2
 from psycopg2 import pool as _pg_pool
 from fastapi import APIRouter, BackgroundTasks, HTTPException, Query, Request, Depends
@@ -275,7 +275,7 @@ async def lookup_cik_on_edgar(name: str) -> str | None:
             f'https://efts.sec.gov/LATEST/search-index?q="{name}"'
             "&dateRange=custom&startdt=2020-01-01&forms=13F-HR"
         )
-        async with httpx.AsyncClient(timeout=15) as client:
+        async with http_pool.session(timeout=15) as client:
             resp = await client.get(url, headers=_SEC_HEADERS)
             resp.raise_for_status()
             data = resp.json()
@@ -316,7 +316,7 @@ async def discover_top_whales_via_perplexity() -> list[dict]:
 
     logger.info("[WHALE_DISCOVER] Querying Perplexity for top-performing funds…")
     try:
-        async with httpx.AsyncClient(timeout=60) as client:
+        async with http_pool.session(timeout=60) as client:
             resp = await client.post(
                 "https://api.perplexity.ai/chat/completions",
                 headers={
@@ -653,7 +653,7 @@ async def discover_famous_investors_via_perplexity() -> list[dict]:
 
     logger.info("[FAMOUS] Querying Perplexity for famous investors…")
     try:
-        async with httpx.AsyncClient(timeout=60) as client:
+        async with http_pool.session(timeout=60) as client:
             resp = await client.post(
                 "https://api.perplexity.ai/chat/completions",
                 headers={
@@ -853,7 +853,7 @@ async def _load_edgar_tickers_index() -> dict[str, str]:
 
     logger.info("[WHALE_EDGAR] Downloading company tickers index from SEC…")
     try:
-        async with httpx.AsyncClient(timeout=30) as client:
+        async with http_pool.session(timeout=30) as client:
             resp = await client.get(_EDGAR_TICKERS_URL, headers=_SEC_HEADERS)
             resp.raise_for_status()
             data = resp.json()
@@ -907,7 +907,7 @@ async def _load_edgar_tickers_index() -> dict[str, str]:
     return index
 
 
-async def _edgar_name_to_ticker(company_name: str, client: httpx.AsyncClient) -> str:
+async def _edgar_name_to_ticker(company_name: str, client: http_pool.PooledSession) -> str:
     """
     EDGAR full-text search fallback: search the EDGAR search API for the company
     name and extract the ticker from the first 10-K hit.
@@ -999,7 +999,7 @@ async def _cusips_to_tickers(
         async def _fts_one(cusip: str) -> tuple[str, str]:
             async with sem:
                 company_name = names.get(cusip, "")
-                async with httpx.AsyncClient(timeout=12) as client:
+                async with http_pool.session(timeout=12) as client:
                     ticker = await _edgar_name_to_ticker(company_name, client)
                 await asyncio.sleep(0.1)
             return cusip, ticker
@@ -1034,7 +1034,7 @@ async def fetch_13f_filings(cik: str, whale_name: str) -> list[dict]:
 
     # Step 1: Get submissions index from EDGAR
     try:
-        async with httpx.AsyncClient(timeout=20, follow_redirects=True) as client:
+        async with http_pool.session(timeout=20, follow_redirects=True) as client:
             resp = await client.get(
                 f"{_SEC_BASE}/submissions/CIK{cik_padded}.json",
                 headers=_SEC_HEADERS,
@@ -1091,7 +1091,7 @@ async def fetch_13f_filings(cik: str, whale_name: str) -> list[dict]:
     index_url = f"{_EDGAR_ARCHIVE}/{cik_int}/{accession_nodash}/"
 
     try:
-        async with httpx.AsyncClient(timeout=20, follow_redirects=True) as client:
+        async with http_pool.session(timeout=20, follow_redirects=True) as client:
             resp = await client.get(index_url, headers=_SEC_HEADERS)
             resp.raise_for_status()
             index_html = resp.text
@@ -1115,7 +1115,7 @@ async def fetch_13f_filings(cik: str, whale_name: str) -> list[dict]:
 
     # Step 4: Download and parse the infotable XML
     try:
-        async with httpx.AsyncClient(timeout=30, follow_redirects=True) as client:
+        async with http_pool.session(timeout=30, follow_redirects=True) as client:
             resp = await client.get(infotable_url, headers=_SEC_HEADERS)
             resp.raise_for_status()
             xml_content = resp.text
@@ -1427,7 +1427,7 @@ async def _get_current_prices(tickers: list[str]) -> dict[str, float]:
     if _TRADIER_KEY and remaining:
         try:
             symbols_str = ",".join(remaining[:50])
-            async with httpx.AsyncClient(timeout=15) as client:
+            async with http_pool.session(timeout=15) as client:
                 resp = await client.get(
                     "https://sandbox.tradier.com/v1/markets/quotes",
                     params={"symbols": symbols_str},
@@ -1787,7 +1787,7 @@ async def generate_whale_theme(whale_name: str) -> str | None:
     )
 
     try:
-        async with httpx.AsyncClient(timeout=30) as client:
+        async with http_pool.session(timeout=30) as client:
             resp = await client.post(
                 "https://api.anthropic.com/v1/messages",
                 headers={
@@ -0,0 +1,102 @@
+import asyncio
+import os
+import sys
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data import http_pool
+from data.cache import cache
+from data.finnhub_provider import FinnhubProvider
+from data.polygon_options_provider import PolygonOptionsProvider
+from data.polygon_provider import PolygonProvider
+from data.twelvedata_provider import TwelveDataProvider
+
+
+def _serve(monkeypatch, handler):
+    """Route every pooled host client through a MockTransport(handler)."""
+    seen: list[httpx.Request] = []
+
+    def record(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        return handler(request)
+
+    monkeypatch.setattr(http_pool, "_new_client",
+                        lambda host: httpx.AsyncClient(transport=httpx.MockTransport(record)))
+    monkeypatch.setattr(http_pool, "_clients", {})
+    monkeypatch.setattr(http_pool, "_ENABLED", True)
+    cache.clear()
+    return seen
+
+
+def test_polygon_rate_limit_holds_under_concurrent_calls(monkeypatch):
+    seen = _serve(monkeypatch, lambda r: httpx.Response(200, json={"results": [{"c": 1.0}]}))
+    poly = PolygonProvider("key")
+
+    async def go():
+        return await asyncio.gather(*[poly.get_daily_bars(f"T{i}") for i in range(6)])
+
+    results = asyncio.run(go())
+    assert len(seen) == 4 == len(poly._call_times)          # 4/min budget
+    assert sum(1 for r in results if r == [{"c": 1.0}]) == 4
+    assert seen[0].url.params["apiKey"] == "key"
+
+
+def test_polygon_options_waits_for_a_rate_slot(monkeypatch):
+    _serve(monkeypatch, lambda r: httpx.Response(200, json={"results": [{"t": 1}]}))
+    opts = PolygonOptionsProvider("key", max_per_minute=1)
+    slept: list[float] = []
+    real_sleep = asyncio.sleep
+
+    async def fast_sleep(s):
+        slept.append(s)
+        opts._call_times.clear()        # the window rolls over
+        await real_sleep(0)
+
+    monkeypatch.setattr("data.polygon_options_provider.asyncio.sleep", fast_sleep)
+
+    async def go():
+        return await asyncio.gather(opts.get_daily_bars("AAPL250321C00200000"),
+                                    opts.get_daily_bars("O:AAPL250321P00200000"))
+
+    assert asyncio.run(go()) == [[{"t": 1}], [{"t": 1}]]
+    assert slept == [1]
+
+
+def test_finnhub_keeps_return_shapes(monkeypatch):
+    def handler(request):
+        path = request.url.path
+        if path.endswith("/quote"):
+            return httpx.Response(200, json={"c": 10.0, "d": 1.0, "dp": 11.1, "h": 11, "l": 9, "o": 9.5, "pc": 9.0})
+        if path.endswith("/stock/social-sentiment"):
+            return httpx.Response(403, text="You don't have access to this resource.")
+        if path.endswith("/calendar/earnings"):
+            return httpx.Response(200, json={"earningsCalendar": [{"symbol": "AAPL", "date": "2026-10-20", "hour": "amc"}]})
+        return httpx.Response(404)
+
+    seen = _serve(monkeypatch, handler)
+    fh = FinnhubProvider("tok")
+
+    async def go():
+        return await asyncio.gather(fh.get_quote("aapl"), fh.get_social_sentiment("aapl"),
+                                    fh.get_upcoming_earnings(), fh.get_company_peers("aapl"))
+
+    quote, social, upcoming, peers = asyncio.run(go())
+    assert quote == {"price": 10.0, "change": 1.0, "change_pct": 11.1, "high": 11, "low": 9,
+                     "open": 9.5, "prev_close": 9.0}
+    assert social["note"] == "Not available on current plan"
+    assert upcoming[0]["ticker"] == "AAPL" and upcoming[0]["hour"] == "amc"
+    assert peers == []
+    assert all(r.headers["X-Finnhub-Token"] == "tok" for r in seen)
+    assert "symbol" not in seen[2].url.params                 # market-wide calendar
+
+
+def test_twelvedata_bars_oldest_first(monkeypatch):
+    _serve(monkeypatch, lambda r: httpx.Response(200, json={"values": [
+        {"datetime": "2026-10-02", "open": "2", "high": "3", "low": "1", "close": "2.5", "volume": "100"},
+        {"datetime": "2026-10-01", "open": "1", "high": "2", "low": "0.5", "close": "1.5", "volume": "50"},
+    ]}))
+    td = TwelveDataProvider("key")
+    bars = asyncio.run(td.get_daily_bars("spy", days=2))
+    assert [b["c"] for b in bars] == [1.5, 2.5] and bars[0]["v"] == 50
@@ -84,8 +84,8 @@ def mock_service():
     svc.finviz.get_oversold_stocks = mock_get_oversold
     svc.finviz.get_most_volatile = mock_get_most_volatile
 
-    svc.finnhub.get_stock_candles = MagicMock(return_value=_make_bars(60))
-    svc.polygon.get_daily_bars = MagicMock(return_value=_make_bars(60))
+    svc.finnhub.get_stock_candles = AsyncMock(return_value=_make_bars(60))
+    svc.polygon.get_daily_bars = AsyncMock(return_value=_make_bars(60))
 
     async def mock_get_overview(ticker):
         return {"name": f"{ticker} Corp", "exchange": "NASDAQ", "market_cap": "150B", "pe_ratio": 25.0}
@@ -178,8 +178,8 @@ async def test_best_trades_all_candles_fail_still_structured(mock_service):
     def fail_candles(ticker, days=120):
         raise Exception("FinnhubAPIException(status_code: 403): You don't have access")
 
-    mock_service.finnhub.get_stock_candles = MagicMock(side_effect=fail_candles)
-    mock_service.polygon.get_daily_bars = MagicMock(return_value=[])
+    mock_service.finnhub.get_stock_candles = AsyncMock(side_effect=fail_candles)
+    mock_service.polygon.get_daily_bars = AsyncMock(return_value=[])
 
     result = await mock_service.get_best_trades_scan()
 
@@ -198,8 +198,8 @@ async def test_best_trades_circuit_breaker_triggers(mock_service):
         def fail_403(ticker, days=120):
             raise Exception("FinnhubAPIException(status_code: 403)")
 
-        mock_service.finnhub.get_stock_candles = MagicMock(side_effect=fail_403)
-        mock_service.polygon.get_daily_bars = MagicMock(return_value=_make_bars(60))
+        mock_service.finnhub.get_stock_candles = AsyncMock(side_effect=fail_403)
+        mock_service.polygon.get_daily_bars = AsyncMock(return_value=_make_bars(60))
 
         result = await mock_service.get_best_trades_scan()
 
@@ -215,7 +215,7 @@ async def test_best_trades_volume_pct_uses_avg(mock_service):
     avg_vol = sum(b["v"] for b in bars[-30:]) / 30
     bars[-1]["v"] = int(avg_vol * 3)
 
-    mock_service.finnhub.get_stock_candles = MagicMock(return_value=bars)
+    mock_service.finnhub.get_stock_candles = AsyncMock(return_value=bars)
     result = await mock_service.get_best_trades_scan()
 
     if result["top_trades"]:
@@ -231,8 +231,8 @@ async def test_best_trades_empty_returns_reason(mock_service):
     def fail_candles(ticker, days=120):
         raise Exception("FinnhubAPIException(status_code: 403)")
 
-    mock_service.finnhub.get_stock_candles = MagicMock(side_effect=fail_candles)
-    mock_service.polygon.get_daily_bars = MagicMock(return_value=[])
+    mock_service.finnhub.get_stock_candles = AsyncMock(side_effect=fail_candles)
+    mock_service.polygon.get_daily_bars = AsyncMock(return_value=[])
 
     result = await mock_service.get_best_trades_scan()
 
@@ -256,8 +256,8 @@ async def test_best_trades_budget_limits_polygon_calls(mock_service):
         call_count["n"] += 1
         return _make_bars(60)
 
-    mock_service.finnhub.get_stock_candles = MagicMock(side_effect=fail_candles)
-    mock_service.polygon.get_daily_bars = MagicMock(side_effect=counting_bars)
+    mock_service.finnhub.get_stock_candles = AsyncMock(side_effect=fail_candles)
+    mock_service.polygon.get_daily_bars = AsyncMock(side_effect=counting_bars)
 
     result = await mock_service.get_best_trades_scan()
 
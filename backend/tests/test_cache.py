@@ -0,0 +1,167 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.cache import TTLCache
+
+
+def test_concurrent_misses_share_one_computation():
+    c = TTLCache()
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return ["bar"]
+
+    async def go():
+        results = await asyncio.gather(*[c.get_or_compute("k", 60, compute) for _ in range(10)])
+        again = await c.get_or_compute("k", 60, compute)
+        return results, again
+
+    results, again = asyncio.run(go())
+    assert calls == 1 and results == [["bar"]] * 10 and again == ["bar"]
+    assert c._inflight == {}
+
+
+def test_errors_reach_every_waiter_and_are_not_cached():
+    c = TTLCache()
+    calls = 0
+
+    async def boom():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        raise RuntimeError("403")
+
+    async def go():
+        results = await asyncio.gather(*[c.get_or_compute("k", 60, boom) for _ in range(3)],
+                                       return_exceptions=True)
+        empty = await c.get_or_compute("e", 60, lambda: asyncio.sleep(0, result=[]), cache_if=bool)
+        return results, empty
+
+    results, empty = asyncio.run(go())
+    assert calls == 1 and all(isinstance(r, RuntimeError) for r in results)
+    assert empty == [] and c.get("k") is None and c.get("e") is None
+    with pytest.raises(RuntimeError):
+        asyncio.run(c.get_or_compute("k", 60, boom))
+    assert calls == 2
+
+
+def test_cancelled_caller_does_not_cancel_the_fill():
+    c = TTLCache()
+
+    async def slow():
+        await asyncio.sleep(0.05)
+        return 42
+
+    async def go():
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(c.get_or_compute("k", 60, slow), timeout=0.01)
+        return await c.get_or_compute("k", 60, slow)
+
+    assert asyncio.run(go()) == 42 and c.get("k") == 42
+
+
+def test_sync_fill_is_shared_across_threads():
+    c = TTLCache()
+    calls = 0
+    results = []
+
+    def compute():
+        nonlocal calls
+        calls += 1
+        time.sleep(0.05)
+        return "series"
+
+    threads = [threading.Thread(target=lambda: results.append(c.get_or_compute_sync("k", 60, compute)))
+               for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert calls == 1 and results == ["series"] * 5 and c._inflight_sync == {}
+
+
+def test_namespace_lru_bounds_and_stats(monkeypatch):
+    import data.cache as cache_mod
+    monkeypatch.setitem(cache_mod._NAMESPACES, "t", {"max_entries": 2, "max_bytes": 10_000})
+    c = TTLCache()
+    c.set("t:a", 1, 60)
+    c.set("t:b", 2, 60)
+    assert c.get("t:a") == 1            # a is now most recently used
+    c.set("t:c", 3, 60)
+    assert c.get("t:b") is None and c.get("t:a") == 1 and c.get("t:c") == 3
+    c.set("t:big", "x" * 20_000, 60)    # over the byte budget on its own
+    assert c.get("t:big") and c.size == 1
+    c.set("other", 1, 60)
+
+    stats = c.stats()["namespaces"]
+    assert stats["t"]["evictions"] == 3 and stats["t"]["hits"] == 4 and stats["t"]["misses"] == 1
+    assert stats["t"]["bytes"] > 20_000 and stats["other"]["entries"] == 1
+
+
+def test_stale_value_is_served_while_one_refresh_runs(monkeypatch):
+    import data.cache as cache_mod
+    monkeypatch.setitem(cache_mod._NAMESPACES, "swr", {"stale": 60})
+    c = TTLCache()
+    now = [1000.0]
+    monkeypatch.setattr(cache_mod.time, "time", lambda: now[0])
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0)
+        return calls
+
+    async def go():
+        first = await c.get_or_compute("swr:k", 10, compute)
+        now[0] += 30                                 # expired, inside the stale window
+        assert c.get("swr:k") is None                # plain get never sees stale
+        stale = await asyncio.gather(*[c.get_or_compute("swr:k", 10, compute) for _ in range(3)])
+        await asyncio.sleep(0.01)                    # background refresh lands
+        return first, stale, await c.get_or_compute("swr:k", 10, compute)
+
+    first, stale, fresh = asyncio.run(go())
+    assert (first, stale, fresh, calls) == (1, [1, 1, 1], 2, 2)
+    assert c.stats()["namespaces"]["swr"]["stale_hits"] == 3
+
+
+def test_sqlite_l2_is_shared_across_instances(tmp_path):
+    from data.cache_l2 import SQLiteStore
+    path = str(tmp_path / "l2.sqlite3")
+    a = TTLCache(l2=SQLiteStore(path))
+    a.set("edgar:cik:AAPL", "0000320193", 604800)
+    a.set("sector:AAPL", {"sector": "Technology", "peers": list(range(500))}, 86400)
+    a.set("finnhub:quote:AAPL", {"price": 1.0}, 86400)  # prefix not persisted
+    a.set("finnhub:profile:MSFT", {"ipo": (1986, 3)}, 86400)  # tuple: not JSON-native
+    a.set("candles:AAPL:1d:120", [1, 2, 3], 86400)
+    a.flush_l2()
+    assert a.stats()["l2"]["written"] == 2 and a.stats()["l2"]["errors"] == 1
+
+    b = TTLCache(l2=SQLiteStore(path))                  # another worker / a restart
+    assert b.get("edgar:cik:AAPL") is None              # plain get is L1-only
+    assert asyncio.run(b.get_async("edgar:cik:AAPL")) == "0000320193"
+    assert b.get("edgar:cik:AAPL") == "0000320193"      # now in L1
+    assert asyncio.run(b.get_async("finnhub:quote:AAPL")) is None
+
+    computed = []
+
+    async def compute():
+        computed.append(1)
+        return {}
+
+    sector = asyncio.run(b.get_or_compute("sector:AAPL", 86400, compute))
+    assert sector["peers"][-1] == 499 and not computed
+    assert b.stats()["namespaces"]["edgar"]["l2_hits"] == 1
+
+    c = TTLCache(l2=SQLiteStore(path))
+    assert c.warm_l2() == 2 and c.size == 2
@@ -0,0 +1,101 @@
+import asyncio
+import os
+import sys
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data import http_pool
+
+
+def _mock_pool(monkeypatch):
+    """Host clients backed by a MockTransport that echoes what it received."""
+    seen: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        return httpx.Response(200, json={"host": request.url.host})
+
+    def new_client(host):
+        return httpx.AsyncClient(timeout=http_pool._host_config(host)["timeout"],
+                                 transport=httpx.MockTransport(handler))
+
+    monkeypatch.setattr(http_pool, "_new_client", new_client)
+    monkeypatch.setattr(http_pool, "_clients", {})
+    monkeypatch.setattr(http_pool, "_ENABLED", True)
+    return seen
+
+
+def test_sessions_share_one_client_per_host(monkeypatch):
+    seen = _mock_pool(monkeypatch)
+
+    async def go():
+        async with http_pool.session(timeout=3, headers={"User-Agent": "ua"}) as s:
+            r1 = await s.get("https://finviz.com/a", headers={"X-Extra": "1"})
+            await s.get("https://api.polygon.io/b")
+        async with http_pool.session() as s:
+            r2 = await s.get("https://finviz.com/c")
+        finviz = http_pool._clients["finviz.com"][1]
+        assert not finviz.is_closed                  # leaving a session closes nothing
+        await http_pool.close_all()
+        return r1, r2, finviz
+
+    r1, r2, finviz = asyncio.run(go())
+    assert r1.json() == {"host": "finviz.com"} and r2.status_code == 200
+    assert finviz.is_closed and http_pool._clients == {}
+    assert seen[0].headers["User-Agent"] == "ua" and seen[0].headers["X-Extra"] == "1"
+    assert seen[0].extensions["timeout"]["read"] == 3
+    assert seen[2].extensions["timeout"]["read"] == 10.0     # finviz host default
+    assert seen[2].headers.get("User-Agent") != "ua"       # headers are per session
+
+
+def test_client_is_not_reused_across_event_loops(monkeypatch):
+    _mock_pool(monkeypatch)
+
+    async def client():
+        return http_pool.get_client("https://finnhub.io/api/v1/quote")
+
+    first = asyncio.run(client())
+    second = asyncio.run(client())
+    assert first is not second
+
+
+def test_disabled_pool_uses_a_client_per_session(monkeypatch):
+    _mock_pool(monkeypatch)
+    monkeypatch.setattr(http_pool, "_ENABLED", False)
+
+    async def go():
+        s = http_pool.session()
+        async with s:
+            own = s._client("https://finviz.com/a")
+            assert s._client("https://api.polygon.io/b") is own
+        return own
+
+    assert asyncio.run(go()).is_closed and http_pool._clients == {}
+
+
+def test_host_clients_never_keep_cookies(monkeypatch):
+    seen: list[httpx.Request] = []
+
+    def handler(request):
+        seen.append(request)
+        return httpx.Response(200, headers={"Set-Cookie": "session=abc; Path=/"})
+
+    real_client = httpx.AsyncClient
+
+    def transport_client(**kwargs):
+        return real_client(transport=httpx.MockTransport(handler), **kwargs)
+
+    monkeypatch.setattr(http_pool.httpx, "AsyncClient", transport_client)
+    monkeypatch.setattr(http_pool, "_clients", {})
+    monkeypatch.setattr(http_pool, "_ENABLED", True)
+
+    async def go():
+        async with http_pool.session() as s:
+            await s.get("https://finviz.com/a")
+            await s.get("https://finviz.com/b")
+        await http_pool.close_all()
+
+    asyncio.run(go())
+    assert "cookie" not in seen[1].headers
@@ -0,0 +1,77 @@
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.hyperliquid.state import READY_CANDLE_FEATURES, READY_PRICES, READY_TSMOM, HyperliquidState
+from services.hyperliquid.websocket_manager import _boot_sequence, _mark_candles_ready
+
+_COINS = ["BTC", "ETH", "SOL"]
+
+
+class _SlowClient:
+    """Each universe call takes 0.1s, candles 0.2s."""
+
+    async def get_meta_and_asset_ctxs(self):
+        await asyncio.sleep(0.1)
+        uni = {"universe": [{"name": c, "szDecimals": 2, "maxLeverage": 20} for c in _COINS]}
+        ctxs = [{"markPx": "10", "oraclePx": "10", "midPx": "10", "prevDayPx": "9", "funding": "0.0001",
+                 "openInterest": "1000", "dayNtlVlm": str(1e7 * (i + 1)), "premium": "0",
+                 "impactPxs": ["9.9", "10.1"], "dayBaseVlm": "100"} for i, _ in enumerate(_COINS)]
+        return [uni, ctxs]
+
+    async def get_spot_meta_and_asset_ctxs(self):
+        await asyncio.sleep(0.1)
+        return []
+
+    async def get_all_mids(self):
+        await asyncio.sleep(0.1)
+        return {"BTC": "10.5"}
+
+    async def get_candles_multi(self, coins, interval, n_bars=50, progress=None):
+        await asyncio.sleep(0.2)
+        return {c: [{"t": 0, "T": 59_999, "o": "1", "h": "1", "l": "1", "c": "1", "v": "1", "n": 1}] for c in coins}
+
+    async def get_l2_books_multi(self, coins, progress=None):
+        return {}
+
+
+def _end(stage):
+    return stage["start_s"] + stage["duration_s"]
+
+
+def test_boot_stages_overlap_and_mark_readiness_early():
+    state = HyperliquidState()
+    asyncio.run(_boot_sequence(state, _SlowClient()))
+    stages = state.boot_stages
+
+    assert all(s["ok"] for s in stages.values()) and len(stages) == 11
+    # Spot + mids fetched alongside perp: prices comes before any candle fetch ends
+    assert stages["spot"]["start_s"] >= _end(stages["perp"])
+    assert stages["prices"]["start_s"] >= _end(stages["mids"])
+    assert stages["prices"]["start_s"] <= min(_end(stages[f"candles_{i}"]) for i in ("1h", "5m", "1d"))
+    # Candles wait for the perp ranking (cold boot), not for spot / mids
+    assert stages["candles_1h"]["start_s"] >= _end(stages["perp"])
+    assert stages["candle_features"]["start_s"] >= max(_end(stages["candles_1h"]), _end(stages["candles_5m"]))
+
+    assert state.is_ready and state.readiness() == {READY_PRICES: True, READY_CANDLE_FEATURES: True, READY_TSMOM: True}
+    assert state.ready_at[READY_PRICES] < state.ready_at[READY_CANDLE_FEATURES]
+    assert state.get_asset("BTC").mid_px == 10.5 and len(state.candles["ETH"]["1h"]) == 1
+
+
+class _NoDailyCandlesClient(_SlowClient):
+    async def get_candles_multi(self, coins, interval, n_bars=50, progress=None):
+        if interval == "1d":
+            raise RuntimeError("429")
+        return await super().get_candles_multi(coins, interval, n_bars, progress)
+
+
+def test_failed_candle_stage_leaves_its_capability_unready():
+    state = HyperliquidState()
+    asyncio.run(_boot_sequence(state, _NoDailyCandlesClient()))
+
+    assert not state.boot_stages["candles_1d"]["ok"] and state.boot_stages["tsmom"]["ok"]
+    assert state.readiness() == {READY_PRICES: True, READY_CANDLE_FEATURES: True, READY_TSMOM: False}
+    _mark_candles_ready(state)          # the next successful backfill pass
+    assert state.has(READY_TSMOM)
@@ -0,0 +1,128 @@
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pytest
+
+from services.hyperliquid import websocket_manager as wsm
+from services.hyperliquid.candles import CLOSE, HIGH, LOW, OPEN, T, TRADES, VOLUME, CandleRing, parse_candles
+from services.hyperliquid.models import ScreenerAsset
+from services.hyperliquid.state import DIRTY_CANDLES, HyperliquidState
+
+
+def _bar(t, c):
+    return {"t": t, "T": t + 59_999, "o": "1", "h": "2", "l": "0.5", "c": str(c), "v": "10", "n": 3}
+
+
+def _ts(ring):
+    return ring.window()[:, T].tolist()
+
+
+def test_ring_upsert_orders_replaces_and_evicts():
+    ring = CandleRing(4)
+    assert ring.upsert(parse_candles([_bar(t, t) for t in (0, 1, 2)]))
+    # Forming bar updated, duplicate within the batch: last one wins
+    assert ring.upsert(parse_candles([_bar(2, 20), _bar(2, 21), _bar(3, 3)]))
+    assert _ts(ring) == [0, 1, 2, 3] and ring.window()[2, CLOSE] == 21
+    assert not ring.upsert(parse_candles([_bar(1, 1)]))        # unchanged
+    assert not ring.upsert(parse_candles([{"c": "1"}]))        # no open time
+
+    for t in range(4, 20):
+        ring.upsert(parse_candles([_bar(t, t)]))
+    assert _ts(ring) == [16, 17, 18, 19]
+
+    # Late bar is inserted in order, the oldest falls off
+    ring.upsert(parse_candles([_bar(17.5, 0)]))
+    assert _ts(ring) == [17, 17.5, 18, 19] and ring.last_open_ms == 19
+    # ...but one older than the whole full window changes nothing
+    assert not ring.upsert(parse_candles([_bar(3, 3)]))
+    assert not ring.upsert(parse_candles([_bar(2, 2), _bar(17.5, 0)]))
+    assert _ts(ring) == [17, 17.5, 18, 19]
+
+    view = ring.window(2)
+    assert view.base is not None and not view.flags.writeable
+    with pytest.raises(ValueError):
+        view[0, CLOSE] = 0
+
+
+def test_state_marks_dirty_only_on_change():
+    state = HyperliquidState()
+    state.add_candles("BTC", "1m", [_bar(0, 1), _bar(60_000, 2)])
+    assert "BTC" in state.dirty[DIRTY_CANDLES]
+    state.dirty[DIRTY_CANDLES].clear()
+
+    state.upsert_candle("BTC", "1m", _bar(60_000, 2))
+    assert not state.dirty[DIRTY_CANDLES]
+    state.upsert_candle("BTC", "1m", _bar(60_000, 2.5))
+    assert "BTC" in state.dirty[DIRTY_CANDLES]
+
+    assert state.candle_window("BTC", "1m", n=1)[:, CLOSE].tolist() == [2.5]
+    assert state.candle_window("ETH", "1m").shape == (0, 8) and "ETH" not in state.candles
+    assert np.isnan(parse_candles([{"t": 1, "c": "x"}])[0, CLOSE])
+
+
+_H = 3_600_000
+
+
+def _trade(t, px, sz=1):
+    return {"coin": "BTC", "side": "B", "px": str(px), "sz": str(sz), "time": t}
+
+
+def test_trades_extend_seeded_series():
+    state = HyperliquidState()
+    state.add_candles("BTC", "1h", [{"t": 0, "T": _H - 1, "o": "10", "h": "11", "l": "9", "c": "10", "v": "5", "n": 2}])
+    state.add_candles("BTC", "5m", [{"t": _H - 300_000, "T": _H - 1, "o": "10", "h": "10", "l": "10", "c": "10", "v": "1", "n": 1}])
+    state.dirty[DIRTY_CANDLES].clear()
+
+    # Two trades finish the forming hour, one opens the next
+    state.add_trades("BTC", [_trade(_H - 30_000, 12, 2), _trade(_H - 10_000, 8), _trade(_H + 5_000, 9, 3)])
+    hour = state.candle_window("BTC", "1h", n=None)
+    assert hour[:, T].tolist() == [0, _H]
+    assert hour[0, [OPEN, HIGH, LOW, CLOSE, VOLUME, TRADES]].tolist() == [10, 12, 8, 8, 8, 4]
+    assert hour[1, [OPEN, CLOSE, VOLUME, TRADES]].tolist() == [9, 9, 3, 1]
+    assert state.candle_window("BTC", "5m", n=None)[:, T].tolist() == [_H - 300_000, _H]
+    assert set(state.candles["BTC"]) == {"1h", "5m"} and "BTC" in state.dirty[DIRTY_CANDLES]
+
+    # Coins without REST-seeded candles don't start series from trades
+    state.add_trades("ETH", [dict(_trade(_H, 1), coin="ETH")])
+    assert "ETH" not in state.candles
+
+
+class _CandleClient:
+    def __init__(self):
+        self.calls = []
+
+    async def get_candles_multi(self, coins, interval, n_bars=50, progress=None):
+        self.calls.append((interval, sorted(coins), n_bars))
+        return {c: [] for c in coins}
+
+
+def test_backfill_fetches_only_new_gap_and_uncovered():
+    state = HyperliquidState()
+    for i, coin in enumerate(("BTC", "ETH", "NEW")):
+        state.assets[coin] = ScreenerAsset(coin=coin, display_name=coin, market_type="perp", day_ntl_vlm=1e9 - i)
+    bars = [{"t": 0, "T": 59_999, "c": "1"}]
+    for coin in ("BTC", "ETH"):
+        for interval in ("1h", "5m", "1d"):
+            state.add_candles(coin, interval, bars)
+    state.trade_coins = {"BTC", "NEW"}
+    state.ws_connected = True
+    now = wsm.time.time()
+    last = {i: now for i in wsm._CANDLE_BARS}
+
+    client = _CandleClient()
+    asyncio.run(wsm._candle_backfill_once(state, client, last))
+    assert {(i, tuple(c)) for i, c, _ in client.calls} == {("1h", ("NEW",)), ("5m", ("NEW",)), ("1d", ("NEW",))}
+
+    client.calls.clear()
+    last = {i: now - wsm._UNCOVERED_REFRESH_S for i in last}
+    asyncio.run(wsm._candle_backfill_once(state, client, last))
+    assert ("1h", ["ETH"], 2) in client.calls and ("1h", ["NEW"], 50) in client.calls
+
+    client.calls.clear()
+    state.candle_gap_since = now - 600
+    asyncio.run(wsm._candle_backfill_once(state, client, last))
+    assert ("1h", ["BTC", "ETH"], 2) in client.calls and state.candle_gap_since is None
@@ -0,0 +1,54 @@
+import json
+import os
+import sys
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.hyperliquid import codec
+from services.hyperliquid.models import ScreenerAsset
+
+
+@pytest.fixture(params=codec.available_backends())
+def backend(request):
+    previous = codec.BACKEND
+    codec.use_backend(request.param)
+    yield request.param
+    codec.use_backend(previous)
+
+
+def test_response_matches_fastapi_default_encoding(backend):
+    payload = {
+        "rows": [{"coin": "BTC", "markPrice": 1e-05, "tags": ["l1"], "score": None, "name": "Bitcoin ₿"}],
+        "asset": ScreenerAsset(coin="BTC", display_name="BTC", mark_px=1.0, tags=["l1"]),
+        "seen": {"ETH"},
+        "ts": datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+    }
+    expected = json.loads(JSONResponse(jsonable_encoder(payload)).body)
+    assert json.loads(codec.FastJSONResponse(payload).body) == expected
+    assert codec.loads(codec.dumps_str(expected)) == expected
+    # NumPy scalars/arrays (jsonable_encoder rejects these)
+    assert codec.loads(codec.dumps([np.float64(1.5), np.int64(3), np.arange(2)])) == [1.5, 3, [0, 1]]
+
+
+def test_stdlib_backend_is_byte_identical_to_starlette():
+    previous = codec.BACKEND
+    try:
+        codec.use_backend("json")
+        payload = {"a": [1, 2.5, None, "é"], "b": {"c": True}}
+        assert codec.FastJSONResponse(payload).body == JSONResponse(payload).body
+    finally:
+        codec.use_backend(previous)
+
+
+def test_unknown_backend_falls_back():
+    previous = codec.BACKEND
+    try:
+        assert codec.use_backend("nope") in codec.available_backends()
+    finally:
+        codec.use_backend(previous)
@@ -0,0 +1,80 @@
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.hyperliquid.cross_section import mode_composites, universe_percentiles
+from services.hyperliquid.models import ScreenerAsset
+from services.hyperliquid.ranking_engine import _MODE_WEIGHTS, rank_assets
+
+
+def _universe(n, seed=3):
+    rng = random.Random(seed)
+
+    def maybe(v):
+        return None if rng.random() < 0.1 else v
+
+    return [
+        ScreenerAsset(
+            coin=f"C{i}", display_name=f"C{i}",
+            # Coarse buckets → plenty of ties
+            day_ntl_vlm=maybe(float(rng.randint(0, 50)) * 1e6),
+            open_interest_usd=maybe(rng.uniform(1e3, 1e8)),
+            funding=maybe(rng.choice([0.0, -0.0001, 0.0001, rng.uniform(-1e-3, 1e-3)])),
+            realized_volatility_medium=maybe(round(rng.uniform(5, 200), 1)),
+            momentum_score=maybe(rng.choice([0.0, 50.0, round(rng.uniform(0, 100), 1)])),
+            flow_score=maybe(round(rng.uniform(0, 100), 1)),
+            breakout_score=maybe(round(rng.uniform(0, 100), 1)),
+            mean_reversion_score=maybe(round(rng.uniform(0, 100), 1)),
+            liquidity_score=maybe(round(rng.uniform(0, 100), 1)),
+            volatility_score=maybe(round(rng.uniform(0, 100), 1)),
+        )
+        for i in range(n)
+    ]
+
+
+def _scalar_rank(value, population):
+    if not population:
+        return 0.5
+    return sum(1 for v in population if v < value) / len(population)
+
+
+def test_percentiles_match_scalar_definition():
+    # n=2000 exercises k/n values that sit exactly on a 3-dp rounding boundary
+    for n in (1, 7, 2000):
+        perps = _universe(n)
+        got = universe_percentiles(perps)
+        vlm_pop  = [a.day_ntl_vlm for a in perps if a.day_ntl_vlm is not None]
+        oi_pop   = [a.open_interest_usd for a in perps if a.open_interest_usd is not None]
+        fund_pop = [abs(a.funding or 0) for a in perps]
+        vol_pop  = [a.realized_volatility_medium for a in perps if a.realized_volatility_medium is not None]
+        for i, a in enumerate(perps):
+            exp = {
+                "volume_percentile": round(_scalar_rank(a.day_ntl_vlm, vlm_pop), 3) if a.day_ntl_vlm is not None else None,
+                "oi_percentile": round(_scalar_rank(a.open_interest_usd, oi_pop), 3) if a.open_interest_usd is not None else None,
+                "funding_percentile": round(_scalar_rank(abs(a.funding), fund_pop), 3) if a.funding is not None else None,
+                "volatility_percentile": (
+                    round(_scalar_rank(a.realized_volatility_medium, vol_pop), 3)
+                    if a.realized_volatility_medium is not None else None
+                ),
+            }
+            assert {f: got[f][i] for f in exp} == exp
+
+
+def test_mode_composites_and_rank_order_match_scalar():
+    assets = _universe(300)
+    got = mode_composites(assets, _MODE_WEIGHTS)
+    for mode, weights in _MODE_WEIGHTS.items():
+        expected = []
+        for a in assets:
+            total = 0.0
+            for field, w in weights.items():
+                total += (getattr(a, field) or 50.0) * w
+            expected.append(max(0.0, min(100.0, total)))
+        assert got[mode].tolist() == expected
+
+        ranked = rank_assets(assets, mode=mode)
+        order = sorted(range(len(assets)), key=lambda i: -expected[i])
+        assert [a.coin for a in ranked] == [assets[i].coin for i in order]
+        assert ranked[0].composite_signal_score == round(expected[order[0]], 1)
@@ -0,0 +1,78 @@
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.hyperliquid.history import SnapshotHistory
+from services.hyperliquid.models import ScreenerAsset
+from services.hyperliquid.state import DIRTY_OI, HyperliquidState
+from services.hyperliquid.websocket_manager import _compute_oi_changes, _save_score_snapshots
+
+
+def test_asof_lookup_and_ring_wrap():
+    hist = SnapshotHistory(capacity=4)
+    for i in range(10):
+        hist.record(100.0 * i, ["BTC", "ETH"] if i % 2 else ["BTC"], np.array([i, 10 * i][: 1 + i % 2], dtype=float))
+
+    assert len(hist) == 4
+    assert hist.timestamps().tolist() == [600.0, 700.0, 800.0, 900.0]
+    assert hist.asof(850.0, ["BTC", "ETH", "DOGE"]).tolist()[0] == 8.0
+    assert np.isnan(hist.asof(850.0, ["ETH"])[0])          # ETH missing in that snapshot
+    assert hist.asof(700.0, ["ETH"]).tolist() == [70.0]     # exact timestamp counts
+    assert np.isnan(hist.asof(599.0, ["BTC"])[0])           # before the window
+    assert np.isnan(hist.asof(850.0, ["BTC"], oldest=820.0)[0])
+    assert hist.points("ETH") == [(700.0, 70.0), (900.0, 90.0)]
+    assert hist.coins_with(2) == 2 and hist.coins_with(3) == 1
+
+
+def test_min_spacing_and_column_growth():
+    hist = SnapshotHistory(capacity=3, min_spacing_s=50)
+    coins = [f"C{i}" for i in range(600)]
+    assert hist.record(0.0, coins, np.arange(600.0))
+    assert not hist.record(30.0, coins, np.zeros(600))
+    assert hist.latest(["C599", "NEW"])[0] == 599.0
+
+
+def _state(now):
+    state = HyperliquidState()
+    for coin, oi in (("BTC", 1100.0), ("ETH", 0.0), ("SOL", 500.0)):
+        state.assets[coin] = ScreenerAsset(coin=coin, display_name=coin, market_type="perp", open_interest_usd=oi)
+    state.assets["PURR/USDC"] = ScreenerAsset(coin="PURR/USDC", display_name="PURR", market_type="spot")
+    state.oi_history.record(now - 3600, ["BTC", "ETH", "SOL"], np.array([1000.0, 10.0, 400.0]))
+    state.oi_history.record(now - 300, ["BTC", "ETH"], np.array([1000.0, 10.0]))
+    state.oi_history.record(now - 60, ["BTC", "ETH", "SOL"], np.array([1050.0, 10.0, 450.0]))
+    return state
+
+
+def test_oi_changes_vectorized_over_perps():
+    now = time.time()
+    state = _state(now)
+    _compute_oi_changes(state)
+
+    btc = state.get_asset("BTC")
+    assert btc.oi_change_5m == 0.1 and btc.oi_change_1h == 0.1
+    assert btc.oi_change_15m is None and btc.oi_change_24h is None
+    sol = state.get_asset("SOL")
+    assert sol.oi_change_5m is None          # no SOL value in the 5m snapshot
+    assert sol.oi_change_1h == 0.25
+    assert state.get_asset("ETH").oi_change_1h is None   # current OI is 0
+    assert state.take_dirty()[DIRTY_OI] == {"BTC", "SOL"}
+
+
+def test_score_change_against_previous_snapshot():
+    state = HyperliquidState()
+    state.assets["BTC"] = ScreenerAsset(coin="BTC", display_name="BTC", market_type="perp", composite_signal_score=40.0)
+    state.score_history.record(time.time() - 60, ["BTC"], np.array([35.5]))
+
+    _save_score_snapshots(state)
+    assert state.get_asset("BTC").score_change == 4.5
+    assert state.score_history.points("BTC")[-1][1] == 40.0
+
+    # Within 50s of the last snapshot: nothing recorded, score_change kept
+    state.assets["BTC"] = state.get_asset("BTC").model_copy(update={"composite_signal_score": 90.0})
+    _save_score_snapshots(state)
+    assert state.get_asset("BTC").score_change == 4.5
+    assert len(state.score_history) == 2
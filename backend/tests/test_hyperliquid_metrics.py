@@ -0,0 +1,76 @@
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.hyperliquid.feature_engine import run_full_feature_pass
+from services.hyperliquid.metrics import Histogram
+from services.hyperliquid.models import ScreenerAsset
+from services.hyperliquid.state import HyperliquidState
+from services.hyperliquid.websocket_manager import _apply_batch
+
+
+def _state():
+    state = HyperliquidState()
+    state.assets["BTC"] = ScreenerAsset(coin="BTC", display_name="BTC", mark_px=100.0, mid_px=100.0)
+    return state
+
+
+def _batch(recv_ts):
+    return [
+        (recv_ts, json.dumps({"channel": "allMids", "data": {"mids": {"BTC": "101"}}})),
+        (recv_ts, json.dumps({"channel": "bbo", "data": {"coin": "BTC", "bid": [{"px": "100"}], "ask": [{"px": "102"}]}})),
+        (recv_ts, json.dumps({"channel": "allMids", "data": {"mids": {"BTC": "102"}}})),
+    ]
+
+
+def test_histogram_exposition_is_cumulative():
+    hist = Histogram(buckets=(0.1, 1.0))
+    for v in (0.05, 0.5, 0.5, 3.0):
+        hist.observe(v)
+    assert hist.lines("x", 'pass="full"') == [
+        'x_bucket{pass="full",le="0.1"} 1',
+        'x_bucket{pass="full",le="1.0"} 3',
+        'x_bucket{pass="full",le="+Inf"} 4',
+        'x_sum{pass="full"} 4.050000',
+        'x_count{pass="full"} 4',
+    ]
+
+
+def test_detail_timings_only_after_a_scrape():
+    state = _state()
+    metrics = state.metrics
+    _apply_batch(state, _batch(time.time()))
+    assert metrics.frames == {"allMids": 2, "bbo": 1}
+    assert metrics.apply_latency.count == 1
+    assert not metrics.patch_seconds and not metrics.patch_calls
+
+    text = metrics.render({"ingest": state.ingest.as_dict(), "views": {"generation": None, "ok": True}})
+    assert 'hl_ws_frames_total{channel="allMids"} 2' in text
+    assert "hl_ingest_frames_applied 2" in text and "hl_views_ok 1" in text
+    assert "hl_views_generation" not in text
+
+    _apply_batch(state, _batch(time.time()))
+    assert metrics.patch_calls["patch_from_all_mids"] == 1 and metrics.patch_calls["decode"] == 3
+    assert metrics.patch_seconds["patch_from_bbo"] > 0
+
+    run_full_feature_pass(state)
+    stages = {stage for kind, stage in metrics.feature_pass if kind == "full"}
+    assert stages == {"total", "candle_features", "scores", "structural", "universe_ranks", "listeners"}
+
+
+def test_broadcast_latency_from_oldest_unbroadcast_frame():
+    state = _state()
+    metrics = state.metrics
+    _apply_batch(state, _batch(time.time() - 2.0))
+    _apply_batch(state, _batch(time.time()))
+    metrics.record_broadcast(sent=True)
+    assert metrics.broadcast_latency.count == 1 and metrics.broadcast_latency.sum >= 2.0
+
+    # Cycles without a delta (or the loop starting up) only reset the marker
+    _apply_batch(state, _batch(time.time() - 5.0))
+    metrics.record_broadcast(sent=False)
+    metrics.record_broadcast(sent=True)
+    assert metrics.broadcast_latency.count == 1
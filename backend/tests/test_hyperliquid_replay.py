@@ -0,0 +1,89 @@
+import asyncio
+import gzip
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.hyperliquid.recorder import RecordingRestClient, StreamRecorder, read_records
+from services.hyperliquid.replay import replay
+
+_COINS = ["BTC", "ETH"]
+
+
+class _FakeClient:
+    def __init__(self):
+        self.mids_calls = 0
+
+    async def get_meta_and_asset_ctxs(self):
+        uni = {"universe": [{"name": c, "szDecimals": 2, "maxLeverage": 20} for c in _COINS]}
+        ctxs = [{"markPx": "10", "oraclePx": "10", "midPx": "10", "prevDayPx": "9", "funding": "0.0001",
+                 "openInterest": "1000", "dayNtlVlm": str(1e7 * (i + 1)), "premium": "0",
+                 "impactPxs": ["9.9", "10.1"], "dayBaseVlm": "100"} for i, _ in enumerate(_COINS)]
+        return [uni, ctxs]
+
+    async def get_spot_meta_and_asset_ctxs(self):
+        return []
+
+    async def get_all_mids(self):
+        self.mids_calls += 1
+        return {"BTC": "10.5"}
+
+    async def get_candles_multi(self, coins, interval, n_bars=50, progress=None):
+        return {c: [{"t": 0, "T": 59_999, "o": "1", "h": "1", "l": "1", "c": "1", "v": "1", "n": 1}] for c in coins}
+
+    async def get_l2_books_multi(self, coins, progress=None):
+        return {c: {"coin": c, "levels": [[{"px": "9", "sz": "1", "n": 1}], [{"px": "11", "sz": "1", "n": 1}]]}
+                for c in coins}
+
+    async def close(self):
+        pass
+
+
+def _record(path):
+    from services.hyperliquid.state import HyperliquidState
+    from services.hyperliquid.websocket_manager import _boot_sequence
+
+    recorder = StreamRecorder(path)
+    asyncio.run(_boot_sequence(HyperliquidState(), RecordingRestClient(_FakeClient(), recorder)))
+    t0 = time.time()
+    for i in range(20):
+        mids = {"channel": "allMids", "data": {"mids": {"BTC": str(11 + i), "ETH": "20"}}}
+        recorder.frame(t0 + i * 0.01, json.dumps(mids))
+    recorder.frame(t0 + 0.5, json.dumps({"channel": "trades", "data": [
+        {"coin": "ETH", "side": "B", "px": "20", "sz": "1", "time": t0 * 1000}]}))
+    recorder.close()
+    return recorder
+
+
+def test_recorded_boot_and_frames_replay_through_the_pipeline(tmp_path):
+    path = tmp_path / "capture.jsonl.gz"
+    recorder = _record(path)
+    assert recorder.frames == 21 and recorder.rest_calls >= 5
+
+    state, report = asyncio.run(replay(path))
+    assert state.is_ready and set(state.assets) == {"BTC", "ETH"}
+    assert len(state.candles["ETH"]["1h"]) >= 1 and state.get_book("BTC") is not None
+    assert report.frames == 21 and report.batches == 5        # 50ms windows: 4 of mids, then the trade
+    assert state.metrics.frames == {"allMids": 20, "trades": 1}
+    assert state.get_asset("BTC").mid_px == 30.0               # last mids frame wins
+    assert len(state.get_recent_trades("ETH", max_age_s=1e9)) == 1
+    assert report.msgs_per_s > 0
+
+
+def test_truncated_capture_reads_up_to_the_cut(tmp_path):
+    path = tmp_path / "capture.jsonl.gz"
+    recorder = StreamRecorder(path)
+    for i in range(200):
+        recorder.frame(float(i), json.dumps({"channel": "allMids", "data": {"mids": {"BTC": str(i)}}}))
+    recorder.close()
+    data = path.read_bytes()
+    path.write_bytes(data[: len(data) - 20])
+
+    records = list(read_records(path))
+    assert 0 < len(records) <= 200 and records[0] == {"ws": records[0]["ws"], "t": 0.0}
+    with gzip.open(tmp_path / "empty.jsonl.gz", "wb"):
+        pass
+    assert list(read_records(tmp_path / "empty.jsonl.gz")) == []
@@ -0,0 +1,85 @@
+import asyncio
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+
+from services.hyperliquid.client import HyperliquidRestClient
+from services.hyperliquid.scheduler import InfoScheduler, request_weight
+
+
+def test_bulk_candles_retry_throttle_and_report():
+    calls: dict[str, int] = {}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        coin = json.loads(request.content)["req"]["coin"]
+        calls[coin] = calls.get(coin, 0) + 1
+        if coin == "BAD":
+            return httpx.Response(400, json={"error": "unknown coin"})
+        if coin == "FLAKY" and calls[coin] == 1:
+            return httpx.Response(429, headers={"Retry-After": "0"})
+        bars = [] if coin == "NEW" else [{"t": 0, "c": "1"}]
+        return httpx.Response(200, json=bars)
+
+    reports = []
+
+    async def run():
+        client = HyperliquidRestClient(transport=httpx.MockTransport(handler),
+                                       weight_per_min=60_000, backoff_base_s=0.01)
+        try:
+            out = await client.get_candles_multi(["BTC", "FLAKY", "BAD", "NEW"], "1h",
+                                                  n_bars=50, progress=reports.append)
+            return out, client.scheduler.stats()
+        finally:
+            await client.close()
+
+    out, stats = asyncio.run(run())
+    assert out == {"BTC": [{"t": 0, "c": "1"}], "FLAKY": [{"t": 0, "c": "1"}], "BAD": [], "NEW": []}
+    assert calls == {"BTC": 1, "FLAKY": 2, "BAD": 1, "NEW": 1}       # 4xx is not retried
+
+    report = reports[-1]
+    assert len(reports) == 4 and report.finished is not None
+    assert (report.ok, report.empty, report.failed, report.retries) == (3, 1, 1, 1)
+    assert report.weight == 5 * request_weight({"type": "candleSnapshot"}, 52) == 5 * 21
+    assert stats["throttled"] == 1 and stats["failures"] == 1 and stats["concurrency"] < 8
+
+
+def test_scheduler_budget_and_dedupe():
+    sent = []
+
+    async def send(payload):
+        sent.append(payload)
+        await asyncio.sleep(0.01)
+        return payload["n"]
+
+    async def run():
+        sched = InfoScheduler(send, weight_per_min=600)          # 10 weight/s, burst 600
+        same = await asyncio.gather(sched.request({"n": 1}, 20), sched.request({"n": 1}, 20))
+        assert same == [1, 1] and len(sent) == 1 and sched.deduped == 1
+
+        await sched.request({"n": 2}, 480)
+        t0 = asyncio.get_running_loop().time()
+        await sched.request({"n": 3}, 101)                       # 1 over budget → ~0.1s
+        return asyncio.get_running_loop().time() - t0
+
+    waited = asyncio.run(run())
+    assert 0.05 < waited < 0.5
+
+
+def test_cancelled_send_releases_its_slot():
+    async def send(payload):
+        await asyncio.sleep(10)
+
+    async def run():
+        sched = InfoScheduler(send, weight_per_min=600)
+        task = asyncio.ensure_future(sched._run({"n": 1}, 1, None))
+        await asyncio.sleep(0.01)
+        assert sched.stats()["in_flight"] == 1
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        return sched.stats()["in_flight"]
+
+    assert asyncio.run(run()) == 0
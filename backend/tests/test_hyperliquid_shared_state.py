@@ -0,0 +1,116 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.hyperliquid import shared_state
+from services.hyperliquid.models import ScreenerAsset
+from services.hyperliquid.shared_state import (
+    SharedStateReader,
+    SharedStateWriter,
+    collect_shared,
+    decode_shared,
+    try_ingester_lock,
+)
+from services.hyperliquid.state import READY_PRICES, HyperliquidState
+from services.hyperliquid.warm_start import encode_snapshot
+
+_HOUR_MS = 3_600_000
+
+
+def test_seqlock_publish_read_and_growth(tmp_path):
+    path = tmp_path / "state.bin"
+    writer = SharedStateWriter(path, initial_capacity=16)
+    reader = SharedStateReader(path)
+    assert reader.read() is None                       # nothing published yet
+
+    assert writer.publish(b"first") == 1
+    gen, _, payload = reader.read()
+    assert (gen, payload) == (1, b"first")
+    assert reader.read() is None                       # same generation
+
+    writer.publish(b"x" * 100)                         # grows the slots past the reader's mapping
+    assert reader.read()[2] == b"x" * 100
+    assert writer.stats()["capacity"] >= 100
+
+    # A publish left half-done (odd seq) is never read
+    writer.publish(b"third")
+    shared_state._SEQ.pack_into(writer._mm, shared_state._SEQ_OFFSET, writer.seq + 1)
+    assert reader.read() is None and reader.retries == shared_state._READ_ATTEMPTS
+
+    # A new ingester continues the sequence; readers pick up its first publish
+    writer.close()
+    writer = SharedStateWriter(path, initial_capacity=16)
+    writer.publish(b"fourth")
+    assert reader.read()[:3:2] == (4, b"fourth")
+    writer.close()
+    reader.close()
+
+
+def test_ingester_lock_is_exclusive(tmp_path):
+    lock = tmp_path / "state.bin.lock"
+    fd = try_ingester_lock(lock)
+    assert fd is not None
+    assert try_ingester_lock(lock) is None
+    os.close(fd)
+    fd = try_ingester_lock(lock)
+    assert fd is not None
+    os.close(fd)
+
+
+def test_reader_state_matches_ingester(tmp_path):
+    state = HyperliquidState()
+    state.assets["BTC"] = ScreenerAsset(coin="BTC", display_name="BTC", market_type="perp", mark_px=100.0)
+    state.universe_allowlist = {"BTC"}
+    now_ms = time.time() * 1000
+    start = int(now_ms // _HOUR_MS - 1) * _HOUR_MS
+    state.add_candles("BTC", "1h", [
+        {"t": t, "T": t + _HOUR_MS - 1, "o": "1", "h": "2", "l": "1", "c": "2", "v": "5", "n": 3}
+        for t in (start, start + _HOUR_MS)                 # the second bar is still forming
+    ])
+    state.set_book("BTC", {"levels": [[{"px": "99", "sz": "1", "n": 1}], [{"px": "101", "sz": "2", "n": 1}]]})
+    state.add_trades("BTC", [{"coin": "BTC", "px": "100", "sz": "1", "side": "B", "time": now_ms}])
+    state.mark_ready(READY_PRICES)
+    state.ingest.frames_received = 42
+    state.features_updated()
+
+    writer = SharedStateWriter(tmp_path / "state.bin")
+    writer.publish(encode_snapshot(collect_shared(state)))
+    reader = SharedStateReader(tmp_path / "state.bin")
+    copy = decode_shared(reader.read()[2])
+
+    assert copy.get_asset("BTC").mark_px == 100.0 and copy.in_universe("BTC")
+    assert copy.candle_window("BTC", "1h").tolist() == state.candle_window("BTC", "1h").tolist()
+    assert copy.get_book("BTC") == state.get_book("BTC")
+    assert len(copy.get_recent_trades("BTC")) == 1
+    assert copy.is_ready and copy.readiness() == state.readiness()
+    assert copy.feature_generation == 1 and copy.ingest.frames_received == 42
+    writer.close()
+    reader.close()
+
+
+def test_reader_metrics_survive_state_swaps(tmp_path, monkeypatch):
+    import asyncio
+    from services.hyperliquid.metrics import PipelineMetrics
+
+    monkeypatch.setattr(shared_state, "_PUBLISH_INTERVAL_S", 0.001)
+    monkeypatch.setattr(shared_state, "_ELECTION_INTERVAL_S", 0.0)
+    state = HyperliquidState()
+    state.mark_ready(READY_PRICES)
+    writer = SharedStateWriter(tmp_path / "state.bin")
+    writer.publish(encode_snapshot(collect_shared(state)))
+    seen = []
+
+    def set_state(s):
+        seen.append(s)
+        state.features_updated()
+        writer.publish(encode_snapshot(collect_shared(state)))
+
+    monkeypatch.setattr(shared_state, "try_ingester_lock", lambda path: 0 if len(seen) >= 2 else None)
+    metrics = PipelineMetrics()
+    asyncio.run(shared_state._follow(tmp_path / "state.bin", tmp_path / "lock", set_state, metrics))
+
+    assert len(seen) == 2 and seen[0] is not seen[1]
+    assert all(s.metrics is metrics for s in seen)
+    writer.close()
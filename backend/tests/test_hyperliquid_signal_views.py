@@ -0,0 +1,95 @@
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.hyperliquid.feature_engine import run_full_feature_pass
+from services.hyperliquid.models import ScreenerAsset
+from services.hyperliquid.signal_views import SignalViews
+from services.hyperliquid.state import HyperliquidState
+
+
+def _views(calls):
+    def build(kind):
+        def fn(state, *params):
+            calls.append((kind, params, state.feature_generation))
+            return {"kind": kind, "params": params, "generation": state.feature_generation}
+        return fn
+    return SignalViews(builders={"sections": build("sections"), "rank": build("rank")},
+                       eager=frozenset({"sections"}), max_remembered=2)
+
+
+def test_payloads_memoized_per_generation_and_params():
+    calls = []
+    views, state = _views(calls), HyperliquidState()
+
+    first = views.get(state, "sections", 6)
+    assert views.get(state, "sections", 6) is first
+    assert views.get(state, "sections", 10) is not first
+    assert len(calls) == 2 and views.stats()["hits"] == 1
+
+    state.features_updated()
+    assert views.get(state, "sections", 6)["generation"] == 1
+    assert len(calls) == 3
+
+
+def test_rebuild_renders_remembered_eager_params_only():
+    calls = []
+    views, state = _views(calls), HyperliquidState()
+    state.on_feature_pass(views.rebuild)
+    state.on_feature_pass(views.rebuild)          # registered once
+    for rows in (4, 6, 8):
+        views.get(state, "sections", rows)
+    views.get(state, "rank", "balanced")
+    calls.clear()
+
+    state.features_updated()
+    # Only the two most recent sections params; "rank" is built on demand
+    assert sorted(calls) == [("sections", (6,), 1), ("sections", (8,), 1)]
+    views.get(state, "sections", 8)
+    assert views.stats()["hits"] == 1 and views.stats()["eager_builds"] == 2
+
+
+def test_unrequested_params_age_out_of_eager_rebuilds():
+    calls = []
+    views, state = _views(calls), HyperliquidState()
+    state.on_feature_pass(views.rebuild)
+    views.remember("sections", 6)                  # endpoint default
+    views.get(state, "sections", 999)              # one-off client request
+    for _ in range(5):
+        state.features_updated()
+    rebuilt = [(params, gen) for kind, params, gen in calls if (kind, params) == ("sections", (999,))]
+    assert [gen for _, gen in rebuilt] == [0, 1, 2, 3]  # on request, then 3 idle passes
+    # The pinned default too stops once nobody polls the kind
+    assert [gen for kind, params, gen in calls if params == (6,)] == [1, 2, 3]
+
+
+def test_rebuild_runs_after_the_pass_and_yields_to_a_newer_one():
+    calls = []
+    views, state = _views(calls), HyperliquidState()
+    state.on_feature_pass(views.rebuild)
+    views.get(state, "sections", 6)
+    views.get(state, "sections", 8)
+    calls.clear()
+
+    async def go():
+        state.features_updated()
+        assert calls == []                      # nothing rendered inside the pass
+        await asyncio.sleep(0)
+        state.features_updated()                # lands mid-rebuild
+        for _ in range(5):
+            await asyncio.sleep(0)
+
+    asyncio.run(go())
+    assert sorted(calls) == [("sections", (6,), 2), ("sections", (8,), 2)]
+
+
+def test_feature_pass_bumps_generation():
+    state = HyperliquidState()
+    state.assets["BTC"] = ScreenerAsset(coin="BTC", display_name="BTC", market_type="perp", mark_px=1.0)
+    state.universe_allowlist = {"BTC"}
+    seen = []
+    state.on_feature_pass(lambda s: seen.append(s.feature_generation))
+    run_full_feature_pass(state)
+    assert state.feature_generation == 1 and seen == [1]
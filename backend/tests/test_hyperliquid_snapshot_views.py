@@ -0,0 +1,100 @@
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from services.hyperliquid import router
+from services.hyperliquid.models import ScreenerAsset
+from services.hyperliquid.snapshot_views import SnapshotViews, etag_matches
+from services.hyperliquid.state import HyperliquidState
+
+
+def _state():
+    state = HyperliquidState()
+    for i, (coin, mtype, vlm, score) in enumerate((
+        ("BTC", "perp", 5e9, 80.0),
+        ("ETH", "perp", 2e9, 90.0),
+        ("@1", "spot", 1e3, 99.0),      # below the default spot volume floor
+        ("@2", "spot", 1e6, 10.0),
+        ("SOL", "perp", 1e9, None),
+    )):
+        state.assets[coin] = ScreenerAsset(
+            coin=coin, display_name=coin.strip("@"), market_type=mtype,
+            day_ntl_vlm=vlm, overall_score=score, spread_bps=float(i),
+        )
+    state.universe_allowlist = set(state.assets)
+    return state
+
+
+def _rows(body: bytes) -> list[tuple[int, str]]:
+    return [(r["rank"], r["canonicalCoinId"]) for r in json.loads(body)["rows"]]
+
+
+def test_views_rank_filter_and_invalidate_by_generation():
+    state = _state()
+    views = SnapshotViews(router._asset_to_row, router._build_meta, max_staleness_s=0)
+
+    etag, body = views.render(state, "all", 10, "overall_score", True)
+    assert _rows(body) == [(1, "ETH"), (2, "BTC"), (3, "@2"), (4, "SOL")]
+    assert views.render(state, "all", 10, "overall_score", True) == (etag, body)
+
+    # Same cached row bytes, re-ranked for another order and filter
+    _, body = views.render(state, "all", 10, "overall_score", False, max_spread_bps=3.0)
+    assert _rows(body) == [(1, "@2"), (2, "BTC"), (3, "ETH")]
+    _, body = views.render(state, "perp", 2, "day_ntl_vlm", True)
+    assert _rows(body) == [(1, "BTC"), (2, "ETH")]
+    assert views.stats()["builds"] == 1 and views.stats()["hits"] == 1
+
+    state.assets.patch(state.assets.slot("SOL"), day_ntl_vlm=9e9)
+    _, body = views.render(state, "perp", 2, "day_ntl_vlm", True)
+    assert _rows(body) == [(1, "SOL"), (2, "BTC")]
+    assert views.stats()["builds"] == 2
+
+
+def test_meta_follows_readiness_and_time_without_a_table_write(monkeypatch):
+    from services.hyperliquid import snapshot_views
+    now = [1000.0]
+    monkeypatch.setattr(snapshot_views.time, "time", lambda: now[0])
+    state = _state()
+    views = SnapshotViews(router._asset_to_row, router._build_meta, meta_interval_s=15)
+
+    etag, body = views.render(state, "all", 10, "overall_score", True)
+    assert not json.loads(body)["meta"]["readiness"]["candleFeatures"]
+    assert views.render(state, "all", 10, "overall_score", True)[0] == etag
+
+    state.mark_ready(router.READY_CANDLE_FEATURES)
+    etag2, body = views.render(state, "all", 10, "overall_score", True)
+    assert etag2 != etag and json.loads(body)["meta"]["readiness"]["candleFeatures"]
+
+    state.is_stale = True
+    etag3, body = views.render(state, "all", 10, "overall_score", True)
+    assert etag3 != etag2 and json.loads(body)["meta"]["readiness"]["stale"]
+
+    misses = views.stats()["misses"]
+    now[0] += 15                                    # next meta bucket
+    views.render(state, "all", 10, "overall_score", True)
+    assert views.stats()["misses"] == misses + 1 and views.stats()["builds"] == 1
+
+
+def test_snapshot_etag_not_modified():
+    router.set_state(_state())
+    app = FastAPI()
+    app.include_router(router.router)
+    client = TestClient(app)
+    url = router.router.prefix + "/snapshot"
+
+    first = client.get(url)
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+    assert [r["coin"] for r in first.json()["rows"]] == ["ETH", "BTC", "2", "SOL"]
+
+    again = client.get(url, headers={"If-None-Match": etag})
+    assert again.status_code == 304 and again.headers["etag"] == etag
+    assert client.get(url + "?limit=1", headers={"If-None-Match": etag}).status_code == 200
+
+    assert etag_matches(f'"x", W/{etag}', etag)
+    assert not etag_matches(None, etag)
@@ -0,0 +1,202 @@
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.hyperliquid.feature_engine import run_full_feature_pass, run_incremental_feature_pass
+from services.hyperliquid.models import ScreenerAsset
+from services.hyperliquid.normalizer import (
+    patch_from_active_asset_ctx,
+    patch_from_all_mids,
+    patch_from_bbo,
+    patch_from_l2,
+    patch_trade_flow,
+)
+from services.hyperliquid.state import DIRTY_CANDLES, DIRTY_CTX, DIRTY_MIDS, HyperliquidState
+from services.hyperliquid.trade_flow import TradeFlow
+
+
+def _asset(coin, market_type="perp", **kw):
+    return ScreenerAsset(coin=coin, display_name=coin, market_type=market_type, **kw)
+
+
+def _state():
+    state = HyperliquidState()
+    state.assets["BTC"] = _asset("BTC", mark_px=100.0, mid_px=100.0, day_ntl_vlm=5e9, open_interest_usd=1e9)
+    state.assets["ETH"] = _asset("ETH", mark_px=10.0, day_ntl_vlm=2e9, open_interest_usd=3e9)
+    state.assets["SOL"] = _asset("SOL", mark_px=1.0, day_ntl_vlm=2e9)
+    state.assets["PURR/USDC"] = _asset("PURR/USDC", market_type="spot", mark_px=0.2, day_ntl_vlm=9e9)
+    return state
+
+
+def test_asset_table_behaves_like_dict():
+    state = _state()
+    assert len(state.assets) == 4
+    assert "BTC" in state.assets and "DOGE" not in state.assets
+    assert state.get_asset("DOGE") is None
+    assert list(state.assets) == ["BTC", "ETH", "SOL", "PURR/USDC"]
+    assert [a.coin for a in state.all_assets()] == ["BTC", "ETH", "SOL", "PURR/USDC"]
+    assert [a.coin for a in state.perp_assets()] == ["BTC", "ETH", "SOL"]
+
+    replaced = state.assets["BTC"].model_copy(update={"overall_score": 77.0, "mark_px": 101.0})
+    state.assets["BTC"] = replaced
+    assert state.assets["BTC"].overall_score == 77.0
+    assert state.assets["BTC"].mark_px == 101.0
+
+    del state.assets["ETH"]
+    assert "ETH" not in state.assets
+    state.assets["DOGE"] = _asset("DOGE", mark_px=0.1)
+    assert state.assets["DOGE"].mark_px == 0.1
+    assert state.assets["DOGE"].bid_px is None
+
+
+def test_patches_write_columns_and_materialize_lazily():
+    state = _state()
+    before = state.assets["BTC"]
+
+    patch_from_all_mids(state, {"BTC": "99.5", "ETH": "10.1", "UNKNOWN": "1.0", "SOL": "bad"})
+    # Nothing rebuilt yet — only columns changed
+    assert state.assets._rows[state.assets.slot("BTC")] is before
+
+    btc = state.assets["BTC"]
+    assert btc is not before
+    assert btc.mid_px == 99.5
+    assert btc.distance_mark_mid_pct == round((100.0 - 99.5) / 99.5 * 100, 4)
+    assert state.assets["SOL"].mid_px is None
+    # Cached until the next patch
+    assert state.assets["BTC"] is btc
+
+
+def test_bbo_l2_and_ctx_patches_match_previous_semantics():
+    state = _state()
+    patch_from_l2(state, "ETH", [[{"px": "9.9", "sz": "10"}], [{"px": "10.1", "sz": "5"}]])
+    eth = state.get_asset("ETH")
+    assert eth.bid_px == 9.9 and eth.ask_px == 10.1
+    assert eth.orderbook_bid_depth == 99.0
+    assert eth.orderbook_imbalance == round((99.0 - 50.5) / 149.5, 4)
+
+    # A real BBO overrides L2-derived best prices, L2 does not override BBO
+    patch_from_bbo(state, "ETH", {"bid": [{"px": "9.95"}], "ask": [{"px": "10.05"}]})
+    patch_from_l2(state, "ETH", [[{"px": "9.0", "sz": "1"}], [{"px": "11.0", "sz": "1"}]])
+    eth = state.get_asset("ETH")
+    assert eth.bid_px == 9.95 and eth.ask_px == 10.05
+    assert eth.spread_bps == round(0.1 / 10.0 * 10_000, 2)
+    assert eth.mid_px == 10.0
+
+    patch_from_active_asset_ctx(state, "BTC", {"markPx": "110", "openInterest": "2", "prevDayPx": "100"})
+    btc = state.get_asset("BTC")
+    assert btc.mark_px == 110.0
+    assert btc.open_interest_usd == 220.0
+    assert btc.pct_change_24h == 10.0
+    assert btc.day_ntl_vlm == 5e9   # partial ctx keeps existing values
+    assert btc.recent_trade_count == 0
+
+
+def test_top_coins_use_columns_and_keep_tie_order():
+    state = _state()
+    assert state.top_coins_by_volume(2) == ["BTC", "ETH"]
+    assert state.top_coins_by_volume(10) == ["BTC", "ETH", "SOL"]   # spot excluded
+    assert state.top_coins_by_oi(3) == ["ETH", "BTC", "SOL"]
+    patch_from_active_asset_ctx(state, "SOL", {"dayNtlVlm": "9e9"})
+    assert state.top_coins_by_volume(1) == ["SOL"]
+
+
+def test_table_grows_past_initial_capacity():
+    state = HyperliquidState()
+    for i in range(1500):
+        state.assets[f"C{i}"] = _asset(f"C{i}", mark_px=float(i + 1))
+    patch_from_all_mids(state, {f"C{i}": str(i + 2) for i in range(1500)})
+    assert len(state.assets) == 1500
+    assert state.assets["C1499"].mid_px == 1501.0
+    assert state.assets["C0"].mark_px == 1.0
+
+
+def _scored_state():
+    state = _state()
+    state.universe_allowlist = set(state.assets)
+    bars = [{"t": i * 3_600_000, "o": str(100 + i), "h": str(102 + i), "l": str(99 + i),
+             "c": str(101 + i), "v": str(10 + i % 7)} for i in range(40)]
+    for coin in ("BTC", "ETH"):
+        state.add_candles(coin, "1h", bars)
+        state.add_candles(coin, "5m", bars[-20:])
+    run_full_feature_pass(state)
+    return state
+
+
+def _rows(state):
+    return {c: a.model_dump(exclude={"last_updated_ts"}) for c, a in state.assets.items()}
+
+
+def test_patches_mark_dirty_sets():
+    state = _state()
+    patch_from_all_mids(state, {"BTC": "100.0", "ETH": "10.2"})   # BTC mid unchanged
+    patch_from_active_asset_ctx(state, "SOL", {"markPx": "1.1"})
+    state.add_candles("ETH", "1h", [{"t": 1, "c": "10"}])
+    state.add_candles("ETH", "1h", [{"t": 1, "c": "10"}])          # duplicate → no-op
+    dirty = state.take_dirty()
+    assert dirty[DIRTY_MIDS] == {"ETH"}
+    assert dirty[DIRTY_CTX] == {"SOL"}
+    assert dirty[DIRTY_CANDLES] == {"ETH"}
+    assert not state.take_dirty()
+
+
+def test_incremental_pass_matches_full_pass():
+    full, incr = _scored_state(), _scored_state()
+    assert asyncio.run(run_incremental_feature_pass(incr)) == 0
+
+    for state in (full, incr):
+        patch_from_all_mids(state, {"BTC": "97.0"})
+        patch_from_active_asset_ctx(state, "SOL", {"markPx": "1.3", "funding": "0.0005"})
+        state.upsert_candle("ETH", "1h", {"t": 40 * 3_600_000, "o": "140", "h": "150",
+                                          "l": "139", "c": "149", "v": "40"})
+    run_full_feature_pass(full)
+    assert asyncio.run(run_incremental_feature_pass(incr, yield_every=1)) == 3
+    assert _rows(incr) == _rows(full)
+
+
+def test_trade_flow_windows_accumulate_and_evict():
+    flow = TradeFlow()
+    now = 1_000_000_000.0
+    flow.add([
+        {"time": now - 800_000, "side": "A", "sz": "4", "px": "10"},    # 15m only
+        {"time": now - 120_000, "side": "B", "sz": "2", "px": "11"},    # 5m + 15m
+        {"time": now - 10_000,  "side": "B", "sz": "1", "px": "12"},    # all windows
+        {"time": now - 5_000,   "side": "X", "sz": "3", "px": "null"},  # unknown side, no px
+        {"time": now - 2_000_000, "side": "B", "sz": "9", "px": "9"},   # already expired
+    ], now)
+
+    m1, m5, m15 = (flow.stats(w, now) for w in (60, 300, 900))
+    assert (m1.count, m1.buy_volume, m1.sell_volume, m1.vwap) == (2, 1.0, 0.0, 12.0)
+    assert (m5.count, m5.buy_volume, m5.imbalance) == (3, 3.0, 1.0)
+    assert m5.vwap == (2 * 11 + 12) / 3
+    assert (m15.count, m15.sell_volume) == (4, 4.0)
+    assert m15.imbalance == (3.0 - 4.0) / 7.0
+
+    later = flow.stats(900, now + 200_000)   # oldest sell ages out of 15m
+    assert (later.count, later.sell_volume, later.imbalance) == (3, 0.0, 1.0)
+    drained = flow.stats(60, now + 600_000)
+    assert drained == (0, 0.0, 0.0, 0.0, None)
+
+
+def test_patch_trade_flow_matches_window_scan():
+    state = _state()
+    now_ms = time.time() * 1000
+    trades = [
+        {"coin": "BTC", "time": now_ms - i * 7_000, "side": "B" if i % 3 else "A",
+         "sz": str(0.1 * (i + 1)), "px": str(100 + i)}
+        for i in reversed(range(60))
+    ]
+    state.add_trades("BTC", trades)
+    patch_trade_flow(state, "BTC")
+
+    recent = [t for t in trades if t["time"] >= now_ms - 300_000]
+    buy = sum(float(t["sz"]) for t in recent if t["side"] == "B")
+    sell = sum(float(t["sz"]) for t in recent if t["side"] == "A")
+    btc = state.get_asset("BTC")
+    assert btc.recent_trade_count == len(recent)
+    assert btc.recent_trade_buy_volume == round(buy, 4)
+    assert btc.recent_trade_sell_volume == round(sell, 4)
+    assert btc.recent_trade_imbalance == round((buy - sell) / (buy + sell), 4)
+    assert btc.trade_imbalance_15m is not None and btc.recent_trade_vwap is not None
@@ -0,0 +1,85 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.hyperliquid.models import ScreenerAsset
+from services.hyperliquid.state import HyperliquidState
+from services.hyperliquid.subscriptions import (
+    ALL_MIDS,
+    SubscriptionManager,
+    desired_subscriptions,
+    subscription_message,
+)
+
+
+def _state():
+    state = HyperliquidState()
+    for i, coin in enumerate(["BTC", "ETH", "SOL", "DOGE"]):
+        state.assets[coin] = ScreenerAsset(
+            coin=coin, display_name=coin, market_type="perp",
+            day_ntl_vlm=1e9 * (4 - i), open_interest_usd=1e8 * (4 - i),
+        )
+    state.universe_allowlist = set(state.assets)
+    return state
+
+
+def test_subscription_message_shapes():
+    assert subscription_message(ALL_MIDS) == {"method": "subscribe", "subscription": {"type": "allMids"}}
+    assert subscription_message(("trades", "BTC"), "unsubscribe") == {
+        "method": "unsubscribe", "subscription": {"type": "trades", "coin": "BTC"},
+    }
+
+
+def test_desired_set_follows_detail_views_and_score_movers(monkeypatch):
+    import services.hyperliquid.subscriptions as subs
+
+    monkeypatch.setattr(subs, "_CTX_SUBS", 1)
+    monkeypatch.setattr(subs, "_BBO_SUBS", 1)
+    monkeypatch.setattr(subs, "_TRADE_SUBS", 1)
+    state = _state()
+    state.assets["SOL"] = state.assets["SOL"].model_copy(update={"score_change": -12.0})
+    state.detail_views["DOGE"] = 1000.0
+
+    desired = desired_subscriptions(state, now=1100.0)
+    assert ALL_MIDS in desired
+    assert {("activeAssetCtx", "BTC"), ("bbo", "BTC"), ("trades", "BTC")} <= desired
+    # Mover: ctx + bbo only; detail view: every feed
+    assert {("activeAssetCtx", "SOL"), ("bbo", "SOL")} <= desired and ("trades", "SOL") not in desired
+    assert {("activeAssetCtx", "DOGE"), ("bbo", "DOGE"), ("trades", "DOGE")} <= desired
+    assert not any(coin == "ETH" for _, coin in desired)
+
+    # An expired view drops out
+    assert ("trades", "DOGE") not in desired_subscriptions(state, now=1000.0 + 3600)
+
+
+def test_plan_returns_incremental_diffs():
+    manager = SubscriptionManager(n_connections=1, per_connection=100)
+    (add, gone), = manager.plan({ALL_MIDS, ("trades", "BTC"), ("trades", "ETH")})
+    assert set(add) == {ALL_MIDS, ("trades", "BTC"), ("trades", "ETH")} and gone == []
+
+    (add, gone), = manager.plan({ALL_MIDS, ("trades", "BTC"), ("bbo", "SOL")})
+    assert add == [("bbo", "SOL")]
+    assert gone == [("trades", "ETH")]
+    assert manager.coins("trades") == {"BTC"}
+
+    (add, gone), = manager.plan({ALL_MIDS, ("trades", "BTC"), ("bbo", "SOL")})
+    assert add == [] and gone == []
+    assert manager.stats()["subscribes"] == 4 and manager.stats()["unsubscribes"] == 1
+
+
+def test_plan_balances_shards_and_counts_overflow():
+    manager = SubscriptionManager(n_connections=2, per_connection=3)
+    desired = {ALL_MIDS} | {("trades", f"C{i}") for i in range(7)}
+    changes = manager.plan(desired)
+
+    assert [len(s) for s in manager.shards] == [3, 3]
+    assert manager.overflow == 2
+    # Lower-priority feeds are the ones left out; allMids always gets a slot
+    assert ALL_MIDS in manager.assigned()
+    assert sum(len(add) for add, _ in changes) == 6
+
+    # Freed capacity is refilled on the next rotation, on the shard that lost it
+    manager.plan(desired - {("trades", "C0")})
+    assert [len(s) for s in manager.shards] == [3, 3]
+    assert manager.overflow == 1
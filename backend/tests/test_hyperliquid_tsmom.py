@@ -0,0 +1,90 @@
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.hyperliquid.candles import CLOSE
+from services.hyperliquid.models import ScreenerAsset
+from services.hyperliquid.state import HyperliquidState
+from services.hyperliquid.tsmom import TsmomEngine, compute_tsmom_signals
+
+_DAY_MS = 86_400_000
+
+
+def _daily(n, drift, seed, end_day):
+    rng = random.Random(seed)
+    px, bars = 100.0, []
+    for i in range(n + 1):     # + the forming bar
+        t = (end_day - n + i) * _DAY_MS
+        px *= math.exp(drift + rng.gauss(0, 0.03))
+        bars.append({"t": t, "T": t + _DAY_MS - 1, "o": "1", "h": "1", "l": "1", "c": str(px), "v": "1", "n": 1})
+    return bars
+
+
+def _state():
+    state = HyperliquidState()
+    today = int(time.time() * 1000 // _DAY_MS)
+    specs = {"BTC": (120, 0.01, 1e9), "ETH": (120, -0.01, 5e8), "NEW": (25, 0.0, 1e8), "TINY": (10, 0.0, 1e7)}
+    for i, (coin, (n, drift, vlm)) in enumerate(specs.items()):
+        state.assets[coin] = ScreenerAsset(coin=coin, display_name=coin, market_type="perp",
+                                           day_ntl_vlm=vlm, funding=0.0001 * (i - 1))
+        state.add_candles(coin, "1d", _daily(n, drift, i, today))
+    # HIP-3 perps are outside the TSMOM universe
+    state.assets["xyz:AAPL"] = ScreenerAsset(coin="xyz:AAPL", display_name="AAPL", market_type="perp", day_ntl_vlm=1e10)
+    state.add_candles("xyz:AAPL", "1d", _daily(120, 0.0, 9, today))
+    return state
+
+
+def _reference(state, coin):
+    """The per-coin loop the matrix engine replaced (closed bars only)."""
+    closes = state.candle_window(coin, "1d", n=121)[:-1, CLOSE].tolist()
+    rets = [math.log(b / a) for a, b in zip(closes, closes[1:])]
+
+    def std(xs):
+        m = sum(xs) / len(xs)
+        return math.sqrt(sum((x - m) ** 2 for x in xs) / len(xs))
+
+    sigma = std(rets[-30:])
+    zs = [max(-2, min(2, sum(rets[-lb:]) / (std(rets[-lb:]) * math.sqrt(lb)))) for lb in (10, 30, 90) if len(rets) >= lb]
+    return sum(zs) / len(zs), sigma * math.sqrt(365)
+
+
+def test_matrix_engine_matches_per_coin_computation():
+    state = _state()
+    out = compute_tsmom_signals(state)
+    by_coin = {s["coin"]: s for s in out["signals"]}
+
+    assert set(by_coin) == {"BTC", "ETH", "NEW"}       # TINY: too few bars; xyz:AAPL: HIP-3
+    for coin, sig in by_coin.items():
+        s_raw, sigma_ann = _reference(state, coin)
+        assert sig["s_raw"] == round(s_raw, 3)
+        assert sig["sigma"] == round(sigma_ann * 100, 1)
+    assert by_coin["NEW"]["bars_used"] == 25 and by_coin["NEW"]["momentum_30d"] is None
+    assert by_coin["BTC"]["side"] == "long" and by_coin["ETH"]["side"] == "short"
+    assert out["meta"]["total_signals"] == 3
+    assert out["meta"]["long_count"] + out["meta"]["short_count"] + out["meta"]["flat_count"] == 3
+
+    assert [s["coin"] for s in compute_tsmom_signals(state, top_n=1)["signals"]] == ["BTC"]
+
+
+def test_engine_caches_per_candle_generation():
+    state = _state()
+    engine = TsmomEngine()
+    first = engine.signals(state)
+    assert engine.signals(state) is first
+    assert engine.stats()["builds"] == 1 and engine.stats()["hits"] == 1
+
+    # A forming-bar update from trades does not invalidate; a REST upsert does
+    state._fold_trades("BTC", [{"coin": "BTC", "px": "1", "sz": "1", "time": time.time() * 1000}])
+    assert engine.signals(state) is first
+    today = int(time.time() * 1000 // _DAY_MS)
+    state.add_candles("BTC", "1d", _daily(120, -0.02, 7, today))
+    second = engine.signals(state)
+    assert second is not first and engine.stats()["builds"] == 2
+
+    for n in range(1, 40):
+        engine.signals(state, top_n=n)
+    assert len(engine._results) == 16
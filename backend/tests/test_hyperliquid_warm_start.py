@@ -0,0 +1,128 @@
+import asyncio
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.hyperliquid.candles import CLOSE, TRADES
+from services.hyperliquid.normalizer import build_perp_universe
+from services.hyperliquid.state import HyperliquidState
+from services.hyperliquid.warm_start import load_warm_start, save_warm_start
+from services.hyperliquid.websocket_manager import _boot_sequence
+
+_HOUR_MS = 3_600_000
+
+
+def _universe(coins):
+    uni = {"universe": [{"name": c, "szDecimals": 2, "maxLeverage": 20} for c in coins]}
+    ctxs = [{"markPx": "10.5", "oraclePx": "10.4", "midPx": "10.5", "prevDayPx": "10", "funding": "0.0001",
+             "openInterest": "1000", "dayNtlVlm": str(1e6 * (i + 1)), "premium": "0", "impactPxs": ["10.4", "10.6"],
+             "dayBaseVlm": "100"} for i, _ in enumerate(coins)]
+    return [uni, ctxs]
+
+
+def _bars(n, end_ms):
+    start = end_ms - n * _HOUR_MS
+    return [{"t": start + i * _HOUR_MS, "T": start + (i + 1) * _HOUR_MS - 1, "s": "X", "i": "1h",
+             "o": "1.5", "h": "1.75", "l": "1.25", "c": str(1 + i / 8), "v": "12.5", "n": 7}
+            for i in range(n)]
+
+
+def _warm_state():
+    state = HyperliquidState()
+    for coin, asset in build_perp_universe(_universe(["BTC", "ETH", "OLD"])).items():
+        state.assets[coin] = asset.model_copy(update={"overall_score": 61.0})
+    state.perp_allowlist = set(state.assets)
+    state.universe_allowlist = set(state.assets)
+    now_ms = int(time.time() * 1000)
+    # Last bar still forming (closes in the future)
+    state.add_candles("BTC", "1h", _bars(30, now_ms + _HOUR_MS // 2))
+    state.oi_history.record(time.time() - 120, ["BTC"], np.array([1000.0]))
+    state.oi_history.record(time.time() - 60, ["BTC", "ETH"], np.array([1100.0, 5.0]))
+    state.score_history.record(time.time() - 60, ["ETH"], np.array([42.5]))
+    return state
+
+
+def test_snapshot_round_trip(tmp_path):
+    path = tmp_path / "state.bin"
+    state = _warm_state()
+    assert save_warm_start(state, path) > 0
+
+    warm = HyperliquidState()
+    saved_at = load_warm_start(warm, path)
+    assert saved_at is not None and warm.warm_start_ts == saved_at
+    assert {c: a.model_dump() for c, a in warm.assets.items()} == {c: a.model_dump() for c, a in state.assets.items()}
+    assert warm.universe_allowlist == state.universe_allowlist
+
+    orig = state.candle_window("BTC", "1h", n=None)[:-1]   # forming bar dropped
+    got = warm.candle_window("BTC", "1h", n=None)
+    assert got.tolist() == orig.tolist()
+    assert got[0, TRADES] == 7 and got[-1, CLOSE] == 1 + 28 / 8
+    assert warm.oi_history.points("BTC") == state.oi_history.points("BTC")
+    assert warm.oi_history.points("ETH") == state.oi_history.points("ETH") != []
+    assert warm.score_history.points("ETH") == state.score_history.points("ETH")
+
+    assert load_warm_start(HyperliquidState(), path, max_age_s=-1) is None
+    assert load_warm_start(HyperliquidState(), tmp_path / "missing.bin") is None
+
+
+def test_corrupt_snapshot_falls_back_to_cold_boot(tmp_path):
+    path = tmp_path / "state.bin"
+    save_warm_start(_warm_state(), path)
+    data = path.read_bytes()
+    path.write_bytes(data[:-64])                     # truncated mid history block
+
+    warm = HyperliquidState()
+    assert load_warm_start(warm, path) is None
+    assert len(warm.assets) == 0 and not warm.candles and not warm.universe_allowlist
+    assert warm.warm_start_ts is None and warm.oi_history.points("BTC") == []
+
+    # Failing after the assets were restored leaves nothing half-loaded
+    save_warm_start(_warm_state(), path)
+    warm = HyperliquidState()
+
+    def bad_rows(*args):
+        raise ValueError("incompatible candle layout")
+    warm.add_candle_rows = bad_rows
+    assert load_warm_start(warm, path) is None
+    assert len(warm.assets) == 0 and not warm.universe_allowlist
+
+
+class _FakeClient:
+    def __init__(self):
+        self.candle_calls = []
+
+    async def get_meta_and_asset_ctxs(self):
+        return _universe(["BTC", "ETH", "SOL"])
+
+    async def get_spot_meta_and_asset_ctxs(self):
+        return []
+
+    async def get_all_mids(self):
+        return {}
+
+    async def get_candles_multi(self, coins, interval, n_bars=50, progress=None):
+        self.candle_calls.append((interval, sorted(coins), n_bars))
+        return {c: [] for c in coins}
+
+    async def get_l2_books_multi(self, coins, progress=None):
+        return {}
+
+
+def test_boot_backfills_only_the_gap(tmp_path):
+    path = tmp_path / "state.bin"
+    save_warm_start(_warm_state(), path)
+    state = HyperliquidState()
+    saved_at = load_warm_start(state, path)
+
+    client = _FakeClient()
+    asyncio.run(_boot_sequence(state, client, since_ts=saved_at - 2 * 3600 + 60))
+
+    calls = {(i, tuple(c)): n for i, c, n in client.candle_calls if c}
+    assert calls[("1h", ("BTC",))] == 3                    # <2h gap + 1 bar
+    assert calls[("1h", ("ETH", "SOL"))] == 50              # no warm bars → full window
+    assert "OLD" not in state.assets and "OLD" not in state.universe_allowlist
+    assert state.get_asset("ETH").mark_px == 10.5
@@ -0,0 +1,95 @@
+import asyncio
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.hyperliquid.broadcaster import ScreenerBroadcaster
+
+
+class _FakeWS:
+    def __init__(self, gate: asyncio.Event | None = None):
+        self.frames: list[dict] = []
+        self.gate = gate
+
+    async def send_text(self, text: str):
+        if self.gate is not None:
+            await self.gate.wait()
+        self.frames.append(json.loads(text))
+
+
+def _row(coin, price, score):
+    return {"coin": coin, "canonicalCoinId": coin.lower(), "price": price, "overallScore": score}
+
+
+def _broadcaster(rows, queue_max=32):
+    return ScreenerBroadcaster(
+        build_rows=lambda: list(rows),
+        build_meta=lambda r: {"count": len(r)},
+        ready=lambda: True,
+        interval_s=3600,
+        queue_max=queue_max,
+    )
+
+
+async def _settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_delta_carries_only_changed_fields():
+    async def run():
+        rows = [_row("BTC", 100.0, 70), _row("ETH", 10.0, 60), _row("SOL", 1.0, 50)]
+        b = _broadcaster(rows)
+        ws = _FakeWS()
+        b.add(ws)
+        await _settle()
+        assert ws.frames[0]["event"] == "snapshot_ready"
+        assert len(ws.frames[0]["data"]["rows"]) == 3
+
+        rows[0] = _row("BTC", 101.0, 70)
+        rows.pop()
+        delta = b.publish()
+        await _settle()
+        assert delta["rows"] == [{"price": 101.0, "coin": "BTC", "canonicalCoinId": "btc"}]
+        assert delta["removed"] == ["sol"]
+        assert ws.frames[-1]["event"] == "rows_delta" and ws.frames[-1]["seq"] == 1
+
+        assert b.publish() is None          # nothing changed → no frame
+        b.remove(ws)
+
+    asyncio.run(run())
+
+
+def test_slow_client_is_resynced_without_blocking_others():
+    async def run():
+        rows = [_row("BTC", 100.0, 70)]
+        b = _broadcaster(rows, queue_max=2)
+        gate = asyncio.Event()
+        slow, fast = _FakeWS(gate), _FakeWS()
+        b.add(slow)
+        b.add(fast)
+        await _settle()
+
+        for i in range(6):
+            rows[0] = _row("BTC", 101.0 + i, 70)
+            b.publish()
+            await _settle()
+
+        # The fast client saw every delta in order
+        assert [f["seq"] for f in fast.frames if f["event"] == "rows_delta"] == [1, 2, 3, 4, 5, 6]
+        assert b.resyncs >= 1 and b.frames_dropped >= 1
+
+        gate.set()
+        await _settle()
+        # The slow client's backlog collapsed into a fresh snapshot at the latest seq
+        last = slow.frames[-1]
+        assert last["event"] == "snapshot_ready" and last["seq"] == 6
+        assert last["data"]["rows"][0]["price"] == 106.0
+        assert all(f["seq"] <= 6 for f in slow.frames)
+
+        b.remove(slow)
+        b.remove(fast)
+
+    asyncio.run(run())
@@ -0,0 +1,84 @@
+import json
+import os
+import sys
+import time
+from collections import deque
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.hyperliquid.models import ScreenerAsset
+from services.hyperliquid.state import HyperliquidState
+from services.hyperliquid.websocket_manager import _apply_batch, _enqueue_frame
+
+
+def _state():
+    state = HyperliquidState()
+    for coin, px in (("BTC", 100.0), ("ETH", 10.0)):
+        state.assets[coin] = ScreenerAsset(coin=coin, display_name=coin, mark_px=px, mid_px=px)
+    return state
+
+
+def _frame(channel, data):
+    return (time.time(), json.dumps({"channel": channel, "data": data}))
+
+
+def _bbo(coin, bid, ask):
+    return _frame("bbo", {"coin": coin, "bid": [{"px": str(bid)}], "ask": [{"px": str(ask)}]})
+
+
+def test_batch_coalesces_latest_per_coin():
+    state = _state()
+    batch = [
+        _bbo("BTC", 99, 101),
+        _bbo("BTC", 98, 102),
+        _frame("activeAssetCtx", {"coin": "BTC", "ctx": {"funding": "0.0001", "openInterest": "5"}}),
+        _frame("activeAssetCtx", {"coin": "BTC", "ctx": {"funding": "0.0002"}}),
+        _frame("allMids", {"mids": {"BTC": "100.5", "ETH": "10.5"}}),
+        _bbo("ETH", 9.9, 10.1),
+        _frame("allMids", {"mids": {"BTC": "100.7"}}),
+        _frame("allMids", {"mids": {"DOGE": "0.1"}}),
+        _frame("trades", [{"coin": "ETH", "side": "B", "sz": "1", "px": "10", "time": time.time() * 1000}]),
+        _frame("trades", [{"coin": "ETH", "side": "A", "sz": "3", "px": "10", "time": time.time() * 1000}]),
+        (time.time(), "not json"),
+        _frame("pong", {}),
+    ]
+    _apply_batch(state, batch)
+
+    btc, eth = state.get_asset("BTC"), state.get_asset("ETH")
+    assert (btc.bid_px, btc.ask_px) == (98.0, 102.0)        # latest bbo only
+    assert btc.funding == 0.0002 and btc.open_interest == 5.0  # ctx fields merged
+    assert btc.mid_px == 100.7                               # allMids came after BTC's bbo
+    assert eth.mid_px == 10.0                                # ETH's bbo came after its mid
+    assert eth.recent_trade_count == 2 and eth.recent_trade_imbalance == -0.5
+
+    stats = state.ingest
+    assert stats.frames_coalesced == 4
+    assert stats.decode_errors == 1
+    assert stats.frames_applied == len(batch) - 4 - 1
+    assert stats.batches == 1 and stats.apply_latency_ms_last >= 0
+
+
+def test_enqueue_drops_oldest_when_full():
+    state = _state()
+    frames = deque(maxlen=3)
+    for i in range(3):
+        _enqueue_frame(state, frames, str(i))
+    assert state.candle_gap_since is None
+    first_ts = frames[0][0]
+    for i in range(3, 5):
+        _enqueue_frame(state, frames, str(i))
+    assert [raw for _, raw in frames] == ["2", "3", "4"]
+    assert state.candle_gap_since == first_ts       # the backfill repairs bars from the drop
+    assert state.ingest.frames_received == 5
+    assert state.ingest.frames_dropped == 2
+    assert state.ingest.queue_depth == 3
+
+
+def test_partial_all_mids_frames_are_merged():
+    state = _state()
+    _apply_batch(state, [
+        _frame("allMids", {"mids": {"BTC": "101", "ETH": "11"}}),
+        _frame("allMids", {"mids": {"BTC": "102"}}),
+    ])
+    assert state.get_asset("BTC").mid_px == 102.0
+    assert state.get_asset("ETH").mid_px == 11.0
@@ -73,7 +73,7 @@ def mock_service():
 
     svc.finviz._custom_screen = mock_custom_screen
 
-    def mock_get_quote(ticker):
+    async def mock_get_quote(ticker):
         return {
             "price": 55.0,
             "change_pct": 2.5,
@@ -96,8 +96,8 @@ def mock_service():
 
     svc.stockanalysis.get_overview = mock_get_overview
 
-    svc.finnhub.get_stock_candles = MagicMock(return_value=_make_bars(60))
-    svc.polygon.get_daily_bars = MagicMock(return_value=_make_bars(60))
+    svc.finnhub.get_stock_candles = AsyncMock(return_value=_make_bars(60))
+    svc.polygon.get_daily_bars = AsyncMock(return_value=_make_bars(60))
 
     return svc
 
@@ -278,7 +278,7 @@ async def test_quotes_batch_populates_prices(mock_service):
 
     def mock_quote(ticker):
         return {"price": 100.5, "change_pct": 2.3, "prev_close": 98.2}
-    mock_service.finnhub.get_quote = MagicMock(side_effect=mock_quote)
+    mock_service.finnhub.get_quote = AsyncMock(side_effect=mock_quote)
 
     quotes = await mock_service.get_quotes_batch(["AAPL", "MSFT", "GOOG"])
     assert len(quotes) == 3
@@ -294,7 +294,7 @@ async def test_quotes_batch_fallback_on_failure(mock_service):
 
     def fail_quote(ticker):
         raise Exception("Finnhub down")
-    mock_service.finnhub.get_quote = MagicMock(side_effect=fail_quote)
+    mock_service.finnhub.get_quote = AsyncMock(side_effect=fail_quote)
 
     async def mock_fmp_quote(ticker):
         return {"price": 99.0, "changesPercentage": 1.5, "previousClose": 97.5}
@@ -303,3 +303,27 @@ async def test_quotes_batch_fallback_on_failure(mock_service):
     quotes = await mock_service.get_quotes_batch(["AAPL"])
     assert "AAPL" in quotes
     assert quotes["AAPL"]["price"] == 99.0
+
+
+def test_candle_budget_is_checked_per_caller(mock_service):
+    cache.clear()
+
+    async def slow_candles(symbol, days):
+        await asyncio.sleep(0.01)
+        return _make_bars(60)
+
+    mock_service.finnhub.get_stock_candles = slow_candles
+    exhausted, payer, joiner = CandleBudget(max_calls=0), CandleBudget(), CandleBudget()
+
+    async def go():
+        return await asyncio.gather(*[mock_service.get_candles("ZZBUD", budget=b)
+                                      for b in (exhausted, payer, joiner)])
+
+    blocked, bars, shared = asyncio.run(go())
+    assert blocked == [] and len(bars) == 60 and shared is bars
+    assert exhausted.stats_dict()["blocked"] == 1
+    assert payer.stats_dict()["cache_hits"] == 0 and joiner.stats_dict()["cache_hits"] == 0
+
+    # Now cached: even an exhausted budget is served, as a hit
+    assert asyncio.run(mock_service.get_candles("ZZBUD", budget=exhausted)) == bars
+    assert exhausted.stats_dict()["cache_hits"] == 1